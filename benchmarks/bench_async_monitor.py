@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the frames/s AsyncCANMonitor fans in from several interfaces at full
+load, one sender per interface flooding it as fast as it can, and what a
+subscriber that keeps up receives.
+
+With SocketCAN (the default) the senders are separate processes and the
+interfaces must exist:
+    sudo modprobe vcan
+    for i in 0 1 2 3; do sudo ip link add dev vcan$i type vcan && sudo ip link set up vcan$i; done
+
+With --bustype virtual the python-can virtual bus is used, senders are
+threads of this process and no kernel support is needed.
+
+Usage:
+    python benchmarks/bench_async_monitor.py [--interfaces 4] [--seconds 5] [--bustype virtual]
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+
+import can
+
+from vss_lib.canbus.aio import AsyncCANMonitor
+
+
+def flood(channel, bustype, seconds, ready):
+    bus = can.Bus(channel, interface=bustype)
+    messages = [can.Message(arbitration_id=0x100 + i, data=bytes([i] * 8), is_extended_id=False) for i in range(64)]
+    ready.wait()
+    deadline = time.monotonic() + seconds
+    sent = 0
+    while time.monotonic() < deadline:
+        try:
+            bus.send(messages[sent % 64])
+            sent += 1
+        except can.CanError:
+            time.sleep(0.0001)  # Transmit queue full
+    bus.shutdown()
+
+
+async def measure(channels, bustype, seconds):
+    monitor = AsyncCANMonitor(channels, bustype=bustype)
+    subscription = monitor.subscribe(maxsize=10000)
+    if bustype == 'virtual':
+        ready = threading.Event()
+        senders = [threading.Thread(target=flood, args=(channel, bustype, seconds, ready)) for channel in channels]
+    else:
+        ready = multiprocessing.Event()
+        senders = [multiprocessing.Process(target=flood, args=(channel, bustype, seconds, ready)) for channel in channels]
+    for sender in senders:
+        sender.start()
+
+    consumed = 0
+
+    async def consume():
+        nonlocal consumed
+        async for _ in subscription:
+            consumed += 1
+
+    monitor.start()
+    consumer = asyncio.create_task(consume())
+    cpu = time.process_time()
+    ready.set()
+    await asyncio.sleep(seconds)
+    cpu = time.process_time() - cpu
+    await monitor.stop()
+    await consumer
+    for sender in senders:
+        sender.join()
+    return monitor.received, consumed, subscription.dropped, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AsyncCANMonitor fan-in from several interfaces.")
+    parser.add_argument("--interfaces", type=int, default=4, help="Number of interfaces read concurrently")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of the measurement")
+    parser.add_argument("--bustype", default="socketcan", help="python-can interface, socketcan or virtual")
+    parser.add_argument("--prefix", default="vcan", help="Interface name prefix, numbered from 0")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    channels = [f"{args.prefix}{i}" for i in range(args.interfaces)]
+    received, consumed, dropped, cpu = asyncio.run(measure(channels, args.bustype, args.seconds))
+    total = sum(received.values())
+    print(f"{args.interfaces} {args.bustype} interfaces at full load for {args.seconds:g} s")
+    for channel, count in received.items():
+        print(f"  {channel:<8} {count / args.seconds:12,.0f} frames/s read")
+    print(f"  total    {total / args.seconds:12,.0f} frames/s read, {consumed / args.seconds:,.0f} frames/s consumed, "
+          f"{dropped:,} dropped, reader CPU {cpu / args.seconds * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the per-frame cost of the CANBusMonitor bus statistics and the cost
+of polling a snapshot, for buses with 64 and 2048 active arbitration IDs.
+
+Usage:
+    python benchmarks/bench_bus_stats.py [--frames N]
+"""
+
+import argparse
+import logging
+import time
+
+from vss_lib.canbus.busstats import BusStatistics
+
+
+def synthetic_frames(count, ids, rate=3000.0):
+    return [(1000.0 + i / rate, 0x100 + i % ids, bytes([i // ids % 256] * 8)) for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-ID CAN bus statistics.")
+    parser.add_argument("--frames", type=int, default=1000000, help="Frames counted per measurement")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    print(f"{args.frames:,} frames per measurement")
+    for ids in (64, 2048):
+        frames = synthetic_frames(args.frames, ids)
+        stats = BusStatistics()
+        update = stats.update
+        start = time.perf_counter()
+        for timestamp, can_id, data in frames:
+            update(timestamp, can_id, data)
+        elapsed = time.perf_counter() - start
+
+        polls = 100
+        now = frames[-1][0]
+        start = time.perf_counter()
+        for _ in range(polls):
+            snapshot = stats.snapshot(now=now)
+        poll = (time.perf_counter() - start) / polls
+        print(f"  {ids:>5} IDs  update {args.frames / elapsed:12,.0f} frames/s ({elapsed / args.frames * 1e9:5.0f} ns/frame)   "
+              f"snapshot {poll * 1e3:6.2f} ms   bus load {snapshot['bus_load_percent']:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Decode a synthetic recorded drive with decode_many() and compare it with
+decoding frame by frame through CANDatabase.decode_vss(), and measure
+encode_many() on the same signals.
+
+The log has --frames 8-byte frames spread over --messages message IDs with
+four Intel/Motorola signals each. The frame-by-frame rate is measured on a
+sample of the log.
+
+Usage:
+    python benchmarks/bench_can_bulk.py [--frames N] [--messages N] [--sample N]
+"""
+
+import argparse
+import logging
+import time
+
+import numpy
+
+from vss_lib.canbus.bulk import decode_many, encode_many
+from vss_lib.canbus.codec import BIG_ENDIAN, LITTLE_ENDIAN, CANDatabase, CANFrame, MessageLayout, SignalLayout
+
+
+def synthetic_database(messages):
+    database = CANDatabase()
+    for index in range(messages):
+        byte_order = BIG_ENDIAN if index % 2 else LITTLE_ENDIAN
+        signals = [
+            SignalLayout(f"Message{index}.Signal{slot}", slot * 16 + (7 if byte_order == BIG_ENDIAN else 0), 16,
+                         byte_order, is_signed=slot % 2 == 1, scale=0.01, offset=-100,
+                         vss_path=f"Vehicle.Message{index}.Signal{slot}")
+            for slot in range(4)
+        ]
+        database.add(MessageLayout(0x100 + index, f"Message{index}", signals))
+    return database
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk CAN frame decoding and encoding.")
+    parser.add_argument("--frames", type=int, default=10_000_000, help="Frames in the synthetic log")
+    parser.add_argument("--messages", type=int, default=50, help="Distinct message IDs in the log")
+    parser.add_argument("--sample", type=int, default=200_000, help="Frames decoded one at a time")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    database = synthetic_database(args.messages)
+    rng = numpy.random.default_rng(1)
+    ids = rng.integers(0x100, 0x100 + args.messages, size=args.frames, dtype=numpy.uint32)
+    payloads = rng.integers(0, 256, size=(args.frames, 8), dtype=numpy.uint8)
+    print(f"{args.frames:,} frames, {args.messages} message IDs, {args.messages * 4} signals")
+
+    sample = min(args.sample, args.frames)
+    frames = [CANFrame(int(i), bytes(data), False, False) for i, data in zip(ids[:sample], payloads[:sample])]
+    start = time.perf_counter()
+    for frame in frames:
+        database.decode_vss(frame)
+    single = sample / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    columns = decode_many(database, ids, payloads.tobytes())
+    elapsed = time.perf_counter() - start
+    bulk = args.frames / elapsed
+    values = sum(len(column.values) for column in columns.values())
+    print(f"  frame by frame   {single:14,.0f} frames/s   (sample of {sample:,})")
+    print(f"  decode_many      {bulk:14,.0f} frames/s   {elapsed:.2f} s, {values:,} values")
+    print(f"  speedup: {bulk / single:.0f}x")
+
+    start = time.perf_counter()
+    encoded = encode_many(database, {name: column.values for name, column in columns.items()})
+    elapsed = time.perf_counter() - start
+    print(f"  encode_many      {len(encoded) / elapsed:14,.0f} frames/s   {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
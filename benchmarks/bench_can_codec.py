@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure CAN frame encoding and decoding rates of the signal packing engine for
+classic 8-byte frames (Intel and Motorola signals) and 64-byte CAN FD frames,
+and for CANBusSimulator's single-signal encode/decode round trip.
+
+Usage:
+    python benchmarks/bench_can_codec.py [--frames N]
+"""
+
+import argparse
+import logging
+import time
+
+from vss_lib.canbus import CANBusSimulator
+from vss_lib.canbus.codec import BIG_ENDIAN, CANDatabase, CANFrame, LITTLE_ENDIAN, MessageLayout, SignalLayout
+
+
+def layouts():
+    intel = MessageLayout(0x100, "Intel", [
+        SignalLayout(f"Intel{i}", i * 16, 16, LITTLE_ENDIAN, scale=0.01, offset=-100) for i in range(4)
+    ])
+    motorola = MessageLayout(0x200, "Motorola", [
+        SignalLayout(f"Motorola{i}", i * 16 + 7, 16, BIG_ENDIAN, is_signed=True, scale=0.1) for i in range(4)
+    ])
+    fd = MessageLayout(0x300, "FD", [
+        SignalLayout(f"FD{i}", i * 16, 16, LITTLE_ENDIAN, scale=0.01) for i in range(32)
+    ], length=64)
+    return intel, motorola, fd
+
+
+def rate(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CAN signal packing engine.")
+    parser.add_argument("--frames", type=int, default=200000, help="Frames per measurement")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    print(f"{args.frames:,} frames per measurement")
+    for message in layouts():
+        values = {signal.name: 42.5 for signal in message.signals}
+        data = message.encode(values)
+        encode = rate(lambda: message.encode(values), args.frames)
+        decode = rate(lambda: message.decode(data), args.frames)
+        label = f"{message.name} ({len(message.signals)} signals, {message.length} bytes)"
+        print(f"  {label:34s} encode {encode:12,.0f} frames/s   decode {decode:12,.0f} frames/s")
+
+    intel = layouts()[0]
+    simulator = CANBusSimulator(CANDatabase([intel]))
+    payload = {"signal": "Intel0", "value": 42.5}
+    round_trip = rate(lambda: simulator.decode_can_message(simulator.encode_can_message(payload)), args.frames)
+    frame = CANFrame(0x100, intel.encode({"Intel0": 42.5}), False, False)
+    database_decode = rate(lambda: simulator.database.decode(frame), args.frames)
+    print(f"  {'CANBusSimulator encode + decode':34s} {round_trip:19,.0f} frames/s")
+    print(f"  {'CANDatabase.decode by ID':34s} {database_decode:19,.0f} frames/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Drive a vcan interface with the CAN load generator at increasing rates and
+measure what CANBusMonitor keeps up with: frames/s processed, CPU and frames
+dropped (sent by the generator but never processed), with the monitor only
+logging frames and with it also decoding them into VSS signals.
+
+The generator runs in its own process and sends the IDs of a vendor from
+CANBusMonitor.VENDORS with counter payloads. Needs a vcan interface:
+    sudo modprobe vcan
+    sudo ip link add dev vcan0 type vcan && sudo ip link set up vcan0
+
+Usage:
+    python benchmarks/bench_can_load.py [--interface vcan0] [--rates 1000,10000,50000] [--seconds 3]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+
+from vss_lib.canbus.codec import CANDatabase
+from vss_lib.canbus.loadgen import LoadGenerator, vendor_stream
+from vss_lib.canbus.monitor import CANBusMonitor
+
+LAYOUT = os.path.join(os.path.dirname(__file__), "..", "usr", "share", "vss-lib", "can", "toyota.yaml")
+
+
+def generate(interface, vendor, rate, seconds, ready, result):
+    with LoadGenerator(interface, [vendor_stream(vendor, rate, burst=max(1, int(rate // 1000)))]) as generator:
+        ready.wait()
+        result.put(generator.run(duration=seconds))
+
+
+def measure(interface, vendor, rate, seconds, database):
+    monitor = CANBusMonitor(interface, database=database, log_capacity=10000)
+    ready = multiprocessing.Event()
+    result = multiprocessing.Queue()
+    generator = multiprocessing.Process(target=generate, args=(interface, vendor, rate, seconds, ready, result))
+    generator.start()
+    processed = 0
+    cpu = time.process_time()
+    ready.set()
+    while True:
+        msg = monitor.bus.recv(0.2)
+        if msg is None:
+            if not generator.is_alive():
+                break
+            continue
+        monitor.process_message(msg)
+        processed += 1
+    cpu = time.process_time() - cpu
+    stats = result.get()
+    generator.join()
+    monitor.bus.shutdown()
+    return stats, processed, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CANBusMonitor under generated CAN load.")
+    parser.add_argument("--interface", default="vcan0", help="vcan interface to use")
+    parser.add_argument("--vendor", default="toyota", help="Vendor whose CAN IDs are sent")
+    parser.add_argument("--rates", default="1000,10000,50000,100000", help="Comma separated frames/s")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duration of each measurement")
+    parser.add_argument("--layout", default=LAYOUT, help="CAN layout file used for decoding")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    database = CANDatabase.from_file(args.layout)
+    print(f"{args.vendor} IDs on {args.interface}, {args.seconds:g} s per measurement")
+    for rate in (float(rate) for rate in args.rates.split(",")):
+        for label, db in (("log", None), ("log+decode", database)):
+            stats, processed, cpu = measure(args.interface, args.vendor, rate, args.seconds, db)
+            dropped = stats['sent'] - processed
+            print(f"  {rate:>9,.0f} frames/s {label:<11} sent {stats['frames_per_s']:10,.0f}/s   "
+                  f"processed {processed / args.seconds:10,.0f}/s   dropped {dropped:8,} "
+                  f"({dropped / max(stats['sent'], 1) * 100:5.1f}%)   CPU {cpu / args.seconds * 100:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
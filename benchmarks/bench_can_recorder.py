@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the CAN traffic recorder and replayer: frames/s recorded to and read
+back from a native log and a candump log, peak memory while streaming the
+log, and the timing accuracy of a replay at 1x, 10x and as fast as possible
+onto a python-can virtual bus.
+
+Usage:
+    python benchmarks/bench_can_recorder.py [--frames N] [--replay-seconds S]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+import can
+
+from vss_lib.canbus.recorder import FrameRecorder, FrameReplayer, LoggedFrame, convert, open_frames
+
+
+def synthetic_frames(count, rate=2000.0):
+    for i in range(count):
+        yield LoggedFrame(1000.0 + i / rate, 0x100 + i % 64, bytes([i % 256] * 8))
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def drain(frames):
+    count = 0
+    for _ in frames:
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CAN traffic recorder and replayer.")
+    parser.add_argument("--frames", type=int, default=1000000, help="Frames in the synthetic log")
+    parser.add_argument("--replay-seconds", type=float, default=2.0, help="Duration of the 1x replay")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as directory:
+        native = os.path.join(directory, "drive.canlog")
+        candump = os.path.join(directory, "drive.log")
+
+        def record():
+            with FrameRecorder(native) as recorder:
+                for frame in synthetic_frames(args.frames):
+                    recorder.record(frame)
+
+        _, elapsed = timed(record)
+        size = os.path.getsize(native)
+        print(f"{args.frames:,} frames, native log {size / 1e6:.1f} MB ({size / args.frames:.1f} bytes/frame)")
+        print(f"  record native       {args.frames / elapsed:12,.0f} frames/s")
+
+        _, elapsed = timed(lambda: drain(open_frames(native)))
+        tracemalloc.start()
+        drain(open_frames(native))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  read native         {args.frames / elapsed:12,.0f} frames/s   peak memory {peak / 1e6:.1f} MB")
+
+        _, elapsed = timed(lambda: convert(native, candump))
+        print(f"  export candump      {args.frames / elapsed:12,.0f} frames/s   {os.path.getsize(candump) / 1e6:.1f} MB")
+        _, elapsed = timed(lambda: drain(open_frames(candump)))
+        print(f"  read candump        {args.frames / elapsed:12,.0f} frames/s")
+
+        bus = can.Bus("bench-replay", interface="virtual")
+        replay_frames = int(args.replay_seconds * 2000)
+        for label, speed, count in (("1x", 1.0, replay_frames), ("10x", 10.0, replay_frames * 10),
+                                    ("as fast as possible", None, args.frames)):
+            frames = (frame for _, frame in zip(range(count), open_frames(native)))
+            stats = FrameReplayer(bus, speed=speed).replay(frames)
+            print(f"  replay {label:<20} {stats['frames_per_s']:12,.0f} frames/s   lateness mean "
+                  f"{stats['jitter_mean_ms']:.3f} ms, stddev {stats['jitter_stddev_ms']:.3f} ms, max {stats['jitter_max_ms']:.3f} ms")
+        bus.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the per-value cost of the hardware signal change filter and the share
+of D-Bus values it saves for a producer sending slowly changing and noisy
+signals at 100 Hz, without deadbands, with deadbands and disabled.
+
+Usage:
+    python benchmarks/bench_change_filter.py [--values N] [--signals N]
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from vss_lib.dbus.changefilter import ChangeFilter
+
+
+def synthetic_values(count, signals, period_us=10000):
+    # A third of the signals are constant, a third step every second, a third are noisy around a level
+    rng = random.Random(0)
+    entries = []
+    for i in range(count):
+        signal = i % signals
+        tick = i // signals
+        timestamp = 1_700_000_000_000_000 + tick * period_us
+        kind = signal % 3
+        if kind == 0:
+            value = 1.0
+        elif kind == 1:
+            value = float(tick // 100)
+        else:
+            value = 50.0 + rng.gauss(0.0, 0.1)
+        entries.append((f"toyota.Signal{signal}", value, timestamp))
+    return entries
+
+
+def measure(label, change_filter, entries):
+    start = time.perf_counter()
+    emitted = len(change_filter.filter(entries))
+    elapsed = time.perf_counter() - start
+    stats = change_filter.stats()
+    print(f"{label:<28} {elapsed / len(entries) * 1e9:8.0f} ns/value  {emitted:>10,} emitted"
+          f"  {stats['saved_percent']:5.1f}% saved  {stats['keyframes']:,} keyframes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hardware signal change filter.")
+    parser.add_argument("--values", type=int, default=1000000, help="Values filtered per measurement")
+    parser.add_argument("--signals", type=int, default=300, help="Distinct signals")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    entries = synthetic_values(args.values, args.signals)
+    print(f"{args.values:,} values of {args.signals} signals at 100 Hz")
+
+    measure("disabled", ChangeFilter(enabled=False), entries)
+    measure("exact change, 1 s keyframe", ChangeFilter(), entries)
+    deadbands = ChangeFilter()
+    deadbands.configure("toyota", {f"Signal{s}": {"absolute": 0.5} for s in range(2, args.signals, 3)}, prefix="toyota")
+    measure("deadband on noisy signals", deadbands, entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure DBC import on a synthetic file with thousands of messages: parsing and
+compiling the DBC text vs. loading the compiled database from the disk cache,
+and mapping the signals to the VSS paths of a model.
+
+Usage:
+    python benchmarks/bench_dbc.py [--messages N] [--signals N] [--runs N]
+"""
+
+import argparse
+import gc
+import logging
+import os
+import tempfile
+import time
+
+from vss_lib.canbus.dbc import load_dbc, map_signals
+from vss_lib.vspec.model import Model
+
+VSPEC_FILE = os.path.join(os.path.dirname(__file__), "..", "usr", "share", "vss-lib", "toyota.vspec")
+
+
+def synthetic_dbc(messages, signals):
+    """
+    Build a DBC document with `messages` 8-byte messages of `signals` signals each,
+    alternating Intel and Motorola byte order; every tenth message is multiplexed.
+    """
+    bits = 64 // signals
+    lines = ['VERSION ""', '', 'BU_: ECU', '']
+    for index in range(messages):
+        raw_id = 0x100 + index if index < 0x600 else 0x80000000 | (0x18000000 + index)
+        lines.append(f"BO_ {raw_id} Message{index}: 8 ECU")
+        multiplexed = index % 10 == 0
+        for slot in range(signals):
+            mux = ""
+            if multiplexed and slot == 0:
+                mux = " M"
+            elif multiplexed:
+                mux = f" m{slot % 2}"
+            if index % 2:
+                start, order = slot * bits + bits - 1, "0"  # Motorola start bit is the MSB
+            else:
+                start, order = slot * bits, "1"
+            lines.append(f" SG_ Signal{index}_{slot}{mux} : {start}|{bits}@{order}+ (0.01,-10) [0|100] \"\" Vector__XXX")
+        lines.append("")
+    lines.append('BA_DEF_ SG_ "VSSPath" STRING ;')
+    lines.append('BA_ "VSSPath" SG_ 256 Signal0_1 "Speed";')
+    return "\n".join(lines) + "\n"
+
+
+def timed(func, runs):
+    best = float("inf")
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DBC parsing and the compiled DBC cache.")
+    parser.add_argument("--messages", type=int, default=5000, help="Messages in the synthetic DBC file")
+    parser.add_argument("--signals", type=int, default=8, help="Signals per message (1-64)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement, the best is reported")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dbc_file = os.path.join(tmp, "synthetic.dbc")
+        with open(dbc_file, "w") as file:
+            file.write(synthetic_dbc(args.messages, args.signals))
+        cache_dir = os.path.join(tmp, "cache")
+
+        parse, database = timed(lambda: load_dbc(dbc_file, use_cache=False), args.runs)
+        load_dbc(dbc_file, cache_dir=cache_dir)
+        cached, _ = timed(lambda: load_dbc(dbc_file, cache_dir=cache_dir), args.runs)
+        model = Model.from_file(VSPEC_FILE)
+        mapping, mapped = timed(lambda: map_signals(database, model), args.runs)
+
+        size = os.path.getsize(dbc_file)
+        signals = sum(len(message.signals) for message in database.messages.values())
+        print(f"{len(database):,} messages, {signals:,} signals, {size / 1e6:.1f} MB DBC file")
+        print(f"  parse + compile   {parse * 1000:9.1f} ms   {len(database) / parse:12,.0f} messages/s")
+        print(f"  compiled cache    {cached * 1000:9.1f} ms   {len(database) / cached:12,.0f} messages/s")
+        print(f"  map to VSS paths  {mapping * 1000:9.1f} ms   ({mapped} signal(s) mapped)")
+        print(f"  cache speedup: {parse / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
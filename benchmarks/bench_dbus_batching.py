@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare end-to-end D-Bus throughput of one SignalEmitted message per value
+with SignalsEmitted batches built by the service's SignalBuffer.
+
+A publisher subprocess emits the values on the session bus and this process
+receives them; rates are measured on the receiving side. Needs pydbus and a
+session bus, e.g. run it under dbus-run-session.
+
+Usage:
+    dbus-run-session -- python benchmarks/bench_dbus_batching.py [--count N] [--batch-size N]
+"""
+
+import argparse
+import logging
+import subprocess
+import sys
+import time
+
+from gi.repository import GLib
+from pydbus import SessionBus
+from pydbus.generic import signal
+
+from vss_lib.dbus.batching import SignalBuffer
+
+BUS_NAME = "com.vss_lib.BenchSignals"
+INTERFACE = "com.vss_lib.VehicleSignals"
+
+
+class Publisher:
+    """
+    The signal part of the com.vss_lib.VehicleSignals interface.
+    """
+    dbus = f"""
+    <node>
+      <interface name='{INTERFACE}'>
+        <signal name='SignalEmitted'>
+          <arg type='s' name='signal_name'/>
+          <arg type='d' name='value'/>
+        </signal>
+        <signal name='SignalsEmitted'>
+          <arg type='a(sdt)' name='signals'/>
+        </signal>
+      </interface>
+    </node>
+    """
+
+    SignalEmitted = signal()
+    SignalsEmitted = signal()
+
+
+def publish(mode, count, batch_size):
+    bus = SessionBus()
+    publisher = Publisher()
+    bus.publish(BUS_NAME, publisher)
+    time.sleep(0.5)  # Let the receiver see the name before the first value
+
+    names = [f"toyota.Signal{i}" for i in range(64)]
+    if mode == "single":
+        for i in range(count):
+            publisher.SignalEmitted(names[i % 64], float(i))
+    else:
+        buffer = SignalBuffer(publisher.SignalsEmitted, max_size=batch_size)
+        for i in range(count):
+            buffer.add(names[i % 64], float(i))
+        buffer.flush()
+    bus.con.flush_sync(None)
+
+
+def receive(mode, count, batch_size, timeout):
+    bus = SessionBus()
+    loop = GLib.MainLoop()
+    state = {'values': 0, 'messages': 0, 'first': None, 'last': None}
+
+    def on_signal(sender, object_path, interface, member, parameters):
+        now = time.perf_counter()
+        if state['first'] is None:
+            state['first'] = now
+        state['last'] = now
+        state['messages'] += 1
+        state['values'] += len(parameters[0]) if member == "SignalsEmitted" else 1
+        if state['values'] >= count:
+            loop.quit()
+
+    member = "SignalEmitted" if mode == "single" else "SignalsEmitted"
+    bus.subscribe(iface=INTERFACE, signal=member, signal_fired=on_signal)
+    publisher = subprocess.Popen([sys.executable, __file__, "--publish", mode,
+                                  "--count", str(count), "--batch-size", str(batch_size)])
+    GLib.timeout_add_seconds(timeout, loop.quit)
+    loop.run()
+    publisher.wait()
+
+    elapsed = (state['last'] or 0) - (state['first'] or 0) or float('nan')
+    return state['values'], state['messages'], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched vs. single-value D-Bus signals.")
+    parser.add_argument("--count", type=int, default=100000, help="Values to send per mode")
+    parser.add_argument("--batch-size", type=int, default=256, help="Values per SignalsEmitted message")
+    parser.add_argument("--timeout", type=int, default=120, help="Seconds to wait for the values of one mode")
+    parser.add_argument("--publish", choices=["single", "batched"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    if args.publish:
+        publish(args.publish, args.count, args.batch_size)
+        return
+
+    print(f"{args.count:,} values per mode, batches of {args.batch_size}")
+    rates = {}
+    for mode in ("single", "batched"):
+        values, messages, elapsed = receive(mode, args.count, args.batch_size, args.timeout)
+        rates[mode] = values / elapsed
+        lost = f", {args.count - values:,} not received" if values < args.count else ""
+        print(f"  {mode:8s} {messages / elapsed:12,.0f} messages/s {values / elapsed:12,.0f} values/s{lost}")
+    print(f"  speedup: {rates['batched'] / rates['single']:.1f}x values/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Load test of the asyncio ELM327 transport against the pty-based fake ELM327.
+
+Compares the blocking ELM327 shared by threads behind a lock with
+AsyncELM327 serving concurrent tasks, then repeats the async run while
+faults are injected (unanswered requests, spontaneous adapter restarts and
+a hang-up of the port) and checks that no request was lost.
+
+Usage:
+    python benchmarks/bench_elm327_async.py [--clients N] [--requests N] [--latency S]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from vss_lib.elm327 import ELM327
+from vss_lib.elm327.aio import AsyncELM327
+from vss_lib.elm327.emulator import FakeELM327
+
+PIDS = [0x0C, 0x0D, 0x05, 0x0F, 0x11, 0x04]
+
+
+def report(label, latencies, elapsed, failed=0):
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+    print(f"{label:<34} {len(latencies) / elapsed:7.1f} requests/s  p50 {statistics.median(latencies) * 1000:6.1f} ms"
+          f"  p99 {p99 * 1000:6.1f} ms  failed {failed}")
+
+
+def run_threads(port, clients, requests):
+    elm = ELM327(port)
+    elm.initialize()
+    lock = threading.Lock()
+    latencies = []
+
+    def client(index):
+        for i in range(requests):
+            start = time.perf_counter()
+            with lock:
+                elm.query_many([PIDS[(index + i) % len(PIDS)]], responses=1)
+            latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    report(f"ELM327, {clients} threads + lock", latencies, time.perf_counter() - start)
+    elm.close()
+
+
+async def run_tasks(port, clients, requests, label, fake=None, timeout=1.0):
+    latencies = []
+    failed = 0
+
+    async def client(elm, index):
+        nonlocal failed
+        for i in range(requests):
+            start = time.perf_counter()
+            try:
+                await elm.query_many([PIDS[(index + i) % len(PIDS)]], responses=1)
+            except (TimeoutError, ConnectionError):
+                failed += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    async def faults():
+        for round in range(3):
+            await asyncio.sleep(0.3)
+            fake.unanswered = 1
+            await asyncio.sleep(0.3)
+            fake.reboot()
+        await asyncio.sleep(0.3)
+        await asyncio.to_thread(fake.hangup, 0.2)
+
+    async with AsyncELM327(port, timeout=timeout) as elm:
+        start = time.perf_counter()
+        injector = asyncio.create_task(faults()) if fake is not None else None
+        await asyncio.gather(*(client(elm, index) for index in range(clients)))
+        elapsed = time.perf_counter() - start
+        if injector is not None:
+            await injector
+        report(label, latencies, elapsed, failed)
+        lost = clients * requests - len(latencies) - failed
+        if fake is not None:
+            print(f"{'':<34} timeouts {elm.timeouts}, resets {elm.resets}, reconnects {elm.reconnects}, lost {lost}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the asyncio ELM327 transport.")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent threads or tasks")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per client")
+    parser.add_argument("--latency", type=float, default=0.002, help="Seconds the emulated ECU takes to answer")
+    args = parser.parse_args()
+
+    with FakeELM327(latency=args.latency) as fake:
+        print(f"{args.clients} clients x {args.requests} requests, emulated ECU latency {args.latency * 1000:.0f} ms")
+        run_threads(fake.port, 1, args.clients * args.requests)
+        run_threads(fake.port, args.clients, args.requests)
+        asyncio.run(run_tasks(fake.port, 1, args.clients * args.requests, "AsyncELM327, 1 task"))
+        asyncio.run(run_tasks(fake.port, args.clients, args.requests, f"AsyncELM327, {args.clients} tasks"))
+    with tempfile.TemporaryDirectory() as directory:
+        with FakeELM327(latency=args.latency, link=os.path.join(directory, "elm327")) as fake:
+            asyncio.run(run_tasks(fake.port, args.clients, args.requests,
+                                  f"AsyncELM327, {args.clients} tasks, faults", fake, timeout=0.2))
+
+
+if __name__ == "__main__":
+    main()
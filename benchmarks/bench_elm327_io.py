@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the PIDs per second ELM327 polls from the pty-based fake ELM327:
+the former fixed one second sleep and 128-byte read per command vs. reading
+up to the prompt.
+
+Usage:
+    python benchmarks/bench_elm327_io.py [--latency S] [--queries N]
+"""
+
+import argparse
+import itertools
+import time
+
+from vss_lib.elm327 import ELM327
+from vss_lib.elm327.emulator import FakeELM327
+
+POLLED = [ELM327.RPM_COMMAND, ELM327.SPEED_COMMAND, ELM327.COOLANT_TEMP_COMMAND]
+
+
+def sleep_and_read(elm, command):
+    # The request/response cycle every getter used before
+    elm.ser.write(command)
+    time.sleep(1)
+    return elm.ser.read(128).decode('utf-8')
+
+
+def measure(label, query, elm, queries):
+    start = time.perf_counter()
+    for command in itertools.islice(itertools.cycle(POLLED), queries):
+        query(elm, command)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {queries:>5} PIDs in {elapsed:6.2f} s  {queries / elapsed:8.1f} PIDs/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ELM327 request/response I/O.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the emulated ECU takes to answer")
+    parser.add_argument("--queries", type=int, default=300, help="PIDs polled reading up to the prompt")
+    parser.add_argument("--sleep-queries", type=int, default=3, help="PIDs polled with the fixed sleep")
+    args = parser.parse_args()
+
+    with FakeELM327(latency=args.latency) as fake:
+        elm = ELM327(fake.port)
+        elm.initialize()
+        print(f"Emulated ECU latency {args.latency * 1000:.0f} ms, polling RPM, speed and coolant temperature")
+        measure("sleep(1) + read(128)", sleep_and_read, elm, args.sleep_queries)
+        measure("read to prompt", ELM327.send_command, elm, args.queries)
+        elm.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure random signal generation ticks per second of the D-Bus service: the
+former per-tick tree walk vs. the precomputed emission table, one value per
+tick and in batches.
+
+Logging is disabled, so the former tick is measured without the INFO dump of
+the signal list it used to write on every tick.
+
+Usage:
+    python benchmarks/bench_emission.py [vspec_file ...] [--ticks N] [--batch N]
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from vss_lib.vspec.model import Model
+
+
+def walk_tick(model):
+    """
+    One tick as GetRandomSignal did it before the emission table.
+    """
+    available_signals = []
+
+    def recursively_load_signals(signal_dict, prefix=""):
+        for signal_name, signal_data in signal_dict.items():
+            if isinstance(signal_data, dict):
+                recursively_load_signals(signal_data, prefix + signal_name + ".")
+            else:
+                available_signals.append(prefix + signal_name)
+
+    recursively_load_signals(model.signals)
+    signal_name = random.choice(available_signals)
+    details = model.get_signal_details(signal_name)
+    min_value = details.get('min', 0)
+    max_value = details.get('max', 100)
+    if min_value >= max_value:
+        return None, None
+    return signal_name, random.uniform(min_value, max_value)
+
+
+def rate(func, ticks, per_call=1):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        func()
+    return ticks * per_call / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark random signal generation.")
+    parser.add_argument("vspec_files", nargs="*", default=[
+        "usr/share/vss-lib/toyota.vspec",
+        "usr/share/vss-lib/airspace-vehicles/airplanes/Airbus/A350_XWB/A350_XWB.vspec",
+    ], help="VSS files to generate signals for")
+    parser.add_argument("--ticks", type=int, default=20000, help="Ticks per measurement")
+    parser.add_argument("--batch", type=int, default=1000, help="Values per batched call")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    for vspec_file in args.vspec_files:
+        model = Model.from_file(vspec_file, use_cache=False)
+        table = model.emission
+        print(f"{vspec_file}: {len(model.table)} signals, {len(table)} emittable")
+
+        walk = rate(lambda: walk_tick(model), args.ticks)
+        pick = rate(table.pick, args.ticks)
+        batches = max(1, args.ticks // args.batch)
+        batched = rate(lambda: table.pick_many(args.batch), batches, per_call=args.batch)
+
+        print(f"  tree walk per tick        {walk:14,.0f} values/s")
+        print(f"  emission table            {pick:14,.0f} values/s  ({pick / walk:.0f}x)")
+        print(f"  emission table, batch {args.batch:<4d}{batched:14,.0f} values/s  ({batched / walk:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
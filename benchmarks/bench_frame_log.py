@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare the per-frame cost of CANBusMonitor's message log: formatted strings
+in a list trimmed with pop(0) vs. the FrameLog ring buffer of raw frames, for
+several capacities, and the cost of reading the log back.
+
+Usage:
+    python benchmarks/bench_frame_log.py [--frames N]
+"""
+
+import argparse
+import logging
+import time
+
+import can
+
+from vss_lib.canbus.framelog import FrameLog
+
+
+def list_log(messages, capacity):
+    """
+    The previous message log: format every frame and trim the list from the front.
+    """
+    log = []
+    for msg in messages:
+        log.append(f"{time.time():.2f} {msg.arbitration_id:X} {msg.data.hex()}")
+        if len(log) > capacity:
+            log.pop(0)
+    return log
+
+
+def ring_log(messages, capacity):
+    log = FrameLog(capacity)
+    for msg in messages:
+        log.append(msg.timestamp, msg.arbitration_id, msg.data)
+    return log
+
+
+def rate(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CANBusMonitor message log.")
+    parser.add_argument("--frames", type=int, default=500000, help="Frames appended per measurement")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    messages = [can.Message(timestamp=time.time(), arbitration_id=0x100 + i % 64, data=bytes([i % 256] * 8))
+                for i in range(args.frames)]
+    print(f"{args.frames:,} frames appended per measurement")
+    for capacity in (10, 1000, 100000):
+        old = rate(list_log, messages, capacity)
+        new = rate(ring_log, messages, capacity)
+        print(f"  capacity {capacity:>7,}  list + pop(0) {args.frames / old:12,.0f} frames/s   "
+              f"ring buffer {args.frames / new:12,.0f} frames/s   {old / new:5.1f}x")
+
+    log = ring_log(messages, 100000)
+    reads = 1000
+    start = time.perf_counter()
+    for _ in range(reads):
+        log.snapshot(10)
+    snapshot = (time.perf_counter() - start) / reads
+    start = time.perf_counter()
+    for _ in range(reads):
+        log.latest()
+    latest = (time.perf_counter() - start) / reads
+    print(f"  snapshot(10) of a 100,000-frame log {snapshot * 1e6:8.1f} us, latest() of 64 IDs {latest * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
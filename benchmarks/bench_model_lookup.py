@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare signal lookup throughput of the compiled Model index against the
+original tree walk.
+
+Usage:
+    python benchmarks/bench_model_lookup.py [vspec_file] [--iterations N]
+"""
+
+import argparse
+import logging
+import time
+
+from vss_lib.vspec.model import Model
+
+
+def measure(func, paths, iterations):
+    """
+    Call func for every path, iterations times, and return lookups per second.
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for path in paths:
+            func(path)
+    elapsed = time.perf_counter() - start
+    return (iterations * len(paths)) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark VSS signal lookups.")
+    parser.add_argument("vspec_file", nargs="?", default="usr/share/vss-lib/toyota.vspec",
+                        help="VSS file to load (default: usr/share/vss-lib/toyota.vspec)")
+    parser.add_argument("--iterations", type=int, default=20000,
+                        help="Number of passes over every signal path")
+    args = parser.parse_args()
+
+    # Keep the logging out of the measurement, the tree walk warns on misses
+    logging.disable(logging.CRITICAL)
+
+    model = Model.from_file(args.vspec_file)
+    if model is None:
+        raise SystemExit(f"Unable to load {args.vspec_file}")
+
+    # The tree walk starts at the document root, so give it absolute paths
+    root = "Vehicle." if "Vehicle" in model.vspec_data else ""
+    paths = list(model.index)
+    walk_paths = [root + path for path in paths]
+
+    print(f"{args.vspec_file}: {len(paths)} signals, {args.iterations} iterations")
+
+    results = [
+        ("get_signal_details (tree walk)", measure(model._walk_signal_details, walk_paths, args.iterations)),
+        ("get_signal_details (index)", measure(model.get_signal_details, paths, args.iterations)),
+        ("find (tree walk)", measure(model._walk_find, paths, args.iterations)),
+        ("find (index)", measure(model.find, paths, args.iterations)),
+    ]
+    for name, rate in results:
+        print(f"  {name:<32} {rate:>14,.0f} lookups/s")
+    print(f"  speedup get_signal_details: {results[1][1] / results[0][1]:.1f}x")
+    print(f"  speedup find:               {results[3][1] / results[2][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the CPU time CANBusMonitor spends per 10k frames/s of vcan traffic
+with and without a vendor filter. A separate process floods the interface
+with frames from 64 IDs, of which 3 belong to the filtered vendor; with the
+filter set the kernel drops the other frames before they reach Python.
+
+Needs a vcan interface:
+    sudo modprobe vcan
+    sudo ip link add dev vcan0 type vcan && sudo ip link set up vcan0
+
+Usage:
+    python benchmarks/bench_monitor_filter.py [--interface vcan0] [--rate 10000] [--seconds 5]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import time
+
+import can
+
+from vss_lib.canbus.monitor import CANBusMonitor
+
+VENDOR = "toyota"
+
+
+def generate(interface, rate, seconds, ready):
+    """
+    Send frames at `rate` frames/s, cycling through the vendor IDs and 61 others.
+    """
+    bus = can.interface.Bus(channel=interface, bustype='socketcan')
+    ids = [int(can_id, 16) for can_id in CANBusMonitor.VENDORS[VENDOR]] + list(range(0x500, 0x500 + 61))
+    messages = [can.Message(arbitration_id=can_id, data=bytes(8), is_extended_id=False) for can_id in ids]
+    ready.wait()
+    period = 1.0 / rate
+    start = time.perf_counter()
+    sent = 0
+    while time.perf_counter() - start < seconds:
+        bus.send(messages[sent % len(messages)])
+        sent += 1
+        delay = start + sent * period - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    bus.shutdown()
+
+
+def measure(interface, rate, seconds, vendor):
+    monitor = CANBusMonitor(interface, log_capacity=1000)
+    if vendor:
+        monitor.set_vendor(vendor)
+    ready = multiprocessing.Event()
+    generator = multiprocessing.Process(target=generate, args=(interface, rate, seconds, ready))
+    generator.start()
+    ready.set()
+    cpu = time.process_time()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        msg = monitor.bus.recv(0.1)
+        if msg is not None:
+            monitor.process_message(msg)
+    cpu = time.process_time() - cpu
+    generator.join()
+    monitor.bus.shutdown()
+    return cpu, monitor.log.total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark kernel CAN filtering in CANBusMonitor.")
+    parser.add_argument("--interface", default="vcan0", help="vcan interface to use")
+    parser.add_argument("--rate", type=int, default=10000, help="Frames/s sent by the load generator")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each measurement")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    print(f"{args.rate:,} frames/s on {args.interface} for {args.seconds:g} s")
+    for label, vendor in (("no filter", None), (f"{VENDOR} filter", VENDOR)):
+        cpu, logged = measure(args.interface, args.rate, args.seconds, vendor)
+        per_10k = cpu / args.seconds * 10000 / args.rate
+        print(f"  {label:<15} {per_10k * 100:6.1f}% CPU per 10k frames/s   {logged:>9,} frames logged")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the cost of decoding a six-PID mode 01 response: parsing the text
+response byte by byte, splitting the payload and decoding each PID with a
+function, and the compiled PID table, alone and mapped to typed, validated
+VSS signal entries.
+
+Usage:
+    python benchmarks/bench_obd_decode.py [--responses N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from vss_lib.elm327.obd import decode_pids, split_pids
+from vss_lib.elm327.signals import OBDSignalMap, load_obd_model
+
+# Engine speed, speed, coolant, intake, throttle and engine load of one ECU
+RESPONSE = "41 0C 1A F8 0D 32 05 7B 0F 46 11 33 04 80"
+
+# Per-PID decoding functions, as the PID table held them before it was compiled
+FUNCTIONS = {
+    0x04: lambda d: d[0] * 100.0 / 255,
+    0x05: lambda d: d[0] - 40.0,
+    0x0C: lambda d: int.from_bytes(d, 'big') / 4.0,
+    0x0D: lambda d: float(d[0]),
+    0x0F: lambda d: d[0] - 40.0,
+    0x11: lambda d: d[0] * 100.0 / 255,
+}
+
+# Data length by PID for parsing the text response
+LENGTHS = {0x04: 1, 0x05: 1, 0x0C: 2, 0x0D: 1, 0x0F: 1, 0x11: 1}
+
+
+def parse_text(text):
+    values = [int(byte, 16) for byte in text.split()]
+    result = {}
+    i = 1
+    while i < len(values):
+        pid = values[i]
+        data = values[i + 1:i + 1 + LENGTHS[pid]]
+        result[pid] = FUNCTIONS[pid](bytes(data))
+        i += 1 + LENGTHS[pid]
+    return result
+
+
+def measure(label, decode, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        decode()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    for _ in range(1000):
+        decode()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<42} {elapsed / count * 1e6:6.2f} us/response {count / elapsed:10.0f} responses/s "
+          f"{peak:6d} B peak")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OBD-II PID decoding.")
+    parser.add_argument("--responses", type=int, default=200000, help="Responses decoded per measurement")
+    args = parser.parse_args()
+
+    payload = bytes.fromhex(RESPONSE)
+    signals = OBDSignalMap(load_obd_model())
+    out = {}
+    print(f"Six-PID response, {len(payload)} bytes")
+    measure("text response, per-PID functions", lambda: parse_text(RESPONSE), args.responses)
+    measure("split payload, per-PID functions",
+            lambda: {pid: FUNCTIONS[pid](data) for pid, data in split_pids(payload).items()}, args.responses)
+    measure("compiled table", lambda: decode_pids(payload), args.responses)
+    measure("compiled table, reused dict", lambda: decode_pids(payload, out), args.responses)
+    measure("compiled table + typed VSS entries", lambda: signals.entries(decode_pids(payload, out), 0),
+            args.responses)
+
+
+if __name__ == "__main__":
+    main()
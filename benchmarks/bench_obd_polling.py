@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the effective OBD-II sample rate against the pty-based fake ELM327:
+one PID per request vs. multi-PID requests, with and without the response
+count (which spares the adapter's wait for further ECUs) and spaces, and the PIDPoller with per-PID rates.
+
+Usage:
+    python benchmarks/bench_obd_polling.py [--latency S] [--seconds S]
+"""
+
+import argparse
+import time
+
+from vss_lib.elm327 import ELM327
+from vss_lib.elm327.emulator import FakeELM327
+from vss_lib.elm327.obd import build_request
+from vss_lib.elm327.poller import PIDPoller
+
+PIDS = [0x0C, 0x0D, 0x11, 0x04, 0x05, 0x0F, 0x2F, 0x5E]
+
+# Requested rates of the poller: engine speed, speed and throttle fast, temperatures and fuel slow
+RATES = {0x0C: 20, 0x0D: 10, 0x11: 10, 0x04: 5, 0x05: 1, 0x0F: 1, 0x2F: 0.2, 0x5E: 1}
+
+
+def measure(label, poll, seconds):
+    samples = requests = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        count, sent = poll()
+        samples += count
+        requests += sent
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {requests / elapsed:7.1f} requests/s {samples / elapsed:8.1f} samples/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched OBD-II polling.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the emulated ECU takes to answer")
+    parser.add_argument("--response-wait", type=float, default=0.03,
+                        help="Seconds the emulated adapter listens for further ECUs without a response count")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Seconds per measurement")
+    args = parser.parse_args()
+
+    with FakeELM327(latency=args.latency, response_wait=args.response_wait) as fake:
+        elm = ELM327(fake.port)
+        elm.initialize()
+        print(f"Emulated ECU latency {args.latency * 1000:.0f} ms, adapter response wait "
+              f"{args.response_wait * 1000:.0f} ms, {len(PIDS)} PIDs")
+
+        def one_per_request():
+            for pid in PIDS:
+                elm.send_command(build_request([pid]))
+            return len(PIDS), len(PIDS)
+
+        def batched(responses=None):
+            values = elm.query_many(PIDS, responses=responses)
+            return len(values), 2
+
+        measure("one PID per request", one_per_request, args.seconds)
+        measure("6 PIDs per request", batched, args.seconds)
+        measure("6 PIDs per request, response count", lambda: batched(1), args.seconds)
+        elm.set_spaces(False)
+        measure("  ... and spaces off (ATS0)", lambda: batched(1), args.seconds)
+
+        poller = PIDPoller(elm, RATES, lambda entries: None, responses=1)
+        stats = poller.run(duration=args.seconds * 2)
+        print(f"PIDPoller, {sum(RATES.values()):.1f} samples/s requested: {stats['requests_per_s']:.1f} requests/s, "
+              f"{stats['samples_per_s']:.1f} samples/s, {stats['pids_per_request']:.2f} PIDs per request")
+        for pid, pid_stats in stats['pids'].items():
+            print(f"  PID {pid:02X} {pid_stats['rate_hz']:6.1f} Hz requested {pid_stats['samples_per_s']:6.2f} samples/s")
+        elm.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure what the ELM327 vehicle cache saves against the pty-based fake
+ELM327: the time from opening the port to knowing the supported PIDs on a
+first (protocol search and bitmap discovery) and a repeated connection, and
+the samples/s of PIDPoller when PIDs the vehicle does not support are
+polled anyway or skipped.
+
+Usage:
+    python benchmarks/bench_obd_session.py [--search-delay S] [--latency S] [--seconds S]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from vss_lib.elm327 import ELM327
+from vss_lib.elm327.emulator import FakeELM327
+from vss_lib.elm327.poller import PIDPoller
+from vss_lib.elm327.vehicles import VehicleCache, identify_vehicle
+
+# Six supported PIDs and three unsupported ones (fuel pressure, the PID 60 and 80 bitmaps), all faster than the
+# adapter can answer, so unsupported PIDs take request slots from supported ones unless they are skipped
+SUPPORTED = (0x0C, 0x0D, 0x05, 0x0F, 0x11, 0x04)
+RATES = {pid: 50 for pid in SUPPORTED + (0x0A, 0x60, 0x80)}
+
+
+def connect(port, cache):
+    start = time.perf_counter()
+    elm = ELM327(port)
+    elm.initialize()
+    vehicle = identify_vehicle(elm, cache)
+    return elm, vehicle, time.perf_counter() - start
+
+
+def poll(elm, supported, seconds):
+    poller = PIDPoller(elm, RATES, lambda entries: None, responses=1, supported=supported)
+    stats = poller.run(duration=seconds)
+    wanted = sum(stats['pids'][pid]['samples_per_s'] for pid in SUPPORTED)
+    return stats['requests_per_s'], wanted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ELM327 vehicle cache.")
+    parser.add_argument("--search-delay", type=float, default=2.0, help="Seconds of the emulated protocol search")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the emulated ECU takes to answer")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Seconds per polling measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        port = os.path.join(directory, "elm327")
+        cache = VehicleCache(os.path.join(directory, "vehicles.json"))
+        options = {"latency": args.latency, "search_delay": args.search_delay, "link": port,
+                   "responses": {"010A": None}}
+        print(f"Emulated protocol search {args.search_delay:.1f} s, ECU latency {args.latency * 1000:.0f} ms")
+        with FakeELM327(**options):
+            elm, vehicle, elapsed = connect(port, cache)
+            elm.close()
+        print(f"{'first connection':<40} {elapsed:6.2f} s to {len(vehicle.supported)} supported PIDs")
+        with FakeELM327(**options):
+            elm, vehicle, elapsed = connect(port, cache)
+            print(f"{'known vehicle (cached)':<40} {elapsed:6.2f} s to {len(vehicle.supported)} supported PIDs")
+            modes = (("polling unsupported PIDs too", None), ("skipping unsupported PIDs", vehicle.supported))
+            for label, supported in modes:
+                requests, samples = poll(elm, supported, args.seconds)
+                print(f"{label:<40} {requests:6.1f} requests/s {samples:6.1f} samples/s of supported PIDs")
+            elm.close()
+
+
+if __name__ == "__main__":
+    main()
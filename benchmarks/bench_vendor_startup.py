@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the startup time of the D-Bus service's vendor registry for a fleet of
+vendors, initialized one after another vs. in parallel.
+
+By default each vendor loads its VSS model and then waits --startup-delay
+seconds in place of building and starting its containers, so the benchmark
+runs without podman. Pass --containers to start the real containers (needs
+root and podman).
+
+Usage:
+    python benchmarks/bench_vendor_startup.py [vspec_dir] [--vendors N] [--startup-delay S] [--containers]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from vss_lib.vendor_registry import VendorRegistry
+from vss_lib.vspec.model import Model
+
+
+class ModelInterface:
+    """
+    Loads the VSS model of a vendor like VehicleSignalInterface, without containers.
+    """
+    startup_delay = 0.0
+
+    def __init__(self, vendor, vspec_file, preference=None, attached_electronics=None):
+        self.vendor = vendor
+        self.vspec_file = vspec_file
+        self.model = Model.from_file(vspec_file)
+        time.sleep(self.startup_delay)
+
+
+def startup(factory, settings, max_workers):
+    registry = VendorRegistry(factory=factory, max_workers=max_workers)
+    start = time.perf_counter()
+    loaded = registry.load(settings)
+    elapsed = time.perf_counter() - start
+    if len(loaded) != len(settings):
+        raise RuntimeError(f"Only {len(loaded)} of {len(settings)} vendors started")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-vendor startup of the D-Bus service.")
+    parser.add_argument("vspec_dir", nargs="?", default="usr/share/vss-lib",
+                        help="Directory with vendor VSS files (default: usr/share/vss-lib)")
+    parser.add_argument("--vendors", type=int, default=12, help="Number of vendors to start")
+    parser.add_argument("--startup-delay", type=float, default=0.5,
+                        help="Seconds each vendor waits in place of starting its containers")
+    parser.add_argument("--containers", action="store_true",
+                        help="Start the real vendor containers through VehicleSignalInterface")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    vspec_files = sorted(os.path.join(args.vspec_dir, name) for name in os.listdir(args.vspec_dir)
+                         if name.endswith('.vspec'))
+    settings = [(f"vendor{i}", vspec_files[i % len(vspec_files)], None, []) for i in range(args.vendors)]
+
+    if args.containers:
+        from vss_lib.vendor_interface import VehicleSignalInterface
+        factory = VehicleSignalInterface
+        settings = [(os.path.basename(vspec_file)[:-len('.vspec')], vspec_file, None, [])
+                    for vspec_file in vspec_files[:args.vendors]]
+        print(f"{len(settings)} vendors with containers")
+    else:
+        factory = ModelInterface
+        ModelInterface.startup_delay = args.startup_delay
+        print(f"{len(settings)} vendors, {args.startup_delay:.2f}s simulated container startup each")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ['VSS_LIB_CACHE_DIR'] = cache_dir
+        if not args.containers:
+            # Compile the VSS cache first so both runs start from the same state
+            for vspec_file in vspec_files:
+                Model.from_file(vspec_file)
+        sequential = startup(factory, settings, max_workers=1)
+        parallel = startup(factory, settings, max_workers=len(settings))
+
+    print(f"  one vendor at a time   {sequential * 1000:9.2f} ms")
+    print(f"  parallel               {parallel * 1000:9.2f} ms")
+    print(f"  speedup: {sequential / parallel:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure cold-start (YAML parse) and warm-start (compiled cache) model loading
+over every VSS file of a directory tree.
+
+Usage:
+    python benchmarks/bench_vspec_cache.py [vspec_dir] [--repeat N]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from vss_lib.vspec.model import Model
+
+
+def load_all(vspec_files, **kwargs):
+    start = time.perf_counter()
+    for vspec_file in vspec_files:
+        Model.from_file(vspec_file, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled VSS cache.")
+    parser.add_argument("vspec_dir", nargs="?", default="usr/share/vss-lib",
+                        help="Directory with VSS files (default: usr/share/vss-lib)")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed passes")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    vspec_files = []
+    for dirpath, _, filenames in os.walk(args.vspec_dir):
+        vspec_files.extend(os.path.join(dirpath, name) for name in filenames if name.endswith('.vspec'))
+    print(f"{len(vspec_files)} VSS files under {args.vspec_dir}, best of {args.repeat} passes")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = min(load_all(vspec_files, use_cache=False) for _ in range(args.repeat))
+        build = load_all(vspec_files, cache_dir=cache_dir)
+        warm = min(load_all(vspec_files, cache_dir=cache_dir) for _ in range(args.repeat))
+
+    print(f"  cold start (YAML parse)      {cold * 1000:9.2f} ms")
+    print(f"  first run (parse + write)    {build * 1000:9.2f} ms")
+    print(f"  warm start (compiled cache)  {warm * 1000:9.2f} ms")
+    print(f"  speedup: {cold / warm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
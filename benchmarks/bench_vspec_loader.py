@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare the pure-Python YAML loader, the libyaml loader and the streaming
+signal index builder over the shipped VSS files and a synthetic catalog.
+
+Usage:
+    python benchmarks/bench_vspec_loader.py [vspec_dir] [--signals N]
+"""
+
+import argparse
+import logging
+import os
+import time
+import tracemalloc
+
+import yaml
+
+from vss_lib.vspec.loader import HAS_LIBYAML, load_yaml, stream_signal_table
+from vss_lib.vspec.model import Model
+
+
+def synthetic_catalog(signals):
+    """
+    Return a VSS document with the given number of signals spread over nested branches.
+    """
+    lines = ["Vehicle:"]
+    per_branch = 100
+    for branch in range(0, signals, per_branch):
+        lines.append(f"  Branch{branch // per_branch}:")
+        for leaf in range(branch, min(branch + per_branch, signals)):
+            lines.append(f"    Signal{leaf}:")
+            lines.append("      datatype: float")
+            lines.append("      unit: km/h")
+            lines.append(f"      min: {-leaf}")
+            lines.append(f"      max: {leaf}")
+            lines.append(f"      description: Synthetic signal number {leaf}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def measure(func, sources):
+    """
+    Run func over every source and return (seconds, peak traced bytes).
+
+    The timing pass runs without tracemalloc, which would distort it.
+    """
+    start = time.perf_counter()
+    for source in sources:
+        func(source)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for source in sources:
+        func(source)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def report(title, sources, pure_python=True):
+    print(title)
+    loaders = [
+        ("load_yaml + index", lambda source: Model(load_yaml(source))),
+        ("stream_signal_table", stream_signal_table),
+    ]
+    if pure_python:
+        loaders.insert(0, ("yaml.SafeLoader + index", lambda source: Model(yaml.load(source, Loader=yaml.SafeLoader))))  # nosec B506
+    baseline = None
+    for name, func in loaders:
+        elapsed, peak = measure(func, sources)
+        baseline = baseline or elapsed
+        print(f"  {name:<26} {elapsed * 1000:10.1f} ms  peak {peak / 2**20:8.1f} MiB  {baseline / elapsed:5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the VSS YAML loaders.")
+    parser.add_argument("vspec_dir", nargs="?", default="usr/share/vss-lib",
+                        help="Directory with VSS files (default: usr/share/vss-lib)")
+    parser.add_argument("--signals", type=int, default=100000, help="Signals in the synthetic catalog")
+    parser.add_argument("--pure-python", action="store_true",
+                        help="Also run the (slow) pure-Python loader on the synthetic catalog")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"libyaml available: {HAS_LIBYAML}")
+
+    sources = []
+    for dirpath, _, filenames in os.walk(args.vspec_dir):
+        for name in filenames:
+            if name.endswith('.vspec'):
+                with open(os.path.join(dirpath, name), 'rb') as file:
+                    sources.append(file.read())
+    report(f"{len(sources)} shipped VSS files", sources)
+
+    catalog = synthetic_catalog(args.signals)
+    report(f"synthetic catalog, {args.signals} signals, {len(catalog) / 2**20:.1f} MiB", [catalog], args.pure_python)
+
+
+if __name__ == "__main__":
+    main()
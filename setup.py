@@ -28,9 +28,11 @@ DBUS_DIR = '/usr/lib/vss-lib/dbus/'
 JOYSTICKS_USR_SHARE = '/usr/share/vss-lib/joysticks/'
 JOYSTICKS_USR_LIB = '/usr/lib/vss-lib/joysticks/'
 LOG_DIR = '/var/log/vss-lib/'
+CACHE_DIR = '/var/cache/vss-lib/'
 DBUS_CONF_DIR = '/etc/dbus-1/system.d/'
 VSS_DBUS_SERVICE = "vss-dbus"
 ELECTRONICS_DIR = os.path.join(SHARE_DIR, 'electronics/')
+CAN_DIR = os.path.join(SHARE_DIR, 'can/')
 LATEST_PYTHON_SITE_PACKAGES = sysconfig.get_paths()['purelib']
 
 # Array of individual Python files to copy to LATEST_PYTHON_SITE_PACKAGES
@@ -41,18 +43,21 @@ python_files = [
     'vspec_parser.py',
     'vss_logging.py',
     'vendor_interface.py',
-    'canbus.py'
+    'cli.py',
+    'vendor_registry.py'
 ]
 
 # Directories to copy recursively to LATEST_PYTHON_SITE_PACKAGES
 directories_to_copy = [
+    'canbus',
     'client',
     'dbus',
     'vendor',
     'vspec',
     'containers',
     'cloud',
-    'kuksa'
+    'kuksa',
+    'elm327'
 ]
 
 
@@ -91,6 +96,7 @@ class CustomInstallCommand(install):
         os.makedirs(JOYSTICKS_USR_SHARE, exist_ok=True)
         os.makedirs(JOYSTICKS_USR_LIB, exist_ok=True)
         os.makedirs(LOG_DIR, exist_ok=True)
+        os.makedirs(CACHE_DIR, exist_ok=True)
         os.makedirs(ELECTRONICS_DIR, exist_ok=True)
         dbus_manager_dir = os.path.join(SHARE_DIR, 'dbus-manager/')
         os.makedirs(dbus_manager_dir, exist_ok=True)
@@ -164,6 +170,16 @@ class CustomInstallCommand(install):
         else:
             print(f"Directory {electronics_source_dir} does not exist, skipping electronics files...")
 
+        # Copy the CAN message layouts from usr/share/vss-lib/can/ to /usr/share/vss-lib/can/
+        can_source_dir = 'usr/share/vss-lib/can/'
+        if os.path.exists(can_source_dir):
+            os.makedirs(CAN_DIR, exist_ok=True)
+            for file_name in os.listdir(can_source_dir):
+                shutil.copy(os.path.join(can_source_dir, file_name), os.path.join(CAN_DIR, file_name))
+                print(f"Copied {file_name} to {CAN_DIR}")
+        else:
+            print(f"Directory {can_source_dir} does not exist, skipping CAN layouts...")
+
         # Copy files from dbus-manager into /usr/share/vss-lib/joyticks
         joystick_source_dir = './usr/share/vss-lib/joysticks/'
         if os.path.exists(joystick_source_dir):
@@ -208,6 +224,13 @@ class CustomInstallCommand(install):
             else:
                 print(f"Directory {src_dir} does not exist, skipping...")
 
+        # Pre-build the compiled VSS cache so services skip the YAML parsing at startup
+        try:
+            subprocess.check_call([sys.executable, '-m', 'vss_lib.cli', 'compile', SHARE_DIR, '--cache-dir', CACHE_DIR])
+            print(f"Compiled VSS cache into {CACHE_DIR}")
+        except subprocess.CalledProcessError as e:
+            print(f"Failed to compile VSS cache (files will be parsed at runtime): {e}")
+
         # Reload D-Bus service and enable/start vss-dbus.service
         try:
             subprocess.check_call(['sudo', 'systemctl', 'reload', 'dbus'])
@@ -302,14 +325,21 @@ setup(
     install_requires=[
         "pydbus",
         "toml",
+        "tomli; python_version < '3.11'",
         "pyyaml",
         "invoke",
         "pygame",
         "pydualsense",
         "python-can",
+        "pyserial",
         "vss-tools",
         "kuksa-client"
     ],
+    entry_points={
+        'console_scripts': [
+            'vss-lib=vss_lib.cli:main',
+        ],
+    },
     cmdclass={
         'install': CustomInstallCommand,  # Custom install command for Python files and system-wide files
     },
@@ -28,6 +28,7 @@ DBUS_DIR = '/usr/lib/vss-lib/dbus/'
 JOYSTICKS_USR_SHARE = '/usr/share/vss-lib/joysticks/'
 JOYSTICKS_USR_LIB = '/usr/lib/vss-lib/joysticks/'
 LOG_DIR = '/var/log/vss-lib/'
+CACHE_DIR = '/var/cache/vss-lib/'
 DBUS_CONF_DIR = '/etc/dbus-1/system.d/'
 VSS_DBUS_SERVICE = "vss-dbus"
 ELECTRONICS_DIR = os.path.join(SHARE_DIR, 'electronics/')
@@ -41,16 +42,19 @@ python_files = [
     'vspec_parser.py',
     'vss_logging.py',
     'vendor_interface.py',
-    'canbus.py'
+    'cli.py',
+    'vendor_registry.py'
 ]
 
 # Directories to copy recursively to LATEST_PYTHON_SITE_PACKAGES
 directories_to_copy = [
+    'canbus',
     'client',
     'dbus',
     'vendor',
     'vspec',
-    'containers'
+    'containers',
+    'elm327'
 ]
 
 
@@ -89,6 +93,7 @@ class CustomInstallCommand(install):
         os.makedirs(JOYSTICKS_USR_SHARE, exist_ok=True)
         os.makedirs(JOYSTICKS_USR_LIB, exist_ok=True)
         os.makedirs(LOG_DIR, exist_ok=True)
+        os.makedirs(CACHE_DIR, exist_ok=True)
         os.makedirs(ELECTRONICS_DIR, exist_ok=True)
         dbus_manager_dir = os.path.join(SHARE_DIR, 'dbus-manager/')
         os.makedirs(dbus_manager_dir, exist_ok=True)
@@ -206,6 +211,13 @@ class CustomInstallCommand(install):
             else:
                 print(f"Directory {src_dir} does not exist, skipping...")
 
+        # Pre-build the compiled VSS cache so services skip the YAML parsing at startup
+        try:
+            subprocess.check_call([sys.executable, '-m', 'vss_lib.cli', 'compile', SHARE_DIR, '--cache-dir', CACHE_DIR])
+            print(f"Compiled VSS cache into {CACHE_DIR}")
+        except subprocess.CalledProcessError as e:
+            print(f"Failed to compile VSS cache (files will be parsed at runtime): {e}")
+
         # Reload D-Bus service and enable/start vss-dbus.service
         try:
             subprocess.check_call(['sudo', 'systemctl', 'reload', 'dbus'])
@@ -292,8 +304,7 @@ extensions = [
     Extension("vss_lib.config_loader", ["src/config_loader.pyx"]),
     Extension("vss_lib.vspec_parser", ["src/vspec_parser.pyx"]),
     Extension("vss_lib.vss_logging", ["src/vss_logging.pyx"]),
-    Extension("vss_lib.vendor_interface", ["src/vendor_interface.pyx"]),
-    Extension("vss_lib.canbus", ["src/canbus.pyx"])
+    Extension("vss_lib.vendor_interface", ["src/vendor_interface.pyx"])
 ]
 
 # Define the setup for the package
@@ -314,10 +325,16 @@ setup(
         "pygame",
         "pydualsense",
         "python-can",
+        "pyserial",
         "vss-tools",
         "cython"  # Added Cython for compiling Python to C
     ],
     ext_modules=cythonize(extensions),  # Cython extensions for CPython
+    entry_points={
+        'console_scripts': [
+            'vss-lib=vss_lib.cli:main',
+        ],
+    },
     cmdclass={
         'install': CustomInstallCommand,  # Custom install command for Python files and system-wide files
     },
@@ -14,8 +14,8 @@
 from vss_lib.vss_logging import logger
 from vss_lib.vendor_interface import VehicleSignalInterface
 from vss_lib.uds import UDSHandler
-from vss_lib.vspec_parser import load_vspec_file
-from config_loader import get_vspec_file, load_config
+from vss_lib.vspec.model import Model
+from vss_lib.config_loader import get_vspec_file, load_config
 from vss_lib.canbus import CANTransport
 from vss_lib.uprotocol import UProtocol
 
@@ -40,10 +40,12 @@ class BaseModel:
         if not vspec_file:
             raise FileNotFoundError(f"VSS file for vendor '{vendor}' not found.")
 
-        # Load VSS data
-        self.vspec_data = load_vspec_file(vspec_file)
-        if not self.vspec_data:
+        # Load the compiled VSS model (served from the cache when it is valid).
+        # Large files are streamed: only the signal index is kept, vspec_data is None.
+        self.model = Model.from_file(vspec_file)
+        if not self.model or not self.model.index:
             raise AttributeError(f"Failed to load model from {vspec_file}")
+        self.vspec_data = self.model.vspec_data
         logger.info(f"Loaded VSS model from {vspec_file}")
 
         # Initialize VehicleSignalInterface
@@ -100,9 +102,9 @@ class BaseModel:
         Returns:
             list: A list of signal paths available in the model.
         """
-        if not self.vspec_data:
-            raise AttributeError("BaseModel has no 'vspec_data' initialized.")
-        return list(self.vspec_data.keys())
+        if not self.model.index:
+            raise AttributeError("BaseModel has no signal index initialized.")
+        return list(self.model.index)
 
     def attach_electronic(self, electronic_model):
         """
@@ -122,31 +124,13 @@ class BaseModel:
             signal_name (str): The name of the signal to retrieve details for.
 
         Returns:
-            dict: A dictionary containing signal details such as datatype, unit, min, and max.
+            SignalSpec: A read-only mapping with the signal datatype, unit, min, and max,
+                        shared with the compiled model (not a copy), or None if not found.
         """
-        keys = signal_name.split(".")
-        signal = self.vspec_data
-
-        for key in keys:
-            if isinstance(signal, dict):
-                signal = signal.get(key)
-            else:
-                logger.error(f"Expected dictionary for signal path '{signal_name}', got: {type(signal)}")
-                return None
-            if signal is None:
-                logger.warning(f"Signal path '{signal_name}' not found.")
-                return None
-
-        if not isinstance(signal, dict):
-            logger.error(f"Expected signal details for '{signal_name}', got: {type(signal)}")
-            return None
-
-        return {
-            "datatype": signal.get("datatype"),
-            "unit": signal.get("unit"),
-            "min": signal.get("min"),
-            "max": signal.get("max"),
-        }
+        signal = self.model.lookup(signal_name)
+        if signal is None:
+            logger.warning(f"Signal path '{signal_name}' not found.")
+        return signal
 
     def validate_signal(self, signal_name, value):
         """
@@ -1,66 +0,0 @@
-# Licensed under the Apache License, Version 2.0 (the "License");
-# you may not use this file except in compliance with the License.
-# You may obtain a copy of the License at
-#
-#     http://www.apache.org/licenses/LICENSE-2.0
-#
-# Unless required by applicable law or agreed to in writing, software
-# distributed under the License is distributed on an "AS IS" BASIS,
-# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
-# See the License for the specific language governing permissions and
-# limitations under the License.
-
-
-import toml
-import logging
-
-CONFIG_PATH = '/etc/vss-lib/vss.config'
-
-# Set up logger
-logger = logging.getLogger("canbus")
-logging.basicConfig(level=logging.INFO)
-
-
-class CANBusSimulator:
-    def __init__(self):
-        self.communication_protocol = self.load_config().get("communication_protocol", "CAN")
-
-    def load_config(self):
-        """
-        Load the communication protocol from the configuration file.
-
-        Returns:
-            dict: Parsed configuration data.
-        """
-        try:
-            with open(CONFIG_PATH, 'r') as config_file:
-                config = toml.load(config_file)
-            logger.info(f"Loaded config: {config}")
-            return config
-        except FileNotFoundError:
-            logger.error(f"Configuration file not found: {CONFIG_PATH}")
-            return {}
-
-    def encode_can_message(self, data):
-        """
-        Simulate encoding a CAN message.
-
-        Args:
-            data (dict): The data to encode in the CAN message.
-        """
-        logger.info(f"Encoding CAN message using protocol: {self.communication_protocol}")
-        encoded_message = f"ENCODED_CAN_MESSAGE: {data}"
-        logger.info(f"Encoded CAN message: {encoded_message}")
-        return encoded_message
-
-    def decode_can_message(self, encoded_message):
-        """
-        Simulate decoding a CAN message.
-
-        Args:
-            encoded_message (str): The encoded CAN message to decode.
-        """
-        logger.info(f"Decoding CAN message using protocol: {self.communication_protocol}")
-        decoded_message = f"DECODED_CAN_MESSAGE: {encoded_message}"
-        logger.info(f"Decoded CAN message: {decoded_message}")
-        return decoded_message
@@ -0,0 +1,102 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import logging
+from vss_lib.canbus.bulk import SignalColumn, decode_many, encode_many, frame_dtype
+from vss_lib.canbus.codec import CANDatabase, CANFrame, MessageLayout, SignalLayout
+from vss_lib.config_loader import CONFIG_PATH, TomlDecodeError, get_config
+
+# Set up logger
+logger = logging.getLogger("canbus")
+logging.basicConfig(level=logging.INFO)
+
+
+__all__ = [
+    'CANBusSimulator',
+    'CANDatabase',
+    'CANFrame',
+    'MessageLayout',
+    'SignalColumn',
+    'SignalLayout',
+    'decode_many',
+    'encode_many',
+    'frame_dtype'
+]
+
+
+class CANBusSimulator:
+    """
+    Encode and decode signal values as CAN frames using a vendor's message layouts.
+
+    Attributes:
+        database (CANDatabase): The message layouts signals are packed with.
+    """
+    def __init__(self, database=None):
+        self.communication_protocol = self.load_config().get("communication_protocol", "CAN")
+        self.database = database if database is not None else CANDatabase()
+
+    def load_config(self):
+        """
+        Load the communication protocol from the configuration file.
+
+        Returns:
+            dict: Parsed configuration data.
+        """
+        try:
+            config = get_config(CONFIG_PATH)
+            logger.debug(f"Loaded config: {config}")
+            return config
+        except FileNotFoundError:
+            logger.error(f"Configuration file not found: {CONFIG_PATH}")
+            return {}
+        except TomlDecodeError as e:
+            logger.error(f"Error decoding TOML file {CONFIG_PATH}: {e}")
+            return {}
+
+    def encode_can_message(self, data):
+        """
+        Encode a signal value into the CAN frame of the message that carries it.
+
+        Args:
+            data (dict): {"signal": signal name or VSS path, "value": physical value}.
+
+        Returns:
+            CANFrame: The encoded frame, or None if the signal has no layout.
+        """
+        signal_name = data.get("signal")
+        value = data.get("value")
+        if signal_name not in self.database or not isinstance(value, (int, float)):
+            logger.debug(f"No CAN layout for signal {signal_name}, not encoding it")
+            return None
+        frame = self.database.encode(signal_name, value)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Encoded {signal_name}={value} as {self.communication_protocol} frame "
+                         f"{frame.arbitration_id:03X}#{frame.data.hex().upper()}")
+        return frame
+
+    def decode_can_message(self, encoded_message):
+        """
+        Decode a CAN frame into physical signal values.
+
+        Args:
+            encoded_message (CANFrame): The frame to decode, or None.
+
+        Returns:
+            dict: Physical value by signal name, empty if the frame is unknown.
+        """
+        if encoded_message is None:
+            return {}
+        decoded_message = self.database.decode(encoded_message)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Decoded {self.communication_protocol} frame {encoded_message.arbitration_id:03X}: {decoded_message}")
+        return decoded_message
@@ -0,0 +1,264 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+asyncio CAN reader fanning in frames from several interfaces.
+
+Every interface is read by its own task. SocketCAN buses are watched through
+their socket file descriptor on the event loop; buses without one (e.g. the
+python-can virtual interface) are polled with recv() in the default executor.
+Frames are delivered to subscribers through bounded queues. A subscriber
+either drops its oldest frames when it falls behind, or blocks the readers
+until it catches up, which leaves the frames in the kernel socket buffer.
+
+    async with AsyncCANMonitor(["vcan0", "vcan1"]) as monitor:
+        async for msg in monitor.subscribe(ids={0x2F0}):
+            print(msg.channel, msg)
+"""
+
+import asyncio
+import can
+import logging
+
+logger = logging.getLogger("canbus")
+
+# Overflow policies of a subscription whose queue is full
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+
+# Frames queued per subscriber unless another size is requested
+DEFAULT_QUEUE_SIZE = 1000
+
+# Frames read from one interface before yielding to the other readers
+READ_BATCH = 256
+
+# Seconds a recv() of a bus without file descriptor waits in the executor
+POLL_TIMEOUT = 0.1
+
+_CLOSED = object()
+
+
+class Subscription:
+    """
+    A bounded queue of frames received by an AsyncCANMonitor.
+
+    Iterate over it with `async for`; iteration ends once the monitor stops
+    and the queued frames have been consumed.
+
+    Attributes:
+        ids (frozenset): Arbitration IDs delivered, None for all.
+        overflow (str): DROP_OLDEST or BLOCK.
+        dropped (int): Frames dropped because the queue was full.
+    """
+
+    def __init__(self, maxsize=DEFAULT_QUEUE_SIZE, ids=None, overflow=DROP_OLDEST):
+        if overflow not in (DROP_OLDEST, BLOCK):
+            raise ValueError(f"Unknown overflow policy {overflow!r}, expected {DROP_OLDEST!r} or {BLOCK!r}")
+        if maxsize < 1:
+            raise ValueError(f"Subscription queue size must be at least 1, got {maxsize}")
+        self.ids = frozenset(ids) if ids is not None else None
+        self.overflow = overflow
+        self.dropped = 0
+        self.closed = False
+        self.queue = asyncio.Queue(maxsize)
+
+    def __len__(self):
+        return self.queue.qsize()
+
+    async def put(self, msg):
+        """
+        Queue a frame according to the overflow policy.
+        """
+        queue = self.queue
+        if not queue.full():
+            queue.put_nowait(msg)
+        elif self.overflow == BLOCK:
+            await queue.put(msg)
+        else:
+            queue.get_nowait()
+            queue.put_nowait(msg)
+            self.dropped += 1
+
+    async def get(self):
+        """
+        Wait for the next frame.
+
+        Returns:
+            can.Message: The frame, None once the subscription is closed and drained.
+        """
+        if self.closed and self.queue.empty():
+            return None
+        msg = await self.queue.get()
+        return None if msg is _CLOSED else msg
+
+    def close(self):
+        """
+        End iteration once the queued frames have been consumed.
+        """
+        self.closed = True
+        if not self.queue.full():
+            self.queue.put_nowait(_CLOSED)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        msg = await self.get()
+        if msg is None:
+            raise StopAsyncIteration
+        return msg
+
+
+class AsyncCANMonitor:
+    """
+    Read CAN frames from several interfaces concurrently and fan them in to subscribers.
+
+    Attributes:
+        buses (dict): can.BusABC by interface name.
+        received (dict): Frames read by interface name.
+        subscriptions (list): The active subscriptions.
+    """
+
+    def __init__(self, interfaces, bustype='socketcan'):
+        """
+        Args:
+            interfaces (Iterable): Interface names (opened with `bustype`), open can.BusABC
+                instances, or a dict of open buses by interface name.
+            bustype (str): python-can interface used to open interfaces given by name.
+        """
+        self.buses = {}
+        self._owned = []
+        if isinstance(interfaces, dict):
+            interfaces = interfaces.items()
+        for interface in interfaces:
+            if isinstance(interface, tuple):
+                name, bus = interface
+            elif isinstance(interface, can.BusABC):
+                name, bus = str(getattr(interface, "channel", None) or interface.channel_info), interface
+            else:
+                name, bus = interface, can.interface.Bus(channel=interface, bustype=bustype)
+                self._owned.append(bus)
+            self.buses[name] = bus
+        self.received = dict.fromkeys(self.buses, 0)
+        self.subscriptions = []
+        self._tasks = []
+
+    def subscribe(self, maxsize=DEFAULT_QUEUE_SIZE, ids=None, overflow=DROP_OLDEST):
+        """
+        Create a subscription receiving the frames of every interface.
+
+        Args:
+            maxsize (int): Frames queued before the overflow policy applies.
+            ids (Optional[Iterable[int]]): Only deliver these arbitration IDs.
+            overflow (str): DROP_OLDEST to drop the oldest queued frame, BLOCK
+                to stop reading until the subscriber catches up.
+
+        Returns:
+            Subscription: The subscription, iterate over it with `async for`.
+        """
+        subscription = Subscription(maxsize, ids, overflow)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Stop delivering frames to a subscription and close it.
+        """
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+        subscription.close()
+
+    async def _publish(self, msg):
+        for subscription in self.subscriptions:
+            if subscription.ids is None or msg.arbitration_id in subscription.ids:
+                await subscription.put(msg)
+
+    async def _wait_readable(self, fd):
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+        loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+        try:
+            await readable
+        finally:
+            loop.remove_reader(fd)
+
+    async def _read(self, name, bus):
+        loop = asyncio.get_running_loop()
+        try:
+            fd = bus.fileno()
+        except NotImplementedError:
+            fd = -1
+        while True:
+            if fd >= 0:
+                await self._wait_readable(fd)
+                msg = bus.recv(0)
+            else:
+                msg = await loop.run_in_executor(None, bus.recv, POLL_TIMEOUT)
+            count = 0
+            while msg is not None:
+                if msg.channel is None:
+                    msg.channel = name
+                await self._publish(msg)
+                count += 1
+                if count == READ_BATCH:
+                    break
+                msg = bus.recv(0)
+            self.received[name] += count
+            if count == READ_BATCH:
+                await asyncio.sleep(0)  # Let the other interfaces and the subscribers run
+
+    async def _run_reader(self, name, bus):
+        try:
+            await self._read(name, bus)
+        except can.CanError as e:
+            logger.error(f"Stopped reading CAN interface {name}: {e}")
+
+    def start(self):
+        """
+        Start one reader task per interface on the running event loop.
+        """
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._run_reader(name, bus), name=f"can-reader-{name}")
+                       for name, bus in self.buses.items()]
+
+    async def stop(self):
+        """
+        Cancel the readers, close the subscriptions and shut down the buses opened by the monitor.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for subscription in self.subscriptions:
+            subscription.close()
+        self.subscriptions = []
+        for bus in self._owned:
+            bus.shutdown()
+        self._owned = []
+
+    async def run(self):
+        """
+        Read until cancelled, then stop.
+        """
+        self.start()
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            await self.stop()
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
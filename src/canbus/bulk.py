@@ -0,0 +1,310 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Vectorized encoding and decoding of many CAN frames at once.
+
+Frames are held in NumPy arrays: a structured array of frame_dtype(), or an
+array of arbitration IDs with the payloads as an (N, width) uint8 array or a
+contiguous bytes buffer of N payloads. decode_many() groups the frames by
+message and extracts every signal with shifts and masks over whole columns,
+encode_many() does the reverse. Both need numpy.
+"""
+
+from collections import namedtuple
+from vss_lib.canbus.codec import CLASSIC_CAN_LENGTH, LITTLE_ENDIAN
+
+try:
+    import numpy
+except ImportError:  # Bulk encoding and decoding are unavailable
+    numpy = None
+
+# Bits of the `flags` field of frame_dtype()
+FLAG_EXTENDED_ID = 0x1
+FLAG_FD = 0x2
+
+SignalColumn = namedtuple('SignalColumn', ['index', 'values'])
+SignalColumn.__doc__ = "Decoded values of one signal and the positions of the frames they were decoded from."
+
+# Standard IDs are mapped to messages through a dense lookup table
+_STANDARD_ID_LIMIT = 0x800
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("Bulk CAN encoding and decoding need numpy")
+
+
+def frame_dtype(payload_length=CLASSIC_CAN_LENGTH):
+    """
+    Return the NumPy structured dtype of a frame with payloads of up to `payload_length` bytes.
+
+    Fields: timestamp (float64 seconds), arbitration_id (uint32), flags
+    (FLAG_EXTENDED_ID | FLAG_FD), length (payload bytes) and data.
+    """
+    _require_numpy()
+    return numpy.dtype([
+        ('timestamp', '<f8'),
+        ('arbitration_id', '<u4'),
+        ('flags', 'u1'),
+        ('length', 'u1'),
+        ('data', 'u1', (payload_length,)),
+    ])
+
+
+def _payload_matrix(ids, payloads):
+    """
+    Return the arbitration IDs as uint32 and the payloads as an (N, width) uint8 array.
+    """
+    if payloads is None:
+        frames = ids
+        return numpy.asarray(frames['arbitration_id'], dtype=numpy.uint32), frames['data']
+    ids = numpy.asarray(ids, dtype=numpy.uint32)
+    if isinstance(payloads, numpy.ndarray) and payloads.ndim == 2:
+        return ids, payloads.astype(numpy.uint8, copy=False)
+    flat = numpy.frombuffer(payloads, dtype=numpy.uint8)
+    if len(ids) == 0 or len(flat) % len(ids):
+        raise ValueError(f"A buffer of {len(flat)} bytes does not hold {len(ids)} payloads of equal size")
+    return ids, flat.reshape(len(ids), len(flat) // len(ids))
+
+
+def _message_slots(database, ids):
+    """
+    Return the messages of a database and the index of each frame's message (-1 if unknown).
+    """
+    messages = sorted(database.messages.values(), key=lambda message: message.arbitration_id)
+    known = numpy.array([message.arbitration_id for message in messages], dtype=numpy.uint32)
+    if len(ids) and int(ids.max()) < _STANDARD_ID_LIMIT:
+        table = numpy.full(_STANDARD_ID_LIMIT, -1, dtype=numpy.int32)
+        standard = known < _STANDARD_ID_LIMIT
+        table[known[standard]] = numpy.flatnonzero(standard)
+        return messages, table[ids]
+    if not len(known):
+        return messages, numpy.full(len(ids), -1, dtype=numpy.int32)
+    positions = numpy.minimum(numpy.searchsorted(known, ids), len(known) - 1)
+    return messages, numpy.where(known[positions] == ids, positions, -1).astype(numpy.int32)
+
+
+def _group(slots, count):
+    """
+    Yield (slot, frame positions) for every message present, positions in frame order.
+    """
+    dtype = numpy.int16 if count < 0x7FFF else numpy.int32  # int16 is sorted with a radix sort
+    order = numpy.argsort(slots.astype(dtype), kind='stable')
+    bounds = numpy.cumsum(numpy.bincount(slots + 1, minlength=count + 1))
+    for slot in range(count):
+        start, end = bounds[slot], bounds[slot + 1]
+        if end > start:
+            yield slot, order[start:end]
+
+
+def _fits_window(signal):
+    return signal.shift % 8 + signal.length <= 64
+
+
+def _window(message, signal):
+    """
+    Return the first byte of the 8-byte window holding a signal in a payload padded by 8 bytes
+    on both sides, and the signal's shift within the window read in the signal's byte order.
+    """
+    if signal.byte_order == LITTLE_ENDIAN:
+        return 8 + signal.shift // 8, signal.shift % 8
+    last = message.length - 1 - signal.shift // 8
+    return 8 + last - 7, signal.shift % 8
+
+
+def _physical(signal, raw):
+    """
+    Convert a column of raw uint64 values to physical values.
+    """
+    if signal.is_signed:
+        raw = raw.view(numpy.int64)
+        if signal.length < 64:
+            raw = numpy.where(raw > signal.raw_max, raw - (1 << signal.length), raw)
+    elif signal.length < 64:
+        raw = raw.view(numpy.int64)
+    if signal.is_identity:
+        return raw
+    return raw * signal.scale + signal.offset
+
+
+def _physical_dtype(signal):
+    """
+    Return the dtype of a signal's physical values, the one _physical() produces.
+    """
+    if not signal.is_identity:
+        return numpy.float64
+    return numpy.int64 if signal.is_signed or signal.length < 64 else numpy.uint64
+
+
+def _raw_bounds(signal):
+    low, high = float(signal.raw_min), float(signal.raw_max)
+    if int(high) > signal.raw_max:  # 64-bit bounds round up when converted to float
+        high = float(numpy.nextafter(high, 0.0))
+    return low, high
+
+
+def _to_raw(signal, values):
+    """
+    Convert a column of physical values to raw uint64 bit patterns, saturated to the signal's range.
+    """
+    values = numpy.asarray(values)
+    if signal.is_identity and values.dtype.kind in 'iu' and signal.length < 64:
+        raw = numpy.clip(values.astype(numpy.int64), signal.raw_min, signal.raw_max)
+        return raw.view(numpy.uint64) & numpy.uint64(signal.mask)
+    raw = numpy.rint((values.astype(numpy.float64) - signal.offset) / signal.scale)
+    raw = numpy.clip(raw, *_raw_bounds(signal))
+    if signal.is_signed:
+        return raw.astype(numpy.int64).view(numpy.uint64) & numpy.uint64(signal.mask)
+    return raw.astype(numpy.uint64)
+
+
+class _Payloads:
+    """
+    The payloads of the frames of one message, read as whole integers or 8-byte windows.
+    """
+
+    def __init__(self, message, rows):
+        self.message = message
+        self.rows = rows
+        self._words = {}
+        self._padded = None
+
+    def raw(self, signal):
+        message = self.message
+        if message.length <= 8 and self.rows.shape[1] >= 8:
+            big = signal.byte_order != LITTLE_ENDIAN
+            word = self._words.get(big)
+            if word is None:
+                data = numpy.ascontiguousarray(self.rows[:, :8])
+                word = self._words[big] = data.view('>u8' if big else '<u8').ravel().astype(numpy.uint64)
+            shift = signal.shift + (8 * (8 - message.length) if big else 0)
+            return (word >> numpy.uint64(shift)) & numpy.uint64(signal.mask)
+
+        if self._padded is None:
+            width = min(self.rows.shape[1], message.length)
+            self._padded = numpy.zeros((len(self.rows), message.length + 16), dtype=numpy.uint8)
+            self._padded[:, 8:8 + width] = self.rows[:, :width]
+        start, shift = _window(message, signal)
+        data = numpy.ascontiguousarray(self._padded[:, start:start + 8])
+        word = data.view('<u8' if signal.byte_order == LITTLE_ENDIAN else '>u8').ravel().astype(numpy.uint64)
+        return (word >> numpy.uint64(shift)) & numpy.uint64(signal.mask)
+
+
+def decode_many(database, ids, payloads=None, key='vss_path'):
+    """
+    Decode many frames into one column of values per signal.
+
+    Args:
+        database (CANDatabase): The message layouts.
+        ids: Arbitration IDs (array-like), or a structured array of frame_dtype()
+             when payloads is None.
+        payloads: (N, width) uint8 array, or a bytes-like buffer of N payloads of equal size.
+        key (str): Signal attribute the columns are keyed by: 'vss_path' (signals
+                   without one are skipped) or 'name'.
+
+    Returns:
+        dict: SignalColumn by signal key, for the signals of at least one frame;
+              `index` holds the positions of the frames the values were decoded
+              from, shared by the signals of a message.
+              Identity signals (scale 1, offset 0) decode to integers, others to float64.
+    """
+    _require_numpy()
+    ids, payloads = _payload_matrix(ids, payloads)
+    messages, slots = _message_slots(database, ids)
+    columns = {}
+    for slot, index in _group(slots, len(messages)):
+        message = messages[slot]
+        rows = _Payloads(message, payloads[index])
+
+        selected = None
+        if message.multiplexer is not None:
+            selected = _physical(message.multiplexer, rows.raw(message.multiplexer))
+        for signal in message.signals:
+            name = getattr(signal, key)
+            if name is None:
+                continue
+            if not _fits_window(signal):
+                values = numpy.array([message.decode_signal(bytes(row), signal.name) for row in rows.rows],
+                                     dtype=_physical_dtype(signal))
+            else:
+                values = _physical(signal, rows.raw(signal))
+            signal_index = index
+            if signal.multiplex is not None:
+                present = selected == signal.multiplex
+                if not present.any():
+                    continue
+                signal_index, values = index[present], values[present]
+            columns[name] = SignalColumn(signal_index, values)
+    return columns
+
+
+def encode_many(database, columns, timestamps=None):
+    """
+    Encode columns of signal values into frames.
+
+    The signals of a message (and multiplexer value) are packed together:
+    row i of every column of the message goes into the same frame, and
+    signals of the message without a column are 0.
+
+    Args:
+        database (CANDatabase): The message layouts.
+        columns (dict): Array of physical values by signal name or VSS path.
+        timestamps: Optional timestamps (seconds) of the rows, shared by all messages.
+
+    Returns:
+        numpy.ndarray: Frames of frame_dtype(), grouped by message.
+    """
+    _require_numpy()
+    groups = {}
+    for name, values in columns.items():
+        message, signal = database.lookup(name)
+        group = groups.setdefault((message.arbitration_id, signal.multiplex), (message, {}))
+        group[1][signal] = numpy.asarray(values)
+
+    width = max((message.length for message, _ in groups.values()), default=CLASSIC_CAN_LENGTH)
+    blocks = []
+    for (_, multiplex), (message, signals) in groups.items():
+        if multiplex is not None:
+            multiplexer = message.multiplexer
+            count = len(next(iter(signals.values())))
+            signals.setdefault(multiplexer, numpy.full(count, multiplex * multiplexer.scale + multiplexer.offset))
+        blocks.append(_encode_message(message, signals, width, timestamps))
+    if not blocks:
+        return numpy.zeros(0, dtype=frame_dtype(width))
+    return numpy.concatenate(blocks)
+
+
+def _encode_message(message, signals, width, timestamps):
+    count = len(next(iter(signals.values())))
+    padded = numpy.zeros((count, message.length + 16), dtype=numpy.uint8)
+    for signal, values in signals.items():
+        if len(values) != count:
+            raise ValueError(f"Message {message.name}: columns of its signals differ in length")
+        if not _fits_window(signal):
+            for row, value in zip(padded, values.tolist()):
+                row[8:8 + message.length] = numpy.frombuffer(
+                    message.encode({signal.name: value}, bytes(row[8:8 + message.length])), dtype=numpy.uint8)
+            continue
+        raw = _to_raw(signal, values)
+        start, shift = _window(message, signal)
+        word = (raw << numpy.uint64(shift)).astype('<u8' if signal.byte_order == LITTLE_ENDIAN else '>u8')
+        padded[:, start:start + 8] |= word.view(numpy.uint8).reshape(count, 8)
+
+    frames = numpy.zeros(count, dtype=frame_dtype(width))
+    frames['arbitration_id'] = message.arbitration_id
+    frames['flags'] = (FLAG_EXTENDED_ID if message.is_extended_id else 0) | (FLAG_FD if message.is_fd else 0)
+    frames['length'] = message.length
+    frames['data'][:, :message.length] = padded[:, 8:8 + message.length]
+    if timestamps is not None:
+        frames['timestamp'] = timestamps
+    return frames
@@ -0,0 +1,264 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import math
+import threading
+import time
+from array import array
+
+# Nominal bitrate of a classic CAN bus in bit/s
+DEFAULT_BITRATE = 500000
+
+# Length in seconds of the rolling window rates and the bus load are computed over
+DEFAULT_WINDOW = 1.0
+
+# Buckets the rolling window is divided into
+DEFAULT_BUCKETS = 10
+
+# Arbitration IDs tracked individually, enough for every standard ID
+DEFAULT_MAX_IDS = 2048
+
+
+def frame_bits(length, is_extended_id=False, is_fd=False, bitrate=DEFAULT_BITRATE, data_bitrate=None):
+    """
+    Estimate the time a frame occupies the bus, in nominal bit times.
+
+    Classic frames count SOF, arbitration, control, data, CRC, ACK, EOF and
+    the 3-bit interframe space (47 bits plus the payload for standard IDs, 67
+    for extended IDs) and the worst-case stuff bits. For CAN FD frames the
+    data phase (payload, CRC, stuff count) is scaled by the ratio of the
+    nominal to the data bitrate.
+
+    Args:
+        length (int): Payload length in bytes.
+        is_extended_id (bool): 29-bit identifier.
+        is_fd (bool): CAN FD frame.
+        bitrate (int): Nominal (arbitration) bitrate in bit/s.
+        data_bitrate (Optional[int]): CAN FD data phase bitrate, the nominal bitrate by default.
+
+    Returns:
+        float: Bit times at the nominal bitrate.
+    """
+    payload = 8 * length
+    if not is_fd:
+        stuffed = (54 if is_extended_id else 34) + payload
+        return (67 if is_extended_id else 47) + payload + (stuffed - 1) // 4
+    # Nominal bitrate: SOF, ID and control bits up to BRS, then CRC delimiter, ACK, EOF and interframe space
+    header = 36 if is_extended_id else 17
+    arbitration = header + (header - 1) // 4 + 13
+    # Data bitrate: ESI, DLC and payload with stuff bits, stuff count and CRC with fixed stuff bits
+    crc = 17 if length <= 16 else 21
+    data = 5 + payload + (4 + payload) // 4 + 4 + crc + (crc + 7) // 4
+    ratio = bitrate / data_bitrate if data_bitrate else 1.0
+    return arbitration + data * ratio
+
+
+class BusStatistics:
+    """
+    Per-arbitration-ID frame statistics and bus load, updated with O(1) work per frame.
+
+    Every ID gets a slot in arrays preallocated for `max_ids` IDs: frame and
+    payload change counts per bucket of the rolling window, and the online
+    mean, variance and maximum of the inter-arrival time (Welford). The
+    window is a ring of `buckets` time buckets; buckets the clock moved past
+    are cleared when the next frame arrives or a snapshot is taken. Frames of
+    IDs beyond `max_ids` only count toward the totals and the bus load.
+
+    Attributes:
+        bitrate (int): Nominal bitrate the bus load is computed from.
+        data_bitrate (int): CAN FD data phase bitrate.
+        window (float): Length in seconds of the rolling window.
+        frames (int): Frames counted since creation or the last reset().
+        untracked (int): Frames of IDs that did not get a slot.
+    """
+
+    def __init__(self, bitrate=DEFAULT_BITRATE, data_bitrate=None, window=DEFAULT_WINDOW,
+                 buckets=DEFAULT_BUCKETS, max_ids=DEFAULT_MAX_IDS, clock=time.time):
+        if window <= 0 or buckets < 1 or max_ids < 1:
+            raise ValueError(f"Invalid statistics window {window} s / {buckets} buckets / {max_ids} IDs")
+        self.bitrate = bitrate
+        self.data_bitrate = data_bitrate or bitrate
+        self.window = window
+        self.buckets = buckets
+        self.bucket_width = window / buckets
+        self.max_ids = max_ids
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._bits_cache = {}
+        self.reset()
+
+    def reset(self):
+        """
+        Clear every counter and release the ID slots.
+        """
+        size = self.max_ids * self.buckets
+        with self._lock:
+            self.frames = 0
+            self.untracked = 0
+            self._slots = {}
+            self._payloads = []
+            self._count = array('Q', [0]) * self.max_ids
+            self._changes = array('Q', [0]) * self.max_ids
+            self._last = array('d', [0]) * self.max_ids
+            self._gap_mean = array('d', [0]) * self.max_ids
+            self._gap_m2 = array('d', [0]) * self.max_ids
+            self._gap_max = array('d', [0]) * self.max_ids
+            self._window_frames = array('L', [0]) * size
+            self._window_changes = array('L', [0]) * size
+            self._window_bits = array('d', [0]) * self.buckets
+            self._window_total = array('L', [0]) * self.buckets
+            self._bucket = None
+
+    def _advance(self, bucket):
+        # Clear the buckets between the current one and `bucket`, at most the whole ring
+        current = self._bucket
+        if current is None or bucket - current >= self.buckets:
+            cleared = range(self.buckets)
+        else:
+            cleared = [b % self.buckets for b in range(current + 1, bucket + 1)]
+        stride = self.buckets
+        slots = len(self._payloads)
+        for b in cleared:
+            self._window_bits[b] = 0.0
+            self._window_total[b] = 0
+            for offset in range(b, slots * stride, stride):
+                self._window_frames[offset] = 0
+                self._window_changes[offset] = 0
+        self._bucket = bucket
+
+    def update(self, timestamp, arbitration_id, data, is_extended_id=False, is_fd=False):
+        """
+        Count one frame.
+
+        Args:
+            timestamp (float): Reception time in seconds, on the same time base as `clock`.
+            arbitration_id (int): CAN ID of the frame.
+            data (bytes): The payload.
+            is_extended_id (bool): 29-bit identifier.
+            is_fd (bool): CAN FD frame.
+        """
+        length = len(data)
+        key = (length, is_extended_id, is_fd)
+        bits = self._bits_cache.get(key)
+        if bits is None:
+            bits = self._bits_cache[key] = frame_bits(length, is_extended_id, is_fd, self.bitrate, self.data_bitrate)
+        bucket = int(timestamp / self.bucket_width)
+        with self._lock:
+            if self._bucket is None or bucket > self._bucket:
+                self._advance(bucket)
+            # A frame older than the window (e.g. reordered) is only counted in the totals
+            ring = bucket % self.buckets if bucket > self._bucket - self.buckets else None
+            self.frames += 1
+            if ring is not None:
+                self._window_bits[ring] += bits
+                self._window_total[ring] += 1
+
+            slot = self._slots.get(arbitration_id)
+            if slot is None:
+                slot = len(self._payloads)
+                if slot == self.max_ids:
+                    self.untracked += 1
+                    return
+                self._slots[arbitration_id] = slot
+                self._payloads.append(bytes(data))
+                self._count[slot] = 1
+                self._last[slot] = timestamp
+                if ring is not None:
+                    self._window_frames[slot * self.buckets + ring] += 1
+                return
+
+            count = self._count[slot] + 1
+            self._count[slot] = count
+            gap = timestamp - self._last[slot]
+            self._last[slot] = timestamp
+            # Welford's online mean/variance over the count - 1 inter-arrival times
+            gaps = count - 1
+            delta = gap - self._gap_mean[slot]
+            self._gap_mean[slot] += delta / gaps
+            self._gap_m2[slot] += delta * (gap - self._gap_mean[slot])
+            if gap > self._gap_max[slot]:
+                self._gap_max[slot] = gap
+
+            changed = data != self._payloads[slot]
+            if changed:
+                self._payloads[slot] = bytes(data)
+                self._changes[slot] += 1
+            if ring is not None:
+                offset = slot * self.buckets + ring
+                self._window_frames[offset] += 1
+                if changed:
+                    self._window_changes[offset] += 1
+
+    def record(self, msg):
+        """
+        Count a can.Message.
+        """
+        self.update(msg.timestamp, msg.arbitration_id, msg.data, msg.is_extended_id, msg.is_fd)
+
+    def snapshot(self, arbitration_ids=None, now=None):
+        """
+        Return the bus load and the statistics of every ID.
+
+        The buckets the clock moved past since the last frame are cleared
+        first, so rates fall to 0 on a silent bus. Rates are divided by the
+        time the ring actually covers: the full buckets plus the elapsed part
+        of the current one. The result only holds numbers and dicts, cheap to
+        poll and to serialize.
+
+        Args:
+            arbitration_ids (Optional[Iterable[int]]): Only report these IDs.
+            now (Optional[float]): Current time, `clock()` by default.
+
+        Returns:
+            dict: window_s (time covered by the rates), frames, untracked, frames_per_s, bus_load_percent,
+                  and ids, by arbitration ID: frames, changes, frames_per_s,
+                  changes_per_s, interarrival_mean_ms, jitter_ms (stddev of the
+                  inter-arrival time) and interarrival_max_ms.
+        """
+        now = self.clock() if now is None else now
+        width = self.bucket_width
+        stride = self.buckets
+        with self._lock:
+            bucket = int(now / width)
+            if self._bucket is None or bucket > self._bucket:
+                self._advance(bucket)
+            elapsed = min(max(now - self._bucket * width, 0.0), width)
+            span = max(self.window - width + elapsed, width)
+            slots = self._slots
+            if arbitration_ids is not None:
+                slots = {can_id: slots[can_id] for can_id in arbitration_ids if can_id in slots}
+            ids = {}
+            for can_id, slot in slots.items():
+                start = slot * stride
+                count = self._count[slot]
+                gaps = count - 1
+                ids[can_id] = {
+                    'frames': count,
+                    'changes': self._changes[slot],
+                    'frames_per_s': sum(self._window_frames[start:start + stride]) / span,
+                    'changes_per_s': sum(self._window_changes[start:start + stride]) / span,
+                    'interarrival_mean_ms': self._gap_mean[slot] * 1000.0,
+                    'jitter_ms': math.sqrt(self._gap_m2[slot] / gaps) * 1000.0 if gaps else 0.0,
+                    'interarrival_max_ms': self._gap_max[slot] * 1000.0,
+                }
+            bits = sum(self._window_bits)
+            frames_in_window = sum(self._window_total)
+            stats = {
+                'window_s': span,
+                'frames': self.frames,
+                'untracked': self.untracked,
+                'frames_per_s': frames_in_window / span,
+                'bus_load_percent': bits / span / self.bitrate * 100.0,
+                'ids': ids,
+            }
+        return stats
@@ -0,0 +1,601 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import struct
+from collections import namedtuple
+import yaml
+from vss_lib.vspec.loader import SafeLoader
+
+# Directory with per-vendor CAN message layouts (<vendor>.yaml)
+CAN_LAYOUT_DIR = '/usr/share/vss-lib/can/'
+
+# Payload size of classic CAN and CAN FD frames
+CLASSIC_CAN_LENGTH = 8
+CAN_FD_LENGTH = 64
+
+# Payload sizes a CAN FD frame can carry
+CAN_FD_LENGTHS = (0, 1, 2, 3, 4, 5, 6, 7, 8, 12, 16, 20, 24, 32, 48, 64)
+
+LITTLE_ENDIAN = 'little_endian'  # Intel byte order, start bit is the LSB
+BIG_ENDIAN = 'big_endian'  # Motorola byte order, start bit is the MSB (DBC numbering)
+
+# Precompiled formats that read a whole payload as one unsigned integer
+_PAYLOAD_STRUCTS = {
+    1: (struct.Struct('<B'), struct.Struct('>B')),
+    2: (struct.Struct('<H'), struct.Struct('>H')),
+    4: (struct.Struct('<I'), struct.Struct('>I')),
+    8: (struct.Struct('<Q'), struct.Struct('>Q')),
+}
+
+CANFrame = namedtuple('CANFrame', ['arbitration_id', 'data', 'is_fd', 'is_extended_id'])
+CANFrame.__doc__ = "A CAN frame: arbitration ID, payload bytes and frame format flags."
+
+
+class SignalLayout:
+    """
+    Placement and scaling of one signal inside a CAN message payload.
+
+    physical value = raw value * scale + offset
+
+    Attributes:
+        name (str): Signal name, the VSS path for layouts of a vendor.
+        start_bit (int): LSB position for little endian signals, MSB position
+                         (DBC numbering) for big endian signals.
+        length (int): Number of bits, 1 to 64.
+        byte_order (str): LITTLE_ENDIAN or BIG_ENDIAN.
+        is_signed (bool): Whether the raw value is two's complement.
+        scale (float): Factor from raw to physical value.
+        offset (float): Offset from raw to physical value.
+        vss_path (Optional[str]): VSS path the signal is decoded into, None if it is not mapped.
+        multiplex (Optional[int]): Multiplexer value the signal is sent with, None if it is always present.
+        is_multiplexer (bool): Whether the signal selects the multiplexed signals of its message.
+    """
+
+    __slots__ = ('name', 'start_bit', 'length', 'byte_order', 'is_signed', 'scale', 'offset',
+                 'vss_path', 'multiplex', 'is_multiplexer', 'mask', 'shift', 'raw_min', 'raw_max', 'is_identity')
+
+    def __init__(self, name, start_bit, length, byte_order=LITTLE_ENDIAN, is_signed=False, scale=1.0, offset=0.0,
+                 vss_path=None, multiplex=None, is_multiplexer=False):
+        if byte_order not in (LITTLE_ENDIAN, BIG_ENDIAN):
+            raise ValueError(f"Signal {name}: unknown byte order '{byte_order}'")
+        if not 1 <= length <= 64:
+            raise ValueError(f"Signal {name}: length must be between 1 and 64 bits, got {length}")
+        if start_bit < 0:
+            raise ValueError(f"Signal {name}: start bit must not be negative, got {start_bit}")
+        if scale == 0:
+            raise ValueError(f"Signal {name}: scale must not be 0")
+        self.name = name
+        self.start_bit = start_bit
+        self.length = length
+        self.byte_order = byte_order
+        self.is_signed = is_signed
+        self.scale = float(scale)
+        self.offset = float(offset)
+        self.vss_path = vss_path
+        self.multiplex = multiplex
+        self.is_multiplexer = is_multiplexer
+        self.mask = (1 << length) - 1
+        self.is_identity = self.scale == 1.0 and self.offset == 0.0  # Raw and physical values are equal
+        self.shift = None  # Bit position within the payload integer, set by MessageLayout
+        if is_signed:
+            self.raw_min, self.raw_max = -(1 << (length - 1)), (1 << (length - 1)) - 1
+        else:
+            self.raw_min, self.raw_max = 0, self.mask
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a signal layout from a mapping, e.g. an entry of a layout file.
+        """
+        return cls(
+            data['name'],
+            int(data['start_bit']),
+            int(data['length']),
+            data.get('byte_order', LITTLE_ENDIAN),
+            bool(data.get('is_signed', False)),
+            data.get('scale', 1.0),
+            data.get('offset', 0.0),
+            data.get('vss_path'),
+            data.get('multiplex'),
+            bool(data.get('is_multiplexer', False)),
+        )
+
+    def to_dict(self):
+        """
+        Return the signal layout as a mapping accepted by from_dict.
+        """
+        data = {
+            'name': self.name,
+            'start_bit': self.start_bit,
+            'length': self.length,
+            'byte_order': self.byte_order,
+            'is_signed': self.is_signed,
+            'scale': self.scale,
+            'offset': self.offset,
+        }
+        if self.vss_path is not None:
+            data['vss_path'] = self.vss_path
+        if self.multiplex is not None:
+            data['multiplex'] = self.multiplex
+        if self.is_multiplexer:
+            data['is_multiplexer'] = True
+        return data
+
+    def bit_span(self):
+        """
+        Return the first and last bit of the signal in payload bit order.
+
+        Little endian signals count from bit 0 of byte 0 upwards; big endian
+        signals count from bit 7 of byte 0 (the MSB of the payload) downwards.
+        """
+        if self.byte_order == LITTLE_ENDIAN:
+            return self.start_bit, self.start_bit + self.length - 1
+        msb = (self.start_bit // 8) * 8 + (7 - self.start_bit % 8)
+        return msb, msb + self.length - 1
+
+    def to_raw(self, value):
+        """
+        Convert a physical value to the raw integer, saturated to the signal's range.
+        """
+        if self.is_identity and isinstance(value, int):
+            raw = value  # Exact, also for values beyond the 53 bits of a float
+        else:
+            raw = round((value - self.offset) / self.scale)
+        if raw < self.raw_min:
+            return self.raw_min
+        if raw > self.raw_max:
+            return self.raw_max
+        return raw
+
+    def __repr__(self):
+        return (f"SignalLayout({self.name!r}, start_bit={self.start_bit}, length={self.length}, "
+                f"byte_order={self.byte_order!r}, scale={self.scale}, offset={self.offset})")
+
+
+class MessageLayout:
+    """
+    A CAN message and the signals packed into its payload.
+
+    The layout is compiled once: each signal gets the shift and mask that
+    locate it in the payload read as a single little endian (Intel signals)
+    or big endian (Motorola signals) integer. Payloads of 1, 2, 4 or 8 bytes
+    are read and written with precompiled struct formats, larger CAN FD
+    payloads with int.from_bytes/to_bytes.
+
+    A message may have one multiplexer signal; multiplexed signals are only
+    present when the multiplexer holds their `multiplex` value, and signals
+    of different multiplexer values may share bits.
+
+    Layouts are validated (payload size, ID range, signal fit and overlaps)
+    unless `validate` is False, for layouts read back from a compiled cache.
+
+    Attributes:
+        arbitration_id (int): CAN ID of the message.
+        name (str): Message name.
+        length (int): Payload size in bytes, up to 8 for classic CAN and 64 for CAN FD.
+        is_fd (bool): Whether the message is sent as a CAN FD frame.
+        is_extended_id (bool): Whether the arbitration ID is 29 bits.
+        signals (list): The SignalLayout entries of the message.
+        multiplexer (Optional[SignalLayout]): The multiplexer signal, if any.
+    """
+
+    def __init__(self, arbitration_id, name, signals, length=CLASSIC_CAN_LENGTH, is_fd=None, is_extended_id=None,
+                 validate=True):
+        if is_fd is None:
+            is_fd = length > CLASSIC_CAN_LENGTH
+        if is_extended_id is None:
+            is_extended_id = arbitration_id > 0x7FF
+        if validate:
+            if is_fd and length not in CAN_FD_LENGTHS:
+                raise ValueError(f"Message {name}: {length} is not a valid CAN FD payload length")
+            if not is_fd and not 0 <= length <= CLASSIC_CAN_LENGTH:
+                raise ValueError(f"Message {name}: classic CAN payloads hold at most {CLASSIC_CAN_LENGTH} bytes")
+            if arbitration_id > (0x1FFFFFFF if is_extended_id else 0x7FF):
+                raise ValueError(f"Message {name}: arbitration ID {arbitration_id:#x} does not fit")
+
+        self.arbitration_id = arbitration_id
+        self.name = name
+        self.length = length
+        self.is_fd = is_fd
+        self.is_extended_id = is_extended_id
+        self.signals = list(signals)
+        self.by_name = {}
+        self.multiplexer = None
+        self._base = ([], [])
+        self._multiplexed = {}
+        self._structs = _PAYLOAD_STRUCTS.get(length)
+
+        bits = length * 8
+        for signal in self.signals:
+            first, last = signal.bit_span()
+            if validate and last >= bits:
+                raise ValueError(f"Message {name}: signal {signal.name} does not fit in {length} bytes")
+            big = signal.byte_order != LITTLE_ENDIAN
+            signal.shift = bits - 1 - last if big else first
+            if signal.is_multiplexer:
+                self.multiplexer = signal
+            self.by_name[signal.name] = signal
+            if signal.multiplex is None:
+                group = self._base
+            else:
+                group = self._multiplexed.get(signal.multiplex)
+                if group is None:
+                    group = self._multiplexed[signal.multiplex] = ([], [])
+            group[big].append(signal)
+
+        if validate:
+            self._check_overlaps()
+
+    def _check_overlaps(self):
+        """
+        Raise ValueError if signals share bits.
+
+        Multiplexed signals only have to avoid the always present signals and
+        the signals sent with the same multiplexer value.
+        """
+        def placed_bits(signals):
+            used = 0
+            for signal in signals[0] + signals[1]:
+                placed = signal.mask << signal.shift
+                if signal.byte_order != LITTLE_ENDIAN:
+                    placed = int.from_bytes(placed.to_bytes(self.length, 'big'), 'little')
+                if used & placed:
+                    raise ValueError(f"Message {self.name}: signal {signal.name} overlaps another signal")
+                used |= placed
+            return used
+
+        base = placed_bits(self._base)
+        for value, group in self._multiplexed.items():
+            if base & placed_bits(group):
+                raise ValueError(f"Message {self.name}: signals of multiplexer value {value} overlap another signal")
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a message layout from a mapping, e.g. an entry of a layout file.
+        """
+        arbitration_id = data['arbitration_id']
+        if isinstance(arbitration_id, str):
+            arbitration_id = int(arbitration_id, 16)
+        return cls(
+            arbitration_id,
+            data.get('name', f"{arbitration_id:X}"),
+            [SignalLayout.from_dict(signal) for signal in data.get('signals', [])],
+            int(data.get('length', CLASSIC_CAN_LENGTH)),
+            data.get('is_fd'),
+            data.get('is_extended_id'),
+        )
+
+    def to_dict(self):
+        """
+        Return the message layout as a mapping accepted by from_dict.
+        """
+        return {
+            'arbitration_id': self.arbitration_id,
+            'name': self.name,
+            'length': self.length,
+            'is_fd': self.is_fd,
+            'is_extended_id': self.is_extended_id,
+            'signals': [signal.to_dict() for signal in self.signals],
+        }
+
+    def _read(self, data, byteorder):
+        structs = self._structs
+        if structs is not None and len(data) == self.length:
+            return structs[byteorder == 'big'].unpack(data)[0]
+        return int.from_bytes(data[:self.length], byteorder)
+
+    def decode(self, data, key='name'):
+        """
+        Decode the physical values of all signals of a payload.
+
+        For multiplexed messages only the signals sent with the payload's
+        multiplexer value are decoded.
+
+        Args:
+            data (bytes): The payload, at least `length` bytes.
+            key (str): Signal attribute the values are keyed by: 'name', or
+                       'vss_path' to only decode the signals mapped to VSS.
+
+        Returns:
+            dict: Physical value by signal name (or VSS path).
+        """
+        if len(data) < self.length:
+            raise ValueError(f"Message {self.name}: payload has {len(data)} bytes, expected {self.length}")
+        values = {}
+        payloads = [None, None]
+        self._decode_group(data, self._base, payloads, values, key)
+        if self.multiplexer is not None:
+            group = self._multiplexed.get(self._raw(data, self.multiplexer, payloads))
+            if group is not None:
+                self._decode_group(data, group, payloads, values, key)
+        return values
+
+    def _payload(self, data, payloads, big):
+        payload = payloads[big]
+        if payload is None:
+            payload = payloads[big] = self._read(data, 'big' if big else 'little')
+        return payload
+
+    def _raw(self, data, signal, payloads):
+        payload = self._payload(data, payloads, signal.byte_order == BIG_ENDIAN)
+        raw = (payload >> signal.shift) & signal.mask
+        if signal.is_signed and raw > signal.raw_max:
+            raw -= signal.mask + 1
+        return raw
+
+    def _decode_group(self, data, group, payloads, values, key):
+        for big, signals in enumerate(group):
+            if not signals:
+                continue
+            payload = self._payload(data, payloads, big)
+            for signal in signals:
+                name = getattr(signal, key)
+                if name is None:
+                    continue
+                raw = (payload >> signal.shift) & signal.mask
+                if signal.is_signed and raw > signal.raw_max:
+                    raw -= signal.mask + 1
+                values[name] = raw if signal.is_identity else raw * signal.scale + signal.offset
+
+    def decode_signal(self, data, name):
+        """
+        Decode the physical value of one signal of a payload.
+        """
+        signal = self.by_name[name]
+        raw = self._raw(data, signal, [None, None])
+        return raw if signal.is_identity else raw * signal.scale + signal.offset
+
+    def encode(self, values, data=None):
+        """
+        Pack physical values into a payload.
+
+        Signals missing from `values` keep their bits from `data`, or are 0.
+
+        Args:
+            values (dict): Physical value by signal name.
+            data (Optional[bytes]): Previous payload to update.
+
+        Returns:
+            bytes: The payload, `length` bytes long.
+        """
+        length = self.length
+        little = self._read(data, 'little') if data else 0
+        big = 0
+        for signal in self.signals:
+            if signal.name not in values:
+                continue
+            raw = signal.to_raw(values[signal.name]) & signal.mask
+            if signal.byte_order == LITTLE_ENDIAN:
+                little = (little & ~(signal.mask << signal.shift)) | (raw << signal.shift)
+            else:
+                big |= raw << signal.shift
+                if data:
+                    # Clear the bits of the signal in the little endian view of the old payload
+                    cleared = int.from_bytes((signal.mask << signal.shift).to_bytes(length, 'big'), 'little')
+                    little &= ~cleared
+        if big:
+            little |= int.from_bytes(big.to_bytes(length, 'big'), 'little')
+        structs = self._structs
+        if structs is not None:
+            return structs[0].pack(little)
+        return little.to_bytes(length, 'little')
+
+    def frame(self, values, data=None):
+        """
+        Build a CANFrame carrying the encoded values.
+        """
+        return CANFrame(self.arbitration_id, self.encode(values, data), self.is_fd, self.is_extended_id)
+
+    def __repr__(self):
+        return f"MessageLayout({self.arbitration_id:#x}, {self.name!r}, length={self.length}, signals={len(self.signals)})"
+
+
+class CANDatabase:
+    """
+    The CAN messages of a vendor, indexed by arbitration ID, by signal name
+    and by the VSS path signals are mapped to.
+
+    Attributes:
+        messages (dict): MessageLayout by arbitration ID.
+        signals (dict): MessageLayout by signal name.
+        vss_signals (dict): MessageLayout by VSS path.
+    """
+
+    def __init__(self, messages=()):
+        self.messages = {}
+        self.signals = {}
+        self.vss_signals = {}
+        self._vss_names = {}
+        for message in messages:
+            self.add(message)
+
+    def add(self, message):
+        """
+        Register a message layout; its signals become encodable by name.
+        """
+        if message.arbitration_id in self.messages:
+            raise ValueError(f"Duplicate arbitration ID {message.arbitration_id:#x} ({message.name})")
+        self.messages[message.arbitration_id] = message
+        self._index(message)
+
+    def _index(self, message):
+        for signal in message.signals:
+            self.signals[signal.name] = message
+            if signal.vss_path is not None:
+                self.vss_signals[signal.vss_path] = message
+                self._vss_names[signal.vss_path] = signal.name
+
+    def reindex(self):
+        """
+        Rebuild the signal indexes, e.g. after the VSS paths of signals changed.
+        """
+        self.signals = {}
+        self.vss_signals = {}
+        self._vss_names = {}
+        for message in self.messages.values():
+            self._index(message)
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __contains__(self, signal_name):
+        return signal_name in self.signals or signal_name in self.vss_signals
+
+    def lookup(self, signal_name):
+        """
+        Return the message and layout of a signal.
+
+        Args:
+            signal_name (str): The signal name, or the VSS path it is mapped to.
+
+        Returns:
+            tuple: (MessageLayout, SignalLayout).
+
+        Raises:
+            KeyError: If no message carries the signal.
+        """
+        message = self.signals.get(signal_name)
+        if message is None:
+            message = self.vss_signals[signal_name]
+            signal_name = self._vss_names[signal_name]
+        return message, message.by_name[signal_name]
+
+    def encode(self, signal_name, value):
+        """
+        Encode one signal value into a frame of the message that carries it.
+
+        Args:
+            signal_name (str): The signal name, or the VSS path it is mapped to.
+            value (float): The physical value.
+
+        Returns:
+            CANFrame: The frame, other signals of the message are 0.
+        """
+        message, signal = self.lookup(signal_name)
+        values = {signal.name: value}
+        if signal.multiplex is not None:
+            multiplexer = message.multiplexer
+            values[multiplexer.name] = signal.multiplex * multiplexer.scale + multiplexer.offset
+        return message.frame(values)
+
+    def decode(self, frame):
+        """
+        Decode a frame into physical values by signal name.
+
+        Args:
+            frame (CANFrame): A frame, or any object with arbitration_id and data (e.g. a can.Message).
+
+        Returns:
+            dict: Physical value by signal name, empty for an unknown arbitration ID.
+        """
+        message = self.messages.get(frame.arbitration_id)
+        if message is None:
+            return {}
+        return message.decode(frame.data)
+
+    def decode_vss(self, frame):
+        """
+        Decode a frame into physical values by VSS path.
+
+        Signals that are not mapped to a VSS path are skipped.
+
+        Returns:
+            dict: Physical value by VSS path, empty for an unknown arbitration ID.
+        """
+        message = self.messages.get(frame.arbitration_id)
+        if message is None:
+            return {}
+        return message.decode(frame.data, key='vss_path')
+
+    def to_dict(self):
+        """
+        Return the database as a mapping accepted by from_dict.
+        """
+        return {'messages': [message.to_dict() for message in self.messages.values()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a database from a mapping with a `messages` list.
+        """
+        return cls(MessageLayout.from_dict(message) for message in data.get('messages', []))
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Load the message layouts of a YAML layout file.
+
+        The file holds a `messages` list; every message has an arbitration_id
+        (int or hex string), optional name, length, is_fd and is_extended_id,
+        and a `signals` list with name, start_bit, length and optional
+        byte_order, is_signed, scale, offset, multiplex and is_multiplexer.
+        Signal names are VSS paths unless a signal sets its own vss_path.
+        """
+        with open(path, 'rb') as file:
+            data = yaml.load(file, Loader=SafeLoader) or {}
+        database = cls.from_dict(data)
+        for message in database.messages.values():
+            for signal in message.signals:
+                if signal.vss_path is None:
+                    signal.vss_path = signal.name
+        database.reindex()
+        return database
+
+
+def vendor_layout_file(vendor, layout_dir=None):
+    """
+    Return the path of a vendor's layout file, or None if the vendor has none.
+
+    A DBC file (<vendor>.dbc) takes precedence over a YAML layout (<vendor>.yaml).
+    """
+    for extension in ('.dbc', '.yaml'):
+        path = os.path.join(layout_dir or CAN_LAYOUT_DIR, f"{vendor.lower()}{extension}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def default_database(model, base_id=0x100, is_fd=False, signal_bits=16):
+    """
+    Derive a CAN layout for every emittable signal of a VSS model.
+
+    Each signal is stored as an unsigned integer of `signal_bits` bits scaled
+    to its [min, max] range. Signals are packed in VSS order, as many as fit
+    in an 8-byte classic frame (or a 64-byte CAN FD frame), on consecutive
+    arbitration IDs starting at `base_id`.
+
+    Args:
+        model (Model): The VSS model.
+        base_id (int): Arbitration ID of the first message.
+        is_fd (bool): Pack the signals into CAN FD frames.
+        signal_bits (int): Bits per signal.
+
+    Returns:
+        CANDatabase: The derived layout.
+    """
+    length = CAN_FD_LENGTH if is_fd else CLASSIC_CAN_LENGTH
+    per_message = length * 8 // signal_bits
+    table = model.emission
+    database = CANDatabase()
+    raw_max = (1 << signal_bits) - 1
+    for first in range(0, len(table), per_message):
+        signals = []
+        for slot, index in enumerate(range(first, min(first + per_message, len(table)))):
+            low, high = table.lows[index], table.highs[index]
+            signals.append(SignalLayout(table.paths[index], slot * signal_bits, signal_bits,
+                                        scale=(high - low) / raw_max, offset=low, vss_path=table.paths[index]))
+        arbitration_id = base_id + first // per_message
+        database.add(MessageLayout(arbitration_id, f"VSS_{arbitration_id:X}", signals, length, is_fd))
+    return database
@@ -0,0 +1,318 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Import of CAN message layouts from DBC files.
+
+Only the parts of a DBC file that describe the payload are read: messages
+(``BO_``), their signals (``SG_``, including simple multiplexing), the CAN FD
+frame format (``BA_ "VFrameFormat"``) and float signals (``SIG_VALTYPE_``,
+which are skipped). A signal can name the VSS path it is decoded into with a
+string attribute on the signal::
+
+    BA_DEF_ SG_ "VSSPath" STRING ;
+    BA_ "VSSPath" SG_ 752 VehicleSpeed "Speed";
+
+Compiled databases are cached as JSON next to the compiled VSS files, named
+after a hash of the absolute DBC path, and reused while the DBC file is
+unchanged.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+
+from vss_lib.canbus.codec import BIG_ENDIAN, LITTLE_ENDIAN, CANDatabase, MessageLayout, SignalLayout
+from vss_lib.vspec.cache import cache_path
+
+logger = logging.getLogger("canbus")
+
+DBC_CACHE_SUFFIX = '.dbc.json'
+DBC_CACHE_VERSION = 1
+
+# Attribute of a signal holding the VSS path it is mapped to
+VSS_PATH_ATTRIBUTE = 'VSSPath'
+
+# VFrameFormat values of CAN FD messages (StandardCAN_FD, ExtendedCAN_FD)
+FD_FRAME_FORMATS = (14, 15)
+
+# Bit 31 of a DBC message ID marks a 29-bit identifier
+EXTENDED_ID_FLAG = 0x80000000
+
+# Pseudo message that holds signals not sent in any message
+INDEPENDENT_SIGNALS = 'VECTOR__INDEPENDENT_SIG_MSG'
+
+_MESSAGE = re.compile(r'BO_\s+(\d+)\s+(\w+)\s*:\s*(\d+)')
+_SIGNAL = re.compile(
+    r'SG_\s+(\w+)\s*(M|m\d+M?)?\s*:\s*(\d+)\|(\d+)@([01])([+-])\s*'
+    r'\(\s*([^,\s]+)\s*,\s*([^)\s]+)\s*\)')
+_MESSAGE_ATTRIBUTE = re.compile(r'BA_\s+"(\w+)"\s+BO_\s+(\d+)\s+(.*?)\s*;')
+_SIGNAL_ATTRIBUTE = re.compile(r'BA_\s+"(\w+)"\s+SG_\s+(\d+)\s+(\w+)\s+(.*?)\s*;')
+_VALUE_TYPE = re.compile(r'SIG_VALTYPE_\s+(\d+)\s+(\w+)\s*:?\s*(\d)')
+
+
+def _message_id(raw_id):
+    """
+    Split a DBC message ID into the arbitration ID and the extended ID flag.
+    """
+    if raw_id & EXTENDED_ID_FLAG:
+        return raw_id & 0x1FFFFFFF, True
+    return raw_id, False
+
+
+def parse_dbc(text):
+    """
+    Compile the messages of a DBC document into a CANDatabase.
+
+    Messages whose layout is invalid (e.g. overlapping signals) are skipped
+    with a warning, so one broken entry does not prevent loading the rest.
+
+    Args:
+        text (str): Content of the DBC file.
+
+    Returns:
+        CANDatabase: The message layouts, signals mapped to VSS paths where the
+                     file sets the VSSPath attribute.
+
+    Raises:
+        ValueError: If a message or signal definition cannot be parsed.
+    """
+    messages = []  # [raw_id, name, length, signal fields]
+    current = None
+    frame_formats = {}
+    vss_paths = {}
+    float_signals = set()
+
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if line.startswith('SG_ '):
+            match = _SIGNAL.match(line)
+            if match is None:
+                raise ValueError(f"DBC line {number}: invalid signal definition: {line}")
+            if current is not None:
+                current[3].append(match.groups())
+        elif line.startswith('BO_ '):
+            match = _MESSAGE.match(line)
+            if match is None:
+                raise ValueError(f"DBC line {number}: invalid message definition: {line}")
+            raw_id, name, length = match.groups()
+            current = None
+            if name != INDEPENDENT_SIGNALS:
+                current = [int(raw_id), name, int(length), []]
+                messages.append(current)
+        elif line.startswith('BA_ '):
+            match = _MESSAGE_ATTRIBUTE.match(line)
+            if match is not None:
+                attribute, raw_id, value = match.groups()
+                if attribute == 'VFrameFormat':
+                    try:
+                        frame_formats[int(raw_id)] = int(value)
+                    except ValueError:
+                        logger.warning(f"DBC line {number}: skipping invalid VFrameFormat value: {line}")
+                continue
+            match = _SIGNAL_ATTRIBUTE.match(line)
+            if match is not None:
+                attribute, raw_id, signal_name, value = match.groups()
+                if attribute == VSS_PATH_ATTRIBUTE:
+                    vss_paths[(int(raw_id), signal_name)] = value.strip('"') or None
+        elif line.startswith('SIG_VALTYPE_ '):
+            match = _VALUE_TYPE.match(line)
+            if match is not None and match.group(3) != '0':
+                float_signals.add((int(match.group(1)), match.group(2)))
+
+    database = CANDatabase()
+    for raw_id, name, length, fields in messages:
+        arbitration_id, is_extended_id = _message_id(raw_id)
+        try:
+            signals = []
+            for (signal_name, multiplex, start_bit, bit_length, byte_order, sign, scale, offset) in fields:
+                if (raw_id, signal_name) in float_signals:
+                    logger.warning(f"DBC message {name}: skipping float signal {signal_name}")
+                    continue
+                mux_value = None
+                if multiplex and multiplex.startswith('m'):
+                    if multiplex.endswith('M'):
+                        logger.warning(f"DBC message {name}: extended multiplexing of {signal_name} is not supported")
+                        multiplex = multiplex[:-1]
+                    mux_value = int(multiplex[1:])
+                signals.append(SignalLayout(
+                    signal_name, int(start_bit), int(bit_length),
+                    LITTLE_ENDIAN if byte_order == '1' else BIG_ENDIAN,
+                    sign == '-', float(scale), float(offset),
+                    vss_path=vss_paths.get((raw_id, signal_name)),
+                    multiplex=mux_value,
+                    is_multiplexer=multiplex == 'M',
+                ))
+            database.add(MessageLayout(arbitration_id, name, signals, length,
+                                       is_fd=frame_formats.get(raw_id) in FD_FRAME_FORMATS or length > 8,
+                                       is_extended_id=is_extended_id))
+        except ValueError as e:
+            logger.warning(f"Skipping DBC message {name} ({arbitration_id:#x}): {e}")
+    return database
+
+
+def _to_rows(database):
+    """
+    Flatten a database into lists, the compact form stored in the cache.
+    """
+    return [
+        [message.arbitration_id, message.name, message.length, message.is_fd, message.is_extended_id,
+         [[signal.name, signal.start_bit, signal.length, signal.byte_order, signal.is_signed, signal.scale,
+           signal.offset, signal.vss_path, signal.multiplex, signal.is_multiplexer] for signal in message.signals]]
+        for message in database.messages.values()
+    ]
+
+
+def _from_rows(rows):
+    """
+    Rebuild a database from _to_rows() output; the layouts were validated when compiled.
+    """
+    return CANDatabase(
+        MessageLayout(arbitration_id, name, [SignalLayout(*signal) for signal in signals], length, is_fd,
+                      is_extended_id, validate=False)
+        for arbitration_id, name, length, is_fd, is_extended_id, signals in rows
+    )
+
+
+def _source_state(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _read_cache(path, mtime_ns, size, content):
+    """
+    Return the cached database of a DBC file, or None if there is no valid cache entry.
+
+    Args:
+        content (callable): Returns the DBC file content, for the hash check
+                            when mtime or size changed.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            cached = json.load(file)
+        if cached.get('version') != DBC_CACHE_VERSION:
+            return None
+        source = cached['source']
+        if (source['mtime_ns'], source['size']) != (mtime_ns, size) and source['sha256'] != _sha256(content()):
+            return None
+        return _from_rows(cached['messages'])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.debug(f"Ignoring DBC cache {path}: {e}")
+        return None
+
+
+def _write_cache(path, database, mtime_ns, size, data):
+    """
+    Atomically write the compiled database of a DBC file; failures are only logged.
+    """
+    cached = {
+        'version': DBC_CACHE_VERSION,
+        'source': {'mtime_ns': mtime_ns, 'size': size, 'sha256': _sha256(data)},
+        'messages': _to_rows(database),
+    }
+    try:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(cached, file, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug(f"Could not write DBC cache {path}: {e}")
+
+
+def load_dbc(path, use_cache=True, cache_dir=None):
+    """
+    Load a DBC file, from its compiled cache when it is up to date.
+
+    Args:
+        path (str): Path to the DBC file.
+        use_cache (bool): Read and write the compiled cache.
+        cache_dir (Optional[str]): Cache directory, defaults to get_cache_dir().
+
+    Returns:
+        CANDatabase: The message layouts of the file.
+    """
+    mtime_ns, size = _source_state(path)
+    compiled = cache_path(path, cache_dir, DBC_CACHE_SUFFIX)
+    data = None
+
+    def content():
+        nonlocal data
+        if data is None:
+            with open(path, 'rb') as file:
+                data = file.read()
+        return data
+
+    if use_cache and os.path.exists(compiled):
+        database = _read_cache(compiled, mtime_ns, size, content)
+        if database is not None:
+            logger.debug(f"Loaded {len(database)} CAN message(s) of {path} from {compiled}")
+            return database
+
+    # DBC files are usually cp1252/latin-1, which decodes any byte sequence
+    database = parse_dbc(content().decode('latin-1'))
+    logger.debug(f"Parsed {len(database)} CAN message(s) from {path}")
+    if use_cache:
+        _write_cache(compiled, database, mtime_ns, size, content())
+    return database
+
+
+def map_signals(database, model, mapping=None):
+    """
+    Map the signals of a database to the VSS paths of a model.
+
+    For every signal the first match wins: an entry of `mapping` keyed by
+    "<message>.<signal>" or "<signal>", the VSS path already set on the
+    signal (e.g. from the VSSPath attribute), then the signal name itself if
+    it is a path of the model or the unique last component of one. Paths
+    that are not signals of the model are dropped with a warning.
+
+    Args:
+        database (CANDatabase): The message layouts, updated in place.
+        model (Model): The VSS model whose index the paths are checked against.
+        mapping (Optional[dict]): VSS path by signal name.
+
+    Returns:
+        int: The number of signals mapped to a VSS path.
+    """
+    mapping = mapping or {}
+    leaves = {}
+    for path in model.table.paths:
+        leaf = path.rpartition('.')[2]
+        leaves[leaf] = None if leaf in leaves else path
+
+    mapped = 0
+    for message in database.messages.values():
+        for signal in message.signals:
+            path = mapping.get(f"{message.name}.{signal.name}") or mapping.get(signal.name) or signal.vss_path
+            if path is not None:
+                spec = model.lookup(path)
+                if spec is None:
+                    logger.warning(f"CAN signal {message.name}.{signal.name}: {path} is not a signal of the VSS model")
+            else:
+                spec = model.lookup(signal.name) or model.lookup(leaves.get(signal.name) or '')
+            signal.vss_path = spec.path if spec is not None else None
+            mapped += spec is not None
+    database.reindex()
+    return mapped
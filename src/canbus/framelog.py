@@ -0,0 +1,133 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import threading
+from array import array
+from vss_lib.canbus.codec import CAN_FD_LENGTH
+
+# Frames kept by a FrameLog unless another capacity is configured
+DEFAULT_LOG_CAPACITY = 10
+
+
+class FrameLog:
+    """
+    Fixed-capacity ring buffer of raw CAN frames.
+
+    Timestamps, arbitration IDs, payload lengths and payloads are stored in
+    arrays preallocated for `capacity` frames; appending overwrites the
+    oldest frame in O(1) and nothing is formatted until the log is read.
+    The latest frame of every arbitration ID is kept separately, so it
+    survives eviction from the ring.
+
+    Attributes:
+        capacity (int): Number of frames kept.
+        payload_size (int): Bytes reserved per payload, longer payloads are truncated.
+        total (int): Number of frames appended since creation or the last clear().
+    """
+
+    def __init__(self, capacity=DEFAULT_LOG_CAPACITY, payload_size=CAN_FD_LENGTH):
+        if capacity < 1:
+            raise ValueError(f"Frame log capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.payload_size = payload_size
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.ids = array('L', [0]) * capacity
+        self.lengths = bytearray(capacity)
+        self.payloads = bytearray(capacity * payload_size)
+        self.total = 0
+        self._next = 0
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def append(self, timestamp, arbitration_id, data):
+        """
+        Store a frame, evicting the oldest one when the log is full.
+
+        Args:
+            timestamp (float): Reception time in seconds.
+            arbitration_id (int): CAN ID of the frame.
+            data (bytes): The payload.
+        """
+        data = bytes(data)
+        length = len(data)
+        if length > self.payload_size:
+            data = data[:self.payload_size]
+            length = self.payload_size
+        with self._lock:
+            slot = self._next
+            self.timestamps[slot] = timestamp
+            self.ids[slot] = arbitration_id
+            self.lengths[slot] = length
+            offset = slot * self.payload_size
+            self.payloads[offset:offset + length] = data
+            self._next = 0 if slot + 1 == self.capacity else slot + 1
+            self.total += 1
+            self._latest[arbitration_id] = (timestamp, data)
+
+    def snapshot(self, count=None):
+        """
+        Copy the most recent frames, oldest first.
+
+        Only the requested slots are read, so a small snapshot of a large log is cheap.
+
+        Args:
+            count (Optional[int]): Number of frames, all frames in the log by default.
+
+        Returns:
+            list: (timestamp, arbitration_id, payload bytes) tuples.
+        """
+        with self._lock:
+            available = min(self.total, self.capacity)
+            count = available if count is None else max(0, min(count, available))
+            frames = []
+            size = self.payload_size
+            for slot in range(self._next - count, self._next):
+                slot %= self.capacity
+                offset = slot * size
+                frames.append((self.timestamps[slot], self.ids[slot],
+                               bytes(self.payloads[offset:offset + self.lengths[slot]])))
+        return frames
+
+    def latest(self, arbitration_ids=None):
+        """
+        Return the latest frame of every arbitration ID seen.
+
+        Args:
+            arbitration_ids (Optional[Iterable[int]]): Only return these IDs.
+
+        Returns:
+            dict: (timestamp, payload bytes) by arbitration ID.
+        """
+        with self._lock:
+            if arbitration_ids is None:
+                return dict(self._latest)
+            latest = self._latest
+            return {can_id: latest[can_id] for can_id in arbitration_ids if can_id in latest}
+
+    def format(self, count=None):
+        """
+        Format the most recent frames as "<timestamp> <ID> <payload hex>" lines, oldest first.
+        """
+        return [f"{timestamp:.2f} {can_id:X} {data.hex()}" for timestamp, can_id, data in self.snapshot(count)]
+
+    def clear(self):
+        """
+        Drop all frames and latest values.
+        """
+        with self._lock:
+            self.total = 0
+            self._next = 0
+            self._latest = {}
@@ -0,0 +1,295 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Generate controlled CAN load on a SocketCAN interface, e.g. vcan0.
+
+Traffic is described by TrafficStreams: a set of arbitration IDs, a frame
+rate, a payload pattern and a burst size. Every payload a stream sends is
+packed into a kernel can_frame/canfd_frame once, before the run, and due
+frames are written back to back to a raw CAN socket, so the generator
+spends its time in send() rather than building frames. No hardware is
+needed:
+
+    sudo modprobe vcan
+    sudo ip link add dev vcan0 type vcan && sudo ip link set up vcan0
+"""
+
+import heapq
+import random
+import socket
+import struct
+import time
+from vss_lib.canbus.monitor import CANBusMonitor
+
+# Payload patterns
+CONSTANT = "constant"
+COUNTER = "counter"
+RANDOM = "random"
+PATTERNS = (CONSTANT, COUNTER, RANDOM)
+
+# Distinct payloads precomputed per ID for the counter and random patterns
+PATTERN_CYCLE = 256
+
+# Kernel frame layouts: struct can_frame and struct canfd_frame
+CAN_FRAME = struct.Struct('=IB3x8s')
+CANFD_FRAME = struct.Struct('=IBB2x64s')
+
+CAN_EFF_FLAG = 0x80000000
+
+# Streams more than this many seconds behind skip the missed frames instead of sending a burst
+MAX_CATCH_UP = 1.0
+
+
+def pack_frame(arbitration_id, data, is_fd=False, is_extended_id=False):
+    """
+    Pack a frame as the kernel's struct can_frame (or canfd_frame).
+    """
+    can_id = arbitration_id | CAN_EFF_FLAG if is_extended_id else arbitration_id
+    if is_fd:
+        return CANFD_FRAME.pack(can_id, len(data), 0, bytes(data))
+    return CAN_FRAME.pack(can_id, len(data), bytes(data))
+
+
+def unpack_frame(frame):
+    """
+    Unpack a struct can_frame or canfd_frame.
+
+    Returns:
+        tuple: (arbitration_id, data, is_fd, is_extended_id).
+    """
+    if len(frame) == CANFD_FRAME.size:
+        can_id, length, _, data = CANFD_FRAME.unpack(frame)
+        is_fd = True
+    else:
+        can_id, length, data = CAN_FRAME.unpack(frame)
+        is_fd = False
+    return can_id & 0x1FFFFFFF, data[:length], is_fd, bool(can_id & CAN_EFF_FLAG)
+
+
+class TrafficStream:
+    """
+    Frames sent cyclically over a set of arbitration IDs.
+
+    The stream sends `burst` frames back to back every `burst / rate`
+    seconds, so its average rate is `rate` whatever the burst size. The IDs
+    are used in turn, one per frame.
+
+    Attributes:
+        ids (list): Arbitration IDs, used in turn.
+        rate (float): Average frames per second.
+        pattern (str): CONSTANT (`data` every time), COUNTER (a little endian
+                       counter per ID filling the payload) or RANDOM (seeded).
+        length (int): Payload length in bytes, the length of `data` or 8 by default.
+        burst (int): Frames sent back to back.
+        sent (int): Frames sent by the last run.
+    """
+
+    def __init__(self, ids, rate, pattern=COUNTER, length=None, burst=1, data=None, is_fd=False,
+                 is_extended_id=False, seed=0):
+        if length is None:
+            length = len(data) if data is not None else 8
+        if not ids:
+            raise ValueError("A traffic stream needs at least one arbitration ID")
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Invalid traffic stream rate {rate} frames/s / burst {burst}")
+        if pattern not in PATTERNS:
+            raise ValueError(f"Unknown payload pattern {pattern!r}, expected one of {', '.join(PATTERNS)}")
+        if length > (64 if is_fd else 8):
+            raise ValueError(f"Payload of {length} bytes does not fit a {'CAN FD' if is_fd else 'CAN'} frame")
+        self.ids = list(ids)
+        self.rate = rate
+        self.pattern = pattern
+        self.length = length
+        self.burst = burst
+        self.data = bytes(data) if data is not None else bytes(length)
+        self.is_fd = is_fd
+        self.is_extended_id = is_extended_id
+        self.seed = seed
+        self.period = burst / rate
+        self.sent = 0
+        self.frames = self._pack_frames()
+        self._next = 0
+
+    def _payloads(self):
+        if self.pattern == CONSTANT:
+            return [self.data[:self.length].ljust(self.length, b"\x00")]
+        if self.pattern == COUNTER:
+            return [(value % (1 << (8 * self.length))).to_bytes(self.length, 'little') if self.length else b""
+                    for value in range(PATTERN_CYCLE)]
+        rng = random.Random(self.seed)
+        return [bytes(rng.getrandbits(8) for _ in range(self.length)) for _ in range(PATTERN_CYCLE)]
+
+    def _pack_frames(self):
+        # Frame i of the cycle carries ID i % len(ids) and payload i // len(ids) of its ID
+        payloads = self._payloads()
+        count = len(self.ids) * len(payloads)
+        return [pack_frame(self.ids[i % len(self.ids)], payloads[i // len(self.ids)], self.is_fd, self.is_extended_id)
+                for i in range(count)]
+
+    def next_burst(self):
+        """
+        Return the packed frames of the next burst.
+        """
+        frames = self.frames
+        start = self._next
+        end = start + self.burst
+        if end <= len(frames):
+            burst = frames[start:end]
+        else:
+            burst = [frames[i % len(frames)] for i in range(start, end)]
+        self._next = end % len(frames)
+        return burst
+
+    def __repr__(self):
+        return f"TrafficStream({len(self.ids)} IDs, {self.rate:g} frames/s, {self.pattern}, burst={self.burst})"
+
+
+def vendor_stream(vendor, rate, **kwargs):
+    """
+    Build a stream over the CAN IDs of a vendor in CANBusMonitor.VENDORS.
+
+    Args:
+        vendor (str): Vendor name, e.g. 'toyota'.
+        rate (float): Average frames per second.
+        **kwargs: Further TrafficStream arguments.
+    """
+    if vendor not in CANBusMonitor.VENDORS:
+        raise ValueError(f"Unknown vendor {vendor!r}, expected one of {', '.join(CANBusMonitor.VENDORS)}")
+    return TrafficStream([int(can_id, 16) for can_id in CANBusMonitor.VENDORS[vendor]], rate, **kwargs)
+
+
+def open_raw_socket(interface, fd_frames=False):
+    """
+    Open a raw SocketCAN socket bound to an interface, for sending only.
+    """
+    sock = socket.socket(socket.AF_CAN, socket.SOCK_RAW, socket.CAN_RAW)
+    # Receive nothing, the generator only sends
+    sock.setsockopt(socket.SOL_CAN_RAW, socket.CAN_RAW_FILTER, b"")
+    if fd_frames:
+        sock.setsockopt(socket.SOL_CAN_RAW, socket.CAN_RAW_FD_FRAMES, 1)
+    sock.bind((interface,))
+    return sock
+
+
+class LoadGenerator:
+    """
+    Send the frames of several TrafficStreams onto a CAN interface at their rates.
+
+    Streams are kept in a heap ordered by the deadline of their next burst;
+    every due burst is written to the socket back to back before the
+    generator sleeps until the next deadline. Frames the kernel refuses
+    (e.g. ENOBUFS on a full transmit queue) are counted as dropped.
+
+    Attributes:
+        streams (list): The TrafficStreams.
+        sent (int): Frames sent by the last run.
+        dropped (int): Frames refused by the socket in the last run.
+        skipped (int): Frames skipped because the generator fell more than a second behind.
+    """
+
+    def __init__(self, interface, streams, sock=None, clock=time.perf_counter, sleep=time.sleep):
+        """
+        Args:
+            interface (str): The CAN interface, e.g. 'vcan0'.
+            streams (Iterable[TrafficStream]): The traffic to send.
+            sock (Optional): Object with send(bytes), a raw CAN socket bound to `interface` by default.
+            clock (callable): Monotonic time source in seconds.
+            sleep (callable): Sleeps for the given seconds.
+        """
+        self.interface = interface
+        self.streams = list(streams)
+        self._owns_socket = sock is None
+        if sock is None:
+            sock = open_raw_socket(interface, any(stream.is_fd for stream in self.streams))
+        self.sock = sock
+        self.clock = clock
+        self.sleep = sleep
+        self.sent = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.duration = 0.0
+
+    def run(self, duration=None, stop_event=None, max_frames=None):
+        """
+        Send until `duration` seconds passed, `max_frames` were sent or stop_event is set.
+
+        Returns:
+            dict: sent, dropped, skipped, duration_s and frames_per_s.
+        """
+        clock = self.clock
+        send = self.sock.send
+        self.sent = self.dropped = self.skipped = 0
+        start = clock()
+        heap = []
+        for index, stream in enumerate(self.streams):
+            stream.sent = 0
+            heap.append((start, index, stream))
+        heapq.heapify(heap)
+        while heap:
+            if stop_event is not None and stop_event.is_set():
+                break
+            now = clock()
+            if duration is not None and now - start >= duration:
+                break
+            while heap and heap[0][0] <= now:
+                due, index, stream = heap[0]
+                sent = 0
+                for frame in stream.next_burst():
+                    try:
+                        send(frame)
+                        sent += 1
+                    except OSError:
+                        self.dropped += 1
+                stream.sent += sent
+                self.sent += sent
+                due += stream.period
+                if now - due > MAX_CATCH_UP:
+                    missed = int((now - due) / stream.period)
+                    self.skipped += missed * stream.burst
+                    due += missed * stream.period
+                heapq.heapreplace(heap, (due, index, stream))
+                if max_frames is not None and self.sent >= max_frames:
+                    heap = []
+            if heap:
+                delay = heap[0][0] - clock()
+                if duration is not None:
+                    delay = min(delay, start + duration - clock())
+                if delay > 0:
+                    self.sleep(delay)
+        self.duration = clock() - start
+        return self.stats()
+
+    def stats(self):
+        """
+        Return the counters of the last run.
+        """
+        return {
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'skipped': self.skipped,
+            'duration_s': self.duration,
+            'frames_per_s': self.sent / self.duration if self.duration > 0 else 0.0,
+        }
+
+    def close(self):
+        """
+        Close the socket opened by the generator.
+        """
+        if self._owns_socket:
+            self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
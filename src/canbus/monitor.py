@@ -13,6 +13,11 @@
 
 import can
 import time
+from vss_lib.canbus.busstats import DEFAULT_BITRATE, BusStatistics
+from vss_lib.canbus.framelog import DEFAULT_LOG_CAPACITY, FrameLog
+
+# Mask matching all 11 bits of a standard CAN ID
+CAN_SFF_MASK = 0x7FF
 
 
 class CANBusMonitor:
@@ -25,12 +30,24 @@ class CANBusMonitor:
         The CAN interface to monitor (e.g., 'vcan0').
     bus : can.Bus
         The CAN bus object used to interface with the CAN network.
+    log : FrameLog
+        Ring buffer of the most recent raw CAN frames.
     message_log : list
-        Stores the most recent CAN messages for display.
+        The frames of the log formatted for display (formatted when read).
     current_vendor : str
         The currently selected vendor to filter CAN messages by.
     current_message_type : str
         The currently selected message type to filter CAN messages by.
+    database : CANDatabase
+        Optional message layouts (e.g. from a DBC file) received frames are decoded with.
+    vss_values : dict
+        Latest decoded value by VSS path, filled when a database is set.
+    accepted_ids : frozenset
+        Integer CAN IDs passing the current vendor/message type filter, None when unfiltered.
+    recorder : FrameRecorder
+        Optional recorder every accepted frame is written to (see vss_lib.canbus.recorder).
+    stats : BusStatistics
+        Per-ID frame rates, inter-arrival jitter, payload change rates and bus load.
     """
 
     # Predefined vendor CAN IDs
@@ -107,7 +124,8 @@ class CANBusMonitor:
         }
     }
 
-    def __init__(self, interface: str):
+    def __init__(self, interface: str, database=None, log_capacity: int = DEFAULT_LOG_CAPACITY, recorder=None,
+                 bitrate: int = DEFAULT_BITRATE):
         """
         Initializes the CANBusMonitor class with the specified CAN interface.
 
@@ -115,12 +133,74 @@ class CANBusMonitor:
         -----------
         interface : str
             The CAN interface to monitor (e.g., 'vcan0').
+        database : CANDatabase, optional
+            Message layouts with signals mapped to VSS paths (see vss_lib.canbus.dbc).
+        log_capacity : int, optional
+            Number of frames kept in the message log.
+        recorder : FrameRecorder, optional
+            Records every accepted frame to a log file.
+        bitrate : int, optional
+            Nominal bitrate of the bus in bit/s, the bus load is computed from it.
         """
         self.interface = interface
         self.bus = can.interface.Bus(channel=self.interface, bustype='socketcan')
-        self.message_log = []
+        self.log = FrameLog(log_capacity)
         self.current_vendor = None
         self.current_message_type = None
+        self.database = database
+        self.vss_values = {}
+        self.accepted_ids = None
+        self.recorder = recorder
+        self.stats = BusStatistics(bitrate)
+
+    def _apply_filters(self):
+        """
+        Compute the CAN IDs accepted by the current vendor and message type and
+        install them as SocketCAN filters, so the kernel drops every other frame.
+        """
+        if not self.current_vendor and not self.current_message_type:
+            self.accepted_ids = None
+            self.bus.set_filters(None)
+            return
+        ids = {int(can_id, 16) for can_id in self.VENDORS.get(self.current_vendor, [])}
+        if self.current_message_type:
+            types = self.MESSAGE_TYPES.get(self.current_vendor, {})
+            ids &= {int(can_id, 16) for can_id in types.get(self.current_message_type, [])}
+        self.accepted_ids = frozenset(ids)
+        # An empty filter list means "accept all" to python-can, the user-space check drops everything then
+        self.bus.set_filters([{"can_id": can_id, "can_mask": CAN_SFF_MASK, "extended": False}
+                              for can_id in sorted(ids)] or None)
+
+    def process_message(self, msg):
+        """
+        Log a received frame and decode it into VSS signals, unless the current filter rejects it.
+
+        The kernel filters installed on the bus already drop most rejected frames;
+        this check covers interfaces without kernel filtering and frames queued
+        before the filter changed.
+
+        Parameters:
+        -----------
+        msg : can.Message
+            The received frame.
+        """
+        accepted = self.accepted_ids
+        if accepted is not None and msg.arbitration_id not in accepted:
+            return
+
+        # Log the raw frame, it is only formatted when the log is read
+        timestamp = msg.timestamp or time.time()
+        self.log.append(timestamp, msg.arbitration_id, msg.data)
+        self.stats.update(timestamp, msg.arbitration_id, msg.data, msg.is_extended_id, msg.is_fd)
+        if self.recorder is not None:
+            self.recorder.record(msg)
+
+        # Decode the frame straight into VSS signals
+        if self.database is not None:
+            try:
+                self.vss_values.update(self.database.decode_vss(msg))
+            except ValueError:
+                pass  # Payload shorter than the message layout
 
     def read_can_messages(self):
         """
@@ -130,22 +210,32 @@ class CANBusMonitor:
         while True:
             msg = self.bus.recv(1.0)  # Receive a message with a timeout of 1 second
             if msg is not None:
-                can_id = f"{msg.arbitration_id:X}"
-                data = msg.data.hex()
+                self.process_message(msg)
 
-                # Check for vendor filtering
-                if self.current_vendor and can_id not in self.VENDORS.get(self.current_vendor, []):
-                    continue
+    @property
+    def message_log(self):
+        """
+        The frames of the log formatted as "<timestamp> <ID> <payload hex>" lines, oldest first.
+        """
+        return self.log.format()
 
-                # Check for message type filtering
-                if self.current_message_type and can_id not in self.MESSAGE_TYPES.get(self.current_vendor, {}).get(self.current_message_type, []):
-                    continue
+    def snapshot(self, count: int = None):
+        """
+        Return the last `count` raw frames of the log as (timestamp, arbitration_id, data) tuples.
+        """
+        return self.log.snapshot(count)
 
-                # Log the message
-                timestamp = time.time()
-                self.message_log.append(f"{timestamp:.2f} {can_id} {data}")
-                if len(self.message_log) > 10:
-                    self.message_log.pop(0)
+    def latest_frames(self):
+        """
+        Return the latest (timestamp, data) of every arbitration ID received.
+        """
+        return self.log.latest()
+
+    def statistics(self, arbitration_ids=None):
+        """
+        Return the bus load and per-ID statistics over the last second (see BusStatistics.snapshot).
+        """
+        return self.stats.snapshot(arbitration_ids)
 
     def set_vendor(self, vendor: str):
         """
@@ -157,6 +247,7 @@ class CANBusMonitor:
             The vendor to filter by (e.g., 'toyota').
         """
         self.current_vendor = vendor
+        self._apply_filters()
 
     def set_message_type(self, message_type: str):
         """
@@ -168,3 +259,4 @@ class CANBusMonitor:
             The message type to filter by (e.g., 'engine').
         """
         self.current_message_type = message_type
+        self._apply_filters()
@@ -0,0 +1,394 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Record CAN traffic to files and replay it onto a bus.
+
+The native log (`.canlog`) is a header followed by one record per frame:
+timestamp (float64), arbitration ID (uint32), flags (uint8), payload length
+(uint8) and the payload, all little endian. candump ASCII logs (`.log`,
+`candump -l` format) and Vector BLF files (`.blf`, through python-can) are
+read and written as well. Every reader is a generator, so logs of any size
+are processed with constant memory.
+"""
+
+import logging
+import math
+import os
+import re
+import struct
+import time
+from collections import namedtuple
+
+import can
+
+logger = logging.getLogger("canbus")
+
+# Magic and format version at the start of a native log
+LOG_MAGIC = b"VSSCAN\x00\x01"
+
+# Per-frame record header: timestamp, arbitration ID, flags, payload length
+RECORD = struct.Struct('<dIBB')
+
+# Record flags
+FLAG_EXTENDED = 0x01
+FLAG_FD = 0x02
+
+# Bytes buffered by a FrameRecorder before they are written
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+# Bytes read at a time from a native log
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# "(1436509052.249713) vcan0 044#2A366C2BBA", "123##1<data>" for CAN FD, "123#R" for remote frames
+CANDUMP_LINE = re.compile(r'\((\d+\.\d+)\)\s+(\S+)\s+([0-9A-Fa-f]{1,8})#(#[0-9A-Fa-f])?(R\d?|[0-9A-Fa-f.]*)\s*$')
+
+LoggedFrame = namedtuple('LoggedFrame', ['timestamp', 'arbitration_id', 'data', 'is_fd', 'is_extended_id', 'channel'],
+                         defaults=[False, False, None])
+LoggedFrame.__doc__ = "A recorded CAN frame: reception time in seconds, arbitration ID, payload and frame format."
+
+
+def _flags(is_fd, is_extended_id):
+    return (FLAG_EXTENDED if is_extended_id else 0) | (FLAG_FD if is_fd else 0)
+
+
+class FrameRecorder:
+    """
+    Stream CAN frames to a native log with buffered, batched writes.
+
+    Records are packed into an in-memory buffer and written in one call once
+    it holds `buffer_size` bytes, so recording costs no system call per frame.
+    The recorder can be passed as a listener (it is callable with a
+    can.Message) or given to CANBusMonitor as `recorder`.
+
+    Attributes:
+        path (str): The log file.
+        count (int): Frames recorded.
+    """
+
+    def __init__(self, path, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._buffer = bytearray()
+        self._file = open(path, 'wb')
+        self._file.write(LOG_MAGIC)
+
+    def write(self, timestamp, arbitration_id, data, is_fd=False, is_extended_id=False, flags=None):
+        """
+        Record one frame.
+
+        Args:
+            timestamp (float): Reception time in seconds.
+            arbitration_id (int): CAN ID of the frame.
+            data (bytes): The payload, up to 64 bytes.
+            is_fd (bool): CAN FD frame.
+            is_extended_id (bool): 29-bit identifier.
+            flags (Optional[int]): Record flags, overriding is_fd/is_extended_id.
+        """
+        if flags is None:
+            flags = _flags(is_fd, is_extended_id)
+        buffer = self._buffer
+        buffer += RECORD.pack(timestamp, arbitration_id, flags, len(data))
+        buffer += data
+        self.count += 1
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+
+    def record(self, msg):
+        """
+        Record a can.Message, or any frame with the attributes of a LoggedFrame.
+        """
+        self.write(msg.timestamp, msg.arbitration_id, msg.data, flags=_flags(msg.is_fd, msg.is_extended_id))
+
+    __call__ = record
+
+    def flush(self):
+        """
+        Write the buffered records to the file.
+        """
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        """
+        Flush the buffered records and close the file.
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_frames(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read the frames of a native log.
+
+    The file is read `chunk_size` bytes at a time. A truncated last record,
+    e.g. of an interrupted recording, is logged and skipped.
+
+    Args:
+        path (str): The log file.
+        chunk_size (int): Bytes read at a time.
+
+    Yields:
+        LoggedFrame: The recorded frames, in file order.
+    """
+    header_size = RECORD.size
+    unpack_from = RECORD.unpack_from
+    with open(path, 'rb') as f:
+        magic = f.read(len(LOG_MAGIC))
+        if magic != LOG_MAGIC:
+            raise ValueError(f"{path} is not a vss-lib CAN log")
+        buffer = b""
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buffer = buffer + chunk if buffer else chunk
+            end = len(buffer)
+            offset = 0
+            while offset + header_size <= end:
+                timestamp, arbitration_id, flags, length = unpack_from(buffer, offset)
+                stop = offset + header_size + length
+                if stop > end:
+                    break
+                yield LoggedFrame(timestamp, arbitration_id, buffer[offset + header_size:stop],
+                                  bool(flags & FLAG_FD), bool(flags & FLAG_EXTENDED))
+                offset = stop
+            buffer = buffer[offset:]
+        if buffer:
+            logger.warning(f"Skipping truncated record at the end of {path} ({len(buffer)} bytes)")
+
+
+def read_candump(path):
+    """
+    Read a candump ASCII log (`candump -l` format).
+
+    Lines that are not frames are skipped.
+
+    Yields:
+        LoggedFrame: The frames, with the interface name as channel.
+    """
+    with open(path) as f:
+        for line in f:
+            match = CANDUMP_LINE.match(line)
+            if match is None:
+                continue
+            timestamp, channel, can_id, fd_flags, payload = match.groups()
+            data = b"" if payload.startswith("R") else bytes.fromhex(payload.replace(".", ""))
+            yield LoggedFrame(float(timestamp), int(can_id, 16), data, fd_flags is not None, len(can_id) == 8, channel)
+
+
+def write_candump(frames, path, channel="vcan0"):
+    """
+    Write frames as a candump ASCII log.
+
+    Args:
+        frames (Iterable): LoggedFrame or can.Message objects.
+        path (str): The log file.
+        channel (str): Interface name of frames without a channel.
+
+    Returns:
+        int: The number of frames written.
+    """
+    count = 0
+    with open(path, 'w', buffering=DEFAULT_BUFFER_SIZE) as f:
+        for frame in frames:
+            can_id = f"{frame.arbitration_id:08X}" if frame.is_extended_id else f"{frame.arbitration_id:03X}"
+            separator = "##0" if frame.is_fd else "#"
+            f.write(f"({frame.timestamp:.6f}) {frame.channel or channel} {can_id}{separator}{bytes(frame.data).hex().upper()}\n")
+            count += 1
+    return count
+
+
+def read_blf(path):
+    """
+    Read a Vector BLF log.
+
+    Yields:
+        can.Message: The CAN and CAN FD frames of the log.
+    """
+    for msg in can.BLFReader(path):
+        if not msg.is_error_frame:
+            yield msg
+
+
+def write_blf(frames, path):
+    """
+    Write frames as a Vector BLF log.
+
+    Returns:
+        int: The number of frames written.
+    """
+    writer = can.BLFWriter(path)
+    count = 0
+    try:
+        for frame in frames:
+            writer.on_message_received(to_message(frame))
+            count += 1
+    finally:
+        writer.stop()
+    return count
+
+
+def write_frames(frames, path, buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Write frames as a native log.
+
+    Returns:
+        int: The number of frames written.
+    """
+    with FrameRecorder(path, buffer_size) as recorder:
+        for frame in frames:
+            recorder.record(frame)
+        return recorder.count
+
+
+READERS = {'.canlog': read_frames, '.log': read_candump, '.blf': read_blf}
+WRITERS = {'.canlog': write_frames, '.log': write_candump, '.blf': write_blf}
+
+
+def _format(path, formats):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in formats:
+        raise ValueError(f"Unknown CAN log format {extension!r} of {path}, expected one of {', '.join(formats)}")
+    return formats[extension]
+
+
+def open_frames(path):
+    """
+    Read the frames of a log, in the format given by its extension (.canlog, .log or .blf).
+    """
+    return _format(path, READERS)(path)
+
+
+def convert(source, destination):
+    """
+    Convert a log between the native, candump and BLF formats, streaming frame by frame.
+
+    Returns:
+        int: The number of frames converted.
+    """
+    writer = _format(destination, WRITERS)
+    return writer(open_frames(source), destination)
+
+
+def to_message(frame):
+    """
+    Build a can.Message from a LoggedFrame (can.Message objects are returned unchanged).
+    """
+    if isinstance(frame, can.Message):
+        return frame
+    return can.Message(timestamp=frame.timestamp, arbitration_id=frame.arbitration_id, data=frame.data,
+                       is_fd=frame.is_fd, is_extended_id=frame.is_extended_id, channel=frame.channel)
+
+
+class FrameReplayer:
+    """
+    Send recorded frames onto a bus at their original timing, N times faster, or as fast as possible.
+
+    Frames are consumed from an iterator one at a time, so a log of any size
+    is replayed with constant memory. The lateness of every frame behind its
+    scheduled send time is recorded as jitter.
+
+    Attributes:
+        bus (can.BusABC): The bus frames are sent on.
+        speed (Optional[float]): Replay speed factor, 1.0 for real time; None or 0 sends as fast as possible.
+        spin (float): Seconds before a send time spent busy-waiting instead of sleeping, for sub-millisecond accuracy.
+    """
+
+    def __init__(self, bus, speed=1.0, spin=0.0, clock=time.perf_counter, sleep=time.sleep):
+        if speed is not None and speed < 0:
+            raise ValueError(f"Replay speed must be positive, got {speed}")
+        self.bus = bus
+        self.speed = speed or None
+        self.spin = spin
+        self.clock = clock
+        self.sleep = sleep
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.sent = 0
+        self.duration = 0.0
+        self._late_mean = 0.0
+        self._late_m2 = 0.0
+        self._late_max = 0.0
+
+    def replay(self, frames, stop_event=None):
+        """
+        Send frames in order.
+
+        Args:
+            frames (Iterable): LoggedFrame or can.Message objects, e.g. from open_frames().
+            stop_event (Optional[threading.Event]): Stops the replay when set.
+
+        Returns:
+            dict: The statistics of the replay, see stats().
+        """
+        self._reset_stats()
+        clock = self.clock
+        send = self.bus.send
+        speed = self.speed
+        start = clock()
+        first = None
+        for frame in frames:
+            if stop_event is not None and stop_event.is_set():
+                break
+            if speed is not None:
+                if first is None:
+                    first = frame.timestamp
+                due = start + (frame.timestamp - first) / speed
+                delay = due - clock() - self.spin
+                if delay > 0:
+                    self.sleep(delay)
+                while clock() < due:
+                    pass
+                late = max(0.0, clock() - due)
+
+                # Welford's online mean/variance of the lateness
+                count = self.sent + 1
+                delta = late - self._late_mean
+                self._late_mean += delta / count
+                self._late_m2 += delta * (late - self._late_mean)
+                if late > self._late_max:
+                    self._late_max = late
+            send(to_message(frame))
+            self.sent += 1
+        self.duration = clock() - start
+        return self.stats()
+
+    def stats(self):
+        """
+        Return the statistics of the last replay.
+
+        Returns:
+            dict: sent, duration_s, frames_per_s, and jitter_mean_ms,
+                  jitter_stddev_ms, jitter_max_ms (lateness of frames behind
+                  their scheduled send time, 0 when replaying as fast as possible).
+        """
+        count = self.sent if self.speed is not None else 0
+        return {
+            'sent': self.sent,
+            'duration_s': self.duration,
+            'frames_per_s': self.sent / self.duration if self.duration > 0 else 0.0,
+            'jitter_mean_ms': self._late_mean * 1000.0,
+            'jitter_stddev_ms': math.sqrt(self._late_m2 / count) * 1000.0 if count else 0.0,
+            'jitter_max_ms': self._late_max * 1000.0,
+        }
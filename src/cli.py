@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Command line entry point for vss-lib maintenance tasks.
+
+Usage:
+    vss-lib compile [PATH ...] [--cache-dir DIR]
+    vss-lib can-record INTERFACE FILE [--seconds N]
+    vss-lib can-replay FILE INTERFACE [--speed N | --fast]
+    vss-lib can-convert SOURCE DESTINATION
+    vss-lib can-stats INTERFACE [--bitrate N] [--interval S] [--top N]
+    vss-lib can-load INTERFACE [--vendor NAME | --ids ID,...] [--rate N] [--burst N] [--pattern P] [--seconds S]
+    vss-lib obd-poll PORT [--pid PID=HZ ...] [--responses N] [--seconds S] [--no-discovery]
+"""
+
+import argparse
+import sys
+
+from vss_lib.vspec.cache import compile_tree, get_cache_dir
+
+SHARE_DIR = '/usr/share/vss-lib/'
+
+
+def compile_command(args):
+    """
+    Pre-build the compiled VSS cache for the given files or directories.
+    """
+    total_compiled = total_failed = 0
+    for path in args.paths or [SHARE_DIR]:
+        compiled, failed = compile_tree(path, cache_dir=args.cache_dir)
+        print(f"Compiled {compiled} VSS files from {path} ({failed} failed)")
+        total_compiled += compiled
+        total_failed += failed
+    print(f"Cache directory: {args.cache_dir or get_cache_dir()}")
+    return 1 if total_failed else 0
+
+
+def can_record_command(args):
+    """
+    Record the traffic of a CAN interface until interrupted or for --seconds.
+    """
+    import time
+    from vss_lib.canbus.monitor import CANBusMonitor
+    from vss_lib.canbus.recorder import FrameRecorder
+
+    with FrameRecorder(args.file) as recorder:
+        monitor = CANBusMonitor(args.interface, recorder=recorder)
+        deadline = time.monotonic() + args.seconds if args.seconds else None
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                msg = monitor.bus.recv(0.5)
+                if msg is not None:
+                    monitor.process_message(msg)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            monitor.bus.shutdown()
+    print(f"Recorded {recorder.count} frames from {args.interface} to {args.file}")
+    return 0
+
+
+def can_replay_command(args):
+    """
+    Replay a CAN log onto an interface and print the timing statistics.
+    """
+    import can
+    from vss_lib.canbus.recorder import FrameReplayer, open_frames
+
+    bus = can.interface.Bus(channel=args.interface, bustype='socketcan')
+    try:
+        stats = FrameReplayer(bus, speed=None if args.fast else args.speed).replay(open_frames(args.file))
+    finally:
+        bus.shutdown()
+    print(f"Sent {stats['sent']} frames in {stats['duration_s']:.3f} s ({stats['frames_per_s']:.0f} frames/s), "
+          f"lateness mean {stats['jitter_mean_ms']:.3f} ms, stddev {stats['jitter_stddev_ms']:.3f} ms, "
+          f"max {stats['jitter_max_ms']:.3f} ms")
+    return 0
+
+
+def can_convert_command(args):
+    """
+    Convert a CAN log between the .canlog, candump (.log) and BLF (.blf) formats.
+    """
+    from vss_lib.canbus.recorder import convert
+
+    count = convert(args.source, args.destination)
+    print(f"Converted {count} frames from {args.source} to {args.destination}")
+    return 0
+
+
+def can_stats_command(args):
+    """
+    Print the bus load and the busiest arbitration IDs of a CAN interface every --interval seconds.
+    """
+    import time
+    from vss_lib.canbus.monitor import CANBusMonitor
+
+    monitor = CANBusMonitor(args.interface, bitrate=args.bitrate)
+    next_report = time.monotonic() + args.interval
+    try:
+        while True:
+            msg = monitor.bus.recv(max(0.0, next_report - time.monotonic()))
+            if msg is not None:
+                monitor.process_message(msg)
+            if time.monotonic() < next_report:
+                continue
+            next_report += args.interval
+            stats = monitor.statistics()
+            print(f"{args.interface}: {stats['frames_per_s']:.0f} frames/s, bus load {stats['bus_load_percent']:.1f}%")
+            busiest = sorted(stats['ids'].items(), key=lambda item: item[1]['frames_per_s'], reverse=True)
+            for can_id, id_stats in busiest[:args.top]:
+                print(f"  {can_id:>8X} {id_stats['frames_per_s']:8.1f} frames/s {id_stats['changes_per_s']:8.1f} changes/s "
+                      f"period {id_stats['interarrival_mean_ms']:8.2f} ms jitter {id_stats['jitter_ms']:6.2f} ms")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.bus.shutdown()
+    return 0
+
+
+def can_load_command(args):
+    """
+    Send generated CAN traffic onto an interface.
+    """
+    from vss_lib.canbus.loadgen import LoadGenerator, TrafficStream, vendor_stream
+
+    options = {"burst": args.burst, "pattern": args.pattern, "length": args.length}
+    if args.ids:
+        stream = TrafficStream([int(can_id, 16) for can_id in args.ids.split(",")], args.rate, **options)
+    else:
+        stream = vendor_stream(args.vendor, args.rate, **options)
+    with LoadGenerator(args.interface, [stream]) as generator:
+        try:
+            generator.run(duration=args.seconds)
+        except KeyboardInterrupt:
+            pass
+        stats = generator.stats()
+    print(f"Sent {stats['sent']} frames to {args.interface} ({stats['frames_per_s']:.0f} frames/s), "
+          f"{stats['dropped']} dropped, {stats['skipped']} skipped")
+    return 0
+
+
+def obd_poll_command(args):
+    """
+    Poll OBD-II PIDs through an ELM327 at their rates and print the values.
+    """
+    from vss_lib.elm327 import ELM327
+    from vss_lib.elm327.poller import PIDPoller
+    from vss_lib.elm327.vehicles import identify_vehicle
+
+    rates = {}
+    for option in args.pid or ["0C=10", "0D=10", "11=5", "05=1", "2F=0.2"]:
+        pid, _, rate = option.partition("=")
+        rates[int(pid, 16)] = float(rate or 1)
+
+    def print_entries(entries):
+        print("  ".join(f"{path}={value:g}" for path, value, _ in entries))
+
+    elm = ELM327(args.port)
+    try:
+        elm.initialize()
+        supported = None
+        if not args.no_discovery:
+            vehicle = identify_vehicle(elm)
+            supported = vehicle.supported
+            print(f"VIN {vehicle.vin or 'unknown'}, protocol {vehicle.protocol}, {len(supported)} supported PIDs"
+                  f"{' (cached)' if vehicle.cached else ''}")
+        poller = PIDPoller(elm, rates, print_entries, responses=args.responses, supported=supported)
+        try:
+            poller.run(duration=args.seconds)
+        except KeyboardInterrupt:
+            pass
+    finally:
+        elm.close()
+    stats = poller.stats()
+    print(f"{stats['requests']} requests, {stats['samples_per_s']:.1f} samples/s, "
+          f"{stats['pids_per_request']:.2f} PIDs per request, {stats['errors']} errors")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="vss-lib", description="vss-lib maintenance commands.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = subparsers.add_parser("compile", help="Pre-build the compiled VSS cache")
+    compile_parser.add_argument("paths", nargs="*", help=f"VSS files or directories (default: {SHARE_DIR})")
+    compile_parser.add_argument("--cache-dir", help="Cache directory (default: $VSS_LIB_CACHE_DIR or /var/cache/vss-lib/)")
+    compile_parser.set_defaults(func=compile_command)
+
+    record_parser = subparsers.add_parser("can-record", help="Record CAN traffic to a .canlog file")
+    record_parser.add_argument("interface", help="CAN interface, e.g. vcan0")
+    record_parser.add_argument("file", help="Log file to write")
+    record_parser.add_argument("--seconds", type=float, help="Stop after this many seconds (default: until Ctrl+C)")
+    record_parser.set_defaults(func=can_record_command)
+
+    replay_parser = subparsers.add_parser("can-replay", help="Replay a CAN log onto an interface")
+    replay_parser.add_argument("file", help="Log file (.canlog, candump .log or .blf)")
+    replay_parser.add_argument("interface", help="CAN interface, e.g. vcan0")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="Speed factor, 1 for the original timing (default: 1)")
+    replay_parser.add_argument("--fast", action="store_true", help="Send as fast as possible")
+    replay_parser.set_defaults(func=can_replay_command)
+
+    convert_parser = subparsers.add_parser("can-convert", help="Convert a CAN log between .canlog, .log and .blf")
+    convert_parser.add_argument("source", help="Log file to read")
+    convert_parser.add_argument("destination", help="Log file to write, format given by its extension")
+    convert_parser.set_defaults(func=can_convert_command)
+
+    stats_parser = subparsers.add_parser("can-stats", help="Print per-ID statistics and the load of a CAN bus")
+    stats_parser.add_argument("interface", help="CAN interface, e.g. vcan0")
+    stats_parser.add_argument("--bitrate", type=int, default=500000, help="Nominal bitrate in bit/s (default: 500000)")
+    stats_parser.add_argument("--interval", type=float, default=1.0, help="Seconds between reports (default: 1)")
+    stats_parser.add_argument("--top", type=int, default=10, help="Number of IDs reported (default: 10)")
+    stats_parser.set_defaults(func=can_stats_command)
+
+    load_parser = subparsers.add_parser("can-load", help="Generate CAN traffic on an interface")
+    load_parser.add_argument("interface", help="CAN interface, e.g. vcan0")
+    load_parser.add_argument("--vendor", default="toyota", help="Send the CAN IDs of this vendor (default: toyota)")
+    load_parser.add_argument("--ids", help="Comma separated hex CAN IDs to send instead of a vendor's")
+    load_parser.add_argument("--rate", type=float, default=1000, help="Frames/s (default: 1000)")
+    load_parser.add_argument("--burst", type=int, default=1, help="Frames sent back to back (default: 1)")
+    load_parser.add_argument("--pattern", choices=("constant", "counter", "random"), default="counter",
+                             help="Payload pattern (default: counter)")
+    load_parser.add_argument("--length", type=int, default=8, help="Payload length in bytes (default: 8)")
+    load_parser.add_argument("--seconds", type=float, help="Stop after this many seconds (default: until Ctrl+C)")
+    load_parser.set_defaults(func=can_load_command)
+
+    poll_parser = subparsers.add_parser("obd-poll", help="Poll OBD-II PIDs through an ELM327 adapter")
+    poll_parser.add_argument("port", help="Serial port of the adapter, e.g. /dev/ttyUSB0")
+    poll_parser.add_argument("--pid", action="append", help="Hex PID and samples/s, e.g. 0C=20 (repeatable)")
+    poll_parser.add_argument("--responses", type=int, help="ECU responses to wait for per request, e.g. 1")
+    poll_parser.add_argument("--seconds", type=float, help="Stop after this many seconds (default: until Ctrl+C)")
+    poll_parser.add_argument("--no-discovery", action="store_true",
+                             help="Poll every PID given instead of only those the vehicle supports")
+    poll_parser.set_defaults(func=obd_poll_command)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,12 +13,29 @@
 
 
 import argparse
+import time
 from pydbus import SystemBus
+from vss_lib.vendor_registry import namespaced
+
+
+def parse_signal(text):
+    """
+    Parse a NAME=VALUE command line argument.
+    """
+    name, sep, value = text.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got '{text}'")
+    try:
+        return name, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"value of '{name}' is not a number: '{value}'")
 
 
 def main():
     parser = argparse.ArgumentParser(description="VSS D-Bus Client to send signals.")
     parser.add_argument("--vendor", help="Specify the vendor (e.g., toyota, bmw, renesas)")
+    parser.add_argument("--signal", action="append", type=parse_signal, metavar="NAME=VALUE",
+                        help="Signal path below the vendor to send, may be repeated (default: Speed=100)")
     args = parser.parse_args()
 
     if not args.vendor:
@@ -28,11 +45,13 @@ def main():
     bus = SystemBus()
     vss_service = bus.get("com.vss_lib.VehicleSignals")
 
-    # Example: Sending a speed signal for the specified vendor
-    signal_name = "Speed"
-    value = 100  # Example speed value
-    vss_service.EmitHardwareSignal(signal_name, value)
-    print(f"Signal '{signal_name}' with value {value} sent by {args.vendor}.")
+    # Send every signal in one EmitHardwareSignals call, stamped with the same time and named
+    # "<vendor>.<path>" so the deadbands of the vendor's section apply
+    timestamp = time.time_ns() // 1000
+    signals = [(namespaced(args.vendor, name), value, timestamp) for name, value in args.signal or [("Speed", 100.0)]]
+    vss_service.EmitHardwareSignals(signals)
+    for name, value, _ in signals:
+        print(f"Signal '{name}' with value {value} sent.")
 
 
 if __name__ == "__main__":
@@ -12,12 +12,121 @@
 
 
 import os
-import toml
+import threading
 import yaml
+from vss_lib.vspec.loader import load_yaml
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+if tomllib is not None:
+    TomlDecodeError = tomllib.TOMLDecodeError
+else:
+    import toml
+    TomlDecodeError = toml.TomlDecodeError
 
 CONFIG_PATH = '/etc/vss-lib/vss.config'
 
 
+class ConfigCache:
+    """
+    Process-wide cache of parsed TOML configuration files.
+
+    Each file is parsed once and kept together with its stat signature
+    (mtime, ctime, size, inode). Later lookups only stat the file and
+    re-parse it when the signature changed. The returned dictionaries are
+    shared between callers and must be treated as read-only.
+
+    Attributes:
+        parses (int): Number of times a configuration file was parsed.
+        parses_avoided (int): Number of lookups served from the cache.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.parses = 0
+        self.parses_avoided = 0
+
+    @staticmethod
+    def _signature(stat):
+        return (stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size, stat.st_ino, stat.st_dev)
+
+    @staticmethod
+    def _parse(config_path):
+        if tomllib is not None:
+            with open(config_path, 'rb') as config_file:
+                return tomllib.load(config_file)
+        with open(config_path, 'r') as config_file:
+            return toml.load(config_file)
+
+    def get(self, config_path=CONFIG_PATH):
+        """
+        Return the parsed configuration, re-parsing it only if the file changed.
+
+        Args:
+            config_path (str): Path to the TOML configuration file.
+
+        Returns:
+            dict: The parsed configuration.
+
+        Raises:
+            FileNotFoundError: If the configuration file does not exist.
+            TomlDecodeError: If the configuration file is not valid TOML.
+        """
+        signature = self._signature(os.stat(config_path))
+        with self._lock:
+            entry = self._entries.get(config_path)
+            if entry is not None and entry[0] == signature:
+                self.parses_avoided += 1
+                return entry[1]
+
+            config = self._parse(config_path)
+            self._entries[config_path] = (signature, config)
+            self.parses += 1
+            return config
+
+    def invalidate(self, config_path=None):
+        """
+        Drop a cached configuration, or all of them when no path is given.
+        """
+        with self._lock:
+            if config_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(config_path, None)
+
+    def stats(self):
+        """
+        Return the parse counters.
+
+        Returns:
+            dict: The number of parses and of parses avoided by the cache.
+        """
+        return {"parses": self.parses, "parses_avoided": self.parses_avoided}
+
+
+config_cache = ConfigCache()
+
+
+def get_config(config_path=CONFIG_PATH):
+    """
+    Return the parsed vss-lib configuration from the process-wide cache.
+
+    Args:
+        config_path (str): Path to the TOML configuration file.
+
+    Returns:
+        dict: The parsed configuration (shared, do not modify).
+    """
+    return config_cache.get(config_path)
+
+
 def get_vspec_file(vendor):
     """
     Get the VSS file path for the given vendor or electronics component.
@@ -28,17 +137,16 @@ def get_vspec_file(vendor):
     Returns:
         str: The path to the VSS file, or None if not found.
     """
-    config_path = '/etc/vss-lib/vss.config'
+    config_path = CONFIG_PATH
     vspec_file = None
 
     # Load the TOML configuration file
     try:
-        with open(config_path, 'r') as config_file:
-            config = toml.load(config_file)
+        config = get_config(config_path)
     except FileNotFoundError:
         print(f"Configuration file not found: {config_path}")
         return None
-    except toml.TomlDecodeError as e:
+    except TomlDecodeError as e:
         print(f"Error decoding TOML file: {e}")
         return None
 
@@ -62,7 +170,7 @@ def get_vspec_file(vendor):
 
 def load_config(vendor):
     try:
-        config = toml.load("/etc/vss-lib/vss.config")
+        config = get_config(CONFIG_PATH)
         return config.get(vendor, {})
     except FileNotFoundError:
         raise FileNotFoundError("Configuration file not found.")
@@ -80,8 +188,8 @@ def load_vspec_file(vspec_file_path):
         dict: Parsed VSS data.
     """
     try:
-        with open(vspec_file_path, 'r') as file:
-            vspec_data = yaml.safe_load(file)
+        with open(vspec_file_path, 'rb') as file:
+            vspec_data = load_yaml(file)
             return vspec_data
     except FileNotFoundError:
         print(f"VSS file not found: {vspec_file_path}")
@@ -13,10 +13,10 @@
 
 import os
 import sys
-import toml
 from invoke import run
+from vss_lib.config_loader import CONFIG_PATH, get_config
 
-CONFIG_PATH = "/etc/vss-lib/vss.config"
+VSS_CACHE_DIR = "/var/cache/vss-lib"
 
 
 class PodmanManager:
@@ -36,9 +36,7 @@ class PodmanManager:
             dict: Parsed configuration data.
         """
         try:
-            with open(config_path, 'r') as config_file:
-                config = toml.load(config_file)
-            return config
+            return get_config(config_path)
         except FileNotFoundError:
             print(f"Configuration file not found: {config_path}")
             sys.exit(1)
@@ -100,6 +98,7 @@ class PodmanManager:
               -v {self.vss_lib_path}:{self.vss_lib_path}:Z \
               -v {self.vspec_file}:/etc/vss-lib/{self.vendor}.vspec:Z \
               -v /etc/vss-lib/vss.config:/etc/vss-lib/vss.config:Z \
+              -v {VSS_CACHE_DIR}:{VSS_CACHE_DIR}:Z \
               -v /run/dbus/system_bus_socket:/run/dbus/system_bus_socket:Z \
               {self.vendor}_vss_image \
               sh -c "/usr/lib/vss-lib/dbus/container_dbus_service && sleep infinity"
@@ -0,0 +1,147 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import threading
+import time
+
+# Signals per SignalsEmitted message before the buffer is flushed
+DEFAULT_BATCH_SIZE = 256
+
+# Milliseconds a signal may wait in the buffer before it is flushed
+DEFAULT_BATCH_INTERVAL = 10
+
+
+def timestamp_us():
+    """
+    Return the current time as used in SignalsEmitted: microseconds since the Unix epoch.
+    """
+    return time.time_ns() // 1000
+
+
+class SignalBuffer:
+    """
+    Coalesce emitted signals into batches of (name, value, timestamp) tuples.
+
+    The buffer is flushed as soon as it holds max_size signals, or when its
+    oldest signal has waited max_delay seconds. For the time-based flush the
+    owner provides `arm(delay)`, which must call expire() after `delay`
+    seconds (e.g. through GLib.timeout_add); it is only called while no
+    expiry is pending.
+
+    Attributes:
+        flush_callback (callable): Receives each batch as a list of (name, value, timestamp).
+        max_size (int): Signals per batch.
+        max_delay (float): Seconds a signal may wait before the buffer is flushed.
+        batches (int): Number of batches flushed.
+        signals (int): Number of signals flushed.
+    """
+
+    def __init__(self, flush_callback, max_size=DEFAULT_BATCH_SIZE, max_delay=DEFAULT_BATCH_INTERVAL / 1000.0,
+                 arm=None, clock=time.monotonic):
+        self.flush_callback = flush_callback
+        self.max_size = max(1, int(max_size))
+        self.max_delay = max(0.0, max_delay)
+        self.arm = arm
+        self.clock = clock
+        self.batches = 0
+        self.signals = 0
+        self._items = []
+        self._oldest = None
+        self._armed = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, name, value, timestamp=None):
+        """
+        Buffer one signal.
+        """
+        self.extend(((name, value),), timestamp)
+
+    def extend(self, signals, timestamp=None):
+        """
+        Buffer several signals taken at the same time.
+
+        Args:
+            signals (Iterable[tuple]): (name, value) pairs.
+            timestamp (Optional[int]): Microseconds since the epoch, now by default.
+        """
+        if timestamp is None:
+            timestamp = timestamp_us()
+        self.extend_timestamped((name, value, timestamp) for name, value in signals)
+
+    def extend_timestamped(self, entries):
+        """
+        Buffer signals that carry their own timestamp.
+
+        Args:
+            entries (Iterable[tuple]): (name, value, timestamp) tuples, timestamps in
+                                       microseconds since the epoch.
+        """
+        batches = []
+        arm = False
+        with self._lock:
+            items = self._items
+            if not items:
+                self._oldest = self.clock()
+            items.extend((name, float(value), int(timestamp)) for name, value, timestamp in entries)
+            while len(items) >= self.max_size:
+                batches.append(items[:self.max_size])
+                del items[:self.max_size]
+            if items and not self._armed and self.arm is not None:
+                self._armed = arm = True
+            if batches and items:
+                self._oldest = self.clock()
+        for batch in batches:
+            self._emit(batch)
+        if arm:
+            self.arm(self.max_delay)
+
+    def flush(self):
+        """
+        Emit everything that is buffered.
+
+        Returns:
+            int: The number of signals flushed.
+        """
+        with self._lock:
+            batch, self._items = self._items, []
+        if batch:
+            self._emit(batch)
+        return len(batch)
+
+    def expire(self):
+        """
+        Flush the buffer if its oldest signal has waited max_delay, otherwise re-arm.
+
+        Returns:
+            bool: False, so it can be used directly as a one-shot GLib timeout callback.
+        """
+        with self._lock:
+            self._armed = False
+            if not self._items:
+                return False
+            remaining = self._oldest + self.max_delay - self.clock()
+            if remaining > 0 and self.arm is not None:
+                self._armed = True
+        if remaining > 0 and self.arm is not None:
+            self.arm(remaining)
+        else:
+            self.flush()
+        return False
+
+    def _emit(self, batch):
+        self.batches += 1
+        self.signals += len(batch)
+        self.flush_callback(batch)
@@ -0,0 +1,309 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import heapq
+import threading
+from vss_lib.vss_logging import logger
+
+# Milliseconds after which an unchanged value is emitted again as a keyframe, 0 disables keyframes
+DEFAULT_KEYFRAME_INTERVAL = 1000
+
+# Keys of a deadband rule in vss.config
+DEADBAND_KEYS = ('absolute', 'relative', 'min_interval', 'keyframe')
+
+
+class Deadband:
+    """
+    Change detection settings of a signal.
+
+    A value is emitted when it differs from the last emitted value by more
+    than max(absolute, relative * |last value|), or by anything at all when
+    both thresholds are 0, and at least min_interval has passed since the
+    last emission; a change that comes earlier is emitted once min_interval
+    has passed. The last value is emitted again once keyframe has passed
+    since the last emission, changed or not.
+
+    Attributes:
+        absolute (float): Absolute threshold.
+        relative (float): Threshold relative to the last emitted value (0.01 = 1%).
+        min_interval (int): Microseconds between two emissions, 0 for no limit.
+        keyframe (int): Microseconds after which a value is emitted anyway, 0 to disable.
+    """
+
+    __slots__ = ('absolute', 'relative', 'min_interval', 'keyframe')
+
+    def __init__(self, absolute=0.0, relative=0.0, min_interval=0, keyframe=DEFAULT_KEYFRAME_INTERVAL):
+        self.absolute = float(absolute)
+        self.relative = float(relative)
+        self.min_interval = int(min_interval * 1000)
+        self.keyframe = int(keyframe * 1000)
+
+    @classmethod
+    def from_config(cls, values, keyframe=DEFAULT_KEYFRAME_INTERVAL):
+        """
+        Build a rule from a vss.config table: absolute, relative, min_interval (ms) and keyframe (ms).
+        """
+        unknown = set(values) - set(DEADBAND_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown deadband setting(s) {', '.join(sorted(unknown))}, expected {', '.join(DEADBAND_KEYS)}")
+        return cls(values.get('absolute', 0.0), values.get('relative', 0.0), values.get('min_interval', 0),
+                   values.get('keyframe', keyframe))
+
+    def __repr__(self):
+        return (f"Deadband(absolute={self.absolute}, relative={self.relative}, "
+                f"min_interval={self.min_interval // 1000}, keyframe={self.keyframe // 1000})")
+
+
+class ChangeFilter:
+    """
+    Suppress hardware signal values that did not change enough to be worth a D-Bus message.
+
+    Rules are configured per owner (a vendor) by signal or branch path; a
+    signal uses the rule of its own path or of its nearest configured branch,
+    and the default rule (exact change detection with the default keyframe
+    interval) otherwise. The rule of a signal name is resolved once and
+    cached, so filtering a value is a dict lookup and a comparison.
+
+    Changes held back by min_interval and keyframes do not wait for the next
+    value: the owner calls due() at next_due() to emit them.
+
+    Attributes:
+        enabled (bool): When False every value is emitted (and counted as emitted).
+        keyframe_interval (int): Keyframe interval in ms of signals without their own.
+        emitted (int): Values emitted, keyframes included.
+        suppressed (int): Values suppressed.
+        keyframes (int): Unchanged values emitted because their keyframe was due.
+    """
+
+    def __init__(self, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, enabled=True):
+        self.enabled = enabled
+        self.keyframe_interval = keyframe_interval
+        self._rules = {}
+        self._last = {}
+        self._pending = {}  # Latest change held back by min_interval: (value, timestamp) by name
+        self._deadlines = []  # Heap of (deadline, name), entries not matching _scheduled are stale
+        self._scheduled = {}  # Earliest deadline in the heap by name
+        self._lock = threading.Lock()
+        self._rebuild()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.emitted = 0
+        self.suppressed = 0
+        self.keyframes = 0
+
+    def configure(self, owner, rules, prefix=None):
+        """
+        Replace the deadband rules of an owner.
+
+        Args:
+            owner (str): Key the rules are stored under, e.g. the vendor.
+            rules (dict): Rule tables (see Deadband.from_config) by signal or branch path.
+            prefix (Optional[str]): Prepended to every path, e.g. "toyota" for names like "toyota.Speed".
+
+        Returns:
+            int: The number of rules configured, invalid ones are logged and skipped.
+        """
+        parsed = {}
+        for path, values in (rules or {}).items():
+            try:
+                parsed[f"{prefix}.{path}" if prefix else path] = Deadband.from_config(values, self.keyframe_interval)
+            except (AttributeError, TypeError, ValueError) as e:
+                logger.error(f"Ignoring deadband of {path} for {owner}: {e}")
+        with self._lock:
+            self._rules[owner] = parsed
+            self._rebuild()
+        return len(parsed)
+
+    def set_keyframe_interval(self, keyframe_interval):
+        """
+        Change the keyframe interval (ms) of signals without a rule of their own.
+        """
+        with self._lock:
+            self.keyframe_interval = keyframe_interval
+            self._rebuild()
+
+    def _rebuild(self):
+        self._paths = {path: rule for rules in self._rules.values() for path, rule in rules.items()}
+        self._default = Deadband(keyframe=self.keyframe_interval)
+        self._resolved = {}
+        # Rules may have changed: recompute the deadline of every signal
+        self._deadlines = []
+        self._scheduled = {}
+        for name in self._last:
+            self._schedule(name)
+
+    def _deadline(self, name):
+        """
+        Return when a signal is next due without a new value: its pending change or keyframe, None if never.
+        """
+        last = self._last.get(name)
+        if last is None:
+            return None
+        rule = self._resolved.get(name) or self.rule_for(name)
+        if name in self._pending:
+            return last[1] + rule.min_interval
+        return last[1] + rule.keyframe if rule.keyframe else None
+
+    def _schedule(self, name):
+        deadline = self._deadline(name)
+        if deadline is not None and deadline < self._scheduled.get(name, deadline + 1):
+            self._scheduled[name] = deadline
+            heapq.heappush(self._deadlines, (deadline, name))
+
+    def rule_for(self, name):
+        """
+        Return the rule of a signal: of its own path or of the nearest configured branch.
+        """
+        rule = self._resolved.get(name)
+        if rule is None:
+            path = name
+            while True:
+                rule = self._paths.get(path)
+                if rule is not None or '.' not in path:
+                    break
+                path = path.rsplit('.', 1)[0]
+            rule = self._resolved[name] = rule or self._default
+        return rule
+
+    def accept(self, name, value, timestamp):
+        """
+        Decide whether a value is emitted, and remember it if so.
+
+        Args:
+            name (str): The signal name.
+            value (float): The value.
+            timestamp (int): Microseconds since the epoch.
+
+        Returns:
+            bool: True to emit the value.
+        """
+        with self._lock:
+            if not self.enabled:
+                self.emitted += 1
+                return True
+            last = self._last.get(name)
+            if last is not None:
+                rule = self._resolved.get(name) or self.rule_for(name)
+                last_value, last_time = last
+                elapsed = timestamp - last_time
+                if rule.keyframe and elapsed >= rule.keyframe:
+                    if value == last_value:
+                        self.keyframes += 1
+                else:
+                    threshold = max(rule.absolute, rule.relative * abs(last_value))
+                    delta = abs(value - last_value)
+                    unchanged = delta <= threshold if threshold else delta == 0
+                    if unchanged or elapsed < rule.min_interval:
+                        self.suppressed += 1
+                        if unchanged:
+                            self._pending.pop(name, None)
+                        else:
+                            self._pending[name] = (value, timestamp)  # Emitted by due() after min_interval
+                            self._schedule(name)
+                        return False
+            self._pending.pop(name, None)
+            self._last[name] = (value, timestamp)
+            self.emitted += 1
+            self._schedule(name)
+            return True
+
+    def filter(self, entries):
+        """
+        Return the (name, value, timestamp) entries to emit, in order.
+        """
+        accept = self.accept
+        return [entry for entry in entries if accept(*entry)]
+
+    def next_due(self):
+        """
+        Return the timestamp (microseconds since the epoch) at which due() may have values to emit, None if none.
+        """
+        with self._lock:
+            return self._deadlines[0][0] if self._deadlines else None
+
+    def due(self, now):
+        """
+        Emit what is due without a new value: changes held back by min_interval and keyframes.
+
+        Args:
+            now (int): Microseconds since the epoch, the clock of the accepted timestamps.
+
+        Returns:
+            list: (name, value, timestamp) entries to emit; a held back change keeps the
+                  timestamp it was received with, a keyframe is stamped `now`.
+        """
+        entries = []
+        with self._lock:
+            deadlines = self._deadlines
+            while deadlines and deadlines[0][0] <= now:
+                deadline, name = heapq.heappop(deadlines)
+                if self._scheduled.get(name) != deadline:
+                    continue  # Superseded by an earlier deadline
+                del self._scheduled[name]
+                if not self.enabled:
+                    continue
+                actual = self._deadline(name)
+                if actual is None:
+                    continue
+                if actual > now:  # Emitted meanwhile, wait for the new deadline
+                    self._schedule(name)
+                    continue
+                pending = self._pending.pop(name, None)
+                if pending is not None:
+                    value, timestamp = pending
+                else:
+                    value, timestamp = self._last[name][0], now
+                    self.keyframes += 1
+                self._last[name] = (value, now)
+                self.emitted += 1
+                self._schedule(name)
+                entries.append((name, value, timestamp))
+        return entries
+
+    def forget(self, name=None):
+        """
+        Drop the last emitted value of a signal (all signals by default), so its next value is emitted.
+        """
+        with self._lock:
+            if name is None:
+                self._last = {}
+                self._pending = {}
+                self._deadlines = []
+                self._scheduled = {}
+            else:
+                self._last.pop(name, None)
+                self._pending.pop(name, None)
+                self._scheduled.pop(name, None)
+
+    def stats(self, reset=False):
+        """
+        Return the emitted, suppressed and keyframe counters.
+
+        Args:
+            reset (bool): Start a new measurement period afterwards.
+
+        Returns:
+            dict: emitted, suppressed, keyframes and saved_percent (share of values suppressed).
+        """
+        with self._lock:
+            total = self.emitted + self.suppressed
+            stats = {
+                'emitted': self.emitted,
+                'suppressed': self.suppressed,
+                'keyframes': self.keyframes,
+                'saved_percent': self.suppressed / total * 100.0 if total else 0.0,
+            }
+            if reset:
+                self._reset_stats()
+        return stats
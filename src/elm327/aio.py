@@ -0,0 +1,436 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+asyncio transport for an ELM327, polled from the event loop of e.g. the KUKSA client.
+
+Callers submit commands concurrently and await their responses. A single
+task works through the queue of commands: the ELM327 handles one command
+at a time and aborts it when anything arrives before its prompt, so the
+next command is written as soon as the prompt of the previous one is read,
+without a round trip through the caller in between. The serial port is
+read through its file descriptor on the event loop.
+
+A command that times out is sent again once the ELM327 was reset and
+initialized; a port that fails, e.g. an unplugged USB adapter, is reopened
+with backoff. Both restore the settings made through the transport
+(headers, spaces, protocol). Meanwhile queued commands wait and the one in
+flight is retried, so none is lost.
+
+    async with AsyncELM327("/dev/ttyUSB0") as elm:
+        rpm, speed = await asyncio.gather(elm.read_pid(0x0C), elm.read_pid(0x0D))
+"""
+
+import asyncio
+import logging
+import os
+import serial
+from collections import deque
+from vss_lib.elm327.elm327 import ELM327, PROMPT, RESET_TIMEOUT, SEARCH_TIMEOUT, parse_response
+from vss_lib.elm327.obd import (MAX_PIDS_PER_REQUEST, build_request, collect_pids, decode_dtcs, decode_vin,
+                                parse_can_frames)
+
+logger = logging.getLogger("elm327")
+
+# Times a command is sent again after it timed out or the port failed
+DEFAULT_RETRIES = 2
+
+# Seconds before a failed port is reopened, doubled after every failed attempt up to MAX_RECONNECT_DELAY
+RECONNECT_DELAY = 0.1
+MAX_RECONNECT_DELAY = 5.0
+
+# Bytes read from the port at once
+READ_SIZE = 4096
+
+# Start of the identification the ELM327 prints after a reset
+BANNER_PREFIX = b'ELM327'
+
+
+class _Request:
+    __slots__ = ('command', 'timeout', 'future', 'attempts')
+
+    def __init__(self, command, timeout, future):
+        self.command = command
+        self.timeout = timeout
+        self.future = future
+        self.attempts = 0
+
+
+class AsyncELM327:
+    """
+    Queue ELM327 commands from concurrent tasks and send them back to back.
+
+    Attributes:
+        port (str): The serial port, e.g. '/dev/ttyUSB0'.
+        baudrate (int): The baud rate of the serial port.
+        timeout (float): Seconds the ELM327 has to complete a response.
+        retries (int): Times a command is sent again after a timeout or port failure.
+        headers (bool): Whether the ELM327 prints CAN headers (ATH1).
+        spaces (bool): Whether the ELM327 separates bytes with spaces (ATS1).
+        answered (int): Commands answered.
+        timeouts (int): Commands that timed out.
+        resets (int): Resets of the ELM327 after a timeout or after it restarted by itself.
+        reconnects (int): Times the port was reopened.
+    """
+
+    def __init__(self, port='/dev/ttyUSB0', baudrate=38400, timeout=1.0, retries=DEFAULT_RETRIES):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.retries = retries
+        self.headers = False
+        self.spaces = True
+        self.answered = 0
+        self.timeouts = 0
+        self.resets = 0
+        self.reconnects = 0
+        self._settings = {}
+        self._pending = deque()
+        self._wakeup = asyncio.Event()
+        self._waiter = None
+        self._buffer = bytearray()
+        self._error = None
+        self._ser = None
+        self._fd = -1
+        self._worker = None
+
+    @property
+    def connected(self):
+        """Whether the port is open."""
+        return self._ser is not None
+
+    def __len__(self):
+        # Commands queued, the one in flight included
+        return len(self._pending)
+
+    def _open(self):
+        self._ser = serial.Serial(port=self.port, baudrate=self.baudrate, timeout=0)
+        self._fd = self._ser.fileno()
+        self._buffer.clear()
+        self._error = None
+        asyncio.get_running_loop().add_reader(self._fd, self._on_readable)
+
+    def _disconnect(self):
+        if self._ser is None:
+            return
+        asyncio.get_running_loop().remove_reader(self._fd)
+        try:
+            self._ser.close()
+        except (OSError, serial.SerialException):
+            pass
+        self._ser = None
+        self._fd = -1
+
+    def _on_readable(self):
+        try:
+            data = os.read(self._fd, READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            data = None
+            self._error = e
+        if not data:
+            self._error = self._error or ConnectionError(f"ELM327 port {self.port} was closed")
+            self._disconnect()
+        else:
+            self._buffer += data
+        self._wake()
+
+    def _wake(self):
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def _exchange(self, command, timeout, expect=None):
+        # Write a command and read up to the prompt ending a response (containing `expect` if given)
+        if self._ser is None:
+            raise ConnectionError(f"ELM327 port {self.port} is not open")
+        buffer = self._buffer
+        buffer.clear()
+        os.write(self._fd, command)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + timeout
+        searching = False
+        while True:
+            end = buffer.find(PROMPT) + 1
+            if end and (expect is None or expect in buffer[:end]):
+                break
+            if end:
+                del buffer[:end]  # The prompt of an earlier command
+                continue
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            if not searching and b'SEARCHING' in buffer:
+                searching = True
+                deadline = max(deadline, start + SEARCH_TIMEOUT)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise TimeoutError(f"No ELM327 prompt within {deadline - start:.1f} s, received {bytes(buffer)!r}")
+            # A plain future and timer rather than wait_for(), which may swallow the cancellation of close()
+            self._waiter = loop.create_future()
+            timer = loop.call_later(remaining, self._wake)
+            try:
+                await self._waiter
+            finally:
+                timer.cancel()
+                self._waiter = None
+        raw = bytes(buffer[:end])
+        del buffer[:end]
+        return raw
+
+    async def _initialize(self, restore=True):
+        # Reset the ELM327, turn off echo and linefeeds and send the settings again (or forget them)
+        raw = await self._exchange(ELM327.RESET_COMMAND, max(self.timeout, RESET_TIMEOUT), expect=BANNER_PREFIX)
+        for command in (ELM327.ECHO_OFF_COMMAND, ELM327.LINEFEEDS_OFF_COMMAND):
+            parse_response(await self._exchange(command, self.timeout), command)
+        if restore:
+            for command in self._settings.values():
+                parse_response(await self._exchange(command, self.timeout), command)
+        else:
+            self._settings = {}
+            self.headers = False
+            self.spaces = True
+        return raw
+
+    async def _reconnect(self):
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                self._disconnect()
+                self._open()
+                await self._initialize()
+            except (OSError, TimeoutError, ValueError, serial.SerialException) as e:
+                logger.warning(f"Cannot reopen ELM327 port {self.port}, retrying in {delay:.1f} s: {e}")
+                self._disconnect()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+            else:
+                self.reconnects += 1
+                logger.info(f"Reopened ELM327 port {self.port}")
+                return
+
+    async def _recover(self):
+        # After a timeout: reset the ELM327, reopen the port if it does not answer either
+        self.resets += 1
+        try:
+            await self._initialize()
+        except (OSError, TimeoutError, ValueError) as e:
+            logger.warning(f"ELM327 did not answer its reset, reopening {self.port}: {e}")
+            self._disconnect()
+
+    async def _transfer(self, request):
+        if self._ser is None:
+            await self._reconnect()
+        command = request.command
+        if command == ELM327.RESET_COMMAND:
+            return await self._initialize(restore=False)
+        if BANNER_PREFIX in self._buffer:
+            # The ELM327 restarted by itself since the last response, e.g. after a supply dip
+            self.resets += 1
+            await self._initialize()
+        raw = await self._exchange(command, request.timeout or self.timeout)
+        if raw.startswith(command) or (BANNER_PREFIX in raw and not command.startswith(b'AT')):
+            # Echo is back on or the banner came instead of a response: the ELM327 restarted, its settings are gone
+            self.resets += 1
+            await self._initialize()
+            raw = await self._exchange(command, request.timeout or self.timeout)
+        return raw
+
+    def _retry(self, request, error):
+        # Keep a failed command at the head of the queue, or fail it once it ran out of retries
+        request.attempts += 1
+        if request.attempts > self.retries:
+            self._pending.popleft()
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    def _track(self, command):
+        # Remember the settings a reset would undo
+        setting = command.decode('ascii').strip().upper().replace(' ', '')
+        if setting in ('ATH0', 'ATH1'):
+            self.headers = setting == 'ATH1'
+            self._settings['headers'] = command
+        elif setting in ('ATS0', 'ATS1'):
+            self.spaces = setting == 'ATS1'
+            self._settings['spaces'] = command
+        elif setting.startswith('ATSP'):
+            self._settings['protocol'] = command
+
+    async def _run(self):
+        pending = self._pending
+        while True:
+            if not pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            request = pending[0]
+            if request.future.done():
+                pending.popleft()  # Cancelled by its caller
+                continue
+            try:
+                raw = await self._transfer(request)
+            except TimeoutError as e:
+                self.timeouts += 1
+                logger.warning(f"ELM327 command {request.command!r} timed out, resetting the adapter: {e}")
+                self._retry(request, e)
+                await self._recover()
+                continue
+            except (OSError, ValueError, serial.SerialException) as e:
+                logger.warning(f"ELM327 port {self.port} failed during {request.command!r}: {e}")
+                self._disconnect()
+                self._retry(request, ConnectionError(f"ELM327 port {self.port} failed: {e}"))
+                continue
+            pending.popleft()
+            self.answered += 1
+            if request.future.done():
+                continue
+            try:
+                lines = parse_response(raw, request.command)
+            except (ValueError, ConnectionError) as e:
+                request.future.set_exception(e)
+            else:
+                self._track(request.command)
+                request.future.set_result(lines)
+
+    async def start(self):
+        """
+        Open the port, initialize the ELM327 and start sending queued commands.
+
+        Raises:
+            OSError: The port cannot be opened.
+            TimeoutError: The ELM327 does not answer.
+        """
+        if self._worker is not None:
+            return
+        self._open()
+        try:
+            await self._initialize(restore=False)
+        except BaseException:
+            self._disconnect()
+            raise
+        self._worker = asyncio.create_task(self._run(), name=f"elm327-{self.port}")
+
+    async def close(self):
+        """
+        Stop sending, fail the queued commands with ConnectionError and close the port.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        while self._pending:
+            future = self._pending.popleft().future
+            if not future.done():
+                future.set_exception(ConnectionError(f"ELM327 transport of {self.port} was closed"))
+        self._disconnect()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def submit(self, command, timeout=None):
+        """
+        Queue a command.
+
+        Args:
+            command (bytes): The command, e.g. b'010C\\r'.
+            timeout (Optional[float]): Seconds the ELM327 has to answer it, `self.timeout` by default.
+
+        Returns:
+            asyncio.Future: Resolves to the response lines (see parse_response()); fails with
+                            TimeoutError or ConnectionError once the retries are exhausted.
+
+        Raises:
+            TypeError: The command is not bytes.
+        """
+        if not isinstance(command, bytes):
+            raise TypeError(f"ELM327 commands are bytes ending in a carriage return, got {command!r}")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_Request(command, timeout, future))
+        self._wakeup.set()
+        return future
+
+    async def send_command(self, command, timeout=None):
+        """
+        Send a command once the commands queued before it were answered, and return its response lines.
+        """
+        return await self.submit(command, timeout)
+
+    async def query(self, command, timeout=None):
+        """
+        Send a command and return its response lines joined by newlines, like the getters of ELM327.
+        """
+        return '\n'.join(await self.submit(command, timeout))
+
+    async def reset(self):
+        """
+        Reset the ELM327 to its defaults, in turn with the queued commands.
+
+        Returns:
+            str: The identification the ELM327 printed, e.g. 'ELM327 v1.5'.
+        """
+        return await self.query(ELM327.RESET_COMMAND)
+
+    async def show_headers(self):
+        """
+        Show CAN headers (ATH1), kept across resets and reconnects.
+        """
+        return await self.query(ELM327.SHOW_HEADERS_COMMAND)
+
+    async def hide_headers(self):
+        """
+        Hide CAN headers (ATH0).
+        """
+        return await self.query(ELM327.HIDE_HEADERS_COMMAND)
+
+    async def set_spaces(self, enabled):
+        """
+        Separate response bytes with spaces (ATS1) or not (ATS0), kept across resets and reconnects.
+        """
+        return await self.query(ELM327.SPACES_ON_COMMAND if enabled else ELM327.SPACES_OFF_COMMAND)
+
+    async def query_many(self, pids, responses=None, by_ecu=False):
+        """
+        Request several mode 01 PIDs, see ELM327.query_many(); the requests are queued at once.
+        """
+        pids = list(pids)
+        futures = [self.submit(build_request(pids[start:start + MAX_PIDS_PER_REQUEST], responses))
+                   for start in range(0, len(pids), MAX_PIDS_PER_REQUEST)]
+        results = {}
+        for lines in await asyncio.gather(*futures):
+            collect_pids(parse_can_frames(lines, self.headers), results, by_ecu)
+        return results
+
+    async def read_pid(self, pid):
+        """
+        Request a single mode 01 PID and return its decoded value, None if no ECU reported it.
+        """
+        return (await self.query_many([pid])).get(pid)
+
+    async def read_vin(self):
+        """
+        Request the VIN (mode 09 PID 02), see ELM327.read_vin().
+        """
+        lines = await self.submit(ELM327.VIN_COMMAND)
+        return decode_vin(payload for _, payload in parse_can_frames(lines, self.headers))
+
+    async def read_dtcs(self):
+        """
+        Request the stored diagnostic trouble codes (mode 03), see ELM327.read_dtcs().
+        """
+        lines = await self.submit(ELM327.CHECK_DTC_COMMAND)
+        return decode_dtcs(payload for _, payload in parse_can_frames(lines, self.headers))
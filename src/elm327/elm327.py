@@ -12,6 +12,77 @@
 
 import serial
 import time
+from vss_lib.elm327.obd import (BITMAP_PIDS, MAX_PIDS_PER_REQUEST, bitmap_pids, build_request, collect_pids,
+                                decode_dtcs, decode_vin, parse_can_frames)
+
+# The ELM327 prints this prompt once a response is complete and it is ready for the next command
+PROMPT = b'>'
+
+# Seconds a single serial read blocks, the granularity at which response deadlines are checked
+READ_TIMEOUT = 0.05
+
+# Seconds the ELM327 gets to answer ATZ, it prints its banner after an internal restart
+RESET_TIMEOUT = 5.0
+
+# Seconds an OBD request may take once the ELM327 reported SEARCHING... for a protocol
+SEARCH_TIMEOUT = 15.0
+
+# Status lines printed while a request is in progress, not part of the response
+STATUS_LINES = ('SEARCHING...', 'BUS INIT: ...', 'BUS INIT: OK')
+
+# Response meaning the vehicle did not answer the request
+NO_DATA = 'NO DATA'
+
+# Response to a command the ELM327 does not understand
+UNKNOWN_COMMAND = '?'
+
+# Responses reporting that the request failed
+ERROR_RESPONSES = ('UNABLE TO CONNECT', 'CAN ERROR', 'BUS ERROR', 'BUS BUSY', 'FB ERROR', 'DATA ERROR',
+                   'BUFFER FULL', 'STOPPED', 'ACT ALERT', 'LV RESET', 'LP ALERT', 'ERR')
+
+
+def protocol_number(protocol):
+    """
+    Return the protocol number of an ATDPN answer or ATSP setting, e.g. '6' for 'A6'.
+
+    Protocol numbers are a single hex digit, so only the 'A' (automatic)
+    prefix of a two-character value is dropped: 'A' itself is SAE J1939.
+    """
+    protocol = protocol.strip().upper()
+    return protocol[1:] if len(protocol) == 2 and protocol[0] == 'A' else protocol
+
+
+def parse_response(raw, command=None):
+    """
+    Split a raw ELM327 response into its lines.
+
+    The prompt, blank lines, the echo of `command` and the status lines
+    (SEARCHING..., BUS INIT) are dropped. `NO DATA` yields no lines.
+
+    Args:
+        raw (bytes): The bytes read up to and including the prompt.
+        command (Optional[bytes]): The command sent, whose echo is dropped.
+
+    Returns:
+        list: The response lines, e.g. ['41 0C 1A F8'].
+
+    Raises:
+        ValueError: The ELM327 did not understand the command ('?').
+        ConnectionError: The ELM327 reported a bus or protocol error.
+    """
+    text = raw.decode('ascii', errors='replace').replace(PROMPT.decode(), '')
+    echo = command.decode('ascii').strip() if command else None
+    lines = []
+    for line in text.replace('\n', '\r').split('\r'):
+        line = line.strip()
+        if not line or line == echo or line in STATUS_LINES or line == NO_DATA:
+            continue
+        if line == UNKNOWN_COMMAND:
+            raise ValueError(f"ELM327 did not understand {echo or 'the command'}")
+        if line.startswith(ERROR_RESPONSES):
+            raise ConnectionError(f"ELM327 {echo or 'request'} failed: {line}")
+        lines.append(line)
+    return lines
 
 
 class ELM327:
@@ -22,11 +93,17 @@ class ELM327:
     and provides access only to specific OBD-II parameters. It is designed for
     querying diagnostic information from the vehicle's ECU.
 
+    Every command is answered as soon as the ELM327 prints its `>` prompt;
+    the getters return the response lines joined by newlines, without the
+    echo, status lines and prompt, and an empty string for NO DATA.
+
     Attributes:
         port (str): The serial port where the ELM327 device is connected (e.g., `/dev/ttyUSB0`).
         baudrate (int): The baud rate for the serial communication (usually 38400 for ELM327).
-        timeout (int or float): The timeout for reading responses from the ELM327.
+        timeout (int or float): Seconds the ELM327 has to complete a response.
         ser (serial.Serial): The serial connection to the ELM327 device.
+        headers (bool): Whether the ELM327 prints CAN headers (ATH1).
+        spaces (bool): Whether the ELM327 separates bytes with spaces (ATS1, its power-up default).
     """
 
     # Protocol commands
@@ -41,7 +118,13 @@ class ELM327:
 
     # General commands
     RESET_COMMAND = b'ATZ\r'  # Reset the ELM327 device
+    ECHO_OFF_COMMAND = b'ATE0\r'  # Do not echo commands
+    LINEFEEDS_OFF_COMMAND = b'ATL0\r'  # End lines with a carriage return only
     SHOW_HEADERS_COMMAND = b'ATH1\r'  # Show CAN message headers
+    HIDE_HEADERS_COMMAND = b'ATH0\r'  # Hide CAN message headers
+    SPACES_OFF_COMMAND = b'ATS0\r'  # Print response bytes without spaces
+    SPACES_ON_COMMAND = b'ATS1\r'  # Separate response bytes with spaces
+    DESCRIBE_PROTOCOL_COMMAND = b'ATDPN\r'  # Report the current protocol by number
     SUPPORTED_PIDS_COMMAND = b'0100\r'  # Request supported PIDs
     RPM_COMMAND = b'010C\r'  # Request engine RPM
     SPEED_COMMAND = b'010D\r'  # Request vehicle speed
@@ -65,12 +148,79 @@ class ELM327:
         Args:
             port (str): The serial port where the ELM327 device is connected (default `/dev/ttyUSB0`).
             baudrate (int): The baud rate for the serial connection (default 38400).
-            timeout (int or float): The timeout duration for reading responses (default 1 second).
+            timeout (int or float): Seconds the ELM327 has to complete a response (default 1 second).
         """
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
-        self.ser = serial.Serial(port=self.port, baudrate=self.baudrate, timeout=self.timeout)
+        self.headers = False
+        self.spaces = True
+        self.ser = serial.Serial(port=self.port, baudrate=self.baudrate, timeout=min(timeout, READ_TIMEOUT))
+
+    def read_response(self, timeout=None, command=None):
+        """
+        Read a response up to the `>` prompt.
+
+        Reads return as soon as bytes arrive, so a response is returned as
+        soon as it is complete, whatever its length. Once the ELM327 reports
+        SEARCHING... the deadline is extended to SEARCH_TIMEOUT, since the
+        protocol search of the first request can take several seconds.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the prompt, `self.timeout` by default.
+            command (Optional[bytes]): The command sent, whose echo is dropped.
+
+        Returns:
+            list: The response lines, see parse_response(); empty for NO DATA.
+
+        Raises:
+            TimeoutError: The prompt did not arrive in time.
+        """
+        start = time.monotonic()
+        deadline = start + (self.timeout if timeout is None else timeout)
+        searching = False
+        ser = self.ser
+        raw = bytearray()
+        while not raw.endswith(PROMPT):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"No ELM327 prompt within {deadline - start:.1f} s, received {bytes(raw)!r}")
+            raw += ser.read(ser.in_waiting or 1)
+            if not searching and b'SEARCHING' in raw:
+                searching = True
+                deadline = max(deadline, start + SEARCH_TIMEOUT)
+        return parse_response(bytes(raw), command)
+
+    def send_command(self, command, timeout=None):
+        """
+        Send a command and read its response.
+
+        Input left over from an earlier, timed out command is discarded first.
+
+        Args:
+            command (bytes): The command, e.g. b'010C\\r'.
+            timeout (Optional[float]): Seconds to wait for the response, `self.timeout` by default.
+
+        Returns:
+            list: The response lines; empty for NO DATA.
+        """
+        self.ser.reset_input_buffer()
+        self.ser.write(command)
+        return self.read_response(timeout, command)
+
+    def _query(self, command, timeout=None):
+        return '\n'.join(self.send_command(command, timeout))
+
+    def initialize(self):
+        """
+        Reset the ELM327 and turn off command echo and linefeeds, which shortens every response.
+
+        Returns:
+            str: The identification the ELM327 printed on reset, e.g. 'ELM327 v1.5'.
+        """
+        banner = self.reset()
+        self.send_command(self.ECHO_OFF_COMMAND)
+        self.send_command(self.LINEFEEDS_OFF_COMMAND)
+        return banner
 
     def reset(self):
         """
@@ -79,9 +229,10 @@ class ELM327:
         Returns:
             str: The response from the ELM327 device after the reset command.
         """
-        self.ser.write(self.RESET_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        response = self._query(self.RESET_COMMAND, max(self.timeout, RESET_TIMEOUT))
+        self.headers = False
+        self.spaces = True
+        return response
 
     def show_headers(self):
         """
@@ -90,79 +241,178 @@ class ELM327:
         Returns:
             str: The response from the ELM327 device after enabling headers.
         """
-        self.ser.write(self.SHOW_HEADERS_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        response = self._query(self.SHOW_HEADERS_COMMAND)
+        self.headers = True
+        return response
+
+    def hide_headers(self):
+        """
+        Disable displaying CAN message headers by sending the ATH0 command.
+
+        Returns:
+            str: The response from the ELM327 device after disabling headers.
+        """
+        response = self._query(self.HIDE_HEADERS_COMMAND)
+        self.headers = False
+        return response
+
+    def set_spaces(self, enabled):
+        """
+        Separate response bytes with spaces (ATS1) or not (ATS0), which shortens responses by a third.
+
+        Returns:
+            str: The response from the ELM327 device.
+        """
+        response = self._query(self.SPACES_ON_COMMAND if enabled else self.SPACES_OFF_COMMAND)
+        self.spaces = enabled
+        return response
+
+    def query_many(self, pids, responses=None, by_ecu=False):
+        """
+        Request several mode 01 PIDs, MAX_PIDS_PER_REQUEST per request (ISO 15765-4 CAN protocols).
+
+        The responses of every ECU are reassembled and split into PIDs. With
+        headers on (show_headers()) the values of each ECU are kept apart;
+        with headers off every response line is taken as a separate message.
+
+        Args:
+            pids (Iterable[int]): The PIDs, e.g. [0x0C, 0x0D, 0x05]; all must be in obd.PIDS.
+            responses (Optional[int]): ECU responses to wait for per request, see obd.build_request().
+            by_ecu (bool): Return the values by ECU header instead of merged.
+
+        Returns:
+            dict: Decoded value by PID, from the first ECU that reported it; or
+                  {header: {pid: value}} with by_ecu (header None with headers off).
+        """
+        pids = list(pids)
+        results = {}
+        for start in range(0, len(pids), MAX_PIDS_PER_REQUEST):
+            lines = self.send_command(build_request(pids[start:start + MAX_PIDS_PER_REQUEST], responses))
+            collect_pids(parse_can_frames(lines, self.headers), results, by_ecu)
+        return results
+
+    def read_pid(self, pid):
+        """
+        Request a single mode 01 PID.
+
+        Returns:
+            The decoded value (float, or int for bitmaps and status words), None if no ECU reported it.
+        """
+        return self.query_many([pid]).get(pid)
+
+    def read_supported_pids(self, base=0x00):
+        """
+        Request a supported-PIDs bitmap (PID 00, 20, 40 ...) and return the PIDs it marks as supported.
+
+        Returns:
+            list: The supported PIDs in base + 1 .. base + 32, merged over every ECU.
+        """
+        supported = set()
+        for values in self.query_many([base], by_ecu=True).values():
+            if base in values:
+                supported.update(bitmap_pids(base, values[base]))
+        return sorted(supported)
+
+    def discover_supported_pids(self):
+        """
+        Find every supported mode 01 PID, following the supported-PIDs bitmaps from PID 00 as long as each
+        reports the next one (PID 20, 40 ...).
+
+        Returns:
+            list: The supported PIDs, ascending, PID 00 and the bitmaps included.
+        """
+        supported = [BITMAP_PIDS[0]]
+        for base in BITMAP_PIDS:
+            pids = self.read_supported_pids(base)
+            supported += pids
+            if base + 0x20 not in pids:
+                break
+        return supported
+
+    def read_vin(self):
+        """
+        Request the VIN (mode 09 PID 02), reassembled from its frames.
+
+        Returns:
+            str: The VIN, None if the vehicle did not report one.
+        """
+        return decode_vin(payload for _, payload in parse_can_frames(self.send_command(self.VIN_COMMAND), self.headers))
+
+    def read_dtcs(self):
+        """
+        Request the stored diagnostic trouble codes (mode 03) of every ECU.
+
+        Returns:
+            list: The DTCs, e.g. ['P0133'], empty if none is stored.
+        """
+        return decode_dtcs(payload for _, payload in parse_can_frames(self.send_command(self.CHECK_DTC_COMMAND),
+                                                                      self.headers))
 
     def set_protocol_can(self):
-        self.ser.write(self.PROTOCOL_CAN)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.PROTOCOL_CAN)
 
     def set_protocol_iso_9141(self):
-        self.ser.write(self.PROTOCOL_ISO_9141)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.PROTOCOL_ISO_9141)
 
     def set_protocol_kwp2000(self):
-        self.ser.write(self.PROTOCOL_KWP2000)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.PROTOCOL_KWP2000)
 
     def set_protocol_kwp2000_fast(self):
-        self.ser.write(self.PROTOCOL_KWP2000_FAST)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.PROTOCOL_KWP2000_FAST)
 
     def set_protocol_j1850_pwm(self):
-        self.ser.write(self.PROTOCOL_J1850_PWM)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.PROTOCOL_J1850_PWM)
 
     def set_protocol_j1850_vpw(self):
-        self.ser.write(self.PROTOCOL_J1850_VPW)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.PROTOCOL_J1850_VPW)
 
     def set_protocol_can_29bit(self):
-        self.ser.write(self.PROTOCOL_CAN_29BIT)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.PROTOCOL_CAN_29BIT)
 
     def set_protocol_auto(self):
-        self.ser.write(self.PROTOCOL_AUTO)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.PROTOCOL_AUTO)
+
+    def set_protocol(self, protocol, fallback=True):
+        """
+        Select a protocol by its number, e.g. '6' (or 'A6' as reported by describe_protocol()).
+
+        Args:
+            protocol (str): The protocol number.
+            fallback (bool): Let the ELM327 search the other protocols if this one fails (ATSPAn) instead of
+                             using only this one (ATSPn).
+
+        Returns:
+            str: The response from the ELM327 device.
+        """
+        number = protocol_number(protocol) or '0'
+        return self._query(f"ATSP{'A' if fallback else ''}{number}\r".encode('ascii'))
+
+    def describe_protocol(self):
+        """
+        Report the current protocol by number (ATDPN).
+
+        Returns:
+            str: The number, prefixed with 'A' while automatic detection is on, e.g. 'A6'.
+        """
+        return self._query(self.DESCRIBE_PROTOCOL_COMMAND)
 
     def get_supported_pids(self):
-        self.ser.write(self.SUPPORTED_PIDS_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.SUPPORTED_PIDS_COMMAND)
 
     def get_rpm(self):
-        self.ser.write(self.RPM_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.RPM_COMMAND)
 
     def get_speed(self):
-        self.ser.write(self.SPEED_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.SPEED_COMMAND)
 
     def get_fuel_level(self):
-        self.ser.write(self.FUEL_LEVEL_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.FUEL_LEVEL_COMMAND)
 
     def clear_dtc(self):
-        self.ser.write(self.CLEAR_DTC_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.CLEAR_DTC_COMMAND)
 
     def check_dtc(self):
-        self.ser.write(self.CHECK_DTC_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.CHECK_DTC_COMMAND)
 
     def get_vin(self):
         """
@@ -171,9 +421,7 @@ class ELM327:
         Returns:
             str: The VIN as reported by the vehicle's ECU.
         """
-        self.ser.write(self.VIN_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.VIN_COMMAND)
 
     def get_battery_voltage(self):
         """
@@ -182,9 +430,7 @@ class ELM327:
         Returns:
             str: The battery voltage as reported by the ELM327 device.
         """
-        self.ser.write(self.BATTERY_VOLTAGE_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.BATTERY_VOLTAGE_COMMAND)
 
     def get_throttle_position(self):
         """
@@ -193,9 +439,7 @@ class ELM327:
         Returns:
             str: The throttle position as a percentage.
         """
-        self.ser.write(self.THROTTLE_POSITION_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.THROTTLE_POSITION_COMMAND)
 
     def get_coolant_temperature(self):
         """
@@ -204,9 +448,7 @@ class ELM327:
         Returns:
             str: The engine coolant temperature in degrees Celsius.
         """
-        self.ser.write(self.COOLANT_TEMP_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.COOLANT_TEMP_COMMAND)
 
     def get_air_intake_temperature(self):
         """
@@ -215,9 +457,7 @@ class ELM327:
         Returns:
             str: The air intake temperature in degrees Celsius.
         """
-        self.ser.write(self.AIR_INTAKE_TEMP_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.AIR_INTAKE_TEMP_COMMAND)
 
     def get_fuel_pressure(self):
         """
@@ -226,9 +466,7 @@ class ELM327:
         Returns:
             str: The fuel pressure as reported by the ECU.
         """
-        self.ser.write(self.FUEL_PRESSURE_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.FUEL_PRESSURE_COMMAND)
 
     def get_fuel_system_status(self):
         """
@@ -237,9 +475,7 @@ class ELM327:
         Returns:
             str: The fuel system status as reported by the ECU.
         """
-        self.ser.write(self.FUEL_SYSTEM_STATUS_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.FUEL_SYSTEM_STATUS_COMMAND)
 
     def get_fuel_consumption(self):
         """
@@ -248,9 +484,7 @@ class ELM327:
         Returns:
             str: The fuel consumption rate as reported by the ECU.
         """
-        self.ser.write(self.FUEL_CONSUMPTION_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.FUEL_CONSUMPTION_COMMAND)
 
     def get_engine_load(self):
         """
@@ -259,9 +493,7 @@ class ELM327:
         Returns:
             str: The engine load as reported by the ECU.
         """
-        self.ser.write(self.ENGINE_LOAD_COMMAND)
-        time.sleep(1)
-        return self.ser.read(128).decode('utf-8')
+        return self._query(self.ENGINE_LOAD_COMMAND)
 
     def close(self):
         """
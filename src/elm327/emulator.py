@@ -0,0 +1,321 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+An ELM327 emulated on a pseudo-terminal, for tests and benchmarks without an adapter or a vehicle.
+
+The emulator answers on the master side of a pty; ELM327 opens the slave
+side (`port`) like any serial adapter:
+
+    with FakeELM327(latency=0.02) as fake:
+        elm = ELM327(fake.port)
+        elm.get_rpm()  # '41 0C 1A F8'
+"""
+
+import os
+import select
+import threading
+import time
+import tty
+
+# Identification printed on reset
+BANNER = "ELM327 v1.5"
+
+# Battery voltage reported by ATRV
+BATTERY_VOLTAGE = "12.6V"
+
+# OBD protocol of the emulated vehicle (ATSP numbering): ISO 15765-4 CAN, 11-bit ID, 500 kbps
+VEHICLE_PROTOCOL = '6'
+
+# Response payloads of the emulated engine ECU by request, formatted as the ELM327 prints them
+DEFAULT_RESPONSES = {
+    '0100': '41 00 BE 3F A8 13',
+    '0120': '41 20 80 02 A0 01',
+    '0140': '41 40 44 00 00 14',
+    '0103': '41 03 02 00',
+    '0104': '41 04 80',
+    '0105': '41 05 7B',
+    '010A': '41 0A 5A',
+    '010C': '41 0C 1A F8',
+    '010D': '41 0D 32',
+    '010F': '41 0F 46',
+    '0111': '41 11 33',
+    '012F': '41 2F 99',
+    '015E': '41 5E 04 D0',
+    '03': '43 01 33 00 00 00 00',
+    '04': '44',
+    # VIN 1D4GP00R55B123456, sent as an ISO 15765-4 multi-frame response
+    '0902': '49 02 01 31 44 34 47 50 30 30 52 35 35 42 31 32 33 34 35 36',
+}
+
+# CAN header of the emulated engine ECU
+ENGINE_ECU = '7E8'
+
+# Byte the emulated ECUs pad CAN frames with
+PADDING = 0xAA
+
+# Seconds the serving thread waits for input before checking whether it was stopped
+POLL_INTERVAL = 0.1
+
+
+class FakeELM327:
+    """
+    Answer ELM327 commands on a pseudo-terminal from a table of responses.
+
+    AT commands are answered at once. OBD requests are answered after
+    `latency` seconds, like an ECU would; requests no ECU has a response for
+    get NO DATA. While the protocol is automatic (after ATZ or ATSP0) the
+    first OBD request prints SEARCHING... and takes `search_delay` seconds
+    longer, as does the first request after ATSPAn with n other than the
+    vehicle's `protocol`; a fixed protocol (ATSPn) other than it gets
+    UNABLE TO CONNECT. ATDPN reports the protocol, 'A6' once found by the
+    search. Requests without the number of responses to wait for take
+    `response_wait` seconds longer, the time the ELM327 keeps listening for
+    further ECUs. Echo (ATE), linefeeds (ATL), spaces (ATS) and CAN headers (ATH)
+    behave like on the real chip, and mode 01 requests may carry several
+    PIDs: every ECU answers the ones it has in one ISO 15765-4 message.
+
+    Faults can be injected: `unanswered` requests get no response at all,
+    reboot() restarts the chip unprompted and hangup() closes the pty like
+    an unplugged USB adapter, then offers a new one at the same `link`.
+
+    Attributes:
+        port (str): The slave device to open, e.g. '/dev/pts/3'.
+        responses (dict): Response payloads of the engine ECU (7E8) by request, e.g.
+                          {'010C': '41 0C 1A F8'}; a list gives the exact lines to print.
+        ecus (dict): Response tables by CAN header, the engine ECU's included.
+        latency (float): Seconds before an OBD request is answered.
+        search_delay (float): Extra seconds of the protocol search.
+        response_wait (float): Extra seconds of requests without a response count.
+        protocol (str): OBD protocol of the emulated vehicle, e.g. '6'.
+        searches (int): Protocol searches made.
+        unanswered (int): OBD requests still to be ignored, like by a hung adapter.
+        commands (list): Every command received, in order.
+    """
+
+    def __init__(self, responses=None, latency=0.0, search_delay=0.0, ecus=None, response_wait=0.0, link=None,
+                 protocol=VEHICLE_PROTOCOL):
+        """
+        Args:
+            responses (Optional[dict]): Responses of the engine ECU added to DEFAULT_RESPONSES.
+            latency (float): Seconds before an OBD request is answered.
+            search_delay (float): Extra seconds of the protocol search.
+            ecus (Optional[dict]): Response tables of further ECUs by CAN header, e.g. {'7E9': {...}}.
+            response_wait (float): Extra seconds of requests without a response count.
+            link (Optional[str]): Symlink to the slave device, which stays valid across hangup(); `port` then.
+            protocol (str): OBD protocol of the emulated vehicle.
+        """
+        self.responses = dict(DEFAULT_RESPONSES)
+        if responses:
+            self.responses.update(responses)
+        self.ecus = {ENGINE_ECU: self.responses}
+        self.ecus.update(ecus or {})
+        self.latency = latency
+        self.search_delay = search_delay
+        self.response_wait = response_wait
+        self.protocol = protocol
+        self.searches = 0
+        self.unanswered = 0
+        self.commands = []
+        self.link = link
+        self._open()
+        self._reset_state()
+        self._start()
+
+    def _open(self):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+        if self.link:
+            os.symlink(self.port, self.link)
+            self.port = self.link
+
+    def _start(self):
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._serve, name="fake-elm327", daemon=True)
+        self._thread.start()
+
+    def _stop(self):
+        self._stopped.set()
+        self._thread.join()
+        os.close(self.master)
+        os.close(self.slave)
+        if self.link:
+            os.unlink(self.link)
+
+    def _reset_state(self):
+        self.echo = True
+        self.linefeeds = True
+        self.spaces = True
+        self.headers = False
+        self.protocol_setting = '0'
+        self.searching = True
+        self.connected = False
+
+    def _is_auto(self):
+        return self.protocol_setting == '0' or len(self.protocol_setting) == 2  # ATSPAn, 'A' alone is J1939
+
+    def _describe_protocol(self):
+        if not self._is_auto():
+            return self.protocol_setting
+        return 'A' + (self.protocol if self.connected else self.protocol_setting[-1])
+
+    def respond(self, command):
+        """
+        Return the response lines of a command, applying its effect on the emulated state.
+        """
+        command = command.upper().replace(' ', '')
+        if command.startswith('AT'):
+            setting = command[2:]
+            if setting in ('Z', 'WS'):
+                self._reset_state()
+                return ['', BANNER]
+            if setting == 'RV':
+                return [BATTERY_VOLTAGE]
+            if setting in ('E0', 'E1'):
+                self.echo = setting == 'E1'
+            elif setting in ('L0', 'L1'):
+                self.linefeeds = setting == 'L1'
+            elif setting in ('H0', 'H1'):
+                self.headers = setting == 'H1'
+            elif setting in ('S0', 'S1'):
+                self.spaces = setting == 'S1'
+            elif setting.startswith('SP'):
+                self.protocol_setting = setting[2:] or '0'
+                self.connected = False
+                self.searching = self._is_auto() and self.protocol_setting[-1] != self.protocol
+            elif setting == 'DPN':
+                return [self._describe_protocol()]
+            return ['OK']
+        if not self._is_auto() and self.protocol_setting != self.protocol:
+            return ['UNABLE TO CONNECT']
+        if len(command) % 2:
+            # A request ending in the number of responses to wait for
+            command = command[:-1]
+        try:
+            bytes.fromhex(command)
+        except ValueError:
+            return ['?']
+        lines = []
+        for header in sorted(self.ecus):
+            response = self._ecu_response(self.ecus[header], command)
+            if isinstance(response, list):
+                lines += response
+            elif response is not None:
+                lines += self._format(header, response)
+        return lines or ['NO DATA']
+
+    def _ecu_response(self, table, command):
+        if not command.startswith('01') or len(command) <= 4:
+            response = table.get(command)
+            return bytes.fromhex(response) if isinstance(response, str) else response
+        # Several mode 01 PIDs: the PID/data pairs of every PID the ECU has, in one message
+        parts = [table.get('01' + command[i:i + 2]) for i in range(2, len(command), 2)]
+        parts = [bytes.fromhex(part)[1:] for part in parts if isinstance(part, str)]
+        return b'\x41' + b''.join(parts) if parts else None
+
+    def _hex(self, data):
+        return (' ' if self.spaces else '').join(f"{byte:02X}" for byte in data)
+
+    def _format(self, header, payload):
+        # Print a payload as the ELM327 prints the ISO 15765-4 frames carrying it
+        if self.headers:
+            if self.spaces and len(header) == 8:
+                header = ' '.join(header[i:i + 2] for i in range(0, 8, 2))
+            prefix = header + (' ' if self.spaces else '')
+            if len(payload) <= 7:
+                frames = [bytes([len(payload)]) + payload]
+            else:
+                frames = [bytes([0x10 | len(payload) >> 8, len(payload) & 0xFF]) + payload[:6]]
+                frames += [bytes([0x20 | (n + 1) % 16]) + payload[offset:offset + 7]
+                           for n, offset in enumerate(range(6, len(payload), 7))]
+            return [prefix + self._hex(frame.ljust(8, bytes([PADDING]))) for frame in frames]
+        if len(payload) <= 7:
+            return [self._hex(payload)]
+        separator = ': ' if self.spaces else ':'
+        lines = [f"{len(payload):03X}", '0' + separator + self._hex(payload[:6])]
+        lines += [f"{(n + 1) % 16:X}{separator}{self._hex(payload[offset:offset + 7])}"
+                  for n, offset in enumerate(range(6, len(payload), 7))]
+        return lines
+
+    def _write(self, text):
+        os.write(self.master, text.encode('ascii'))
+
+    def _answer(self, command):
+        self.commands.append(command)
+        if self.unanswered and not command.upper().startswith('AT'):
+            self.unanswered -= 1
+            return
+        eol = '\r\n' if self.linefeeds else '\r'
+        if self.echo:
+            self._write(command + eol)
+        is_request = not command.upper().startswith('AT')
+        if is_request and self.searching:
+            self._write('SEARCHING...' + eol)
+            time.sleep(self.search_delay)
+            self.searching = False
+            self.searches += 1
+        if is_request:
+            self.connected = True
+        if is_request:
+            has_count = len(command.replace(' ', '')) % 2
+            time.sleep(self.latency + (0.0 if has_count else self.response_wait))
+        lines = self.respond(command)
+        self._write(eol.join(lines) + eol + eol + '>')
+
+    def _serve(self):
+        pending = b''
+        while not self._stopped.is_set():
+            readable, _, _ = select.select([self.master], [], [], POLL_INTERVAL)
+            if not readable:
+                continue
+            try:
+                pending += os.read(self.master, 1024)
+            except OSError:
+                break
+            while b'\r' in pending:
+                line, pending = pending.split(b'\r', 1)
+                command = line.decode('ascii', errors='replace').strip()
+                if command:
+                    self._answer(command)
+
+    def reboot(self):
+        """
+        Restart the emulated chip unprompted, like after a supply dip: settings return to their defaults.
+        """
+        self._reset_state()
+        self._write('\r\n' + BANNER + '\r\n\r\n>')
+
+    def hangup(self, downtime=0.0):
+        """
+        Close the pseudo-terminal like an unplugged adapter and offer a new one after `downtime` seconds.
+
+        Reads and writes of the old port fail. The new pty is found at `link`,
+        or under a new device name in `port` without a link.
+        """
+        self._stop()
+        time.sleep(downtime)
+        self._open()
+        self._reset_state()
+        self._start()
+
+    def close(self):
+        """
+        Stop answering and close the pseudo-terminal.
+        """
+        self._stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
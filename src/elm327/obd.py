@@ -0,0 +1,341 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+OBD-II mode 01 requests carrying several PIDs, and their responses.
+
+On ISO 15765-4 (CAN) a single mode 01 request may ask for up to six PIDs;
+every ECU that supports some of them answers with one message holding
+PID/data pairs back to back. Messages longer than a CAN frame arrive as
+ISO-TP first and consecutive frames, which the ELM327 prints either with
+the CAN header and PCI byte (ATH1) or, headers off, as "LLL" followed by
+numbered "0:", "1:" ... lines. Splitting a response needs the data length of
+every PID, hence the PID table.
+"""
+
+import logging
+from collections import namedtuple
+
+logger = logging.getLogger("elm327")
+
+# Mode 01 PIDs a single request may carry
+MAX_PIDS_PER_REQUEST = 6
+
+# Service (mode) of current data requests and of their responses
+MODE_CURRENT_DATA = 0x01
+RESPONSE_CURRENT_DATA = 0x41
+
+PID = namedtuple('PID', ['pid', 'name', 'length', 'scale', 'offset', 'path'])
+PID.__doc__ = ("A mode 01 PID: number, name, data length in bytes, value = data as big endian integer * scale + offset "
+               "(the integer itself when scale is None) and VSS path.")
+
+# Mode 01 PIDs by number, paths follow the OBD branch of the COVESA VSS catalog (see obd.vspec)
+PIDS = {pid.pid: pid for pid in (
+    PID(0x00, 'PIDS_A', 4, None, 0, 'OBD.PidsA'),
+    PID(0x03, 'FUEL_STATUS', 2, None, 0, 'OBD.FuelStatus'),
+    PID(0x04, 'ENGINE_LOAD', 1, 100 / 255, 0.0, 'OBD.EngineLoad'),
+    PID(0x05, 'COOLANT_TEMP', 1, 1.0, -40.0, 'OBD.CoolantTemperature'),
+    PID(0x06, 'SHORT_FUEL_TRIM_1', 1, 100 / 128, -100.0, 'OBD.ShortTermFuelTrim1'),
+    PID(0x07, 'LONG_FUEL_TRIM_1', 1, 100 / 128, -100.0, 'OBD.LongTermFuelTrim1'),
+    PID(0x0A, 'FUEL_PRESSURE', 1, 3.0, 0.0, 'OBD.FuelPressure'),
+    PID(0x0B, 'INTAKE_PRESSURE', 1, 1.0, 0.0, 'OBD.MAP'),
+    PID(0x0C, 'RPM', 2, 0.25, 0.0, 'OBD.EngineSpeed'),
+    PID(0x0D, 'SPEED', 1, 1.0, 0.0, 'OBD.Speed'),
+    PID(0x0E, 'TIMING_ADVANCE', 1, 0.5, -64.0, 'OBD.TimingAdvance'),
+    PID(0x0F, 'INTAKE_TEMP', 1, 1.0, -40.0, 'OBD.IntakeTemp'),
+    PID(0x10, 'MAF', 2, 0.01, 0.0, 'OBD.MAF'),
+    PID(0x11, 'THROTTLE_POS', 1, 100 / 255, 0.0, 'OBD.ThrottlePosition'),
+    PID(0x1F, 'RUN_TIME', 2, 1.0, 0.0, 'OBD.RunTime'),
+    PID(0x20, 'PIDS_B', 4, None, 0, 'OBD.PidsB'),
+    PID(0x21, 'DISTANCE_WITH_MIL', 2, 1.0, 0.0, 'OBD.DistanceWithMIL'),
+    PID(0x2F, 'FUEL_LEVEL', 1, 100 / 255, 0.0, 'OBD.FuelLevel'),
+    PID(0x31, 'DISTANCE_SINCE_DTC_CLEAR', 2, 1.0, 0.0, 'OBD.DistanceSinceDTCClear'),
+    PID(0x33, 'BAROMETRIC_PRESSURE', 1, 1.0, 0.0, 'OBD.BarometricPressure'),
+    PID(0x40, 'PIDS_C', 4, None, 0, 'OBD.PidsC'),
+    PID(0x42, 'CONTROL_MODULE_VOLTAGE', 2, 0.001, 0.0, 'OBD.ControlModuleVoltage'),
+    PID(0x46, 'AMBIENT_AIR_TEMP', 1, 1.0, -40.0, 'OBD.AmbientAirTemperature'),
+    PID(0x5C, 'OIL_TEMP', 1, 1.0, -40.0, 'OBD.OilTemperature'),
+    PID(0x5E, 'FUEL_RATE', 2, 0.05, 0.0, 'OBD.FuelRate'),
+    PID(0x60, 'PIDS_D', 4, None, 0, 'OBD.PidsD'),
+    PID(0x80, 'PIDS_E', 4, None, 0, 'OBD.PidsE'),
+    PID(0xA0, 'PIDS_F', 4, None, 0, 'OBD.PidsF'),
+    PID(0xC0, 'PIDS_G', 4, None, 0, 'OBD.PidsG'),
+)}
+
+# The PID table compiled for decoding: (length, scale, offset) indexed by PID, None for unknown PIDs
+_DECODERS = [None] * 256
+for _pid in PIDS.values():
+    _DECODERS[_pid.pid] = (_pid.length, _pid.scale, _pid.offset)
+del _pid
+
+# PIDs of the supported-PIDs bitmaps, each covering the 32 PIDs after it
+BITMAP_PIDS = (0x00, 0x20, 0x40, 0x60, 0x80, 0xA0, 0xC0)
+
+# Mode 09 (vehicle information) request and response of the VIN
+VIN_REQUEST = 0x0902
+RESPONSE_VIN = 0x49
+
+# Mode 03 response carrying the stored diagnostic trouble codes
+RESPONSE_DTCS = 0x43
+
+# First character of a DTC by its two top bits: powertrain, chassis, body, network
+DTC_SYSTEMS = 'PCBU'
+
+
+def build_request(pids, responses=None):
+    """
+    Build a mode 01 request for up to MAX_PIDS_PER_REQUEST PIDs.
+
+    Args:
+        pids (Sequence[int]): The PIDs, e.g. [0x0C, 0x0D].
+        responses (Optional[int]): Number of ECU responses to wait for (1-15). The
+            ELM327 returns as soon as they arrived instead of waiting out its
+            timeout for further ECUs.
+
+    Returns:
+        bytes: The command, e.g. b'010C0D1\\r'.
+    """
+    if not 1 <= len(pids) <= MAX_PIDS_PER_REQUEST:
+        raise ValueError(f"A request carries 1 to {MAX_PIDS_PER_REQUEST} PIDs, got {len(pids)}")
+    unknown = [f"{pid:02X}" for pid in pids if pid not in PIDS]
+    if unknown:
+        raise ValueError(f"Unknown mode 01 PID(s) {', '.join(unknown)}, their responses cannot be split")
+    count = f"{responses:X}" if responses else ""
+    return f"{MODE_CURRENT_DATA:02X}{''.join(f'{pid:02X}' for pid in pids)}{count}\r".encode('ascii')
+
+
+def _hex_bytes(text):
+    return bytes.fromhex(text.replace(' ', ''))
+
+
+def _split_header(line):
+    # "7E8 06 41 ..." / "7E80641..." for 11-bit IDs, "18 DA F1 10 06 41 ..." / "18DAF1100641..." for 29-bit IDs
+    if ' ' in line:
+        tokens = line.split()
+        if len(tokens[0]) == 3:
+            return tokens[0], ''.join(tokens[1:])
+        return ''.join(tokens[:4]), ''.join(tokens[4:])
+    if len(line) % 2:
+        return line[:3], line[3:]
+    return line[:8], line[8:]
+
+
+def parse_can_frames(lines, headers=False):
+    """
+    Reassemble the ISO 15765-4 messages of a response.
+
+    Args:
+        lines (list): Response lines as returned by ELM327.send_command().
+        headers (bool): Whether the ELM327 prints CAN headers (ATH1).
+
+    Returns:
+        list: (header, payload) tuples in the order the messages completed;
+              the header is None when headers are off. Padding is removed.
+    """
+    messages = []
+    try:
+        if headers:
+            pending = {}
+            for line in lines:
+                header, data = _split_header(line)
+                data = bytes.fromhex(data)
+                kind = data[0] >> 4
+                if kind == 0:
+                    messages.append((header, data[1:1 + (data[0] & 0x0F)]))
+                elif kind == 1:
+                    pending[header] = (((data[0] & 0x0F) << 8) | data[1], bytearray(data[2:]))
+                elif kind == 2 and header in pending:
+                    length, payload = pending[header]
+                    payload += data[1:]
+                    if len(payload) >= length:
+                        messages.append((header, bytes(payload[:length])))
+                        del pending[header]
+            return messages
+
+        length = None
+        payload = bytearray()
+        for line in lines:
+            _, colon, data = line.partition(':')
+            if colon and length is not None:
+                payload += _hex_bytes(data)
+                if len(payload) >= length:
+                    messages.append((None, bytes(payload[:length])))
+                    length = None
+            elif len(line) == 3:
+                length = int(line, 16)
+                payload = bytearray()
+            else:
+                messages.append((None, _hex_bytes(line)))
+    except (ValueError, IndexError) as e:
+        logger.warning(f"Ignoring malformed OBD response {lines!r}: {e}")
+    return messages
+
+
+def split_pids(payload):
+    """
+    Split a mode 01 response payload (0x41, then PID and data pairs) into the data of each PID.
+
+    Splitting stops at the first PID missing from PIDS, whose length is unknown.
+
+    Returns:
+        dict: Data bytes by PID, empty for a negative or non mode 01 response.
+    """
+    result = {}
+    if not payload or payload[0] != RESPONSE_CURRENT_DATA:
+        return result
+    offset = 1
+    end = len(payload)
+    while offset < end:
+        pid = payload[offset]
+        info = PIDS.get(pid)
+        if info is None:
+            logger.warning(f"Cannot split the OBD response past unknown PID {pid:02X}")
+            break
+        data = payload[offset + 1:offset + 1 + info.length]
+        if len(data) < info.length:
+            break
+        result[pid] = data
+        offset += 1 + info.length
+    return result
+
+
+def decode_pids(payload, out=None):
+    """
+    Decode the PIDs of a mode 01 response payload.
+
+    Values are computed straight from the payload through the compiled PID
+    table, without slicing it: floats for physical values, integers for
+    bitmaps and status words. Decoding stops at the first unknown PID.
+
+    Args:
+        payload (bytes): The response payload, 0x41 then PID and data pairs.
+        out (Optional[dict]): Dict the values are stored into, reused across calls to avoid allocations.
+
+    Returns:
+        dict: Value by PID (`out` if given).
+    """
+    result = {} if out is None else out
+    if not payload or payload[0] != RESPONSE_CURRENT_DATA:
+        return result
+    decoders = _DECODERS
+    offset = 1
+    end = len(payload)
+    while offset < end:
+        pid = payload[offset]
+        decoder = decoders[pid]
+        if decoder is None:
+            logger.warning(f"Cannot split the OBD response past unknown PID {pid:02X}")
+            break
+        length, scale, bias = decoder
+        start = offset + 1
+        offset = start + length
+        if offset > end:
+            break
+        if length == 1:
+            raw = payload[start]
+        elif length == 2:
+            raw = payload[start] << 8 | payload[start + 1]
+        else:
+            raw = int.from_bytes(payload[start:offset], 'big')
+        result[pid] = raw if scale is None else raw * scale + bias
+    return result
+
+
+def collect_pids(messages, results, by_ecu=False):
+    """
+    Decode the mode 01 messages of a response into `results`.
+
+    Args:
+        messages (Iterable[tuple]): (header, payload) messages, see parse_can_frames().
+        results (dict): Value by PID, from the first ECU that reported it; or
+                        {header: {pid: value}} with by_ecu.
+        by_ecu (bool): Keep the values of every ECU apart.
+
+    Returns:
+        dict: `results`.
+    """
+    for header, payload in messages:
+        values = decode_pids(payload)
+        if by_ecu:
+            results.setdefault(header, {}).update(values)
+        else:
+            for pid, value in values.items():
+                results.setdefault(pid, value)
+    return results
+
+
+def bitmap_pids(base, bitmap):
+    """
+    Return the PIDs a supported-PIDs bitmap (PID 00, 20, 40 ...) marks as supported.
+
+    Args:
+        base (int): The PID the bitmap was requested with, e.g. 0x00.
+        bitmap (int): Its 32-bit value; the most significant bit stands for PID base + 1.
+
+    Returns:
+        list: The supported PIDs, ascending.
+    """
+    return [base + bit for bit in range(1, 33) if bitmap & (1 << (32 - bit))]
+
+
+def decode_vin(payloads):
+    """
+    Assemble the VIN from the mode 09 PID 02 response messages.
+
+    On CAN the VIN arrives in one multi-frame message (49 02 01 and 17
+    characters); older protocols send five messages of four bytes, numbered
+    by their third byte, padded with zeros.
+
+    Args:
+        payloads (Iterable[bytes]): The response payloads, e.g. from parse_can_frames().
+
+    Returns:
+        str: The VIN, None if the response holds none.
+    """
+    parts = sorted((payload[2], payload[3:]) for payload in payloads
+                   if len(payload) > 3 and payload[0] == RESPONSE_VIN and payload[1] == VIN_REQUEST & 0xFF)
+    text = b''.join(data for _, data in parts).replace(b'\x00', b'').decode('ascii', errors='replace')
+    return text[-17:] or None
+
+
+def format_dtc(first, second):
+    """
+    Format a DTC from its two bytes, e.g. (0x01, 0x33) as 'P0133'.
+    """
+    return f"{DTC_SYSTEMS[first >> 6]}{(first >> 4) & 0x3}{first & 0xF:X}{second:02X}"
+
+
+def decode_dtcs(payloads):
+    """
+    Decode the DTCs of mode 03 response messages.
+
+    On CAN a message holds 43, the number of DTCs and two bytes per DTC;
+    older protocols send messages of 43 and three DTCs padded with zeros.
+
+    Args:
+        payloads (Iterable[bytes]): The response payloads, e.g. from parse_can_frames().
+
+    Returns:
+        list: The DTCs, e.g. ['P0133', 'C0221'].
+    """
+    dtcs = []
+    for payload in payloads:
+        if not payload or payload[0] != RESPONSE_DTCS:
+            continue
+        if len(payload) >= 2 and len(payload) - 2 == 2 * payload[1]:
+            data = payload[2:]
+        else:
+            data = payload[1:]
+        for i in range(0, len(data) - 1, 2):
+            if data[i] or data[i + 1]:
+                dtcs.append(format_dtc(data[i], data[i + 1]))
+    return dtcs
@@ -0,0 +1,222 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import heapq
+import logging
+import time
+from operator import itemgetter
+from vss_lib.dbus.batching import timestamp_us
+from vss_lib.elm327.obd import MAX_PIDS_PER_REQUEST, PIDS
+
+logger = logging.getLogger("elm327")
+
+# A PID due within this fraction of its period rides along in a request that has room for it
+LOOKAHEAD = 0.5
+
+# Seconds every PID may fall behind before the schedule is shifted forward instead of catching up
+MAX_CATCH_UP = 1.0
+
+
+class PIDPoller:
+    """
+    Poll mode 01 PIDs at individual rates through multi-PID requests.
+
+    Every PID has a deadline, advanced by its period each time it is
+    sampled. A request carries the PIDs whose deadline passed, earliest
+    first, and fills its remaining slots with PIDs due within half their
+    period, so a fast PID is asked for in proportion to its rate and slow
+    PIDs share the requests it triggers. When the adapter cannot keep up the
+    PIDs keep their relative rates (a PID is asked for at most once per
+    request); once every PID is MAX_CATCH_UP behind, the schedule is shifted
+    forward as a whole instead of bursting to catch up later.
+
+    Decoded values are passed to `emit` as a list of (path, value, timestamp)
+    entries per request, the format of EmitHardwareSignals (timestamp in
+    microseconds since the Unix epoch). With an OBDSignalMap the entries are
+    named, typed and range checked by the signals of its model instead.
+    PIDs the vehicle does not support (see vehicles.identify_vehicle()) are
+    left out of the schedule.
+
+    Attributes:
+        elm (ELM327): The adapter.
+        rates (dict): Requested samples per second by PID.
+        paths (dict): VSS path by PID.
+        unsupported (list): Requested PIDs left out because the vehicle does not support them.
+        requests (int): Requests sent by the last run.
+        samples (dict): Values received by PID in the last run.
+        errors (int): Requests that timed out or failed.
+    """
+
+    def __init__(self, elm, rates, emit, paths=None, prefix=None, responses=None, signals=None, supported=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            elm (ELM327): The adapter, anything with query_many().
+            rates (dict): Samples per second by PID, e.g. {0x0C: 10, 0x05: 0.5}.
+            emit (callable): Called with the list of (path, value, timestamp) entries of each request.
+            paths (Optional[dict]): VSS paths by PID, overriding the paths of obd.PIDS.
+            prefix (Optional[str]): Prepended to every path, e.g. "toyota" for "toyota.OBD.Speed".
+            responses (Optional[int]): ECU responses to wait for per request, see obd.build_request().
+            signals (Optional[OBDSignalMap]): Maps the values to typed signals, `paths` and `prefix` are then unused.
+            supported (Optional[Iterable[int]]): PIDs the vehicle supports, the others are not polled.
+            clock (callable): Monotonic time source in seconds.
+            sleep (callable): Sleeps for the given seconds.
+        """
+        unknown = [f"{pid:02X}" for pid in rates if pid not in PIDS]
+        if unknown:
+            raise ValueError(f"Cannot poll unknown mode 01 PID(s) {', '.join(unknown)}")
+        invalid = [f"{pid:02X}" for pid, rate in rates.items() if rate <= 0]
+        if invalid:
+            raise ValueError(f"Polling rates must be positive, PID(s) {', '.join(invalid)}")
+        self.unsupported = []
+        if supported is not None:
+            supported = set(supported)
+            self.unsupported = sorted(pid for pid in rates if pid not in supported)
+            if self.unsupported:
+                logger.info(f"Not polling PID(s) {', '.join(f'{pid:02X}' for pid in self.unsupported)}, "
+                            f"unsupported by the vehicle")
+            rates = {pid: rate for pid, rate in rates.items() if pid in supported}
+            if not rates:
+                raise ValueError("The vehicle supports none of the PIDs to poll")
+        if signals is not None:
+            unmapped = [f"{pid:02X}" for pid in rates if pid not in signals]
+            if unmapped:
+                raise ValueError(f"No VSS signal for mode 01 PID(s) {', '.join(unmapped)}")
+        self.elm = elm
+        self.rates = dict(rates)
+        self.signals = signals
+        self.emit = emit
+        self.responses = responses
+        self.clock = clock
+        self.sleep = sleep
+        self.paths = {pid: PIDS[pid].path for pid in self.rates}
+        self.paths.update(paths or {})
+        if prefix:
+            self.paths = {pid: f"{prefix}.{path}" for pid, path in self.paths.items()}
+        if signals is not None:
+            self.paths = {pid: signals.names[pid] for pid in self.rates}
+        self._periods = {pid: 1.0 / rate for pid, rate in self.rates.items()}
+        self._due = {}
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.requests = 0
+        self.errors = 0
+        self.samples = dict.fromkeys(self.rates, 0)
+        self.duration = 0.0
+
+    def next_batch(self, now):
+        """
+        Return the PIDs of the next request, or an empty list if no PID is due yet.
+        """
+        due = self._due
+        earliest = min(due.values())
+        if earliest > now:
+            return []
+        latest = max(due.values())
+        if now - latest > MAX_CATCH_UP:
+            # Every PID is behind: move the whole schedule, keeping the order of the deadlines
+            shift = now - latest - MAX_CATCH_UP
+            for pid in due:
+                due[pid] += shift
+        candidates = heapq.nsmallest(MAX_PIDS_PER_REQUEST, due.items(), key=itemgetter(1))
+        periods = self._periods
+        return [pid for pid, deadline in candidates if deadline - now <= periods[pid] * LOOKAHEAD]
+
+    def poll(self, now=None):
+        """
+        Send one request for the PIDs due and emit their values.
+
+        Returns:
+            list: The PIDs requested, empty if none was due.
+        """
+        now = self.clock() if now is None else now
+        if not self._due:
+            self._due = dict.fromkeys(self.rates, now)
+        batch = self.next_batch(now)
+        if not batch:
+            return batch
+        for pid in batch:
+            self._due[pid] += self._periods[pid]
+        self.requests += 1
+        try:
+            values = self.elm.query_many(batch, responses=self.responses)
+        except (TimeoutError, ConnectionError) as e:
+            self.errors += 1
+            logger.warning(f"OBD request for PIDs {', '.join(f'{pid:02X}' for pid in batch)} failed: {e}")
+            return batch
+        timestamp = timestamp_us()
+        entries = []
+        signals = self.signals
+        for pid in batch:
+            value = values.get(pid)
+            if value is not None:
+                self.samples[pid] += 1
+                if signals is None:
+                    entries.append((self.paths[pid], value, timestamp))
+                else:
+                    entry = signals.entry(pid, value, timestamp)
+                    if entry is not None:
+                        entries.append(entry)
+        if entries:
+            self.emit(entries)
+        return batch
+
+    def run(self, duration=None, stop_event=None, max_requests=None):
+        """
+        Poll until `duration` seconds passed, `max_requests` were sent or stop_event is set.
+
+        Returns:
+            dict: The statistics of the run, see stats().
+        """
+        clock = self.clock
+        self._reset_stats()
+        self._due = {}
+        start = clock()
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                break
+            now = clock()
+            if duration is not None and now - start >= duration:
+                break
+            if max_requests is not None and self.requests >= max_requests:
+                break
+            if not self.poll(now):
+                delay = min(self._due.values()) - now
+                if duration is not None:
+                    delay = min(delay, start + duration - now)
+                if delay > 0:
+                    self.sleep(delay)
+        self.duration = clock() - start
+        return self.stats()
+
+    def stats(self):
+        """
+        Return the statistics of the last run.
+
+        Returns:
+            dict: requests, errors, duration_s, requests_per_s, samples_per_s (all PIDs), pids_per_request,
+                  and pids, by PID: rate_hz (requested) and samples_per_s (achieved).
+        """
+        duration = self.duration
+        samples = sum(self.samples.values())
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'duration_s': duration,
+            'requests_per_s': self.requests / duration if duration > 0 else 0.0,
+            'samples_per_s': samples / duration if duration > 0 else 0.0,
+            'pids_per_request': samples / self.requests if self.requests else 0.0,
+            'pids': {pid: {'rate_hz': rate, 'samples_per_s': self.samples[pid] / duration if duration > 0 else 0.0}
+                     for pid, rate in self.rates.items()},
+        }
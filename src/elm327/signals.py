@@ -0,0 +1,146 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Typed VSS signals for decoded OBD-II PIDs.
+
+Every PID of obd.PIDS names a signal of the OBD branch in obd.vspec. An
+OBDSignalMap resolves those signals in a Model once, so turning a decoded
+value into a hardware signal entry is a list lookup, a cast to the Python
+type of the signal's datatype and a range check against its min and max.
+"""
+
+import logging
+import os
+from vss_lib.elm327.obd import PIDS
+from vss_lib.vspec.model import Model
+
+logger = logging.getLogger("elm327")
+
+# Installed OBD signal catalog, and its copy in the source tree
+OBD_VSPEC_FILE = '/usr/share/vss-lib/obd.vspec'
+SOURCE_VSPEC_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'usr', 'share', 'vss-lib',
+                                 'obd.vspec')
+
+# Python type of the VSS datatypes a PID value may map to
+DATATYPES = {
+    'float': float,
+    'double': float,
+    'int8': int,
+    'int16': int,
+    'int32': int,
+    'int64': int,
+    'uint8': int,
+    'uint16': int,
+    'uint32': int,
+    'uint64': int,
+    'boolean': bool,
+}
+
+
+def load_obd_model(vspec_file=None):
+    """
+    Load the OBD signal catalog, the installed obd.vspec or the one in the source tree by default.
+
+    Raises:
+        FileNotFoundError: If no catalog is found.
+    """
+    candidates = [vspec_file] if vspec_file else [OBD_VSPEC_FILE, SOURCE_VSPEC_FILE]
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return Model.from_file(candidate)
+    raise FileNotFoundError(f"OBD signal catalog not found at {', '.join(candidates)}")
+
+
+class OBDSignalMap:
+    """
+    Map decoded PID values to typed, validated VSS signal entries.
+
+    The signal of every PID is looked up in the model once; values are cast
+    to the Python type of its datatype and dropped, counted in `rejected`,
+    when they fall outside its min and max. PIDs without a numeric signal in
+    the model are not mapped.
+
+    Attributes:
+        model (Model): The model the signals come from.
+        names (dict): Signal name by PID, the path with the prefix if any.
+        specs (dict): SignalSpec by PID.
+        rejected (int): Values dropped as out of range.
+    """
+
+    def __init__(self, model=None, pids=None, prefix=None):
+        """
+        Args:
+            model (Optional[Model]): Model holding the OBD branch, load_obd_model() by default.
+            pids (Optional[Iterable[int]]): PIDs to map, every PID of obd.PIDS by default.
+            prefix (Optional[str]): Prepended to every name, e.g. "toyota" for "toyota.OBD.Speed".
+        """
+        self.model = model if model is not None else load_obd_model()
+        self.names = {}
+        self.specs = {}
+        self.rejected = 0
+        self._signals = [None] * 256
+        for pid in (PIDS if pids is None else pids):
+            spec = self.model.lookup(PIDS[pid].path)
+            cast = DATATYPES.get(spec.datatype) if spec is not None else None
+            if cast is None:
+                logger.debug(f"PID {pid:02X} has no numeric signal {PIDS[pid].path} in the model")
+                continue
+            name = f"{prefix}.{spec.path}" if prefix else spec.path
+            self.names[pid] = name
+            self.specs[pid] = spec
+            self._signals[pid] = (name, cast, spec.min, spec.max)
+
+    def __contains__(self, pid):
+        return pid in self.names
+
+    def entry(self, pid, value, timestamp):
+        """
+        Return the (name, value, timestamp) entry of a PID value, None if unmapped or out of range.
+        """
+        signal = self._signals[pid]
+        if signal is None:
+            return None
+        name, cast, low, high = signal
+        value = cast(value)
+        if low <= value <= high:
+            return (name, value, timestamp)
+        self._reject(name, value, low, high)
+        return None
+
+    def _reject(self, name, value, low, high):
+        self.rejected += 1
+        logger.warning(f"Value {value} of {name} is out of range (min: {low}, max: {high})")
+
+    def entries(self, values, timestamp):
+        """
+        Return the entries of decoded values, see entry().
+
+        Args:
+            values (dict): Value by PID, e.g. from obd.decode_pids().
+            timestamp (int): Microseconds since the Unix epoch.
+
+        Returns:
+            list: (name, value, timestamp) entries for EmitHardwareSignals.
+        """
+        signals = self._signals
+        result = []
+        for pid, value in values.items():
+            signal = signals[pid]
+            if signal is not None:
+                name, cast, low, high = signal
+                value = cast(value)
+                if low <= value <= high:
+                    result.append((name, value, timestamp))
+                else:
+                    self._reject(name, value, low, high)
+        return result
@@ -0,0 +1,156 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Identify the vehicle behind an ELM327 and remember what it supports.
+
+Every connection otherwise starts with the protocol search of ATSP0, which
+takes seconds, and a request per supported-PIDs bitmap. identify_vehicle()
+keeps both in a JSON file in the vss-lib cache directory: the protocol last
+found on an adapter port, tried first on the next connection (ATSPAn, which
+falls back to the search when another vehicle is connected), and the
+supported PIDs by VIN and protocol.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import namedtuple
+from vss_lib.elm327.elm327 import protocol_number
+from vss_lib.vspec.cache import get_cache_dir
+
+logger = logging.getLogger("elm327")
+
+# File in the cache directory holding the known vehicles
+CACHE_FILE = 'elm327-vehicles.json'
+
+Vehicle = namedtuple('Vehicle', ['vin', 'protocol', 'supported', 'cached'])
+Vehicle.__doc__ = ("The vehicle behind an ELM327: VIN (None if not reported), protocol number, supported mode 01 PIDs "
+                   "and whether they came from the cache.")
+
+
+class VehicleCache:
+    """
+    Protocols and supported PIDs of known vehicles, stored as JSON.
+
+    Attributes:
+        path (str): The JSON file.
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (Optional[str]): The JSON file, CACHE_FILE in get_cache_dir() by default.
+        """
+        self.path = path or os.path.join(get_cache_dir(), CACHE_FILE)
+        self._data = self._load()
+
+    def _load(self):
+        data = None
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable ELM327 vehicle cache {self.path}: {e}")
+        if not isinstance(data, dict):
+            data = {}
+        data.setdefault('ports', {})
+        data.setdefault('vehicles', {})
+        return data
+
+    def save(self):
+        """
+        Write the cache, atomically.
+
+        Returns:
+            bool: False if it could not be written (logged).
+        """
+        directory = os.path.dirname(self.path) or '.'
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(self._data, file, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Unable to write ELM327 vehicle cache {self.path}: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def _key(vin, protocol):
+        return f"{vin}/{protocol_number(protocol)}"
+
+    def supported_pids(self, vin, protocol):
+        """
+        Return the supported PIDs stored for a vehicle, None if it is unknown.
+        """
+        entry = self._data['vehicles'].get(self._key(vin, protocol))
+        return list(entry['supported']) if entry else None
+
+    def store(self, vin, protocol, supported):
+        """
+        Store the supported PIDs of a vehicle.
+        """
+        self._data['vehicles'][self._key(vin, protocol)] = {'supported': sorted(supported),
+                                                            'updated': int(time.time())}
+
+    def last_protocol(self, port):
+        """
+        Return the protocol number last found on an adapter port, None if unknown.
+        """
+        return self._data['ports'].get(port, {}).get('protocol')
+
+    def remember(self, port, vin, protocol):
+        """
+        Remember the vehicle and protocol last found on an adapter port.
+        """
+        self._data['ports'][port] = {'vin': vin, 'protocol': protocol_number(protocol)}
+
+
+def identify_vehicle(elm, cache=None, refresh=False):
+    """
+    Find the protocol, VIN and supported PIDs of the vehicle behind an initialized ELM327.
+
+    The protocol last found on the adapter's port is tried first; the
+    supported PIDs of a known VIN and protocol are taken from the cache,
+    otherwise discovered and stored. Vehicles without a VIN are not cached.
+
+    Args:
+        elm (ELM327): The adapter.
+        cache (Optional[VehicleCache]): The cache, the default VehicleCache() if None.
+        refresh (bool): Discover the supported PIDs even if they are cached.
+
+    Returns:
+        Vehicle: The vehicle.
+    """
+    cache = cache if cache is not None else VehicleCache()
+    known = cache.last_protocol(elm.port)
+    if known:
+        elm.set_protocol(known)
+    vin = elm.read_vin()
+    protocol = protocol_number(elm.describe_protocol())
+    supported = cache.supported_pids(vin, protocol) if vin and not refresh else None
+    cached = supported is not None
+    if not cached:
+        supported = elm.discover_supported_pids()
+        if vin:
+            cache.store(vin, protocol, supported)
+    cache.remember(elm.port, vin, protocol)
+    cache.save()
+    logger.info(f"Vehicle {vin or 'without VIN'} on protocol {protocol}: {len(supported)} supported PIDs"
+                f"{' (cached)' if cached else ''}")
+    return Vehicle(vin, protocol, supported, cached)
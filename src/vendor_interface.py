@@ -14,7 +14,9 @@
 import os
 from vss_lib.vspec.model import Model
 from vss_lib.vss_logging import logger
-from vss_lib.canbus import CANBusSimulator
+from vss_lib.canbus import CANBusSimulator, CANDatabase
+from vss_lib.canbus.codec import default_database, vendor_layout_file
+from vss_lib.canbus.dbc import load_dbc, map_signals
 from vss_lib.containers.podman import PodmanManager
 
 CONFIG_PATH = '/etc/vss-lib/vss.config'
@@ -41,9 +43,6 @@ class VehicleSignalInterface:
         self.preference = preference
         self.attached_electronics = attached_electronics or []
 
-        # Initialize CANBusSimulator
-        self.canbus_simulator = CANBusSimulator()
-
         # Load the VSS model and assign it to self.model
         self.model = self.load_vspec_model(self.vspec_file)
 
@@ -51,6 +50,10 @@ class VehicleSignalInterface:
             logger.error(f"Failed to load VSS model for {vendor}")
             raise ValueError(f"Model not found for {vendor}")
 
+        # Initialize CANBusSimulator with the vendor's CAN message layouts
+        self.can_layout_model = None  # Model the derived CAN layout was built from
+        self.canbus_simulator = CANBusSimulator(self.load_can_database())
+
         # Start the Podman container to run the container_dbus_service
         self.dbus_manager = self.dbus_manager_service()
         self.joysticks_manager = self.joystick_manager_service()
@@ -104,6 +107,36 @@ class VehicleSignalInterface:
                 logger.error(f"VSS file {vspec_file} does not exist.")
             return None
 
+    def load_can_database(self):
+        """
+        Load the CAN message layouts of the vendor.
+
+        The vendor's DBC or YAML layout file in /usr/share/vss-lib/can/ is
+        used when it exists, otherwise a layout is derived from the emittable
+        signals of the VSS model. DBC signals are mapped to the VSS paths of
+        the model, so the layout follows the model when it is reloaded.
+
+        Returns:
+            CANDatabase: The message layouts.
+        """
+        layout_file = vendor_layout_file(self.vendor)
+        if layout_file:
+            try:
+                if layout_file.endswith('.dbc'):
+                    database = load_dbc(layout_file)
+                    mapped = map_signals(database, self.model)
+                    logger.info(f"Mapped {mapped} CAN signal(s) of {layout_file} to VSS paths")
+                    self.can_layout_model = self.model
+                else:
+                    database = CANDatabase.from_file(layout_file)
+                    self.can_layout_model = None
+                logger.info(f"Loaded {len(database)} CAN message layout(s) for {self.vendor} from {layout_file}")
+                return database
+            except Exception as e:
+                logger.error(f"Failed to load CAN layouts from {layout_file}, deriving them from the VSS model: {e}")
+        self.can_layout_model = self.model
+        return default_database(self.model)
+
     def _attach_electronics(self):
         """
         Attach electronics vendors to the running container.
@@ -125,7 +158,8 @@ class VehicleSignalInterface:
             signal_name (str): The name of the signal to retrieve details for.
 
         Returns:
-            dict: The details of the signal, or None if the signal is not found.
+            SignalSpec: The details of the signal as a read-only mapping shared with
+                        the model, or None if the signal is not found.
         """
         if not self.model:
             logger.error("VSS model not loaded.")
@@ -162,15 +196,22 @@ class VehicleSignalInterface:
 
     def simulate_can_message(self, signal_name, value):
         """
-        Simulate encoding and decoding a CAN message for the given signal and value.
+        Encode the given signal value into a CAN frame and decode it back.
 
         Args:
             signal_name (str): The name of the signal.
             value: The value to encode in the CAN message.
+
+        Returns:
+            dict: The signal values decoded back from the frame, empty if the
+                  signal has no CAN layout.
         """
+        if self.can_layout_model is not None and self.can_layout_model is not self.model:
+            # The model was reloaded, derive or map the layout again
+            self.canbus_simulator.database = self.load_can_database()
         data = {"signal": signal_name, "value": value}
         encoded_message = self.canbus_simulator.encode_can_message(data)
-        self.canbus_simulator.decode_can_message(encoded_message)
+        return self.canbus_simulator.decode_can_message(encoded_message)
 
     def stop_podman_container(self):
         """
@@ -0,0 +1,171 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from vss_lib.vss_logging import logger
+
+# Upper bound of vendors initialized at the same time; each one builds and
+# starts containers, so the work is dominated by waiting on podman.
+MAX_PARALLEL_VENDORS = 16
+
+
+def vendor_settings(values, vspec_path):
+    """
+    Resolve the settings of a vehicle_* configuration section.
+
+    Args:
+        values (dict): The values of the configuration section.
+        vspec_path (str): The vspec_path of the global section.
+
+    Returns:
+        tuple: (vendor, vspec_file, preference, attached_electronics)
+    """
+    vendor = values.get('vendor')
+    vspec_file = values.get('vspec_file')
+
+    # Perform manual interpolation for vspec_file if it uses the ${vspec_path} macro
+    if vspec_file and '${vspec_path}' in vspec_file:
+        vspec_file = vspec_file.replace('${vspec_path}', vspec_path)
+
+    preference = values.get('preference', None)
+    attached_electronics = values.get('attach_electronics', [])
+    return vendor, vspec_file, preference, attached_electronics
+
+
+def namespaced(vendor, signal_name):
+    """
+    Qualify a signal name with its vendor, e.g. ("toyota", "Speed") -> "toyota.Speed".
+    """
+    return f"{vendor}.{signal_name}"
+
+
+class VendorRegistry:
+    """
+    Vendor-keyed registry of the interfaces served by the D-Bus service.
+
+    Readers get a snapshot of the registry that is replaced as a whole on every
+    change, so emission can iterate the vendors while another thread adds one.
+
+    Attributes:
+        factory (callable): Builds an interface from (vendor, vspec_file, preference,
+                            attached_electronics), VehicleSignalInterface by default.
+        max_workers (int): Number of vendors initialized in parallel.
+    """
+    def __init__(self, factory=None, max_workers=MAX_PARALLEL_VENDORS):
+        if factory is None:
+            from vss_lib.vendor_interface import VehicleSignalInterface
+            factory = VehicleSignalInterface
+        self.factory = factory
+        self.max_workers = max_workers
+        self._interfaces = {}
+        self._lock = threading.Lock()
+
+    def create(self, settings):
+        """
+        Initialize the interface of one vendor.
+
+        Args:
+            settings (tuple): (vendor, vspec_file, preference, attached_electronics)
+
+        Returns:
+            The interface built by the factory.
+        """
+        vendor, vspec_file, preference, attached_electronics = settings
+        logger.info(f"Loading configuration for {vendor} from VSS file: {vspec_file}")
+        interface = self.factory(vendor, vspec_file, preference, attached_electronics)
+        logger.info(f"Initialized VehicleSignalInterface for {vendor}")
+        return interface
+
+    def load(self, settings):
+        """
+        Initialize several vendors in parallel and register the ones that succeed.
+
+        A vendor that fails to initialize is logged and left out; the others are
+        still served.
+
+        Args:
+            settings (list): (vendor, vspec_file, preference, attached_electronics) tuples.
+
+        Returns:
+            dict: The registered interfaces keyed by vendor, in the order of `settings`.
+        """
+        if not settings:
+            return {}
+
+        workers = max(1, min(self.max_workers, len(settings)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vendor-init") as pool:
+            futures = [(entry[0], pool.submit(self.create, entry)) for entry in settings]
+
+        loaded = {}
+        for vendor, future in futures:
+            try:
+                loaded[vendor] = self.add(vendor, future.result())
+            except Exception as e:
+                logger.error(f"Failed to initialize vendor {vendor}: {e}")
+        return loaded
+
+    def add(self, vendor, interface):
+        """
+        Register the interface of a vendor, replacing a previous one.
+
+        Returns:
+            The registered interface.
+        """
+        key = vendor.lower()
+        with self._lock:
+            interfaces = dict(self._interfaces)
+            if key in interfaces:
+                logger.warning(f"Vendor {key} is configured more than once, serving the last one")
+            interfaces[key] = interface
+            self._interfaces = interfaces
+        return interface
+
+    def remove(self, vendor):
+        """
+        Unregister a vendor.
+
+        Returns:
+            The interface that was registered, or None.
+        """
+        with self._lock:
+            interfaces = dict(self._interfaces)
+            interface = interfaces.pop(vendor.lower(), None)
+            self._interfaces = interfaces
+        return interface
+
+    def get(self, vendor):
+        """
+        Return the interface of a vendor, or None if it is not served.
+        """
+        return self._interfaces.get(vendor.lower())
+
+    def snapshot(self):
+        """
+        Return the registered interfaces as a dict keyed by vendor.
+
+        The dict is never mutated afterwards, so callers may iterate it freely.
+        """
+        return self._interfaces
+
+    def vendors(self):
+        """
+        Return the names of the served vendors.
+        """
+        return list(self._interfaces)
+
+    def __len__(self):
+        return len(self._interfaces)
+
+    def __contains__(self, vendor):
+        return vendor.lower() in self._interfaces
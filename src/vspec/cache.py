@@ -0,0 +1,318 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# vspec/cache.py
+
+"""
+On-disk cache of pre-parsed VSS files.
+
+Each VSS file is compiled into one ``.vssc`` file in CACHE_DIR, named after a
+hash of the absolute source path. The file is a versioned little-endian
+binary image that is read through ``mmap``::
+
+    header     magic, version, source mtime_ns/size/sha256, section lengths
+    strings    '\\0'-separated UTF-8 pool of paths, datatypes and units
+    records    uint32 (path, datatype, unit) string ids per signal
+    mins       float64 per signal
+    maxs       float64 per signal
+    kinds      uint8 per signal, whether min / max were declared as integers
+    tree       pickle of the VSS document (for Model.vspec_data)
+
+The tree keeps the types of the parsed YAML (integer keys, dates) and is only
+unpickled when the document itself is asked for; lookups are served from the
+mapped columns. Like any pickle it must come from a trusted directory, the
+cache files are written by vss-lib with mode 0600.
+
+A cache entry is valid when the source mtime and size match, or, if they do
+not, when the SHA-256 of the source content still matches.
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import sys
+import tempfile
+from array import array
+
+from vss_lib.vss_logging import logger
+from vss_lib.vspec.signal import SignalTable
+
+CACHE_DIR = '/var/cache/vss-lib/'
+CACHE_DIR_ENV = 'VSS_LIB_CACHE_DIR'
+CACHE_SUFFIX = '.vssc'
+CACHE_MAGIC = b'VSSC'
+CACHE_VERSION = 3
+
+# magic, version, little-endian flag, source mtime_ns, source size, source sha256,
+# signal count, string count, strings length, tree length
+HEADER = struct.Struct('<4sHBxqQ32sIIII')
+
+NO_STRING = 0xFFFFFFFF
+
+
+class TreeImage:
+    """
+    A VSS document kept as a pickle, decoded on demand.
+
+    Holding the image instead of the document keeps a model's memory at a
+    fraction of the parsed tree; every load() returns a new copy.
+    """
+
+    __slots__ = ('image',)
+
+    def __init__(self, image):
+        self.image = image
+
+    @classmethod
+    def dump(cls, vspec_data):
+        """
+        Build the image of a parsed document.
+        """
+        return cls(pickle.dumps(vspec_data, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def load(self):
+        """
+        Decode the document.
+        """
+        return pickle.loads(self.image)
+
+    def __len__(self):
+        return len(self.image)
+
+
+def get_cache_dir():
+    """
+    Return the cache directory, honouring the VSS_LIB_CACHE_DIR environment variable.
+    """
+    return os.getenv(CACHE_DIR_ENV, CACHE_DIR)
+
+
+def cache_path(vspec_file, cache_dir=None, suffix=CACHE_SUFFIX):
+    """
+    Return the cache file used for a VSS file.
+
+    Args:
+        vspec_file (str): Path to the VSS file.
+        cache_dir (Optional[str]): Cache directory, defaults to get_cache_dir().
+        suffix (str): Extension of the cache file, for other compiled sources (e.g. DBC files).
+
+    Returns:
+        str: Path of the compiled cache file.
+    """
+    key = hashlib.sha256(os.path.abspath(vspec_file).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir or get_cache_dir(), key[:32] + suffix)
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _layout(count, strings_len):
+    """
+    Return the offsets of the records, mins, maxs, kinds and tree sections.
+    """
+    records = _align(HEADER.size + strings_len)
+    mins = _align(records + 12 * count)
+    maxs = mins + 8 * count
+    kinds = maxs + 8 * count
+    tree = kinds + count
+    return records, mins, maxs, kinds, tree
+
+
+def write_cache(vspec_file, source, stat, tree, table, cache_dir=None):
+    """
+    Write the compiled form of a VSS file to the cache.
+
+    Args:
+        vspec_file (str): Path to the VSS file.
+        source (bytes): Content of the VSS file that was parsed.
+        stat (os.stat_result): Stat of the VSS file taken before it was read.
+        tree (Optional[TreeImage]): Image of the parsed VSS data, None for streamed models.
+        table (SignalTable): The compiled signals of the model.
+        cache_dir (Optional[str]): Cache directory, defaults to get_cache_dir().
+
+    Returns:
+        str: The cache file path, or None if it could not be written.
+    """
+    strings = []
+    string_ids = {}
+
+    def string_id(value):
+        if value is None:
+            return NO_STRING
+        value = str(value)
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    records = array('I')
+    for spec in table.specs:
+        records.append(string_id(spec.path))
+        records.append(string_id(spec.datatype))
+        records.append(string_id(spec.unit))
+
+    blob = '\0'.join(strings).encode('utf-8')
+    tree = (tree or TreeImage.dump(None)).image
+    mins = array('d', table.mins)
+    maxs = array('d', table.maxs)
+    if sys.byteorder != 'little':
+        records.byteswap()
+        mins.byteswap()
+        maxs.byteswap()
+
+    count = len(table)
+    header = HEADER.pack(
+        CACHE_MAGIC, CACHE_VERSION, 1, stat.st_mtime_ns, stat.st_size,
+        hashlib.sha256(source).digest(), count, len(strings), len(blob), len(tree)
+    )
+    records_off, mins_off, _, _, _ = _layout(count, len(blob))
+
+    path = cache_path(vspec_file, cache_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as file:
+            file.write(header)
+            file.write(blob)
+            file.write(b'\0' * (records_off - HEADER.size - len(blob)))
+            file.write(records.tobytes())
+            file.write(b'\0' * (mins_off - records_off - 12 * count))
+            file.write(mins.tobytes())
+            file.write(maxs.tobytes())
+            file.write(bytes(table.kinds))
+            file.write(tree)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Unable to write VSS cache for {vspec_file}: {e}")
+        return None
+    logger.debug(f"Wrote VSS cache {path} for {vspec_file}")
+    return path
+
+
+def _source_matches(vspec_file, stat, mtime_ns, size, digest):
+    """
+    Check the cached source signature against the VSS file on disk.
+    """
+    if stat.st_mtime_ns == mtime_ns and stat.st_size == size:
+        return True
+    if stat.st_size != size:
+        return False
+    # Touched but possibly unchanged, fall back to the content hash
+    with open(vspec_file, 'rb') as file:
+        return hashlib.sha256(file.read()).digest() == digest
+
+
+def read_cache(vspec_file, stat=None, cache_dir=None):
+    """
+    Load the compiled form of a VSS file from the cache if it is still valid.
+
+    The numeric columns of the returned table and the tree image are
+    zero-copy views into the memory-mapped cache file.
+
+    Args:
+        vspec_file (str): Path to the VSS file.
+        stat (Optional[os.stat_result]): Stat of the VSS file, taken if not given.
+        cache_dir (Optional[str]): Cache directory, defaults to get_cache_dir().
+
+    Returns:
+        tuple: (TreeImage, SignalTable), or None if there is no valid cache entry.
+               The image decodes to None for models loaded in streaming mode.
+    """
+    path = cache_path(vspec_file, cache_dir)
+    try:
+        if stat is None:
+            stat = os.stat(vspec_file)
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        if len(mapped) < HEADER.size:
+            raise ValueError("truncated header")
+        (magic, version, little_endian, mtime_ns, size, digest,
+         count, string_count, strings_len, tree_len) = HEADER.unpack_from(mapped, 0)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            raise ValueError(f"unsupported cache format {magic!r} v{version}")
+        records_off, mins_off, maxs_off, kinds_off, tree_off = _layout(count, strings_len)
+        if len(mapped) != tree_off + tree_len:
+            raise ValueError("truncated cache file")
+        if not _source_matches(vspec_file, stat, mtime_ns, size, digest):
+            mapped.close()
+            return None
+
+        view = memoryview(mapped)
+        strings = bytes(view[HEADER.size:HEADER.size + strings_len]).decode('utf-8').split('\0')
+        if len(strings) != string_count and count:
+            raise ValueError("corrupted string pool")
+        records = view[records_off:records_off + 12 * count].cast('I')
+        mins = view[mins_off:mins_off + 8 * count].cast('d')
+        maxs = view[maxs_off:maxs_off + 8 * count].cast('d')
+        kinds = view[kinds_off:kinds_off + count]
+        if sys.byteorder != 'little':
+            records, mins, maxs = (_swapped(records, 'I'), _swapped(mins, 'd'), _swapped(maxs, 'd'))
+        tree = TreeImage(view[tree_off:tree_off + tree_len])
+    except (ValueError, TypeError, UnicodeDecodeError, struct.error) as e:
+        logger.warning(f"Ignoring invalid VSS cache {path}: {e}")
+        return None
+
+    table = SignalTable.from_columns(
+        [strings[records[3 * i]] for i in range(count)],
+        [_string(strings, records[3 * i + 1]) for i in range(count)],
+        [_string(strings, records[3 * i + 2]) for i in range(count)],
+        mins, maxs, kinds
+    )
+    table.mapped = mapped  # Keep the mapping alive as long as the table
+    logger.debug(f"Loaded VSS cache {path} for {vspec_file}")
+    return tree, table
+
+
+def _string(strings, string_id):
+    return None if string_id == NO_STRING else strings[string_id]
+
+
+def _swapped(view, typecode):
+    values = array(typecode, view.tobytes())
+    values.byteswap()
+    return values
+
+
+def compile_tree(root, cache_dir=None):
+    """
+    Pre-build the cache for every VSS file below a directory.
+
+    Args:
+        root (str): Directory (or single VSS file) to compile.
+        cache_dir (Optional[str]): Cache directory, defaults to get_cache_dir().
+
+    Returns:
+        tuple: (number of files compiled, number of failures)
+    """
+    from vss_lib.vspec.model import Model
+
+    if os.path.isfile(root):
+        vspec_files = [root]
+    else:
+        vspec_files = []
+        for dirpath, _, filenames in os.walk(root):
+            vspec_files.extend(os.path.join(dirpath, name) for name in sorted(filenames) if name.endswith('.vspec'))
+
+    compiled = failed = 0
+    for vspec_file in vspec_files:
+        model = Model.from_file(vspec_file, cache_dir=cache_dir)
+        if model is None:
+            failed += 1
+        else:
+            compiled += 1
+    return compiled, failed
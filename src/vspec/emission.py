@@ -0,0 +1,145 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import math
+import random
+from array import array
+from vss_lib.vss_logging import logger
+
+try:
+    import numpy
+except ImportError:  # Batches fall back to the random module
+    numpy = None
+
+
+def is_emittable(spec):
+    """
+    Check whether random values can be generated for a signal.
+
+    A signal is emittable when it is not a string and has finite numeric
+    bounds with min < max.
+
+    Args:
+        spec (SignalSpec): The signal to check.
+
+    Returns:
+        bool: True if the signal has a usable numeric range.
+    """
+    if str(spec.datatype).startswith('string'):
+        return False
+    low, high = spec.min, spec.max
+    if not isinstance(low, (int, float)) or not isinstance(high, (int, float)):
+        return False
+    return math.isfinite(low) and math.isfinite(high) and low < high
+
+
+class EmissionTable:
+    """
+    Precomputed list of the signals of a model that random values can be emitted for.
+
+    The table is built once per model; generating a value is a single index
+    pick plus a uniform draw, and batches of values are drawn with numpy when
+    it is installed.
+
+    Attributes:
+        paths (list): Paths of the emittable signals.
+        lows (array): Minimum values, parallel to paths.
+        highs (array): Maximum values, parallel to paths.
+    """
+
+    def __init__(self, paths, lows, highs):
+        self.paths = paths
+        self.lows = lows
+        self.highs = highs
+        self._vectors = None
+
+    @classmethod
+    def from_table(cls, table):
+        """
+        Collect the emittable signals of a SignalTable.
+
+        Args:
+            table (SignalTable): The signals of a model.
+
+        Returns:
+            EmissionTable: The emittable signals.
+        """
+        paths, lows, highs = [], array('d'), array('d')
+        for spec in table.specs:
+            if is_emittable(spec):
+                paths.append(spec.path)
+                lows.append(spec.min)
+                highs.append(spec.max)
+        skipped = len(table) - len(paths)
+        if skipped:
+            logger.debug(f"Emission table skips {skipped} signal(s) without a numeric range")
+        return cls(paths, lows, highs)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def pick(self, rng=random):
+        """
+        Pick a random signal and a random value within its range.
+
+        Args:
+            rng: Source of randomness with randrange() and uniform(), the random module by default.
+
+        Returns:
+            tuple: (path, value), or (None, None) if the table is empty.
+        """
+        if not self.paths:
+            return None, None
+        index = rng.randrange(len(self.paths))
+        return self.paths[index], rng.uniform(self.lows[index], self.highs[index])
+
+    def pick_many(self, count, rng=None):
+        """
+        Pick `count` random signals (with repetition) and a random value for each.
+
+        Args:
+            count (int): Number of values to generate.
+            rng: A numpy Generator, or a random.Random instance when numpy is not
+                 installed. Defaults to a shared generator.
+
+        Returns:
+            list: (path, value) tuples.
+        """
+        if not self.paths or count <= 0:
+            return []
+        if numpy is None:
+            rng = rng or random
+            return [self.pick(rng) for _ in range(count)]
+
+        if self._vectors is None:
+            lows = numpy.frombuffer(self.lows, dtype=numpy.float64)
+            self._vectors = (lows, numpy.frombuffer(self.highs, dtype=numpy.float64) - lows)
+        lows, spans = self._vectors
+        rng = rng or _generator()
+        indexes = rng.integers(0, len(self.paths), size=count)
+        values = lows[indexes] + spans[indexes] * rng.random(count)
+        paths = self.paths
+        return [(paths[index], value) for index, value in zip(indexes.tolist(), values.tolist())]
+
+
+_shared_generator = None
+
+
+def _generator():
+    """
+    Return the process-wide numpy Generator used by pick_many.
+    """
+    global _shared_generator
+    if _shared_generator is None:
+        _shared_generator = numpy.random.default_rng()
+    return _shared_generator
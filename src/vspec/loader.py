@@ -0,0 +1,187 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# vspec/loader.py
+
+"""
+Shared YAML loading path for VSS files.
+
+``load_yaml`` parses a whole document into Python objects, using the libyaml
+based ``yaml.CSafeLoader`` when PyYAML was built with it. ``stream_signal_table``
+builds the signal index straight from the parser events, without
+materialising the intermediate document, which keeps memory bounded by the
+size of the index for large vendor catalogs.
+"""
+
+import yaml
+from yaml.events import (
+    AliasEvent, MappingEndEvent, MappingStartEvent, ScalarEvent,
+    SequenceEndEvent, SequenceStartEvent
+)
+
+from vss_lib.vspec.signal import (
+    DEFAULT_DATATYPE, DEFAULT_MAX, DEFAULT_MIN, DEFAULT_UNIT, SignalTable
+)
+
+# Use the libyaml bindings when they are available
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+HAS_LIBYAML = SafeLoader is not yaml.SafeLoader
+
+# Files larger than this are loaded in streaming mode by Model.from_file
+STREAMING_THRESHOLD = 4 * 1024 * 1024
+
+# Signal fields kept by the streaming loader
+SIGNAL_KEYS = frozenset(('datatype', 'unit', 'min', 'max'))
+
+
+def load_yaml(stream):
+    """
+    Parse a YAML document with the fastest available safe loader.
+
+    Args:
+        stream: A file object, str or bytes with the YAML document.
+
+    Returns:
+        The parsed document.
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+class _Frame:
+    """
+    State of one mapping while streaming parser events.
+    """
+
+    __slots__ = ('path', 'key', 'fields', 'has_branch', 'pending', 'is_vehicle')
+
+    def __init__(self, path, is_vehicle=False):
+        self.path = path
+        self.key = None
+        self.fields = {}
+        self.has_branch = False
+        self.pending = []
+        self.is_vehicle = is_vehicle
+
+
+def _scalar(loader, event):
+    """
+    Construct the Python value of a scalar event using the loader's resolver.
+    """
+    tag = event.tag
+    if tag is None or tag == '!':
+        tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+    constructor = loader.yaml_constructors.get(tag)
+    if constructor is None:
+        return event.value
+    return constructor(loader, yaml.ScalarNode(tag, event.value, style=event.style))
+
+
+def stream_signal_table(stream):
+    """
+    Build a SignalTable directly from the YAML parser events of a VSS file.
+
+    Leaf detection and path layout match Model._build_table: paths are
+    relative to 'Vehicle' when the document has it, otherwise to the document
+    root, and a mapping is a signal when it declares a datatype or has no
+    nested mappings. Only datatype, unit, min and max are constructed; other
+    scalars are skipped.
+
+    Args:
+        stream: A file object, str or bytes with the YAML document.
+
+    Returns:
+        SignalTable: The signals of the document.
+
+    Raises:
+        yaml.YAMLError: If the document cannot be parsed.
+    """
+    loader = SafeLoader(stream)
+    frames = []
+    vehicle = None
+    skip_depth = 0  # Nesting depth inside sequences, which hold no signals
+    signals = []
+
+    try:
+        while loader.check_event():
+            event = loader.get_event()
+            kind = type(event)
+
+            if skip_depth:
+                if kind is SequenceStartEvent or kind is MappingStartEvent:
+                    skip_depth += 1
+                elif kind is SequenceEndEvent or kind is MappingEndEvent:
+                    skip_depth -= 1
+                    if not skip_depth and frames:
+                        frames[-1].key = None
+                continue
+
+            if kind is ScalarEvent:
+                if not frames:
+                    continue
+                frame = frames[-1]
+                if frame.key is None:
+                    frame.key = event.value
+                else:
+                    if frame.key in SIGNAL_KEYS:
+                        frame.fields[frame.key] = _scalar(loader, event)
+                    frame.key = None
+
+            elif kind is MappingStartEvent:
+                if not frames:
+                    frames.append(_Frame(None))
+                    continue
+                parent = frames[-1]
+                if parent.key is None:
+                    # Complex mapping key, not part of any signal path
+                    skip_depth = 1
+                    continue
+                parent.has_branch = True
+                if len(frames) == 1 and parent.key == 'Vehicle':
+                    frames.append(_Frame(None, is_vehicle=True))
+                elif parent.path is None:
+                    frames.append(_Frame(parent.key))
+                else:
+                    frames.append(_Frame(f"{parent.path}.{parent.key}"))
+
+            elif kind is MappingEndEvent:
+                frame = frames.pop()
+                if not frames:
+                    signals = vehicle if vehicle is not None else frame.pending
+                    continue
+                parent = frames[-1]
+                parent.key = None
+                if frame.is_vehicle:
+                    vehicle = frame.pending
+                elif 'datatype' in frame.fields or not frame.has_branch:
+                    # A signal, any nested mapping belongs to its metadata
+                    parent.pending.append((frame.path, frame.fields))
+                else:
+                    parent.pending.extend(frame.pending)
+
+            elif kind is SequenceStartEvent:
+                skip_depth = 1
+
+            elif kind is AliasEvent:
+                if frames and frames[-1].key is not None:
+                    frames[-1].key = None
+    finally:
+        loader.dispose()
+
+    table = SignalTable()
+    for path, fields in signals:
+        table.append(
+            path,
+            fields.get('datatype', DEFAULT_DATATYPE),
+            fields.get('unit', DEFAULT_UNIT),
+            fields.get('min', DEFAULT_MIN),
+            fields.get('max', DEFAULT_MAX)
+        )
+    return table
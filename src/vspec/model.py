@@ -12,7 +12,15 @@
 # vspec/model.py
 
 
+import os
+from functools import cached_property
 from vss_lib.vss_logging import logger
+from vss_lib.vspec.cache import TreeImage, read_cache, write_cache
+from vss_lib.vspec.emission import EmissionTable
+from vss_lib.vspec.loader import STREAMING_THRESHOLD, load_yaml, stream_signal_table
+from vss_lib.vspec.signal import (
+    DEFAULT_DATATYPE, DEFAULT_MAX, DEFAULT_MIN, DEFAULT_UNIT, SignalTable, is_leaf_signal
+)
 import yaml
 
 
@@ -21,32 +29,98 @@ class Model:
     Class for managing vehicle signals from VSS files.
     """
 
-    def __init__(self, vspec_data):
+    def __init__(self, vspec_data, table=None, tree=None):
         """
         Initialize the model with the loaded VSS data.
 
+        Once the signal table is compiled from vspec_data, the parsed tree and
+        the raw signal entries are dropped: the model keeps the tree as a
+        compact TreeImage and decodes it when it is asked for.
+
         Args:
-            vspec_data (dict): The parsed VSS data.
+            vspec_data (Optional[dict]): The parsed VSS data.
+            table (Optional[SignalTable]): Pre-compiled signals (e.g. from the cache).
+            tree (Optional[TreeImage]): The VSS data as an image decoded on demand, when
+                                        vspec_data is not given (e.g. from the cache).
+        """
+        self._vspec_data = vspec_data
+        self.tree = tree
+        if table is None:
+            table = self._build_table()
+            if vspec_data is not None:
+                self.tree = TreeImage.dump(vspec_data)
+                self._vspec_data = None
+                table.drop_entries()
+        self.table = table  # Compact storage of every leaf signal
+        self.index = self.table.by_path  # Flat path -> SignalSpec table
+        if self.table.tree is None:
+            self.table.tree = self.tree
+
+    @property
+    def vspec_data(self):
         """
-        self.vspec_data = vspec_data
-        self.signals = self._extract_signals()  # Extract signals upon initialization
+        The parsed VSS data, None for models loaded in streaming mode.
+
+        It is decoded from the model's tree image on every access, so callers
+        should keep a reference while they walk it.
+        """
+        if self._vspec_data is None and self.tree is not None:
+            return self.tree.load()
+        return self._vspec_data
+
+    @property
+    def signals(self):
+        """
+        The top-level entries of the 'Vehicle' branch by name.
+        """
+        return self._extract_signals()
 
     @classmethod
-    def from_file(cls, vspec_file):
+    def from_file(cls, vspec_file, use_cache=True, cache_dir=None, streaming=None):
         """
         Load a VSS file and create a Model instance.
 
+        When use_cache is set, a valid compiled cache entry (see vspec.cache) is
+        used instead of parsing the YAML, and a fresh entry is written after parsing.
+
+        In streaming mode the signal index is built straight from the YAML
+        parser events and the document itself is not kept: vspec_data is None
+        and lookups are only served from the index.
+
         Args:
             vspec_file (str): The path to the VSS file.
+            use_cache (bool): Whether to read and write the compiled cache.
+            cache_dir (Optional[str]): Cache directory, defaults to vspec.cache.get_cache_dir().
+            streaming (Optional[bool]): Force streaming mode on or off. By default it is
+                                        used for files larger than STREAMING_THRESHOLD.
 
         Returns:
             Model: An instance of the Model class.
         """
         try:
-            with open(vspec_file, 'r') as file:
-                data = yaml.safe_load(file)
-                logger.info(f'Successfully loaded VSS file: {vspec_file}')
-                return cls(data)
+            stat = os.stat(vspec_file)
+            if use_cache:
+                cached = read_cache(vspec_file, stat, cache_dir)
+                if cached is not None:
+                    logger.info(f'Loaded VSS file from cache: {vspec_file}')
+                    tree, table = cached
+                    return cls(None, table, tree=tree)
+
+            if streaming is None:
+                streaming = stat.st_size > STREAMING_THRESHOLD
+
+            with open(vspec_file, 'rb') as file:
+                source = file.read()
+            if streaming:
+                data = None
+                model = cls(data, stream_signal_table(source))
+            else:
+                data = load_yaml(source)
+                model = cls(data)
+            logger.info(f'Successfully loaded VSS file: {vspec_file}')
+            if use_cache:
+                write_cache(vspec_file, source, stat, model.tree, model.table, cache_dir)
+            return model
         except FileNotFoundError:
             logger.error(f'VSS file not found: {vspec_file}')
             return None
@@ -57,6 +131,18 @@ class Model:
             logger.error(f'Permission denied when accessing VSS file: {vspec_file}')
             return None
 
+    @cached_property
+    def emission(self):
+        """
+        The signals of the model that random values can be emitted for.
+
+        Computed once per model, so a reloaded model gets a fresh table.
+
+        Returns:
+            EmissionTable: The emittable signals and their ranges.
+        """
+        return EmissionTable.from_table(self.table)
+
     def _extract_signals(self):
         """
         Extract signals from the loaded VSS data.
@@ -65,34 +151,103 @@ class Model:
             dict: A dictionary of signals extracted from the VSS data.
         """
         signals = {}
-        if 'Vehicle' in self.vspec_data:
-            for signal_name, details in self.vspec_data['Vehicle'].items():
+        vspec_data = self.vspec_data
+        if isinstance(vspec_data, dict) and 'Vehicle' in vspec_data:
+            for signal_name, details in vspec_data['Vehicle'].items():
                 signals[signal_name] = details
         return signals
 
+    def _build_table(self):
+        """
+        Compile every leaf signal of the model into a SignalTable.
+
+        Paths are relative to the 'Vehicle' branch, so nested branches such as
+        'Electronics.Bosch.TemperatureSensor' or 'Signals.Engine.Thrust' resolve
+        with a single dictionary lookup. Files without a 'Vehicle' root (e.g.
+        electronics vspecs) are indexed from the document root.
+
+        Returns:
+            SignalTable: The signals of the model, indexed by path.
+        """
+        table = SignalTable()
+        vspec_data = self.vspec_data
+        if not isinstance(vspec_data, dict):
+            return table
+
+        root = vspec_data.get('Vehicle', vspec_data)
+        if not isinstance(root, dict):
+            return table
+
+        def collect(prefix, branch):
+            for key, node in branch.items():
+                if not isinstance(node, dict):
+                    continue
+                path = f"{prefix}.{key}" if prefix else str(key)
+                if is_leaf_signal(node):
+                    table.add(path, node)
+                else:
+                    collect(path, node)
+
+        collect(None, root)
+        logger.debug(f"Compiled signal index with {len(table)} signals")
+        return table
+
+    def lookup(self, path):
+        """
+        Return the compiled SignalSpec for a signal path.
+
+        Args:
+            path (str): The signal path, optionally prefixed with 'Vehicle.'.
+
+        Returns:
+            SignalSpec: The signal, or None if the path is not a leaf signal.
+        """
+        spec = self.index.get(path)
+        if spec is None and path.startswith('Vehicle.'):
+            spec = self.index.get(path[8:])
+        return spec
+
     def get_signal_details(self, signal_name):
         """
         Get details of a signal by name from the VSS data. This method is designed to be more
         resilient and flexible when retrieving signal details, allowing for partial information
         and providing default values where necessary.
 
+        Leaf signals are served from the compiled index as shared, read-only
+        SignalSpec records; other paths fall back to walking the VSS tree.
+
+        Args:
+            signal_name (str): The name of the signal to retrieve details for.
+        Returns:
+            Mapping: The signal details such as datatype, unit, min, and max,
+                     or None if the signal is not found.
+        """
+        spec = self.lookup(signal_name)
+        if spec is not None:
+            return spec
+        return self._walk_signal_details(signal_name)
+
+    def _walk_signal_details(self, signal_name):
+        """
+        Resolve signal details by traversing the VSS tree one path component at a time.
+
         Args:
             signal_name (str): The name of the signal to retrieve details for.
         Returns:
-            dict: A dictionary containing signal details such as datatype, unit, min, and max,
-                  or None if the signal is not found.
+            dict: A dictionary containing signal details, or None if the signal is not found.
         """
-        if not self.vspec_data:
+        vspec_data = self.vspec_data
+        if not vspec_data:
             logger.error("VSS data is empty or not loaded.")
             return None
 
         signal_parts = signal_name.split('.')
-        current_data = self.vspec_data
+        current_data = vspec_data
 
         # Traverse the VSS data using the signal path
         for part in signal_parts:
             if part in current_data:
-                logger.info(f"Found part of the path: {part}")
+                logger.debug(f"Found part of the path: {part}")
                 current_data = current_data[part]
             else:
                 # Smart fallback: Try to guess missing parts
@@ -106,13 +261,13 @@ class Model:
 
         # If current_data is a dictionary, extract details and provide smart defaults
         if isinstance(current_data, dict):
-            logger.info(f"Retrieved signal details for {signal_name}: {current_data}")
+            logger.debug(f"Retrieved signal details for {signal_name}: {current_data}")
             # Provide smart defaults for missing fields
             signal_details = {
-                'datatype': current_data.get('datatype', 'float'),  # Default to float
-                'unit': current_data.get('unit', 'unknown'),       # Default to 'unknown'
-                'min': current_data.get('min', 0),                 # Default min to 0
-                'max': current_data.get('max', 100)                # Default max to 100
+                'datatype': current_data.get('datatype', DEFAULT_DATATYPE),
+                'unit': current_data.get('unit', DEFAULT_UNIT),
+                'min': current_data.get('min', DEFAULT_MIN),
+                'max': current_data.get('max', DEFAULT_MAX)
             }
             # Log any missing details that had to be defaulted
             for key, value in signal_details.items():
@@ -134,16 +289,36 @@ class Model:
         Returns:
             dict: The signal data if found, else None.
         """
+        spec = self.index.get(path)
+        if spec is not None:
+            return spec.data
+        return self._walk_find(path)
+
+    def _walk_find(self, path):
+        """
+        Find a node of the VSS tree by traversing it one path component at a time.
+
+        Args:
+            path (str): The path within the model, relative to 'Vehicle'.
+
+        Returns:
+            The node if found, else None.
+        """
+        vspec_data = self.vspec_data
+        if not vspec_data:
+            logger.warning(f'Path "{path}" is not a signal and the VSS tree is not loaded.')
+            return None
+
         keys = path.split(".")
         # Ensure we start looking under the 'Vehicle' key if present
-        signal = self.vspec_data.get('Vehicle', {})
+        signal = vspec_data.get('Vehicle', {})
         partial_path = "Vehicle"
 
         for i, key in enumerate(keys):
             if isinstance(signal, dict) and key in signal:
                 signal = signal[key]
                 partial_path += f".{key}"
-                logger.info(f"Found part of the path: {partial_path}")
+                logger.debug(f"Found part of the path: {partial_path}")
             else:
                 logger.warning(f'Key "{key}" not found in "{partial_path}".')
                 if isinstance(signal, dict):
@@ -151,5 +326,5 @@ class Model:
                     logger.info(f"Available keys at this level: {available_keys}")
                 return None
 
-        logger.info(f"Complete signal path found: {path}")
+        logger.debug(f"Complete signal path found: {path}")
         return signal
@@ -0,0 +1,330 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import heapq
+import itertools
+import math
+import random
+import threading
+import time
+from vss_lib.vspec.signal import is_leaf_signal
+from vss_lib.vss_logging import logger
+
+try:
+    import numpy
+except ImportError:  # Values are drawn with the random module
+    numpy = None
+
+# Emission period (ms) of signals without a period in the VSS file or configuration
+DEFAULT_PERIOD_MS = 2000
+
+# Key of a signal or branch in a VSS file that sets its emission period in ms
+PERIOD_KEY = 'period'
+
+# Shortest supported period, the scheduler works with millisecond resolution
+MIN_PERIOD_MS = 1
+
+
+def _valid_period(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= MIN_PERIOD_MS
+
+
+def vspec_periods(model):
+    """
+    Collect the emission periods declared in a VSS file.
+
+    A `period` (ms) on a signal applies to that signal, a `period` on a branch
+    applies to every signal below it unless a nearer branch or the signal
+    overrides it. Models loaded in streaming mode keep no tree and declare none.
+
+    Args:
+        model (Model): The model to read the periods from.
+
+    Returns:
+        dict: Period in ms by signal path.
+    """
+    periods = {}
+    if not isinstance(model.vspec_data, dict):
+        return periods
+    root = model.vspec_data.get('Vehicle', model.vspec_data)
+    if not isinstance(root, dict):
+        return periods
+
+    def collect(prefix, branch, inherited):
+        period = branch.get(PERIOD_KEY, inherited)
+        for key, node in branch.items():
+            if not isinstance(node, dict):
+                continue
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if is_leaf_signal(node):
+                signal_period = node.get(PERIOD_KEY, period)
+                if signal_period is not None:
+                    periods[path] = signal_period
+            else:
+                collect(path, node, period)
+
+    collect(None, root, None)
+    return periods
+
+
+def resolve_periods(model, overrides=None, default=DEFAULT_PERIOD_MS):
+    """
+    Resolve the emission period of every emittable signal of a model.
+
+    Periods from the configuration (`overrides`, keyed by signal or branch
+    path, longest match wins) take precedence over the VSS file, and signals
+    without either use `default`.
+
+    Args:
+        model (Model): The model whose emission table is scheduled.
+        overrides (Optional[dict]): Period in ms by signal or branch path.
+        default (float): Period in ms of the remaining signals.
+
+    Returns:
+        list: Period in ms for each signal of model.emission, in table order.
+    """
+    if not _valid_period(default):
+        logger.warning(f"Invalid default emission period {default!r}, using {DEFAULT_PERIOD_MS} ms")
+        default = DEFAULT_PERIOD_MS
+
+    configured = {}
+    for path, period in (overrides or {}).items():
+        if _valid_period(period):
+            configured[path] = period
+        else:
+            logger.warning(f"Ignoring invalid emission period {period!r} for {path}")
+
+    declared = vspec_periods(model)
+    periods = []
+    for path in model.emission.paths:
+        period = None
+        prefix = path
+        while configured and prefix:
+            if prefix in configured:
+                period = configured[prefix]
+                break
+            prefix = prefix.rpartition('.')[0]
+        if period is None:
+            period = declared.get(path)
+            if not _valid_period(period):
+                if period is not None:
+                    logger.warning(f"Ignoring invalid emission period {period!r} for {path} in the VSS file")
+                period = default
+        periods.append(period)
+    return periods
+
+
+class EmissionGroup:
+    """
+    Signals of one owner that share an emission period and are emitted together.
+    """
+
+    __slots__ = ('owner', 'period', 'names', 'lows', 'spans', 'due', 'cancelled')
+
+    def __init__(self, owner, period, names, lows, highs):
+        self.owner = owner
+        self.period = period
+        self.names = names
+        if numpy is not None:
+            self.lows = numpy.array(lows, dtype=numpy.float64)
+            self.spans = numpy.array(highs, dtype=numpy.float64) - self.lows
+        else:
+            self.lows = list(lows)
+            self.spans = [high - low for low, high in zip(lows, highs)]
+        self.due = 0.0
+        self.cancelled = False
+
+    def values(self, rng):
+        """
+        Draw a random value within range for every signal of the group.
+        """
+        if numpy is not None:
+            return (self.lows + self.spans * rng.random(len(self.names))).tolist()
+        return [low + span * rng.random() for low, span in zip(self.lows, self.spans)]
+
+
+class EmissionScheduler:
+    """
+    Emit signals at their own periods with millisecond resolution.
+
+    Signals sharing an owner and a period form a group; groups are kept in a
+    heap ordered by their next deadline. run_due() emits every group that is
+    due and reschedules it one period later. A group that falls more than a
+    period behind skips the missed occurrences instead of emitting a burst,
+    and counts them as missed deadlines. The lateness of every emission is
+    recorded as jitter.
+
+    Attributes:
+        emit (callable): Called as emit(names, values) for every due group.
+        clock (callable): Monotonic time source in seconds.
+    """
+
+    def __init__(self, emit, clock=time.monotonic, rng=None):
+        self.emit = emit
+        self.clock = clock
+        if rng is None:
+            rng = numpy.random.default_rng() if numpy is not None else random.Random()
+        self.rng = rng
+        self._heap = []
+        self._order = itertools.count()
+        self._groups = {}
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.ticks = 0
+        self.emitted = 0
+        self.missed = 0
+        self._late_count = 0
+        self._late_mean = 0.0
+        self._late_m2 = 0.0
+        self._late_max = 0.0
+
+    def _push(self, group):
+        heapq.heappush(self._heap, (group.due, next(self._order), group))
+
+    def schedule(self, owner, names, lows, highs, periods):
+        """
+        Replace the signals scheduled for an owner.
+
+        Args:
+            owner (str): Key the signals are scheduled under, e.g. the vendor.
+            names (list): Signal names as passed to emit.
+            lows (Sequence[float]): Minimum value of each signal.
+            highs (Sequence[float]): Maximum value of each signal.
+            periods (Sequence[float]): Emission period of each signal in ms.
+
+        Returns:
+            int: The number of groups scheduled for the owner.
+        """
+        by_period = {}
+        for index, period in enumerate(periods):
+            by_period.setdefault(period / 1000.0, []).append(index)
+
+        groups = [
+            EmissionGroup(owner, period, [names[i] for i in indexes],
+                          [lows[i] for i in indexes], [highs[i] for i in indexes])
+            for period, indexes in sorted(by_period.items())
+        ]
+
+        now = self.clock()
+        with self._lock:
+            for group in self._groups.pop(owner, ()):
+                group.cancelled = True
+            for group in groups:
+                group.due = now + group.period
+                self._push(group)
+            self._groups[owner] = groups
+        logger.debug(f"Scheduled {len(names)} signal(s) of {owner} in {len(groups)} period group(s)")
+        return len(groups)
+
+    def unschedule(self, owner):
+        """
+        Stop emitting the signals of an owner.
+        """
+        with self._lock:
+            for group in self._groups.pop(owner, ()):
+                group.cancelled = True
+
+    def rebase(self):
+        """
+        Restart every deadline from now and clear the statistics.
+
+        Call it when emission actually starts, so time spent between scheduling
+        and the first tick is not reported as missed deadlines.
+        """
+        now = self.clock()
+        with self._lock:
+            self._heap = []
+            for groups in self._groups.values():
+                for group in groups:
+                    group.due = now + group.period
+                    self._push(group)
+            self._reset_stats()
+
+    def run_due(self):
+        """
+        Emit every group whose deadline has passed.
+
+        Returns:
+            Optional[float]: Clock time of the next deadline, or None if nothing is scheduled.
+        """
+        now = self.clock()
+        due_groups = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                due, _, group = heapq.heappop(heap)
+                if group.cancelled:
+                    continue
+                late = now - due
+                skipped = int(late // group.period)
+                self.missed += skipped
+                group.due = due + (skipped + 1) * group.period
+                self._push(group)
+                due_groups.append(group)
+
+                # Welford's online mean/variance of the lateness
+                self._late_count += 1
+                delta = late - self._late_mean
+                self._late_mean += delta / self._late_count
+                self._late_m2 += delta * (late - self._late_mean)
+                if late > self._late_max:
+                    self._late_max = late
+            self.ticks += 1
+            next_due = heap[0][0] if heap else None
+
+        for group in due_groups:
+            self.emit(group.names, group.values(self.rng))
+            self.emitted += len(group.names)
+        return next_due
+
+    def run(self, stop_event, idle=0.1):
+        """
+        Run the scheduler on the calling thread until stop_event is set.
+
+        Args:
+            stop_event (threading.Event): Stops the loop when set.
+            idle (float): Seconds to wait when nothing is scheduled.
+        """
+        while not stop_event.is_set():
+            next_due = self.run_due()
+            delay = idle if next_due is None else min(idle, next_due - self.clock())
+            if delay > 0:
+                stop_event.wait(delay)
+
+    def stats(self, reset=False):
+        """
+        Return emission, missed deadline and jitter statistics.
+
+        Args:
+            reset (bool): Start a new measurement period afterwards.
+
+        Returns:
+            dict: ticks, emitted, missed_deadlines, and jitter_mean_ms,
+                  jitter_stddev_ms, jitter_max_ms (lateness of emissions
+                  behind their deadline).
+        """
+        with self._lock:
+            count = self._late_count
+            stats = {
+                'ticks': self.ticks,
+                'emitted': self.emitted,
+                'missed_deadlines': self.missed,
+                'jitter_mean_ms': self._late_mean * 1000.0,
+                'jitter_stddev_ms': math.sqrt(self._late_m2 / count) * 1000.0 if count else 0.0,
+                'jitter_max_ms': self._late_max * 1000.0,
+            }
+            if reset:
+                self._reset_stats()
+        return stats
@@ -0,0 +1,371 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# vspec/signal.py
+
+
+import math
+import sys
+from array import array
+from collections.abc import Mapping
+
+# Defaults applied to signals that do not declare every field
+DEFAULT_DATATYPE = 'float'
+DEFAULT_UNIT = 'unknown'
+DEFAULT_MIN = 0
+DEFAULT_MAX = 100
+
+# Keys exposed by SignalSpec when used as a mapping
+SIGNAL_FIELDS = ('name', 'datatype', 'unit', 'min', 'max')
+
+# Flags of SignalTable.kinds: the min / max bound was declared as an integer
+INT_MIN = 1
+INT_MAX = 2
+
+
+def is_leaf_signal(node):
+    """
+    Check whether a node of the VSS tree describes a signal rather than a branch.
+
+    A node is a signal when it declares a datatype, or when none of its values
+    are nested mappings (e.g. ``{type: float, unit: km/h, min: 0, max: 220}``).
+
+    Args:
+        node: A value from the parsed VSS tree.
+
+    Returns:
+        bool: True if the node is a leaf signal.
+    """
+    if not isinstance(node, dict):
+        return False
+    if 'datatype' in node:
+        return True
+    for value in node.values():
+        if isinstance(value, dict):
+            return False
+    return True
+
+
+def resolve_path(root, path):
+    """
+    Return the node at a dotted path of a VSS tree.
+
+    Keys that themselves contain dots (e.g. a top-level 'Electronics.Bosch')
+    are matched greedily.
+
+    Args:
+        root (dict): The branch to start from.
+        path (str): The dotted path to resolve.
+
+    Returns:
+        The node, or None if the path does not exist.
+    """
+    parts = path.split('.')
+    node = root
+    i = 0
+    while i < len(parts):
+        if not isinstance(node, dict):
+            return None
+        for j in range(len(parts), i, -1):
+            key = '.'.join(parts[i:j])
+            if key in node:
+                node = node[key]
+                i = j
+                break
+        else:
+            return None
+    return node
+
+
+def _intern(value):
+    """
+    Intern string values so identical units and datatypes share one object.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def _as_number(value):
+    """
+    Convert a min/max value for the numeric arrays.
+
+    Returns:
+        tuple: (float, is_int); the float is NaN when the value is not numeric or
+               is an integer that a float cannot hold exactly.
+    """
+    if isinstance(value, float):
+        return value, False
+    if isinstance(value, int) and not isinstance(value, bool):
+        try:
+            number = float(value)
+        except OverflowError:
+            return math.nan, False
+        if int(number) == value:
+            return number, True
+    return math.nan, False
+
+
+class SignalSpec(Mapping):
+    """
+    Immutable, compact view of one signal stored in a SignalTable.
+
+    The record only keeps the signal id and shared references to its interned
+    strings; min and max are read from the table's numeric arrays. It behaves
+    as a read-only mapping with the keys in SIGNAL_FIELDS, so callers that
+    used the dictionaries returned by get_signal_details keep working.
+
+    Attributes:
+        id (int): Position of the signal in its SignalTable.
+        path (str): Dotted path of the signal relative to the model root.
+        name (str): Last component of the path.
+        datatype (str): Declared datatype, or DEFAULT_DATATYPE.
+        unit (str): Declared unit, or DEFAULT_UNIT.
+    """
+
+    __slots__ = ('id', 'path', 'name', 'datatype', 'unit', '_table')
+
+    def __init__(self, table, signal_id, path, name, datatype, unit):
+        object.__setattr__(self, '_table', table)
+        object.__setattr__(self, 'id', signal_id)
+        object.__setattr__(self, 'path', path)
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'datatype', datatype)
+        object.__setattr__(self, 'unit', unit)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"SignalSpec is immutable, cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"SignalSpec is immutable, cannot delete '{name}'")
+
+    @property
+    def min(self):
+        """Minimum value of the signal."""
+        table = self._table
+        value = table.mins[self.id]
+        if value != value:  # NaN marks a bound the array cannot hold
+            return table.bound(self.id, 'min', DEFAULT_MIN)
+        return int(value) if table.kinds[self.id] & INT_MIN else value
+
+    @property
+    def max(self):
+        """Maximum value of the signal."""
+        table = self._table
+        value = table.maxs[self.id]
+        if value != value:  # NaN marks a bound the array cannot hold
+            return table.bound(self.id, 'max', DEFAULT_MAX)
+        return int(value) if table.kinds[self.id] & INT_MAX else value
+
+    @property
+    def data(self):
+        """The raw signal entry as loaded from the VSS file, if it is available."""
+        return self._table.entry(self.id)
+
+    def __getitem__(self, key):
+        if key in SIGNAL_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in SIGNAL_FIELDS
+
+    def __iter__(self):
+        return iter(SIGNAL_FIELDS)
+
+    def __len__(self):
+        return len(SIGNAL_FIELDS)
+
+    def __repr__(self):
+        return f"SignalSpec({self.path!r}, datatype={self.datatype!r}, unit={self.unit!r}, min={self.min!r}, max={self.max!r})"
+
+
+class SignalTable:
+    """
+    Column-oriented storage for the leaf signals of a VSS model.
+
+    Signals are numbered in insertion order. Paths, names, datatypes and units
+    live in parallel lists (units and datatypes are interned), while min/max
+    bounds live in parallel ``array('d')`` columns indexed by signal id, with
+    a flag per bound in ``kinds`` when it was declared as an integer. Bounds
+    the columns cannot hold (non-numeric, or integers beyond float precision)
+    are stored as NaN and kept as declared in ``bounds``.
+
+    The table does not need the raw entries once built: Model drops them and
+    resolves them on demand from its tree image.
+
+    Tables loaded from the compiled cache do not keep raw entries; they are
+    resolved on demand from ``root`` or, without one, from the model's tree
+    image (decoded once, resolving every entry), and the table is read-only.
+
+    Attributes:
+        paths (list): Signal paths by id.
+        mins (array): Minimum values by id.
+        maxs (array): Maximum values by id.
+        kinds (array): INT_MIN / INT_MAX flags by id.
+        bounds (dict): Declared (min, max) by id of the signals with a NaN bound.
+        data (list): Raw signal entries by id (None until resolved).
+        specs (list): SignalSpec records by id.
+        by_path (dict): Mapping of signal path to SignalSpec.
+        root (Optional[dict]): Branch the signal paths are relative to.
+        tree (Optional[TreeImage]): Image of the VSS document, used when root is None.
+    """
+
+    def __init__(self, root=None):
+        self.paths = []
+        self.mins = array('d')
+        self.maxs = array('d')
+        self.kinds = array('B')
+        self.bounds = {}
+        self.data = []
+        self.specs = []
+        self.by_path = {}
+        self.root = root
+        self.tree = None
+
+    @classmethod
+    def from_columns(cls, paths, datatypes, units, mins, maxs, kinds=None, root=None):
+        """
+        Build a read-only table from pre-compiled columns.
+
+        Args:
+            paths (list): Signal paths by id.
+            datatypes (list): Datatypes by id.
+            units (list): Units by id.
+            mins: Sequence of float minimums by id (e.g. an array or memoryview).
+            maxs: Sequence of float maximums by id.
+            kinds: Sequence of INT_MIN / INT_MAX flags by id, none set by default.
+            root (Optional[dict]): Branch used to resolve raw entries on demand.
+
+        Returns:
+            SignalTable: The table.
+        """
+        table = cls(root)
+        table.mins = mins
+        table.maxs = maxs
+        table.kinds = kinds if kinds is not None else bytes(len(paths))
+        table.data = [None] * len(paths)
+        for signal_id, path in enumerate(paths):
+            path = sys.intern(path)
+            spec = SignalSpec(table, signal_id, path, path.rsplit('.', 1)[-1],
+                              _intern(datatypes[signal_id]), _intern(units[signal_id]))
+            table.paths.append(path)
+            table.specs.append(spec)
+            table.by_path[path] = spec
+        return table
+
+    def add(self, path, entry):
+        """
+        Append a signal to the table.
+
+        Args:
+            path (str): Dotted path of the signal.
+            entry (dict): The raw signal entry from the VSS file.
+
+        Returns:
+            SignalSpec: The record for the new signal.
+        """
+        return self.append(
+            path,
+            entry.get('datatype', DEFAULT_DATATYPE),
+            entry.get('unit', DEFAULT_UNIT),
+            entry.get('min', DEFAULT_MIN),
+            entry.get('max', DEFAULT_MAX),
+            entry
+        )
+
+    def append(self, path, datatype, unit, min_value, max_value, entry=None):
+        """
+        Append a signal from already resolved fields.
+
+        Args:
+            path (str): Dotted path of the signal.
+            datatype (str): Datatype of the signal.
+            unit (str): Unit of the signal.
+            min_value: Minimum value of the signal.
+            max_value: Maximum value of the signal.
+            entry (Optional[dict]): The raw signal entry, if available.
+
+        Returns:
+            SignalSpec: The record for the new signal.
+        """
+        signal_id = len(self.paths)
+        path = sys.intern(path)
+        spec = SignalSpec(self, signal_id, path, path.rsplit('.', 1)[-1], _intern(datatype), _intern(unit))
+        self.paths.append(path)
+        low, low_is_int = _as_number(min_value)
+        high, high_is_int = _as_number(max_value)
+        self.mins.append(low)
+        self.maxs.append(high)
+        self.kinds.append((INT_MIN if low_is_int else 0) | (INT_MAX if high_is_int else 0))
+        if low != low or high != high:
+            # Keep bounds the columns cannot hold reachable without the raw entry
+            self.bounds[signal_id] = (min_value, max_value)
+        self.data.append(entry)
+        self.specs.append(spec)
+        self.by_path[path] = spec
+        return spec
+
+    def entry(self, signal_id):
+        """
+        Return the raw entry of a signal, resolving it from the tree if needed.
+        """
+        entry = self.data[signal_id]
+        if entry is None and self.root is not None:
+            entry = resolve_path(self.root, self.paths[signal_id])
+            self.data[signal_id] = entry
+        elif entry is None and self.tree is not None:
+            self._resolve_entries()
+            entry = self.data[signal_id]
+        return entry
+
+    def _resolve_entries(self):
+        """
+        Decode the tree image once and resolve every missing raw entry from it.
+        """
+        document = self.tree.load()
+        root = document.get('Vehicle', document) if isinstance(document, dict) else None
+        if isinstance(root, dict):
+            data = self.data
+            for signal_id, path in enumerate(self.paths):
+                if data[signal_id] is None:
+                    data[signal_id] = resolve_path(root, path)
+        self.tree = None  # Every entry that exists is resolved now
+
+    def drop_entries(self):
+        """
+        Forget the raw entries, entry() resolves them again from root or tree.
+        """
+        self.data = [None] * len(self.paths)
+
+    def bound(self, signal_id, key, default):
+        """
+        Return a min/max bound the numeric columns cannot hold, as declared.
+        """
+        bounds = self.bounds.get(signal_id)
+        if bounds is not None:
+            return bounds[0 if key == 'min' else 1]
+        entry = self.entry(signal_id)
+        if not isinstance(entry, dict):
+            return default
+        return entry.get(key, default)
+
+    def get(self, path):
+        """
+        Return the SignalSpec for a path, or None.
+        """
+        return self.by_path.get(path)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __iter__(self):
+        return iter(self.specs)
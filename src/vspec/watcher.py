@@ -0,0 +1,329 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# vspec/watcher.py
+
+"""
+File change notification for hot-reloading configuration and VSS files.
+
+FileWatcher uses Linux inotify (through ctypes, no extra dependency) on the
+directories of the watched files, so editors that save by writing a new
+file and renaming it are handled. When inotify is not available it falls
+back to polling the stat signature of each file. ModelReloader builds on it
+to keep one Model per VSS file and rebuild only the files that changed.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import threading
+import time
+
+from vss_lib.vss_logging import logger
+from vss_lib.vspec.model import Model
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+INOTIFY_EVENT = struct.Struct('iIII')
+
+
+def _load_inotify():
+    """
+    Return the libc inotify functions, or None if they are not available.
+    """
+    library = ctypes.util.find_library('c')
+    if library is None:
+        return None
+    try:
+        libc = ctypes.CDLL(library, use_errno=True)
+        return libc.inotify_init1, libc.inotify_add_watch, libc.inotify_rm_watch
+    except (OSError, AttributeError):
+        return None
+
+
+def file_signature(path):
+    """
+    Return the stat signature used to detect changes of a file, or None if it is missing.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size, stat.st_ino)
+
+
+class FileWatcher:
+    """
+    Watch a set of files and call a handler for each one whose content changed.
+
+    Handlers run on the watcher thread with the changed path. A file is
+    reported only when its stat signature differs from the one seen before,
+    so attribute-only events and repeated notifications are ignored.
+
+    Attributes:
+        poll_interval (float): Seconds between checks in polling mode.
+        settle (float): Seconds to wait for more events before reporting a change.
+        use_inotify (bool): Whether inotify is in use (False means polling).
+    """
+
+    def __init__(self, poll_interval=1.0, settle=0.05, use_inotify=True):
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self._signatures = {}
+        self._handlers = {}
+        self._directories = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._fd = None
+        self._add_watch = None
+        self._rm_watch = None
+
+        inotify = _load_inotify() if use_inotify else None
+        if inotify is not None:
+            inotify_init1, self._add_watch, self._rm_watch = inotify
+            fd = inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+            else:
+                logger.warning(f"inotify unavailable ({os.strerror(ctypes.get_errno())}), polling for file changes")
+        self.use_inotify = self._fd is not None
+
+    def watch(self, path, handler):
+        """
+        Start watching a file.
+
+        Args:
+            path (str): The file to watch; it does not need to exist yet.
+            handler (callable): Called with the absolute path when the file changes.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            self._handlers[path] = handler
+            if path in self._signatures:
+                return
+            self._signatures[path] = file_signature(path)
+            directory = os.path.dirname(path)
+            if self.use_inotify and directory not in self._directories.values():
+                wd = self._add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+                if wd < 0:
+                    logger.warning(f"Unable to watch {directory}: {os.strerror(ctypes.get_errno())}")
+                else:
+                    self._directories[wd] = directory
+        logger.debug(f"Watching {path} for changes")
+
+    def unwatch(self, path):
+        """
+        Stop reporting changes of a file, and watching its directory once no other file there is watched.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            if self._signatures.pop(path, 0) == 0:
+                return
+            self._handlers.pop(path, None)
+            directory = os.path.dirname(path)
+            if any(os.path.dirname(other) == directory for other in self._signatures):
+                return
+            for wd, watched in list(self._directories.items()):
+                if watched == directory:
+                    del self._directories[wd]
+                    if self._fd is not None and self._rm_watch(self._fd, wd) < 0:
+                        logger.debug(f"Unable to stop watching {directory}: {os.strerror(ctypes.get_errno())}")
+
+    def check(self, paths=None):
+        """
+        Compare the signature of the given (or all) watched files and report changes.
+
+        Args:
+            paths (Optional[iterable]): Candidate paths, all watched files by default.
+
+        Returns:
+            set: The paths that changed.
+        """
+        changed = {}
+        with self._lock:
+            for path in list(self._signatures if paths is None else paths):
+                if path not in self._signatures:
+                    continue
+                signature = file_signature(path)
+                if signature != self._signatures[path]:
+                    self._signatures[path] = signature
+                    changed[path] = self._handlers[path]
+        for path, handler in changed.items():
+            try:
+                handler(path)
+            except Exception as e:
+                logger.error(f"File change handler failed for {path}: {e}")
+        return set(changed)
+
+    def _read_events(self):
+        """
+        Drain the inotify descriptor and return the paths named by its events.
+        """
+        paths = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 65536)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    return paths
+                raise
+            offset = 0
+            while offset < len(buffer):
+                wd, _, _, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+                offset += INOTIFY_EVENT.size
+                name = buffer[offset:offset + length].rstrip(b'\0')
+                offset += length
+                directory = self._directories.get(wd)
+                if directory is not None and name:
+                    paths.add(os.path.join(directory, os.fsdecode(name)))
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.use_inotify:
+                self.check()
+                self._stop.wait(self.poll_interval)
+                continue
+
+            readable, _, _ = select.select([self._fd], [], [], self.poll_interval)
+            if not readable:
+                continue
+            paths = self._read_events()
+            # Let writers finish (write + rename, several writes) before reporting
+            time.sleep(self.settle)
+            paths |= self._read_events()
+            self.check(paths)
+
+    def start(self):
+        """
+        Start the watcher thread.
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="vss-file-watcher", daemon=True)
+            self._thread.start()
+            logger.info(f"File watcher started ({'inotify' if self.use_inotify else 'polling'})")
+
+    def stop(self):
+        """
+        Stop the watcher thread and release the inotify descriptor.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self.use_inotify = False
+
+
+class ModelReloader:
+    """
+    Keep one Model per VSS file and rebuild it when the file changes.
+
+    Readers always see a complete Model: a new one is built aside and then
+    swapped in with a single assignment, after which the listeners registered
+    for that file are called with it.
+
+    Attributes:
+        models (dict): Mapping of absolute VSS file path to its current Model.
+        watcher (FileWatcher): The underlying watcher.
+    """
+
+    def __init__(self, watcher=None, **watcher_options):
+        self.models = {}
+        self._listeners = {}
+        self.watcher = watcher or FileWatcher(**watcher_options)
+
+    def add(self, vspec_file, listener=None, model=None):
+        """
+        Load (or adopt) the Model of a VSS file and watch it.
+
+        Args:
+            vspec_file (str): The VSS file.
+            listener (Optional[callable]): Called with the new Model after each reload.
+            model (Optional[Model]): Already loaded model for the file.
+
+        Returns:
+            Model: The current model, or None if the file could not be loaded.
+        """
+        path = os.path.abspath(vspec_file)
+        if listener is not None:
+            self._listeners.setdefault(path, []).append(listener)
+        if model is None:
+            model = self.models.get(path) or Model.from_file(path)
+        if model is not None:
+            self.models[path] = model
+        self.watcher.watch(path, self.reload)
+        return model
+
+    def remove(self, vspec_file, listener):
+        """
+        Unregister a listener; the file is no longer watched once it has no listeners.
+        """
+        path = os.path.abspath(vspec_file)
+        listeners = self._listeners.get(path, [])
+        if listener in listeners:
+            listeners.remove(listener)
+        if not listeners:
+            self._listeners.pop(path, None)
+            self.models.pop(path, None)
+            self.watcher.unwatch(path)
+
+    def get(self, vspec_file):
+        """
+        Return the current Model of a VSS file.
+        """
+        return self.models.get(os.path.abspath(vspec_file))
+
+    def reload(self, vspec_file):
+        """
+        Rebuild the Model of one VSS file and swap it in.
+
+        Returns:
+            Model: The new model, or None if the file could not be loaded (the old one is kept).
+        """
+        path = os.path.abspath(vspec_file)
+        model = Model.from_file(path)
+        if model is None:
+            logger.error(f"Keeping the previous model, reloading {path} failed")
+            return None
+        self.models[path] = model
+        logger.info(f"Reloaded VSS model from {path} ({len(model.index)} signals)")
+        for listener in self._listeners.get(path, ()):
+            listener(model)
+        return model
+
+    def start(self):
+        """
+        Start watching the VSS files for changes.
+        """
+        self.watcher.start()
+
+    def stop(self):
+        """
+        Stop watching the VSS files.
+        """
+        self.watcher.stop()
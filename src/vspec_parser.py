@@ -12,6 +12,7 @@
 
 
 import yaml
+from vss_lib.vspec.loader import load_yaml
 
 
 def load_vspec_file(vspec_file_path):
@@ -25,8 +26,8 @@ def load_vspec_file(vspec_file_path):
         dict: Parsed VSS data.
     """
     try:
-        with open(vspec_file_path, 'r') as file:
-            vspec_data = yaml.safe_load(file)
+        with open(vspec_file_path, 'rb') as file:
+            vspec_data = load_yaml(file)
             return vspec_data
     except FileNotFoundError:
         print(f"VSS file not found: {vspec_file_path}")
@@ -0,0 +1,23 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def vss_cache_dir(tmp_path, monkeypatch):
+    """
+    Keep the compiled VSS cache of each test in its own temporary directory.
+    """
+    cache_dir = tmp_path / "vss-cache"
+    monkeypatch.setenv("VSS_LIB_CACHE_DIR", str(cache_dir))
+    return cache_dir
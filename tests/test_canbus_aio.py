@@ -0,0 +1,91 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import can
+import pytest
+from vss_lib.canbus.aio import BLOCK, AsyncCANMonitor, Subscription
+
+
+@pytest.fixture
+def buses():
+    opened = {}
+
+    def open_bus(channel):
+        bus = can.Bus(channel, interface="virtual", receive_own_messages=False)
+        opened.setdefault(channel, []).append(bus)
+        return bus
+
+    yield open_bus
+    for channel_buses in opened.values():
+        for bus in channel_buses:
+            bus.shutdown()
+
+
+def send(bus, *ids):
+    for can_id in ids:
+        bus.send(can.Message(arbitration_id=can_id, data=bytes([can_id & 0xFF]), is_extended_id=False))
+
+
+def test_frames_of_all_interfaces_reach_subscribers(buses):
+    async def main():
+        async with AsyncCANMonitor({"can-a": buses("can-a"), "can-b": buses("can-b")}) as monitor:
+            every = monitor.subscribe()
+            engine = monitor.subscribe(ids={0x2F0})
+            send(buses("can-a"), 0x2F0, 0x300)
+            send(buses("can-b"), 0x2F0)
+            frames = [await asyncio.wait_for(every.get(), 2) for _ in range(3)]
+            first = await asyncio.wait_for(engine.get(), 2)
+            second = await asyncio.wait_for(engine.get(), 2)
+        assert sorted((msg.channel, msg.arbitration_id) for msg in frames) == [
+            ("can-a", 0x2F0), ("can-a", 0x300), ("can-b", 0x2F0)]
+        assert first.arbitration_id == second.arbitration_id == 0x2F0
+        assert monitor.received == {"can-a": 2, "can-b": 1}
+        # Stopping the monitor ends the iteration of its subscriptions
+        assert [msg async for msg in every] == []
+
+    asyncio.run(main())
+
+
+def test_overflow_policies():
+    async def main():
+        dropping = Subscription(maxsize=2)
+        for can_id in (1, 2, 3):
+            await dropping.put(can.Message(arbitration_id=can_id))
+        assert dropping.dropped == 1
+        assert [(await dropping.get()).arbitration_id for _ in range(2)] == [2, 3]
+
+        blocking = Subscription(maxsize=1, overflow=BLOCK)
+        await blocking.put(can.Message(arbitration_id=1))
+        put = asyncio.create_task(blocking.put(can.Message(arbitration_id=2)))
+        await asyncio.sleep(0.01)
+        assert not put.done()
+        assert (await blocking.get()).arbitration_id == 1
+        await asyncio.wait_for(put, 1)
+        assert blocking.dropped == 0 and len(blocking) == 1
+
+    asyncio.run(main())
+    with pytest.raises(ValueError):
+        Subscription(overflow="ignore")
+
+
+def test_run_stops_on_cancellation(buses):
+    async def main():
+        monitor = AsyncCANMonitor([buses("can-c")])
+        task = asyncio.create_task(monitor.run())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert monitor._tasks == [] and monitor.subscriptions == []
+
+    asyncio.run(main())
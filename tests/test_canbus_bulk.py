@@ -0,0 +1,75 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from vss_lib.canbus.bulk import decode_many, encode_many
+from vss_lib.canbus.codec import BIG_ENDIAN, CANDatabase, MessageLayout, SignalLayout
+
+numpy = pytest.importorskip("numpy")
+
+
+def database():
+    return CANDatabase([
+        MessageLayout(0x2F0, "Speed", [
+            SignalLayout("Speed", 0, 16, scale=0.01, vss_path="Speed"),
+            SignalLayout("Temp", 23, 8, BIG_ENDIAN, offset=-40, vss_path="Temperature"),
+        ]),
+        MessageLayout(0x18FEF100, "Diag", [
+            SignalLayout("Page", 0, 8, is_multiplexer=True),
+            SignalLayout("Voltage", 8, 16, scale=0.001, multiplex=0, vss_path="Voltage"),
+            SignalLayout("Current", 8, 16, is_signed=True, multiplex=1, vss_path="Current"),
+        ]),
+        MessageLayout(0x40D, "Battery", [SignalLayout("Level", 496, 10, scale=0.1, vss_path="BatteryLevel")],
+                      length=64),
+    ])
+
+
+def test_decode_many_matches_single_frame_decoding():
+    db = database()
+    rng = numpy.random.default_rng(7)
+    ids = rng.choice([0x2F0, 0x18FEF100, 0x40D, 0x123], size=500).astype(numpy.uint32)
+    payloads = rng.integers(0, 256, size=(500, 64), dtype=numpy.uint8)
+    payloads[ids == 0x18FEF100, 0] %= 2
+
+    columns = decode_many(db, ids, payloads, key='name')
+    for name, column in columns.items():
+        message, _ = db.lookup(name)
+        for index, value in zip(column.index, column.values):
+            assert ids[index] == message.arbitration_id
+            expected = message.decode(bytes(payloads[index, :message.length]))[name]
+            assert value == pytest.approx(expected)
+    # Multiplexed signals only come from frames with their multiplexer value
+    assert len(columns["Voltage"].index) + len(columns["Current"].index) == (ids == 0x18FEF100).sum()
+
+
+def test_decode_many_keeps_unaligned_64_bit_values_exact():
+    db = CANDatabase([MessageLayout(0x100, "Counter", [SignalLayout("Counter", 4, 64)], length=16)])
+    values = [1, 2**63 + 1, 2**64 - 1, 3]
+    payloads = numpy.array([list(db.encode("Counter", value).data) for value in values], dtype=numpy.uint8)
+
+    column = decode_many(db, numpy.full(4, 0x100, dtype=numpy.uint32), payloads, key='name')["Counter"]
+    assert column.values.dtype == numpy.uint64
+    assert [int(value) for value in column.values] == values
+
+
+def test_encode_many_round_trip_through_a_bytes_buffer():
+    db = database()
+    speeds = numpy.linspace(0, 250, 100)
+    frames = encode_many(db, {"Speed": speeds, "Temperature": numpy.full(100, 21), "Current": numpy.arange(-50, 50)})
+    assert frames.dtype.names == ('timestamp', 'arbitration_id', 'flags', 'length', 'data')
+    assert len(frames) == 200
+
+    columns = decode_many(db, frames['arbitration_id'], numpy.ascontiguousarray(frames['data']).tobytes())
+    assert numpy.allclose(columns["Speed"].values, speeds, atol=0.005)
+    assert (columns["Temperature"].values == 21).all()
+    assert (columns["Current"].values == numpy.arange(-50, 50)).all()
+    assert "Voltage" not in columns
@@ -0,0 +1,59 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from vss_lib.canbus.busstats import BusStatistics, frame_bits
+
+
+def test_frame_bits_worst_case_stuffing():
+    assert frame_bits(8) == 135
+    assert frame_bits(0) == 55
+    assert frame_bits(8, is_extended_id=True) == 160
+    # The CAN FD data phase shrinks with a faster data bitrate
+    assert frame_bits(64, is_fd=True, bitrate=500000, data_bitrate=2000000) < frame_bits(64, is_fd=True) / 3
+
+
+def test_rolling_rates_jitter_and_bus_load():
+    stats = BusStatistics(bitrate=500000, window=1.0, buckets=10)
+    # 0x100 every 10 ms with a payload change every other frame, 0x200 at 20/40 ms gaps
+    for i in range(100):
+        stats.update(100.005 + i * 0.01, 0x100, bytes([i // 2]))
+    for at in (100.005, 100.025, 100.065, 100.085, 100.125):
+        stats.update(at, 0x200, b"\x00" * 8)
+    snapshot = stats.snapshot(now=100.995)
+    assert snapshot["frames"] == 105 and snapshot["window_s"] == pytest.approx(0.995)
+    ids = snapshot["ids"]
+    assert ids[0x100]["frames_per_s"] == pytest.approx(100 / 0.995)
+    assert ids[0x100]["changes"] == 49
+    assert ids[0x100]["interarrival_mean_ms"] == pytest.approx(10.0)
+    assert ids[0x100]["jitter_ms"] == pytest.approx(0.0, abs=1e-6)
+    assert ids[0x200]["interarrival_mean_ms"] == pytest.approx(30.0)
+    assert ids[0x200]["interarrival_max_ms"] == pytest.approx(40.0)
+    assert ids[0x200]["jitter_ms"] == pytest.approx(10.0)
+    assert snapshot["bus_load_percent"] == pytest.approx((100 * frame_bits(1) + 5 * 135) / 0.995 / 500000 * 100)
+    assert set(stats.snapshot([0x200, 0x300], now=100.995)["ids"]) == {0x200}
+
+    # Half a window later only the second half of 0x100's frames remains
+    later = stats.snapshot(now=101.495)
+    assert later["ids"][0x100]["frames_per_s"] == pytest.approx(50 / 0.995)
+    assert later["ids"][0x200]["frames_per_s"] == 0.0
+    assert stats.snapshot(now=110.0)["bus_load_percent"] == 0.0
+
+
+def test_ids_beyond_capacity_count_toward_the_bus_load():
+    stats = BusStatistics(max_ids=2)
+    for can_id in (1, 2, 3, 3):
+        stats.update(5.0, can_id, b"\x00")
+    snapshot = stats.snapshot(now=5.05)
+    assert set(snapshot["ids"]) == {1, 2}
+    assert snapshot["untracked"] == 2 and snapshot["frames"] == 4
+    assert snapshot["frames_per_s"] == pytest.approx(4 / 0.95)
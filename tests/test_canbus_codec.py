@@ -0,0 +1,73 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+from vss_lib.canbus import CANBusSimulator
+from vss_lib.canbus.codec import BIG_ENDIAN, CANDatabase, MessageLayout, SignalLayout, default_database
+from vss_lib.vspec.model import Model
+
+SHARE_DIR = os.path.join(os.path.dirname(__file__), "..", "usr", "share", "vss-lib")
+
+
+def test_little_endian_signal_layout():
+    message = MessageLayout(0x2F0, "Speed", [SignalLayout("Speed", 4, 12, scale=0.5, offset=-10)])
+    data = message.encode({"Speed": 100})
+    assert data == bytes([0xC0, 0x0D, 0, 0, 0, 0, 0, 0])  # raw 220 at bit 4
+    assert message.decode(data) == {"Speed": 100.0}
+
+
+def test_big_endian_signal_spanning_bytes():
+    # Motorola start bit 3 is the MSB, the 12 bits run into byte 1
+    message = MessageLayout(0x300, "Temp", [SignalLayout("Temp", 3, 12, BIG_ENDIAN, is_signed=True)])
+    data = message.encode({"Temp": -2})
+    assert data == bytes([0x0F, 0xFE, 0, 0, 0, 0, 0, 0])
+    assert message.decode(data) == {"Temp": -2}
+
+
+def test_can_fd_payload_and_partial_update():
+    message = MessageLayout(0x40D, "Battery", [
+        SignalLayout("Level", 496, 10, scale=0.1),
+        SignalLayout("Cells", 7, 8, BIG_ENDIAN),
+    ], length=64)
+    assert message.is_fd
+    data = message.encode({"Level": 87.3, "Cells": 96})
+    assert len(data) == 64 and data[0] == 96
+    updated = message.encode({"Level": 12.5}, data)
+    assert message.decode(updated) == {"Level": pytest.approx(12.5), "Cells": 96}
+
+
+def test_values_saturate_and_layouts_are_validated():
+    message = MessageLayout(0x100, "Pct", [SignalLayout("Pct", 0, 8)])
+    assert message.decode(message.encode({"Pct": 1000})) == {"Pct": 255}
+    assert message.decode(message.encode({"Pct": -5})) == {"Pct": 0}
+    with pytest.raises(ValueError):
+        MessageLayout(0x100, "TooLong", [SignalLayout("x", 60, 8)])
+    with pytest.raises(ValueError):
+        MessageLayout(0x100, "Overlap", [SignalLayout("a", 0, 8), SignalLayout("b", 4, 8)])
+
+
+def test_vendor_layout_file_round_trip():
+    database = CANDatabase.from_file(os.path.join(SHARE_DIR, "can", "toyota.yaml"))
+    simulator = CANBusSimulator(database)
+    frame = simulator.encode_can_message({"signal": "Electronics.Bosch.TemperatureSensor", "value": -12})
+    assert frame.arbitration_id == 0x300
+    assert simulator.decode_can_message(frame)["Electronics.Bosch.TemperatureSensor"] == -12
+    assert simulator.encode_can_message({"signal": "attach_electronics", "value": "bosch"}) is None
+
+
+def test_default_database_covers_emittable_signals():
+    model = Model.from_file(os.path.join(SHARE_DIR, "toyota.vspec"))
+    database = default_database(model)
+    assert set(database.signals) == set(model.emission.paths)
+    decoded = database.decode(database.encode("Speed", 120))
+    assert decoded["Speed"] == pytest.approx(120, abs=240 / 65535)
@@ -0,0 +1,96 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+from vss_lib.canbus.codec import BIG_ENDIAN, CANFrame
+from vss_lib.canbus.dbc import load_dbc, map_signals, parse_dbc
+from vss_lib.vspec.model import Model
+
+SHARE_DIR = os.path.join(os.path.dirname(__file__), "..", "usr", "share", "vss-lib")
+
+DBC = '''VERSION ""
+
+BU_: ECU
+
+BO_ 752 Powertrain: 8 ECU
+ SG_ VehicleSpeed : 0|16@1+ (0.01,0) [0|655.35] "km/h" Vector__XXX
+ SG_ CoolantTemp : 23|8@0+ (1,-40) [-40|215] "degC" Vector__XXX
+
+BO_ 2566844926 Diagnostics: 8 ECU
+ SG_ Page M : 0|8@1+ (1,0) [0|255] "" Vector__XXX
+ SG_ Voltage m0 : 8|16@1+ (0.001,0) [0|65.535] "V" Vector__XXX
+ SG_ Current m1 : 8|16@1- (0.01,0) [-327.68|327.67] "A" Vector__XXX
+
+BO_ 1037 Battery: 64 ECU
+ SG_ BatteryLevel : 496|10@1+ (0.1,0) [0|100] "%" Vector__XXX
+
+BA_DEF_ BO_ "VFrameFormat" INT 0 15;
+BA_DEF_ SG_ "VSSPath" STRING ;
+BA_DEF_DEF_ "VFrameFormat" 0;
+BA_ "VFrameFormat" BO_ 1037 14;
+BA_ "VSSPath" SG_ 752 CoolantTemp "Vehicle.Electronics.Bosch.TemperatureSensor";
+'''
+
+
+def test_parse_messages_and_multiplexing():
+    database = parse_dbc(DBC)
+    assert sorted(database.messages) == [0x2F0, 0x40D, 0x18FEF1FE]
+
+    diagnostics = database.messages[0x18FEF1FE]
+    assert diagnostics.is_extended_id and diagnostics.multiplexer.name == "Page"
+    frame = database.encode("Current", -1.5)
+    assert frame.data[0] == 1
+    assert database.decode(frame) == {"Page": 1, "Current": pytest.approx(-1.5)}
+
+    battery = database.messages[0x40D]
+    assert battery.is_fd and battery.length == 64
+    assert database.messages[0x2F0].by_name["CoolantTemp"].byte_order == BIG_ENDIAN
+
+
+def test_message_attributes_with_space_before_semicolon():
+    text = DBC.replace('BA_ "VFrameFormat" BO_ 1037 14;', 'BA_ "VFrameFormat" BO_ 1037 14 ;\n'
+                       'BA_ "VFrameFormat" BO_ 752 "CAN" ;')
+    database = parse_dbc(text)
+    assert database.messages[0x40D].is_fd
+    assert not database.messages[0x2F0].is_fd
+
+
+def test_message_with_an_invalid_signal_is_skipped():
+    text = DBC.replace(' SG_ BatteryLevel : 496|10@1+ (0.1,0)', ' SG_ BatteryLevel : 496|10@1+ (0,0)')
+    database = parse_dbc(text)
+    assert sorted(database.messages) == [0x2F0, 0x18FEF1FE]
+
+
+def test_signals_decode_into_vss_paths():
+    database = parse_dbc(DBC)
+    model = Model.from_file(os.path.join(SHARE_DIR, "toyota.vspec"))
+    mapped = map_signals(database, model, {"Powertrain.VehicleSpeed": "Speed"})
+    assert mapped == 3  # BatteryLevel matches the unique leaf Electronics.Renesas.BatteryLevel
+    assert database.messages[0x40D].signals[0].vss_path == "Electronics.Renesas.BatteryLevel"
+    values = database.decode_vss(CANFrame(0x2F0, bytes([0x39, 0x30, 50, 0, 0, 0, 0, 0]), False, False))
+    assert values == {"Speed": pytest.approx(123.45), "Electronics.Bosch.TemperatureSensor": 10}
+    assert database.decode(database.encode("Speed", 80))["VehicleSpeed"] == pytest.approx(80)
+
+
+def test_compiled_dbc_is_cached(tmp_path):
+    dbc_file = tmp_path / "vendor.dbc"
+    dbc_file.write_text(DBC)
+    cache_dir = str(tmp_path / "cache")
+    first = load_dbc(str(dbc_file), cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    cached = load_dbc(str(dbc_file), cache_dir=cache_dir)
+    assert cached.to_dict() == first.to_dict()
+
+    dbc_file.write_text(DBC.replace("BatteryLevel : 496|10", "BatteryLevel : 496|12"))
+    assert load_dbc(str(dbc_file), cache_dir=cache_dir).messages[0x40D].signals[0].length == 12
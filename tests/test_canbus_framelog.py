@@ -0,0 +1,34 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from vss_lib.canbus.framelog import FrameLog
+
+
+def test_ring_buffer_evicts_oldest_frames():
+    log = FrameLog(capacity=3)
+    for i in range(5):
+        log.append(100.0 + i, 0x100 + i % 2, bytes([i, i]))
+    assert len(log) == 3 and log.total == 5
+    assert log.snapshot() == [(102.0, 0x100, b"\x02\x02"), (103.0, 0x101, b"\x03\x03"), (104.0, 0x100, b"\x04\x04")]
+    assert log.snapshot(1) == [(104.0, 0x100, b"\x04\x04")]
+    assert log.format(2) == ["103.00 101 0303", "104.00 100 0404"]
+
+
+def test_latest_value_per_id_survives_eviction():
+    log = FrameLog(capacity=2)
+    log.append(1.0, 0x2F0, b"\x01")
+    log.append(2.0, 0x300, b"\x02" * 8)
+    log.append(3.0, 0x300, b"\x03" * 64)
+    assert log.latest() == {0x2F0: (1.0, b"\x01"), 0x300: (3.0, b"\x03" * 64)}
+    assert log.latest([0x2F0, 0x123]) == {0x2F0: (1.0, b"\x01")}
+    log.clear()
+    assert len(log) == 0 and log.snapshot() == [] and log.latest() == {}
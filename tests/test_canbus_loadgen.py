@@ -0,0 +1,86 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import errno
+import pytest
+from vss_lib.canbus.loadgen import (CONSTANT, RANDOM, LoadGenerator, TrafficStream, pack_frame, unpack_frame,
+                                    vendor_stream)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeSocket:
+    def __init__(self, clock, refuse_every=None):
+        self.clock = clock
+        self.refuse_every = refuse_every
+        self.frames = []
+
+    def send(self, frame):
+        if self.refuse_every and (len(self.frames) + 1) % self.refuse_every == 0:
+            self.frames.append(None)
+            raise OSError(errno.ENOBUFS, "No buffer space available")
+        self.frames.append((self.clock(), unpack_frame(frame)))
+
+
+def test_frame_packing_round_trip():
+    assert len(pack_frame(0x123, b"\x01\x02")) == 16
+    assert unpack_frame(pack_frame(0x123, b"\x01\x02")) == (0x123, b"\x01\x02", False, False)
+    assert unpack_frame(pack_frame(0x18DAF110, bytes(64), is_fd=True, is_extended_id=True)) == \
+        (0x18DAF110, bytes(64), True, True)
+
+
+def test_vendor_stream_counter_payloads_and_bursts():
+    clock = FakeClock()
+    sock = FakeSocket(clock)
+    stream = vendor_stream("toyota", rate=1000, burst=4, length=2)
+    stats = LoadGenerator("vcan0", [stream], sock=sock, clock=clock, sleep=clock.sleep).run(duration=0.1)
+    assert stats["sent"] == 100 and stats["dropped"] == 0
+    sent = [frame for _, frame in sock.frames]
+    assert [can_id for can_id, *_ in sent[:4]] == [0x2F0, 0x300, 0x40D, 0x2F0]
+    # Every ID counts up independently
+    assert [data for can_id, data, *_ in sent if can_id == 0x300][:3] == [b"\x00\x00", b"\x01\x00", b"\x02\x00"]
+    # Bursts of 4 frames every 4 ms
+    assert sorted({round(at, 6) for at, _ in sock.frames})[:3] == [0.0, 0.004, 0.008]
+
+
+def test_several_streams_and_refused_frames():
+    clock = FakeClock()
+    sock = FakeSocket(clock)
+    streams = [TrafficStream([0x100], 500, pattern=CONSTANT, data=b"\xAA"),
+               TrafficStream([0x200, 0x201], 2000, pattern=RANDOM, seed=7)]
+    stats = LoadGenerator("vcan0", streams, sock=sock, clock=clock, sleep=clock.sleep).run(max_frames=500)
+    assert stats["sent"] == 500
+    assert streams[1].sent == pytest.approx(4 * streams[0].sent, abs=4)
+    assert {frame[1] for _, frame in sock.frames if frame[0] == 0x100} == {b"\xAA"}
+
+    refusing = FakeSocket(clock, refuse_every=10)
+    stats = LoadGenerator("vcan0", streams, sock=refusing, clock=clock, sleep=clock.sleep).run(duration=0.1)
+    assert stats["sent"] + stats["dropped"] == len(refusing.frames) == 250
+    assert stats["dropped"] == 25
+
+
+def test_invalid_streams():
+    with pytest.raises(ValueError):
+        TrafficStream([], 100)
+    with pytest.raises(ValueError):
+        TrafficStream([0x100], 100, length=12)
+    with pytest.raises(ValueError):
+        vendor_stream("unknown", 100)
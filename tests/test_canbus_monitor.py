@@ -0,0 +1,56 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import can
+import pytest
+from vss_lib.canbus.monitor import CAN_SFF_MASK, CANBusMonitor
+from vss_lib.canbus.recorder import FrameRecorder, read_frames
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    monkeypatch.setattr(can.interface, "Bus", lambda channel, bustype: can.Bus(channel, interface="virtual"))
+    monitor = CANBusMonitor("vcan-test")
+    yield monitor
+    monitor.bus.shutdown()
+
+
+def test_vendor_and_message_type_install_bus_filters(monitor):
+    monitor.set_vendor("toyota")
+    assert monitor.accepted_ids == {0x2F0, 0x300, 0x40D}
+    assert monitor.bus.filters == [{"can_id": can_id, "can_mask": CAN_SFF_MASK, "extended": False}
+                                   for can_id in (0x2F0, 0x300, 0x40D)]
+    monitor.set_message_type("engine")
+    assert monitor.accepted_ids == {0x2F0, 0x300}
+    monitor.set_message_type(None)
+    monitor.set_vendor(None)
+    assert monitor.accepted_ids is None and monitor.bus.filters is None
+
+
+def test_user_space_filter_drops_rejected_frames(monitor):
+    monitor.set_vendor("toyota")
+    monitor.set_message_type("transmission")  # 4E0 is not one of toyota's IDs
+    assert monitor.accepted_ids == frozenset()
+    monitor.process_message(can.Message(timestamp=1.0, arbitration_id=0x4E0, data=b"\x01"))
+    monitor.set_message_type("radio")
+    monitor.process_message(can.Message(timestamp=2.0, arbitration_id=0x2F0, data=b"\x02"))
+    monitor.process_message(can.Message(timestamp=3.0, arbitration_id=0x40D, data=b"\x03"))
+    assert monitor.snapshot() == [(3.0, 0x40D, b"\x03")]
+
+
+def test_accepted_frames_are_recorded(monitor, tmp_path):
+    path = str(tmp_path / "monitor.canlog")
+    with FrameRecorder(path) as monitor.recorder:
+        monitor.set_vendor("bmw")
+        monitor.process_message(can.Message(timestamp=1.0, arbitration_id=0x1D0, data=b"\x01"))
+        monitor.process_message(can.Message(timestamp=2.0, arbitration_id=0x2F0, data=b"\x02"))
+    assert [(frame.timestamp, frame.arbitration_id) for frame in read_frames(path)] == [(1.0, 0x1D0)]
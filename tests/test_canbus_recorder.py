@@ -0,0 +1,88 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import can
+from vss_lib.canbus.recorder import (FrameRecorder, FrameReplayer, LoggedFrame, convert, open_frames, read_candump,
+                                     read_frames)
+
+FRAMES = [
+    LoggedFrame(10.0, 0x2F0, b"\x01\x02"),
+    LoggedFrame(10.25, 0x18DAF110, b"\xAA" * 8, is_extended_id=True),
+    LoggedFrame(10.5, 0x40D, bytes(range(64)), is_fd=True),
+]
+
+
+def test_native_log_round_trip_across_chunks(tmp_path):
+    path = str(tmp_path / "drive.canlog")
+    with FrameRecorder(path, buffer_size=16) as recorder:
+        for frame in FRAMES:
+            recorder.record(frame)
+    assert recorder.count == 3
+    # A chunk smaller than one record makes every record span chunks
+    assert list(read_frames(path, chunk_size=5)) == FRAMES
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 7)  # Interrupted record
+    assert list(read_frames(path)) == FRAMES
+
+
+def test_candump_and_blf_conversion(tmp_path):
+    native = str(tmp_path / "drive.canlog")
+    candump = str(tmp_path / "drive.log")
+    with FrameRecorder(native) as recorder:
+        for frame in FRAMES:
+            recorder.record(frame)
+    assert convert(native, candump) == 3
+    with open(candump) as f:
+        lines = f.read().splitlines()
+    assert lines[:2] == ["(10.000000) vcan0 2F0#0102", "(10.250000) vcan0 18DAF110#AAAAAAAAAAAAAAAA"]
+    assert [frame._replace(channel=None) for frame in read_candump(candump)] == FRAMES
+
+    blf = str(tmp_path / "drive.blf")
+    assert convert(candump, blf) == 3
+    back = str(tmp_path / "back.canlog")
+    assert convert(blf, back) == 3
+    assert [(f.arbitration_id, f.data, f.is_fd, f.is_extended_id) for f in open_frames(back)] == \
+        [(f.arbitration_id, f.data, f.is_fd, f.is_extended_id) for f in FRAMES]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds + 0.001  # Oversleep by 1 ms
+
+
+class FakeBus:
+    def __init__(self, clock):
+        self.clock = clock
+        self.sent = []
+
+    def send(self, msg):
+        assert isinstance(msg, can.Message)
+        self.sent.append((self.clock(), msg.arbitration_id))
+
+
+def test_replay_timing_and_statistics():
+    clock = FakeClock()
+    bus = FakeBus(clock)
+    stats = FrameReplayer(bus, speed=2.0, clock=clock, sleep=clock.sleep).replay(iter(FRAMES))
+    assert [can_id for _, can_id in bus.sent] == [0x2F0, 0x18DAF110, 0x40D]
+    assert [round(at, 4) for at, _ in bus.sent] == [0.0, 0.126, 0.251]
+    assert stats["sent"] == 3
+    assert round(stats["jitter_max_ms"], 3) == 1.0
+
+    fast = FrameReplayer(FakeBus(clock), speed=None, clock=clock, sleep=clock.sleep)
+    assert fast.replay(FRAMES)["jitter_max_ms"] == 0.0
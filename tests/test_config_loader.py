@@ -0,0 +1,51 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+from vss_lib.config_loader import ConfigCache, TomlDecodeError
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "vss.config"
+    path.write_text('[vehicle_toyota]\nvendor = "toyota"\n')
+    return str(path)
+
+
+def test_config_parsed_once(config_file):
+    cache = ConfigCache()
+    first = cache.get(config_file)
+    assert first["vehicle_toyota"]["vendor"] == "toyota"
+    assert cache.get(config_file) is first
+    assert cache.get(config_file) is first
+    assert cache.stats() == {"parses": 1, "parses_avoided": 2}
+
+
+def test_config_reparsed_on_change(config_file):
+    cache = ConfigCache()
+    cache.get(config_file)
+    with open(config_file, "w") as file:
+        file.write('[vehicle_bmw]\nvendor = "bmw"\n')
+    os.utime(config_file, ns=(1, 1))
+    assert "vehicle_bmw" in cache.get(config_file)
+    assert cache.parses == 2
+
+
+def test_config_errors(tmp_path):
+    cache = ConfigCache()
+    with pytest.raises(FileNotFoundError):
+        cache.get(str(tmp_path / "missing.config"))
+    broken = tmp_path / "broken.config"
+    broken.write_text("[global\n")
+    with pytest.raises(TomlDecodeError):
+        cache.get(str(broken))
@@ -0,0 +1,72 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from vss_lib.dbus.batching import SignalBuffer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def batches():
+    return []
+
+
+@pytest.fixture
+def armed():
+    return []
+
+
+@pytest.fixture
+def buffer(batches, armed, clock):
+    return SignalBuffer(batches.append, max_size=3, max_delay=0.010, arm=armed.append, clock=clock)
+
+
+def test_flushes_when_full(buffer, batches):
+    buffer.extend([("a", 1), ("b", 2), ("c", 3), ("d", 4)], timestamp=42)
+    assert batches == [[("a", 1.0, 42), ("b", 2.0, 42), ("c", 3.0, 42)]]
+    assert len(buffer) == 1
+    assert (buffer.batches, buffer.signals) == (1, 3)
+
+
+def test_flushes_after_the_interval(buffer, batches, armed, clock):
+    buffer.add("a", 1, timestamp=1)
+    buffer.add("b", 2, timestamp=2)
+    assert armed == [0.010]  # Armed once for the oldest value
+
+    clock.now += 0.004
+    buffer.expire()
+    assert batches == []
+    assert armed[-1] == pytest.approx(0.006)  # Re-armed for the remaining wait
+
+    clock.now += 0.006
+    buffer.expire()
+    assert batches == [[("a", 1.0, 1), ("b", 2.0, 2)]]
+    assert len(buffer) == 0
+
+
+def test_timestamped_entries_keep_their_time(buffer, batches):
+    buffer.extend_timestamped([("Speed", 80, 1700000000000000)])
+    assert buffer.flush() == 1
+    assert batches == [[("Speed", 80.0, 1700000000000000)]]
+    assert buffer.flush() == 0
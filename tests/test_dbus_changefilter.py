@@ -0,0 +1,89 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from vss_lib.dbus.changefilter import ChangeFilter, Deadband
+
+MS = 1000  # Timestamps are in microseconds
+
+
+@pytest.fixture
+def change_filter():
+    change_filter = ChangeFilter(keyframe_interval=1000)
+    change_filter.configure("toyota", {
+        "Speed": {"absolute": 0.5},
+        "Cabin": {"relative": 0.1, "min_interval": 100, "keyframe": 0},
+    }, prefix="toyota")
+    return change_filter
+
+
+def test_unchanged_values_are_suppressed_until_the_keyframe(change_filter):
+    accept = change_filter.accept
+    assert accept("toyota.Gear", 3, 0)
+    assert not accept("toyota.Gear", 3, 10 * MS)
+    assert accept("toyota.Gear", 4, 20 * MS)
+    assert not accept("toyota.Gear", 4, 1019 * MS)
+    assert accept("toyota.Gear", 4, 1020 * MS)  # Keyframe
+    assert change_filter.stats() == {"emitted": 3, "suppressed": 2, "keyframes": 1, "saved_percent": 40.0}
+
+
+def test_branch_rules_thresholds_and_minimum_interval(change_filter):
+    accept = change_filter.accept
+    assert change_filter.rule_for("toyota.Cabin.Door.IsOpen").relative == 0.1
+    assert change_filter.rule_for("bmw.Speed").absolute == 0.0
+    # Absolute deadband of 0.5
+    assert accept("toyota.Speed", 100.0, 0)
+    assert not accept("toyota.Speed", 100.4, 1 * MS)
+    assert accept("toyota.Speed", 100.6, 2 * MS)
+    # Relative deadband of 10% and at most one value per 100 ms, no keyframes
+    assert accept("toyota.Cabin.Temperature", 20.0, 0)
+    assert not accept("toyota.Cabin.Temperature", 30.0, 50 * MS)
+    assert not accept("toyota.Cabin.Temperature", 21.5, 150 * MS)
+    assert accept("toyota.Cabin.Temperature", 22.5, 200 * MS)
+    assert not accept("toyota.Cabin.Temperature", 22.5, 60000 * MS)
+
+
+def test_change_held_back_by_the_minimum_interval_is_emitted_later():
+    change_filter = ChangeFilter()
+    change_filter.configure("toyota", {"Door": {"min_interval": 100}}, prefix="toyota")
+    accept = change_filter.accept
+    assert accept("toyota.Door", 0, 0)
+    assert accept("toyota.Door", 1, 200 * MS)
+    assert not accept("toyota.Door", 0, 250 * MS)
+    assert change_filter.next_due() == 300 * MS
+    assert change_filter.due(299 * MS) == []
+    assert change_filter.due(300 * MS) == [("toyota.Door", 0, 250 * MS)]
+    # A change that is undone before the interval passed is not emitted
+    assert not accept("toyota.Door", 1, 350 * MS)
+    assert not accept("toyota.Door", 0, 360 * MS)
+    assert change_filter.due(400 * MS) == []
+
+
+def test_keyframes_are_due_without_new_values(change_filter):
+    assert change_filter.accept("toyota.Gear", 3, 0)
+    assert change_filter.accept("toyota.Cabin.Light", 1, 0)  # No keyframes for Cabin
+    assert change_filter.next_due() == 1000 * MS
+    assert change_filter.due(999 * MS) == []
+    assert change_filter.due(1000 * MS) == [("toyota.Gear", 3, 1000 * MS)]
+    assert not change_filter.accept("toyota.Gear", 3, 1500 * MS)
+    assert change_filter.due(2000 * MS) == [("toyota.Gear", 3, 2000 * MS)]
+    assert change_filter.stats()["keyframes"] == 2
+    change_filter.forget("toyota.Gear")
+    assert change_filter.due(5000 * MS) == []
+
+
+def test_disabled_filter_and_invalid_rules():
+    change_filter = ChangeFilter(enabled=False)
+    assert change_filter.filter([("Speed", 1.0, 0), ("Speed", 1.0, 1)]) == [("Speed", 1.0, 0), ("Speed", 1.0, 1)]
+    assert change_filter.configure("bmw", {"Speed": {"absolut": 1}, "Gear": {"absolute": 1}}) == 1
+    with pytest.raises(ValueError):
+        Deadband.from_config({"window": 10})
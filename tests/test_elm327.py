@@ -0,0 +1,105 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import pytest
+
+pytest.importorskip("serial")
+
+from vss_lib.elm327 import ELM327, parse_response  # noqa: E402
+from vss_lib.elm327.emulator import FakeELM327  # noqa: E402
+
+
+@pytest.fixture
+def fake():
+    with FakeELM327(latency=0.01) as fake:
+        yield fake
+
+
+@pytest.fixture
+def elm(fake):
+    elm = ELM327(fake.port, timeout=1)
+    yield elm
+    elm.close()
+
+
+def test_parse_response_drops_echo_status_and_prompt():
+    assert parse_response(b"010C\r\nSEARCHING...\r\n41 0C 1A F8\r\n\r\n>", b"010C\r") == ["41 0C 1A F8"]
+    assert parse_response(b"0142\rNO DATA\r\r>", b"0142\r") == []
+    assert parse_response(b"014\r0: 49 02 01 31 44 34\r1: 47 50 30 30 52 35 35\r\r>") == \
+        ["014", "0: 49 02 01 31 44 34", "1: 47 50 30 30 52 35 35"]
+    with pytest.raises(ValueError):
+        parse_response(b"ATXX\r?\r\r>", b"ATXX\r")
+    with pytest.raises(ConnectionError, match="UNABLE TO CONNECT"):
+        parse_response(b"010C\rSEARCHING...\rUNABLE TO CONNECT\r\r>", b"010C\r")
+
+
+def test_getters_answer_at_the_prompt(fake, elm):
+    assert elm.initialize() == "ELM327 v1.5"
+    start = time.monotonic()
+    assert elm.get_rpm() == "41 0C 1A F8"
+    assert elm.get_speed() == "41 0D 32"
+    assert elm.get_coolant_temperature() == "41 05 7B"
+    assert elm.get_battery_voltage() == "12.6V"
+    # Three ECU round trips of 10 ms, not three seconds
+    assert time.monotonic() - start < 0.5
+    assert elm.send_command(b"0142\r") == []
+    assert fake.commands[:3] == ["ATZ", "ATE0", "ATL0"]
+
+
+def test_long_multi_line_responses_are_not_truncated():
+    dtcs = [f"43 {i:02X} 01 33 02 21 03 44" for i in range(40)]
+    with FakeELM327({"03": dtcs}) as fake:
+        elm = ELM327(fake.port)
+        assert elm.get_vin().splitlines()[0] == "014"
+        assert elm.check_dtc().splitlines() == dtcs
+        elm.close()
+
+
+def test_response_deadline_and_protocol_search():
+    with FakeELM327(latency=0.3, search_delay=0.2) as fake:
+        elm = ELM327(fake.port, timeout=0.2)
+        # SEARCHING... extends the deadline of the first request
+        assert elm.get_rpm() == "41 0C 1A F8"
+        with pytest.raises(TimeoutError):
+            elm.get_speed()
+        # The late answer of the timed out request is not taken for the next one
+        time.sleep(0.35)
+        assert elm.send_command(b"ATRV\r") == ["12.6V"]
+        elm.close()
+
+
+def test_query_many_batches_pids_and_splits_ecus():
+    with FakeELM327(ecus={"7E9": {"010D": "41 0D 30"}}) as fake:
+        elm = ELM327(fake.port)
+        elm.initialize()
+        pids = [0x0C, 0x0D, 0x05, 0x0F, 0x11, 0x04, 0x2F]
+        values = elm.query_many(pids, responses=2)
+        assert values[0x0C] == 1726.0 and values[0x2F] == 60.0 and len(values) == 7
+        # Six PIDs per request, with the number of responses to wait for
+        assert fake.commands[-2:] == ["010C0D050F11042", "012F2"]
+        elm.show_headers()
+        elm.set_spaces(False)
+        by_ecu = elm.query_many([0x0C, 0x0D], by_ecu=True)
+        assert by_ecu == {"7E8": {0x0C: 1726.0, 0x0D: 50.0}, "7E9": {0x0D: 48.0}}
+        elm.close()
+
+
+def test_typed_readers_reassemble_vin_and_dtcs(elm):
+    elm.initialize()
+    assert elm.read_pid(0x0C) == 1726.0
+    assert elm.read_pid(0x03) == 0x0200
+    assert elm.read_supported_pids()[:6] == [0x01, 0x03, 0x04, 0x05, 0x06, 0x07]
+    assert elm.read_vin() == "1D4GP00R55B123456"
+    assert elm.read_dtcs() == ["P0133"]
+    elm.show_headers()
+    assert elm.read_vin() == "1D4GP00R55B123456"
@@ -0,0 +1,101 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import pytest
+
+pytest.importorskip("serial")
+
+from vss_lib.elm327.aio import AsyncELM327  # noqa: E402
+from vss_lib.elm327.emulator import FakeELM327  # noqa: E402
+
+PIDS = [0x0C, 0x0D, 0x05, 0x0F, 0x11, 0x04, 0x2F]
+
+
+def test_concurrent_requests_are_queued_and_answered_in_order():
+    async def main():
+        with FakeELM327(latency=0.001) as fake:
+            async with AsyncELM327(fake.port) as elm:
+                results = await asyncio.gather(*(elm.read_pid(PIDS[i % len(PIDS)]) for i in range(200)))
+                vin, dtcs = await asyncio.gather(elm.read_vin(), elm.read_dtcs())
+                assert elm.answered == 202 and elm.timeouts == 0
+            requests = [command for command in fake.commands if not command.startswith("AT")]
+        assert results[:3] == [1726.0, 50.0, 83.0] and results[7] == 1726.0
+        assert requests[:200] == [f"01{PIDS[i % len(PIDS)]:02X}" for i in range(200)]
+        assert vin == "1D4GP00R55B123456" and dtcs == ["P0133"]
+
+    asyncio.run(main())
+
+
+def test_timed_out_command_is_retried_after_a_reset():
+    async def main():
+        with FakeELM327() as fake:
+            async with AsyncELM327(fake.port, timeout=0.2) as elm:
+                await elm.show_headers()
+                fake.unanswered = 1
+                values = await asyncio.gather(elm.query_many([0x0C], by_ecu=True), elm.read_pid(0x0D))
+                assert values == [{"7E8": {0x0C: 1726.0}}, 50.0]
+                assert elm.timeouts == 1 and elm.resets == 1
+                # Headers were switched on again after the reset
+                assert fake.commands[-6:] == ["ATZ", "ATE0", "ATL0", "ATH1", "010C", "010D"]
+                fake.unanswered = 10
+                with pytest.raises(TimeoutError):
+                    await elm.read_pid(0x0C)
+                assert elm.timeouts == 4
+
+    asyncio.run(main())
+
+
+def test_adapter_restarting_by_itself_is_initialized_again():
+    async def main():
+        with FakeELM327() as fake:
+            async with AsyncELM327(fake.port) as elm:
+                await elm.set_spaces(False)
+                fake.reboot()
+                await asyncio.sleep(0.05)
+                assert await elm.query(b"010D\r") == "410D32"
+                fake.reboot()
+                assert await elm.query(b"010D\r") == "410D32"
+                assert elm.resets == 2 and not elm.spaces
+
+    asyncio.run(main())
+
+
+def test_queued_commands_survive_a_reconnect(tmp_path):
+    async def main():
+        with FakeELM327(link=str(tmp_path / "elm327")) as fake:
+            async with AsyncELM327(fake.port) as elm:
+                await elm.show_headers()
+                futures = [elm.submit(b"010C\r") for _ in range(20)]
+                await futures[0]
+                await asyncio.to_thread(fake.hangup, 0.3)
+                responses = await asyncio.gather(*futures)
+                assert elm.reconnects == 1 and elm.headers
+                assert all(lines == ["7E8 04 41 0C 1A F8 AA AA AA"] for lines in responses)
+            assert fake.commands[:4] == ["ATZ", "ATE0", "ATL0", "ATH1"]
+
+    asyncio.run(main())
+
+
+def test_close_fails_the_queued_commands():
+    async def main():
+        with FakeELM327(latency=0.05) as fake:
+            elm = AsyncELM327(fake.port)
+            await elm.start()
+            futures = [elm.submit(b"010C\r") for _ in range(5)]
+            await asyncio.sleep(0.01)
+            await elm.close()
+            for future in futures:
+                with pytest.raises(ConnectionError):
+                    await future
+
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from vss_lib.elm327.obd import PIDS, bitmap_pids, decode_dtcs, decode_pids, decode_vin, format_dtc, parse_can_frames
+from vss_lib.elm327.signals import OBDSignalMap, load_obd_model
+
+
+@pytest.fixture(scope="module")
+def model():
+    return load_obd_model()
+
+
+def test_decoded_values_are_typed():
+    values = decode_pids(bytes.fromhex("410C1AF8050003020000BE3FA813"))
+    assert values == {0x0C: 1726.0, 0x05: 0.0 - 40.0, 0x03: 0x0200, 0x00: 0xBE3FA813}
+    assert isinstance(values[0x0C], float) and isinstance(values[0x00], int)
+    # The output dict is reused across calls
+    out = {}
+    assert decode_pids(bytes.fromhex("410D32"), out) is out and out == {0x0D: 50.0}
+    # A truncated pair is dropped
+    assert decode_pids(bytes.fromhex("410D320C1A")) == {0x0D: 50.0}
+
+
+def test_supported_pid_bitmaps():
+    assert bitmap_pids(0x00, 0xBE3FA813) == [0x01, 0x03, 0x04, 0x05, 0x06, 0x07, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F, 0x10,
+                                             0x11, 0x13, 0x15, 0x1C, 0x1F, 0x20]
+    assert bitmap_pids(0x20, 0x80000001) == [0x21, 0x40]
+    assert bitmap_pids(0x40, 0) == []
+
+
+def test_vin_of_can_and_legacy_responses():
+    lines = ["7E8 10 14 49 02 01 31 44 34", "7E8 21 47 50 30 30 52 35 35", "7E8 22 42 31 32 33 34 35 36"]
+    assert decode_vin(payload for _, payload in parse_can_frames(lines, headers=True)) == "1D4GP00R55B123456"
+    # ISO 9141 / KWP: five numbered messages of four bytes, the first padded
+    legacy = ["49 02 02 44 34 47 50", "49 02 01 00 00 00 31", "49 02 03 30 30 52 35", "49 02 04 35 42 31 32",
+              "49 02 05 33 34 35 36"]
+    assert decode_vin(bytes.fromhex(line) for line in legacy) == "1D4GP00R55B123456"
+    assert decode_vin([bytes.fromhex("7F0912")]) is None
+
+
+def test_dtcs_of_can_and_legacy_responses():
+    assert format_dtc(0x01, 0x33) == "P0133" and format_dtc(0x42, 0x21) == "C0221" and format_dtc(0xC1, 0x00) == "U0100"
+    assert decode_dtcs([bytes.fromhex("4302013381A4")]) == ["P0133", "B01A4"]
+    assert decode_dtcs([bytes.fromhex("43013300000000"), bytes.fromhex("43000000000000")]) == ["P0133"]
+    assert decode_dtcs([bytes.fromhex("4300")]) == []
+
+
+def test_every_pid_maps_to_a_typed_signal(model):
+    signals = OBDSignalMap(model)
+    assert set(signals.names) == set(PIDS)
+    assert signals.specs[0x0C].unit == "rpm" and signals.specs[0x00].datatype == "uint32"
+    assert signals.entry(0x0C, 1726.0, 1) == ("OBD.EngineSpeed", 1726.0, 1)
+    name, value, _ = signals.entry(0x00, 0xBE3FA813, 1)
+    assert name == "OBD.PidsA" and type(value) is int
+
+
+def test_out_of_range_values_are_rejected(model):
+    signals = OBDSignalMap(model, pids=[0x0D, 0x05], prefix="toyota")
+    entries = signals.entries({0x0D: 50.0, 0x05: 300.0, 0x0C: 800.0}, 7)
+    assert entries == [("toyota.OBD.Speed", 50.0, 7)]
+    assert signals.rejected == 1
@@ -0,0 +1,123 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from vss_lib.elm327.obd import build_request, decode_pids, parse_can_frames
+from vss_lib.elm327.poller import PIDPoller
+from vss_lib.elm327.signals import OBDSignalMap, load_obd_model
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeAdapter:
+    def __init__(self, clock, latency=0.02):
+        self.clock = clock
+        self.latency = latency
+        self.batches = []
+
+    def query_many(self, pids, responses=None):
+        self.clock.now += self.latency
+        self.batches.append(list(pids))
+        return {pid: float(pid) for pid in pids}
+
+
+def test_build_request():
+    assert build_request([0x0C, 0x0D, 0x05]) == b"010C0D05\r"
+    assert build_request([0x0C], responses=1) == b"010C1\r"
+    with pytest.raises(ValueError):
+        build_request([0x0C, 0x0D, 0x05, 0x0F, 0x11, 0x04, 0x2F])
+    with pytest.raises(ValueError):
+        build_request([0x99])
+
+
+def test_parse_multi_pid_responses_of_several_ecus():
+    lines = ["7E8 10 0E 41 0C 1A F8 0D 32", "7E9 05 41 0D 30 05 70 AA AA",
+             "7E8 21 05 7B 0F 46 11 33 04", "7E8 22 80 AA AA AA AA AA AA"]
+    messages = parse_can_frames(lines, headers=True)
+    assert [header for header, _ in messages] == ["7E9", "7E8"]
+    engine = decode_pids(messages[1][1])
+    assert engine[0x0C] == 1726.0 and engine[0x0D] == 50.0 and engine[0x05] == 83.0 and engine[0x04] == pytest.approx(128 * 100.0 / 255)
+    assert decode_pids(messages[0][1]) == {0x0D: 48.0, 0x05: 72.0}
+    # Headers and spaces off, ISO-TP lines numbered by the ELM327
+    messages = parse_can_frames(["00E", "0:410C1AF80D32", "1:057B0F46113304", "2:80"])
+    assert messages == [(None, bytes.fromhex("410C1AF80D32057B0F4611330480"))]
+    # A negative response carries no values
+    assert decode_pids(bytes.fromhex("7F0112")) == {}
+
+
+def test_poller_samples_pids_at_their_rates():
+    clock = FakeClock()
+    adapter = FakeAdapter(clock)
+    entries = []
+    poller = PIDPoller(adapter, {0x0C: 20, 0x0D: 10, 0x05: 1}, entries.extend, prefix="toyota",
+                       clock=clock, sleep=clock.sleep)
+    stats = poller.run(duration=10)
+    rates = {pid: pid_stats["samples_per_s"] for pid, pid_stats in stats["pids"].items()}
+    assert rates[0x0C] == pytest.approx(20, rel=0.05)
+    assert rates[0x0D] == pytest.approx(10, rel=0.05)
+    assert rates[0x05] == pytest.approx(1, rel=0.15)
+    # Slow PIDs ride along in the requests of the fast one
+    assert stats["requests"] == pytest.approx(200, rel=0.05)
+    assert entries[0][:2] == ("toyota.OBD.EngineSpeed", 12.0)
+    assert {path for path, _, _ in entries} == {"toyota.OBD.EngineSpeed", "toyota.OBD.Speed",
+                                                "toyota.OBD.CoolantTemperature"}
+
+
+def test_overloaded_poller_keeps_relative_rates():
+    clock = FakeClock()
+    adapter = FakeAdapter(clock, latency=0.05)
+    rates = {0x0C: 100, 0x0D: 50, 0x05: 50, 0x0F: 50, 0x11: 50, 0x04: 50, 0x10: 50, 0x0B: 25}
+    stats = PIDPoller(adapter, rates, lambda entries: None, clock=clock, sleep=clock.sleep).run(duration=20)
+    achieved = {pid: pid_stats["samples_per_s"] for pid, pid_stats in stats["pids"].items()}
+    # 20 requests/s of 6 PIDs for 8.5x more demand
+    assert stats["requests_per_s"] == pytest.approx(20, rel=0.01)
+    assert all(len(batch) == 6 for batch in adapter.batches)
+    # The fastest PID is in every request, the others share the rest in proportion to their rates
+    assert achieved[0x0C] == pytest.approx(20, rel=0.01)
+    assert achieved[0x0D] == pytest.approx(achieved[0x11], rel=0.05)
+    assert achieved[0x0D] == pytest.approx(2 * achieved[0x0B], rel=0.05)
+
+
+def test_poller_emits_typed_signals_of_the_model():
+    clock = FakeClock()
+    entries = []
+    signals = OBDSignalMap(load_obd_model(), prefix="toyota")
+    poller = PIDPoller(FakeAdapter(clock), {0x0C: 10, 0x0D: 10, 0x00: 1}, entries.extend, signals=signals,
+                       clock=clock, sleep=clock.sleep)
+    poller.poll()
+    assert entries[0][:2] == ("toyota.OBD.EngineSpeed", 12.0)
+    # 0x0D (13 km/h) is in range; 0.0 as PidsA is cast to the uint32 of the signal
+    types = [(name, type(value)) for name, value, _ in entries[1:]]
+    assert types == [("toyota.OBD.Speed", float), ("toyota.OBD.PidsA", int)]
+    with pytest.raises(ValueError):
+        PIDPoller(FakeAdapter(clock), {0x0C: 10}, entries.extend, signals=OBDSignalMap(load_obd_model(), pids=[0x0D]))
+
+
+def test_poller_skips_pids_the_vehicle_does_not_support():
+    clock = FakeClock()
+    adapter = FakeAdapter(clock)
+    poller = PIDPoller(adapter, {0x0C: 10, 0x0A: 10, 0x5C: 1}, lambda entries: None, supported=[0x00, 0x0C, 0x0D],
+                       clock=clock, sleep=clock.sleep)
+    poller.run(duration=1)
+    assert poller.unsupported == [0x0A, 0x5C]
+    assert {pid for batch in adapter.batches for pid in batch} == {0x0C}
+    with pytest.raises(ValueError):
+        PIDPoller(adapter, {0x0A: 1}, lambda entries: None, supported=[0x0C])
@@ -0,0 +1,96 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pytest
+
+pytest.importorskip("serial")
+
+from vss_lib.elm327 import ELM327  # noqa: E402
+from vss_lib.elm327.elm327 import protocol_number  # noqa: E402
+from vss_lib.elm327.emulator import FakeELM327  # noqa: E402
+from vss_lib.elm327.vehicles import CACHE_FILE, VehicleCache, identify_vehicle  # noqa: E402
+
+VIN = "1D4GP00R55B123456"
+
+
+def connect(fake):
+    elm = ELM327(fake.port)
+    elm.initialize()
+    return elm
+
+
+def test_supported_pids_follow_the_bitmap_chain():
+    with FakeELM327() as fake:
+        elm = connect(fake)
+        supported = elm.discover_supported_pids()
+        elm.close()
+    assert supported[:3] == [0x00, 0x01, 0x03] and 0x1F in supported
+    assert [pid for pid in supported if pid >= 0x20] == [0x20, 0x21, 0x2F, 0x31, 0x33, 0x40, 0x42, 0x46, 0x5C, 0x5E]
+    # PID 40 does not report PID 60, so its bitmap is not requested
+    assert [command for command in fake.commands if command.endswith(("00", "20", "40", "60"))] == [
+        "0100", "0120", "0140"]
+
+
+def test_known_vehicle_skips_the_protocol_search_and_discovery(tmp_path, vss_cache_dir):
+    port = str(tmp_path / "elm327")
+    with FakeELM327(link=port) as fake:
+        elm = connect(fake)
+        vehicle = identify_vehicle(elm)
+        elm.close()
+    assert vehicle.vin == VIN and vehicle.protocol == "6" and not vehicle.cached
+    assert fake.searches == 1 and 0x5E in vehicle.supported
+
+    with FakeELM327(link=port) as fake:
+        elm = connect(fake)
+        again = identify_vehicle(elm)
+        elm.close()
+    assert again == vehicle._replace(cached=True)
+    assert fake.searches == 0 and "ATSPA6" in fake.commands
+    assert not [command for command in fake.commands if command in ("0100", "0120", "0140")]
+    stored = json.loads((vss_cache_dir / CACHE_FILE).read_text())
+    assert stored["ports"][port] == {"vin": VIN, "protocol": "6"}
+
+
+def test_other_vehicle_on_the_port_is_searched_and_discovered(tmp_path):
+    port = str(tmp_path / "elm327")
+    cache = VehicleCache(str(tmp_path / "vehicles.json"))
+    cache.remember(port, VIN, "A6")
+    cache.store(VIN, "6", [0x00, 0x0C])
+    with FakeELM327(link=port, protocol="7") as fake:
+        elm = connect(fake)
+        vehicle = identify_vehicle(elm, cache)
+        elm.close()
+    assert vehicle.protocol == "7" and not vehicle.cached and fake.searches == 1
+    assert VehicleCache(cache.path).last_protocol(port) == "7"
+
+
+def test_unreadable_cache_is_ignored(tmp_path):
+    path = tmp_path / "vehicles.json"
+    path.write_text("{not json")
+    cache = VehicleCache(str(path))
+    assert cache.supported_pids(VIN, "6") is None
+    cache.store(VIN, "A6", [0x0D, 0x0C])
+    assert cache.save() and VehicleCache(str(path)).supported_pids(VIN, "6") == [0x0C, 0x0D]
+
+
+def test_protocol_a_is_kept_as_sae_j1939(tmp_path):
+    assert [protocol_number(p) for p in ("A6", "6", "AA", "A", " a8 ")] == ["6", "6", "A", "A", "8"]
+    with FakeELM327(protocol="A") as fake:
+        elm = connect(fake)
+        elm.set_protocol("AA", fallback=False)
+        assert fake.protocol_setting == "A" and elm.describe_protocol() == "A"
+        elm.set_protocol("A")
+        assert fake.protocol_setting == "AA"
+    cache = VehicleCache(str(tmp_path / "vehicles.json"))
+    cache.store(VIN, "AA", [0x0C])
+    assert cache.supported_pids(VIN, "A") == [0x0C] and cache.supported_pids(VIN, "0") is None
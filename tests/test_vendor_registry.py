@@ -0,0 +1,71 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from vss_lib.vendor_registry import VendorRegistry, namespaced, vendor_settings
+
+
+class ModelOnlyInterface:
+    """
+    Stands in for VehicleSignalInterface without starting containers.
+    """
+    barrier = None
+
+    def __init__(self, vendor, vspec_file, preference=None, attached_electronics=None):
+        if vendor == "broken":
+            raise ValueError(f"Model not found for {vendor}")
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        self.vendor = vendor.lower()
+        self.vspec_file = vspec_file
+
+
+def test_vendor_settings_interpolates_vspec_path():
+    values = {'vendor': 'toyota', 'vspec_file': '${vspec_path}/toyota.vspec', 'attach_electronics': ['bosch']}
+    assert vendor_settings(values, '/usr/share/vss-lib') == ('toyota', '/usr/share/vss-lib/toyota.vspec', None, ['bosch'])
+    assert namespaced('toyota', 'Speed') == 'toyota.Speed'
+
+
+def test_all_vendors_are_served():
+    registry = VendorRegistry(factory=ModelOnlyInterface)
+    loaded = registry.load([('Toyota', 't.vspec', None, []), ('bmw', 'b.vspec', None, [])])
+    assert list(loaded) == ['Toyota', 'bmw']
+    assert registry.vendors() == ['toyota', 'bmw']
+    assert registry.get('TOYOTA').vspec_file == 't.vspec'
+    assert 'bmw' in registry and len(registry) == 2
+
+
+def test_vendors_initialize_in_parallel():
+    # Each vendor blocks until all of them are initializing at the same time
+    vendors = [(f"vendor{i}", f"{i}.vspec", None, []) for i in range(12)]
+    ModelOnlyInterface.barrier = threading.Barrier(len(vendors))
+    try:
+        registry = VendorRegistry(factory=ModelOnlyInterface, max_workers=len(vendors))
+        assert len(registry.load(vendors)) == len(vendors)
+    finally:
+        ModelOnlyInterface.barrier = None
+
+
+def test_failing_vendor_does_not_stop_the_others():
+    registry = VendorRegistry(factory=ModelOnlyInterface)
+    registry.load([('broken', 'x.vspec', None, []), ('ford', 'f.vspec', None, [])])
+    assert registry.vendors() == ['ford']
+
+
+def test_snapshot_is_not_mutated_by_later_changes():
+    registry = VendorRegistry(factory=ModelOnlyInterface)
+    registry.load([('ford', 'f.vspec', None, [])])
+    snapshot = registry.snapshot()
+    registry.add('gm', ModelOnlyInterface('gm', 'g.vspec'))
+    registry.remove('ford')
+    assert list(snapshot) == ['ford']
+    assert registry.vendors() == ['gm']
@@ -0,0 +1,74 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+from vss_lib.vspec import cache
+from vss_lib.vspec.model import Model
+
+VSPEC_DIR = os.path.join(os.path.dirname(__file__), "..", "usr", "share", "vss-lib")
+
+
+def test_model_round_trips_through_cache(tmp_path):
+    vspec_file = str(tmp_path / "bosch.vspec")
+    shutil.copy(os.path.join(VSPEC_DIR, "electronics", "bosch.vspec"), vspec_file)
+
+    parsed = Model.from_file(vspec_file)
+    assert os.path.exists(cache.cache_path(vspec_file))
+
+    cached = Model.from_file(vspec_file)
+    assert isinstance(cached.table.mins, memoryview)
+    assert list(cached.index) == list(parsed.index)
+    for path, spec in parsed.index.items():
+        assert dict(cached.index[path]) == dict(spec)
+    assert cached.find("Electronics.Bosch.TemperatureSensor")["max"] == 125
+
+
+def test_cached_tree_keeps_yaml_types(tmp_path):
+    vspec_file = str(tmp_path / "car.vspec")
+    with open(vspec_file, "w") as file:
+        file.write("Vehicle:\n  Speed: {datatype: float, min: 0, max: 100}\n"
+                   "  Gears: {1: first, 2: second}\n  Released: 2024-05-01\n")
+    cold = Model.from_file(vspec_file)
+    warm = Model.from_file(vspec_file)
+    assert warm.tree is not None
+    assert warm.vspec_data == cold.vspec_data
+    assert warm.vspec_data["Vehicle"]["Gears"] == {1: "first", 2: "second"}
+    assert warm.find("Speed") == {"datatype": "float", "min": 0, "max": 100}
+
+
+def test_cache_invalidated_on_content_change(tmp_path):
+    vspec_file = str(tmp_path / "car.vspec")
+    with open(vspec_file, "w") as file:
+        file.write("Vehicle:\n  Speed:\n    datatype: float\n    min: 0\n    max: 100\n")
+    assert Model.from_file(vspec_file).lookup("Speed").max == 100
+
+    with open(vspec_file, "w") as file:
+        file.write("Vehicle:\n  Speed:\n    datatype: float\n    min: 0\n    max: 200\n")
+    os.utime(vspec_file, ns=(0, 0))
+    assert cache.read_cache(vspec_file) is None
+    assert Model.from_file(vspec_file).lookup("Speed").max == 200
+
+
+def test_cache_survives_touch(tmp_path):
+    vspec_file = str(tmp_path / "car.vspec")
+    with open(vspec_file, "w") as file:
+        file.write("Vehicle:\n  Speed:\n    datatype: float\n    min: 0\n    max: 100\n")
+    Model.from_file(vspec_file)
+    os.utime(vspec_file, ns=(0, 0))
+    assert cache.read_cache(vspec_file) is not None
+
+
+def test_compile_tree(vss_cache_dir):
+    compiled, failed = cache.compile_tree(os.path.join(VSPEC_DIR, "electronics"))
+    assert (compiled, failed) == (2, 0)
+    assert len(os.listdir(vss_cache_dir)) == 2
@@ -0,0 +1,64 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import pytest
+from vss_lib.vspec import emission
+from vss_lib.vspec.model import Model
+
+VSPEC = {
+    'Vehicle': {
+        'Speed': {'datatype': 'float', 'unit': 'km/h', 'min': 0, 'max': 250},
+        'Gear': {'datatype': 'int8', 'min': -1, 'max': 6},
+        'Resolution': {'datatype': 'string', 'min': '480p', 'max': '720p'},
+        'Flat': {'datatype': 'float', 'min': 5, 'max': 5},
+        'Cabin': {'Temperature': {'datatype': 'float', 'min': -40, 'max': 60}},
+    }
+}
+
+
+@pytest.fixture
+def model():
+    return Model(VSPEC)
+
+
+def test_only_signals_with_a_valid_range_are_emittable(model):
+    assert model.emission.paths == ['Speed', 'Gear', 'Cabin.Temperature']
+    assert model.emission is model.emission  # Computed once per model
+
+
+def test_pick_stays_within_range(model):
+    rng = random.Random(7)
+    for _ in range(200):
+        path, value = model.emission.pick(rng)
+        spec = model.lookup(path)
+        assert spec.min <= value <= spec.max
+
+
+@pytest.mark.parametrize("vectorized", [True, False], ids=["numpy", "random"])
+def test_pick_many_stays_within_range(model, monkeypatch, vectorized):
+    if vectorized:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(emission, "numpy", None)
+    values = model.emission.pick_many(500)
+    assert len(values) == 500
+    assert {path for path, _ in values} == set(model.emission.paths)
+    for path, value in values:
+        spec = model.lookup(path)
+        assert spec.min <= value <= spec.max
+
+
+def test_empty_model_emits_nothing():
+    table = Model({'Vehicle': {}}).emission
+    assert table.pick() == (None, None)
+    assert table.pick_many(3) == []
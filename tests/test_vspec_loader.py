@@ -0,0 +1,54 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import glob
+import os
+import pytest
+from vss_lib.vspec.loader import load_yaml, stream_signal_table
+from vss_lib.vspec.model import Model
+
+VSPEC_DIR = os.path.join(os.path.dirname(__file__), "..", "usr", "share", "vss-lib")
+VSPEC_FILES = sorted(glob.glob(os.path.join(VSPEC_DIR, "**", "*.vspec"), recursive=True))
+
+
+@pytest.mark.parametrize("vspec_file", VSPEC_FILES, ids=lambda path: os.path.relpath(path, VSPEC_DIR))
+def test_streaming_matches_document_index(vspec_file):
+    with open(vspec_file, "rb") as file:
+        source = file.read()
+    expected = Model(load_yaml(source)).table
+    streamed = stream_signal_table(source)
+
+    assert streamed.paths == expected.paths
+    for spec in expected:
+        assert dict(streamed.get(spec.path)) == dict(spec)
+
+
+def test_streaming_model_from_file(tmp_path):
+    vspec_file = tmp_path / "catalog.vspec"
+    vspec_file.write_text(
+        "Vehicle:\n"
+        "  Type: Car\n"
+        "  Powertrain:\n"
+        "    Speed: {datatype: float, unit: km/h, min: 0, max: 250}\n"
+        "    Modes: [eco, sport]\n"
+        "  Camera:\n"
+        "    datatype: string\n"
+        "    min: \"720p\"\n"
+        "    max: \"1080p\"\n"
+        "    vendor_specific: {vendor: Acme}\n"
+    )
+    model = Model.from_file(str(vspec_file), streaming=True)
+    assert model.vspec_data is None
+    assert list(model.index) == ["Powertrain.Speed", "Camera"]
+    assert model.get_signal_details("Vehicle.Powertrain.Speed")["max"] == 250
+    assert model.lookup("Camera").max == "1080p"
+    assert model.get_signal_details("Powertrain") is None
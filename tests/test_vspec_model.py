@@ -0,0 +1,99 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+from vss_lib.vspec.model import Model
+
+VSPEC_DIR = os.path.join(os.path.dirname(__file__), "..", "usr", "share", "vss-lib")
+
+
+@pytest.fixture
+def toyota_model():
+    return Model.from_file(os.path.join(VSPEC_DIR, "toyota.vspec"))
+
+
+@pytest.fixture
+def airbus_model():
+    return Model.from_file(os.path.join(VSPEC_DIR, "airspace-vehicles", "airplanes", "Airbus", "A350_XWB", "A350_XWB.vspec"))
+
+
+def test_index_covers_nested_branches(toyota_model):
+    assert set(toyota_model.index) == {
+        "Speed",
+        "TirePressure",
+        "Electronics.Bosch.TemperatureSensor",
+        "Electronics.Renesas.BatteryLevel",
+    }
+
+
+def test_index_covers_signals_layout(airbus_model):
+    assert "Signals.Engine.Thrust" in airbus_model.index
+    assert "Type" not in airbus_model.index
+
+
+def test_get_signal_details_from_index(toyota_model):
+    details = toyota_model.get_signal_details("Electronics.Bosch.TemperatureSensor")
+    assert dict(details) == {"name": "TemperatureSensor", "datatype": "float", "unit": "Celsius", "min": -40, "max": 150}
+    assert toyota_model.get_signal_details("Vehicle.Speed")["max"] == 240
+
+
+def test_signal_spec_is_shared_and_immutable(toyota_model):
+    spec = toyota_model.get_signal_details("Speed")
+    assert spec is toyota_model.get_signal_details("Speed")
+    assert toyota_model.table.maxs[spec.id] == 240
+    with pytest.raises(AttributeError):
+        spec.max = 1
+    with pytest.raises(AttributeError):
+        spec.extra = 1
+
+
+def test_units_and_datatypes_are_interned(toyota_model):
+    other = Model.from_file(os.path.join(VSPEC_DIR, "bmw.vspec"))
+    assert toyota_model.lookup("Speed").datatype is other.lookup("Speed").datatype
+    assert toyota_model.lookup("Speed").unit is other.lookup("Speed").unit
+
+
+def test_non_numeric_bounds():
+    model = Model({"Vehicle": {"Camera": {"datatype": "string", "min": "720p", "max": "1080p"}}})
+    assert model.lookup("Camera").min == "720p"
+    assert model.lookup("Camera").max == "1080p"
+
+
+def test_bounds_keep_their_declared_types(tmp_path):
+    vspec_file = tmp_path / "car.vspec"
+    vspec_file.write_text(
+        "Vehicle:\n"
+        "  Gear: {datatype: int8, min: -1, max: 8}\n"
+        "  Speed: {datatype: float, min: 0.5, max: 250}\n"
+        "  Odometer: {datatype: uint64, min: 0, max: 18446744073709551615}\n"
+        "  Parked: {datatype: boolean, min: false, max: true}\n"
+    )
+    for model in (Model.from_file(str(vspec_file)), Model.from_file(str(vspec_file))):  # Parsed, then cached
+        bounds = {path: (spec.min, spec.max) for path, spec in model.index.items()}
+        assert bounds == {"Gear": (-1, 8), "Speed": (0.5, 250), "Odometer": (0, 2**64 - 1), "Parked": (False, True)}
+        assert [type(bound) for bound in bounds["Gear"] + bounds["Speed"]] == [int, int, float, int]
+        assert bounds["Parked"][1] is True
+
+
+def test_parsed_tree_and_entries_are_dropped():
+    vspec_data = {"Vehicle": {"Speed": {"datatype": "float", "min": 0, "max": 250}}}
+    model = Model(vspec_data)
+    assert model._vspec_data is None and model.table.data == [None]
+    assert model.vspec_data == vspec_data and model.vspec_data is not vspec_data
+    assert model.find("Speed") == {"datatype": "float", "min": 0, "max": 250}
+
+
+def test_find_from_index(toyota_model):
+    assert toyota_model.find("TirePressure")["unit"] == "bar"
+    assert toyota_model.find("Electronics.Bosch")["TemperatureSensor"]["min"] == -40
+    assert toyota_model.find("Missing") is None
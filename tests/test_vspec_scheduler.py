@@ -0,0 +1,93 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from vss_lib.vspec.model import Model
+from vss_lib.vspec.scheduler import EmissionScheduler, resolve_periods
+
+VSPEC = {
+    'Vehicle': {
+        'Speed': {'datatype': 'float', 'min': 0, 'max': 250, 'period': 10},
+        'Gear': {'datatype': 'int8', 'min': -1, 'max': 6},
+        'Cabin': {
+            'period': 1000,
+            'Temperature': {'datatype': 'float', 'min': -40, 'max': 60},
+            'Humidity': {'datatype': 'float', 'min': 0, 'max': 100, 'period': 500},
+        },
+    }
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def emitted():
+    return []
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(emitted, clock):
+    return EmissionScheduler(lambda names, values: emitted.extend(zip(names, values)), clock=clock)
+
+
+def test_periods_from_vspec_branches_and_config():
+    model = Model(VSPEC)
+    assert model.emission.paths == ['Speed', 'Gear', 'Cabin.Temperature', 'Cabin.Humidity']
+    assert resolve_periods(model, default=2000) == [10, 2000, 1000, 500]
+    assert resolve_periods(model, {'Cabin': 100, 'Gear': 0}, default=2000) == [10, 2000, 100, 100]
+
+
+def test_due_signals_are_emitted_at_their_period(scheduler, emitted, clock):
+    scheduler.schedule('car', ['fast', 'slow'], [0, 0], [1, 1], [10, 100])
+    assert scheduler.run_due() == pytest.approx(100.010)
+    assert emitted == []
+
+    for _ in range(10):
+        clock.now += 0.010
+        scheduler.run_due()
+    names = [name for name, _ in emitted]
+    assert names.count('fast') == 10 and names.count('slow') == 1
+    assert all(0 <= value <= 1 for _, value in emitted)
+    assert scheduler.stats()['missed_deadlines'] == 0
+
+
+def test_late_tick_skips_and_reports_missed_deadlines(scheduler, emitted, clock):
+    scheduler.schedule('car', ['fast'], [0], [1], [10])
+    clock.now += 0.035  # Due at +10 ms, ran at +35 ms: the +20 and +30 ms deadlines are missed
+    assert scheduler.run_due() == pytest.approx(100.040)
+    stats = scheduler.stats()
+    assert len(emitted) == 1
+    assert stats['missed_deadlines'] == 2
+    assert stats['jitter_max_ms'] == pytest.approx(25.0)
+
+
+def test_rescheduling_an_owner_replaces_its_signals(scheduler, emitted, clock):
+    scheduler.schedule('car', ['old'], [0], [1], [10])
+    scheduler.schedule('car', ['new'], [0], [1], [10])
+    clock.now += 0.010
+    scheduler.run_due()
+    assert [name for name, _ in emitted] == ['new']
+
+    scheduler.unschedule('car')
+    clock.now += 0.010
+    assert scheduler.run_due() is None
@@ -0,0 +1,90 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+import pytest
+from vss_lib.vspec.watcher import FileWatcher, ModelReloader
+
+RELOAD_DEADLINE = 5.0  # seconds
+
+VSPEC = """Vehicle:
+  Speed:
+    datatype: float
+    unit: km/h
+    min: 0
+    max: {max}
+"""
+
+
+def wait_for(condition, deadline=RELOAD_DEADLINE):
+    end = time.monotonic() + deadline
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.mark.parametrize("use_inotify", [True, False], ids=["inotify", "polling"])
+def test_rewritten_vspec_takes_effect(tmp_path, use_inotify):
+    vspec_file = tmp_path / "car.vspec"
+    vspec_file.write_text(VSPEC.format(max=100))
+
+    reloader = ModelReloader(watcher=FileWatcher(poll_interval=0.05, use_inotify=use_inotify))
+    swapped = []
+    model = reloader.add(str(vspec_file), listener=swapped.append)
+    assert model.lookup("Speed").max == 100
+    reloader.start()
+    try:
+        # Replace the file the way editors do: write aside, then rename over it
+        tmp_file = tmp_path / "car.vspec.new"
+        tmp_file.write_text(VSPEC.format(max=250))
+        os.replace(tmp_file, vspec_file)
+
+        assert wait_for(lambda: reloader.get(str(vspec_file)).lookup("Speed").max == 250)
+        assert swapped and swapped[-1] is reloader.get(str(vspec_file))
+    finally:
+        reloader.stop()
+
+
+def test_broken_vspec_keeps_previous_model(tmp_path):
+    vspec_file = tmp_path / "car.vspec"
+    vspec_file.write_text(VSPEC.format(max=100))
+    reloader = ModelReloader(watcher=FileWatcher(use_inotify=False))
+    reloader.add(str(vspec_file))
+
+    vspec_file.write_text("Vehicle: [unterminated\n")
+    reloader.watcher.check()
+    assert reloader.get(str(vspec_file)).lookup("Speed").max == 100
+
+
+def test_unwatch_releases_the_directory_watch(tmp_path):
+    watcher = FileWatcher()
+    if not watcher.use_inotify:
+        pytest.skip("inotify is not available")
+
+    def kernel_watches():
+        with open(f"/proc/self/fdinfo/{watcher._fd}") as fdinfo:
+            return sum(line.startswith("inotify wd:") for line in fdinfo)
+
+    for directory in ("a", "b"):
+        (tmp_path / directory).mkdir()
+    for name in ("a/car.vspec", "a/truck.vspec", "b/bus.vspec"):
+        watcher.watch(str(tmp_path / name), print)
+    assert kernel_watches() == 2
+    watcher.unwatch(str(tmp_path / "a/car.vspec"))
+    assert kernel_watches() == 2
+    watcher.unwatch(str(tmp_path / "a/truck.vspec"))
+    watcher.unwatch(str(tmp_path / "a/truck.vspec"))
+    assert kernel_watches() == 1
+    watcher.stop()